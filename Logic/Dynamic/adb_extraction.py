@@ -1,33 +1,36 @@
 ##Logic/Dynamic/adb_extraction.py
-import subprocess
+"""
+ADB 기준 경로(ground truth) 추출
+- 라이브러리: extract_paths(pkg, mode="basic"|"recursive", serial=None) -> PathSnapshot
+  (snapshot.extracted 에 CSV로 저장할 폴더 경로 목록, 기기/패키지별로 동시에 호출해도 됨)
+- CLI: python adb_extraction.py <패키지> [-m basic|recursive] [-o 출력.csv] [-s 시리얼]
+  패키지를 생략하면 예전처럼 입력받음
+"""
+import argparse
 import csv
 import sys
 from datetime import datetime
 
-# Windows cp949 인코딩 문제 해결
-if sys.platform == 'win32':
+from adb_session import get_pool
+from fs_snapshot import Entry, PathSnapshot, take_snapshot
+
+EXTRACT_MODES = ("basic", "recursive")
+
+# Windows cp949 인코딩 문제 해결 (스크립트로 실행할 때만, import 한 쪽 stdout은 건드리지 않음)
+if sys.platform == 'win32' and __name__ == "__main__":
     import io
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
 
-def run_adb_command(command):
-    """adb shell su 명령 실행"""
-    try:
-        result = subprocess.run(
-            ['adb', 'shell', 'su', '-c', command],
-            capture_output=True,
-            text=True,
-            encoding='utf-8',
-            errors='ignore',
-            timeout=10
-        )
-        return result.stdout, result.stderr, result.returncode
-    except subprocess.TimeoutExpired:
+def run_adb_command(command, pool=None):
+    """adb shell su 명령 실행 (열어 둔 root 세션 재사용, adb_session). pool 미지정 시 기본 기기"""
+    stdout, stderr, code = (pool or get_pool(root=True)).run(command, timeout=10)
+    if code == -1 and stderr == "Timeout":
         print("    타임아웃")
         return "", "", -1
-    except Exception as e:
-        print(f"    오류: {e}")
-        return "", str(e), -1
+    if code == -1 and stderr:
+        print(f"    오류: {stderr}")
+    return stdout, stderr, code
 
 def parse_ls_line(line):
     """ls -al 한 줄 파싱"""
@@ -53,13 +56,19 @@ def parse_ls_line(line):
         'type': 'directory' if permissions.startswith('d') else 'file'
     }
 
-def scan_one_level(path):
-    """1단계만 스캔 (하위 폴더만)"""
+def scan_one_level(path, snapshot=None, pool=None):
+    """1단계만 스캔 (하위 폴더만, snapshot이 있으면 기기 대신 스냅샷 조회)"""
     paths = []
     
     print(f"    {path} (폴더만 스캔)")
     
-    output, stderr, returncode = run_adb_command(f'ls -al "{path}"')
+    if snapshot is not None:
+        for entry in snapshot.children(path, "d"):
+            paths.append(f"{path}/{entry.name}")
+            print(f"     - [D] {entry.name}")
+        return paths
+    
+    output, stderr, returncode = run_adb_command(f'ls -al "{path}"', pool)
     
     if output is None or returncode != 0 or not output.strip():
         return paths
@@ -83,25 +92,22 @@ def scan_one_level(path):
     
     return paths
 
-def scan_base_paths(package_name):
-    """기본 경로들 스캔"""
-    all_paths = []
-    
-    # /storage/emulated/0 계열 (0단계)
-    storage_base = '/storage/emulated/0'
-    all_paths.append(storage_base)
-    storage_files = f'/storage/emulated/0/Android/data/{package_name}/files'
-    all_paths.append(storage_files)
-    storage_cache = f'/storage/emulated/0/Android/data/{package_name}/cache'
-    all_paths.append(storage_cache)
-    
-    # /sdcard/Android/data/{package_name} 계열 (0단계)
-    sdcard_base = f'/sdcard/Android/data/{package_name}'
-    all_paths.append(sdcard_base)
-    sdcard_files = f'/sdcard/Android/data/{package_name}/files'
-    all_paths.append(sdcard_files)
-    sdcard_cache = f'/sdcard/Android/data/{package_name}/cache'
-    all_paths.append(sdcard_cache)
+def storage_base_paths(package_name):
+    """0단계 기본 경로 (기기 조회 없이 항상 추가, 실제 존재 여부는 확인하지 않음)"""
+    return [
+        # /storage/emulated/0 계열
+        '/storage/emulated/0',
+        f'/storage/emulated/0/Android/data/{package_name}/files',
+        f'/storage/emulated/0/Android/data/{package_name}/cache',
+        # /sdcard/Android/data/{package_name} 계열
+        f'/sdcard/Android/data/{package_name}',
+        f'/sdcard/Android/data/{package_name}/files',
+        f'/sdcard/Android/data/{package_name}/cache',
+    ]
+
+def scan_base_paths(package_name, snapshot=None, pool=None):
+    """기본 경로들 스캔 (snapshot: fs_snapshot.PathSnapshot, 없으면 폴더마다 ls -al)"""
+    all_paths = storage_base_paths(package_name)
     
     # 로그 출력
     print(f"\n{'='*60}")
@@ -114,7 +120,17 @@ def scan_base_paths(package_name):
     print(f"기본 경로 탐색: {data_user_base}")
     print(f"{'='*60}")
     
-    output, stderr, returncode = run_adb_command(f'ls -al "{data_user_base}"')
+    if snapshot is not None:
+        for entry in snapshot.children(data_user_base, "d"):
+            full_path = f"{data_user_base}/{entry.name}"
+            all_paths.append(full_path)
+            print(f"  [D] {entry.name}")
+            if entry.name in ['files', 'databases', 'shared_prefs', 'cache']:
+                print(f"    → {entry.name}/ 하위 1단계 스캔 시작")
+                all_paths.extend(scan_one_level(full_path, snapshot))
+        return all_paths
+    
+    output, stderr, returncode = run_adb_command(f'ls -al "{data_user_base}"', pool)
     
     if output and returncode == 0 and output.strip():
         lines = output.strip().split('\n')
@@ -136,7 +152,7 @@ def scan_base_paths(package_name):
                         # files, databases, shared_prefs, cache만 1단계 더 들어가기
                         if item['filename'] in ['files', 'databases', 'shared_prefs', 'cache']:
                             print(f"    → {item['filename']}/ 하위 1단계 스캔 시작")
-                            sub_paths = scan_one_level(full_path)
+                            sub_paths = scan_one_level(full_path, snapshot, pool)
                             all_paths.extend(sub_paths)
                     # 파일은 무시
             except Exception as e:
@@ -144,42 +160,105 @@ def scan_base_paths(package_name):
     
     return all_paths
 
+def scan_recursive_dirs(package_name, snapshot=None, pool=None):
+    """디렉토리 전체 재귀 수집 (snapshot이 있으면 find 대신 스냅샷 조회)"""
+    paths = []
+    base = f'/data/user/0/{package_name}'
+    if snapshot is not None:
+        return snapshot.dirs(base)
+    output, _, rc = run_adb_command(f'find "{base}" -type d 2>/dev/null', pool)
+    if output and rc == 0:
+        for line in output.split('\n'):
+            if line.strip():
+                paths.append(line.strip())
+    return paths
+
+def extract_paths(package_name, mode="basic", serial=None, pool=None, snapshot=None):
+    """
+    패키지 폴더 경로 추출 -> PathSnapshot (input() / 파일 출력 없음)
+    - mode: "basic" (기본 경로 + 1단계) | "recursive" (/data/user/0/<pkg> 아래 모든 폴더)
+    - serial / pool: 대상 기기 (기본: adb 기본 기기의 root 세션 풀)
+    - snapshot: 이미 찍어 둔 스냅샷 재사용 (basic / recursive 를 둘 다 뽑을 때)
+    - 반환 스냅샷의 extracted = 추출된 폴더 경로 목록 (CSV 저장 순서)
+      스냅샷을 못 찍은 기기에서는 ls / find 로 실제 확인한 폴더만 담긴 스냅샷
+      (확인 없이 추가하는 storage_base_paths 는 extracted 에만 들어가고 스냅샷 항목에서는 제외)
+    """
+    if mode not in EXTRACT_MODES:
+        raise ValueError(f"unknown mode: {mode} (basic | recursive)")
+    pool = pool or get_pool(serial, root=True)
+
+    if snapshot is None:
+        snapshot = take_snapshot(package_name, pool=pool)
+    if mode == "basic":
+        paths = scan_base_paths(package_name, snapshot, pool)
+    else:
+        paths = scan_recursive_dirs(package_name, snapshot, pool)
+
+    if snapshot is None:
+        unverified = set(storage_base_paths(package_name))
+        snapshot = PathSnapshot((Entry(p, "d", 0, 0.0, 0) for p in paths if p not in unverified),
+                                package=package_name, serial=pool.serial)
+    result = PathSnapshot(snapshot.entries.values(), roots=snapshot.roots,
+                          package=package_name, serial=snapshot.serial, taken_at=snapshot.taken_at)
+    result.extracted = list(paths)
+    return result
+
+def write_paths_csv(output_file, paths):
+    """추출 경로 CSV 저장 (full_path 한 컬럼, utf-8-sig)"""
+    with open(output_file, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f)
+        writer.writerow(['full_path'])
+        for path in paths:
+            writer.writerow([path])
+
 def main():
+    parser = argparse.ArgumentParser(description="ADB Package Path Extractor (폴더만 수집)")
+    parser.add_argument("package", nargs="?", help="패키지 이름 (생략 시 입력)")
+    parser.add_argument("-m", "--mode", choices=EXTRACT_MODES, default="basic")
+    parser.add_argument("-o", "--output", help="출력 CSV (기본: paths_<pkg>_dirs_<시각>.csv)")
+    parser.add_argument("-s", "--serial", help="대상 기기 (adb -s)")
+    parser.add_argument("--snapshot-out", help="스냅샷 CSV 저장 경로 (path,type,size,mtime,mode)")
+    args = parser.parse_args()
+
     print("="*60)
     print("ADB Package Path Extractor (폴더만 수집 모드)")
     print("="*60)
     
-    package_name = input("\n패키지 이름 입력 (예: sg.bigo.live): ").strip()
+    package_name = (args.package or input("\n패키지 이름 입력 (예: sg.bigo.live): ")).strip()
     
     if not package_name:
         print("패키지 이름을 입력하세요!")
-        return
+        return 1
     
     print(f"\n📱 패키지: {package_name}")
-    print(f"🔍 경로 수집 시작 (폴더만) ...\n")
+    print(f"🔍 경로 수집 시작 (폴더만, {args.mode}) ...\n")
     
     try:
-        all_paths = scan_base_paths(package_name)
+        snapshot = extract_paths(package_name, args.mode, serial=args.serial)
+        if args.snapshot_out:
+            snapshot.to_csv(args.snapshot_out)
+            print(f" 스냅샷 저장: {args.snapshot_out} ({len(snapshot)}개 항목)")
+
+        all_paths = snapshot.extracted
         
         # CSV 저장
         if all_paths:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_file = f"paths_{package_name}_dirs_{timestamp}.csv"
-            
-            with open(output_file, 'w', newline='', encoding='utf-8-sig') as f:
-                writer = csv.writer(f)
-                writer.writerow(['full_path'])
-                for path in all_paths:
-                    writer.writerow([path])
+            suffix = "dirs" if args.mode == "basic" else "dirs_recursive"
+            output_file = args.output or f"paths_{package_name}_{suffix}_{timestamp}.csv"
+            write_paths_csv(output_file, all_paths)
             
             print(f"\n{'='*60}")
             print(f" 저장 완료: {output_file}")
             print(f"   총 {len(all_paths)}개 폴더 경로")
             print(f"{'='*60}")
-        else:
-            print("\n 수집된 경로가 없습니다.")
+            return 0
+
+        print("\n 수집된 경로가 없습니다.")
+        return 1
     except Exception as e:
         print(f"\n 오류: {e}")
+        return 1
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ADB shell 세션 풀
+- 명령마다 `adb shell su -c ...` 프로세스를 새로 띄우지 않고, `adb shell` (root면 `adb shell su`) 세션을 열어 둔 채 재사용
+- 명령 출력은 명령마다 새로 만든 sentinel 줄로 구분 (stdout: "<sentinel> <종료코드>", stderr: "<sentinel>")
+  stderr 가 stdout 으로 합쳐져 오는 구형 기기(shell v2 미지원 adb)는 stderr sentinel 도 stdout 에서 받음
+- 타임아웃 시 세션을 닫고 다음 명령에서 자동 재연결, 세션이 끊겨 있으면 재연결 후 한 번 재시도
+- AdbSessionPool: 여러 스레드에서 동시에 쓰는 세션 묶음 (get_pool 로 serial/root 별 공용 풀)
+- 하드웨어 없이 테스트하기 위한 가상 기기 백엔드는 adb_sim.FakeDevice
+
+사용 예:
+    from adb_session import get_pool
+    out, err, rc = get_pool(root=True).run('ls -al "/data/user/0/com.x"')
+"""
+
+import atexit
+import queue
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_TIMEOUT = 10
+
+# 기존 run_adb_command / DeviceManager.adb 와 같은 실패 반환값
+TIMEOUT_RESULT = ("", "Timeout", -1)
+
+
+class AdbTimeout(Exception):
+    pass
+
+
+class AdbDisconnected(Exception):
+    pass
+
+
+def _popen_kwargs() -> dict:
+    # Windows GUI에서 콘솔 창이 뜨지 않도록
+    if sys.platform == 'win32':
+        return {"creationflags": subprocess.CREATE_NO_WINDOW}
+    return {}
+
+
+# -------------------------
+# 실제 adb 백엔드
+# -------------------------
+class ShellTransport:
+    """
+    shell 프로세스 하나 (adb shell / adb shell su / 로컬 sh 등)
+    - 명령은 ( ... ) </dev/null 서브셸에서 실행 → cd/exit/stdin 읽기가 세션에 영향 없음
+    - stdout/stderr는 reader 스레드가 줄 단위로 (stderr 여부, 줄) 을 큐 하나에 넣고, execute가 sentinel 두 개까지 모은다
+    """
+
+    def __init__(self, argv: List[str]):
+        self.argv = list(argv)
+        self.proc = subprocess.Popen(
+            self.argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=0,
+            **_popen_kwargs()
+        )
+        self._lines = queue.Queue()
+        for stream, is_err in ((self.proc.stdout, False), (self.proc.stderr, True)):
+            threading.Thread(target=self._reader, args=(stream, is_err, self._lines), daemon=True).start()
+
+    @staticmethod
+    def _reader(stream, is_err, q):
+        try:
+            for line in iter(stream.readline, b""):
+                q.put((is_err, line))
+        except (OSError, ValueError):
+            pass
+        q.put((is_err, None))  # EOF
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def _collect(self, sentinel: bytes, deadline: float):
+        """
+        stdout sentinel ("<sentinel> <종료코드>") 과 stderr sentinel ("<sentinel>") 을 모두 받을 때까지 수집
+        -> (stdout 줄, stderr 줄, 종료코드 문자열)
+        - stderr sentinel 은 어느 스트림으로 와도 인정 (구형 기기는 stderr 가 stdout 으로 합쳐짐)
+        - stdout sentinel 뒤에 stdout 으로 온 줄은 합쳐진 stderr sentinel 앞의 '\n' 이므로 버림
+        """
+        out_lines, err_lines = [], []
+        rc_text = None
+        err_done = False
+        while rc_text is None or not err_done:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise AdbTimeout()
+            try:
+                is_err, line = self._lines.get(timeout=remaining)
+            except queue.Empty:
+                raise AdbTimeout()
+            if line is None:
+                # stderr 만 닫힌 경우 (stderr 를 stdout 으로 돌린 셸) 는 계속, stdout 이 닫히면 세션 종료
+                if is_err:
+                    continue
+                raise AdbDisconnected()
+            if line.startswith(sentinel):
+                rest = line[len(sentinel):].strip()
+                if rest:
+                    rc_text = rest
+                else:
+                    err_done = True
+                continue
+            if is_err:
+                err_lines.append(line)
+            elif rc_text is None:
+                out_lines.append(line)
+        return out_lines, err_lines, rc_text
+
+    @staticmethod
+    def _strip_sentinel_newline(lines: List[bytes]) -> bytes:
+        """sentinel 앞에 붙인 '\\n' 하나 제거 (pty 모드면 '\\r\\n')"""
+        data = b"".join(lines)
+        if data.endswith(b"\r\n"):
+            return data[:-2]
+        if data.endswith(b"\n"):
+            return data[:-1]
+        return data
+
+    def execute(self, command: str, timeout: float) -> Tuple[str, str, int]:
+        if not self.alive:
+            raise AdbDisconnected()
+
+        marker = f"__A3_{uuid.uuid4().hex}__"
+        script = (
+            f"( {command}\n) </dev/null\n"
+            f"printf '\\n{marker} %d\\n' $?\n"
+            f"printf '\\n{marker}\\n' >&2\n"
+        )
+        try:
+            self.proc.stdin.write(script.encode("utf-8"))
+            self.proc.stdin.flush()
+        except (OSError, ValueError):
+            raise AdbDisconnected()
+
+        deadline = time.monotonic() + timeout
+        sentinel = marker.encode()
+        out_lines, err_lines, rc_text = self._collect(sentinel, deadline)
+
+        # stdout / stderr 모두 줄바꿈 없이 끝난 출력도 sentinel 이 줄 맨 앞에 오도록 '\n' 을 붙여 보냄
+        out = self._strip_sentinel_newline(out_lines)
+        err = self._strip_sentinel_newline(err_lines)
+        try:
+            rc = int(rc_text)
+        except ValueError:
+            rc = -1
+        return out.decode("utf-8", errors="ignore"), err.decode("utf-8", errors="ignore"), rc
+
+    def close(self):
+        try:
+            if self.alive:
+                self.proc.stdin.close()
+                self.proc.wait(timeout=2)
+        except Exception:
+            pass
+        if self.alive:
+            self.proc.kill()
+
+
+class AdbBackend:
+    """실제 기기 (adb [-s serial] ...)"""
+
+    def __init__(self, serial: Optional[str] = None, adb_path: str = "adb"):
+        self.serial = serial
+        self.adb_path = adb_path
+
+    def adb_argv(self, *args) -> List[str]:
+        argv = [self.adb_path]
+        if self.serial:
+            argv += ["-s", self.serial]
+        return argv + list(args)
+
+    def open_shell(self, root: bool = False) -> ShellTransport:
+        return ShellTransport(self.adb_argv("shell", *(["su"] if root else [])))
+
+    def run_adb(self, args: List[str], timeout: float = DEFAULT_TIMEOUT) -> Tuple[int, str, str]:
+        """shell 이 아닌 adb 명령 (devices / push / pull 등). (returncode, stdout, stderr)"""
+        try:
+            result = subprocess.run(
+                self.adb_argv(*args), capture_output=True, text=True,
+                encoding="utf-8", errors="ignore", timeout=timeout, **_popen_kwargs()
+            )
+            return result.returncode, result.stdout, result.stderr
+        except subprocess.TimeoutExpired:
+            return -1, "", "Timeout"
+        except Exception as e:
+            return -1, "", str(e)
+
+
+# -------------------------
+# 세션 / 풀
+# -------------------------
+class AdbSession:
+    """
+    열어 둔 shell 세션 하나 (스레드 안전, 한 번에 명령 하나)
+    run(command) -> (stdout, stderr, returncode)
+    - 타임아웃: 세션을 닫고 ("", "Timeout", -1) 반환 (명령 부작용이 있을 수 있으므로 재시도 안 함)
+    - 끊김: 재연결 후 reconnect_retries 번까지 다시 실행
+    """
+
+    def __init__(self, serial: Optional[str] = None, root: bool = False, backend=None,
+                 timeout: float = DEFAULT_TIMEOUT, reconnect_retries: int = 1):
+        self.backend = backend or AdbBackend(serial)
+        self.root = root
+        self.timeout = timeout
+        self.reconnect_retries = reconnect_retries
+        self._transport = None
+        self._lock = threading.Lock()
+        self.stats = {"commands": 0, "connects": 0, "timeouts": 0, "disconnects": 0}
+
+    @property
+    def serial(self):
+        return getattr(self.backend, "serial", None)
+
+    def _ensure(self):
+        if self._transport is None or not self._transport.alive:
+            self._drop()
+            self._transport = self.backend.open_shell(self.root)
+            self.stats["connects"] += 1
+        return self._transport
+
+    def _drop(self):
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+    def run(self, command: str, timeout: Optional[float] = None) -> Tuple[str, str, int]:
+        timeout = self.timeout if timeout is None else timeout
+        with self._lock:
+            self.stats["commands"] += 1
+            for attempt in range(self.reconnect_retries + 1):
+                try:
+                    return self._ensure().execute(command, timeout)
+                except AdbTimeout:
+                    self.stats["timeouts"] += 1
+                    self._drop()
+                    return TIMEOUT_RESULT
+                except AdbDisconnected:
+                    self.stats["disconnects"] += 1
+                    self._drop()
+                except OSError as e:
+                    # adb 실행 파일 없음 등
+                    self._drop()
+                    return "", str(e), -1
+            return "", "Disconnected", -1
+
+    def close(self):
+        with self._lock:
+            self._drop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class AdbSessionPool:
+    """
+    같은 기기/권한 세션 size개를 돌려 쓰는 풀 (세션은 처음 필요할 때 연다)
+    - run(command): 쉬는 세션 하나로 실행
+    - map(commands): 여러 명령을 세션 수만큼 동시에 실행 (결과는 입력 순서)
+    """
+
+    def __init__(self, serial: Optional[str] = None, root: bool = False, size: int = 4,
+                 backend=None, timeout: float = DEFAULT_TIMEOUT):
+        self.backend = backend or AdbBackend(serial)
+        self.root = root
+        self.size = max(1, size)
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._sessions: List[AdbSession] = []
+        self._lock = threading.Lock()
+        self._slots = threading.Semaphore(self.size)
+
+    @property
+    def serial(self):
+        return getattr(self.backend, "serial", None)
+
+    @contextmanager
+    def session(self):
+        self._slots.acquire()
+        try:
+            try:
+                s = self._idle.get_nowait()
+            except queue.Empty:
+                s = AdbSession(root=self.root, backend=self.backend, timeout=self.timeout)
+                with self._lock:
+                    self._sessions.append(s)
+            try:
+                yield s
+            finally:
+                self._idle.put(s)
+        finally:
+            self._slots.release()
+
+    def run(self, command: str, timeout: Optional[float] = None) -> Tuple[str, str, int]:
+        with self.session() as s:
+            return s.run(command, timeout)
+
+    def map(self, commands, timeout: Optional[float] = None) -> List[Tuple[str, str, int]]:
+        commands = list(commands)
+        if len(commands) <= 1 or self.size == 1:
+            return [self.run(c, timeout) for c in commands]
+        with ThreadPoolExecutor(max_workers=min(self.size, len(commands))) as ex:
+            return list(ex.map(lambda c: self.run(c, timeout), commands))
+
+    def stats(self) -> Dict[str, int]:
+        total = {"sessions": len(self._sessions)}
+        for s in self._sessions:
+            for k, v in s.stats.items():
+                total[k] = total.get(k, 0) + v
+        return total
+
+    def close(self):
+        with self._lock:
+            for s in self._sessions:
+                s.close()
+            self._sessions.clear()
+        while not self._idle.empty():
+            self._idle.get_nowait()
+
+
+_POOLS: Dict[tuple, AdbSessionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_pool(serial: Optional[str] = None, root: bool = False, size: int = 4) -> AdbSessionPool:
+    """serial / root 별 프로세스 공용 풀 (프로세스 종료 시 세션 정리)"""
+    key = (serial, root)
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = _POOLS[key] = AdbSessionPool(serial=serial, root=root, size=size)
+        return pool
+
+
+@atexit.register
+def close_all_pools():
+    with _POOLS_LOCK:
+        for pool in _POOLS.values():
+            pool.close()
+        _POOLS.clear()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+가상 adb 기기 (하드웨어 없이 세션/풀/스케줄러 테스트)
+- FakeDevice: 메모리 파일시스템 + 자주 쓰는 명령을 흉내 내는 adb_session 백엔드
+  (open_shell / run_adb 인터페이스는 adb_session.AdbBackend 와 같음)
+- batch_pipeline.py --simulate 와 tests/ 에서 사용
+
+사용 예:
+    from adb_session import AdbSessionPool
+    from adb_sim import FakeDevice
+    dev = FakeDevice(packages=["com.x"])
+    dev.add_file("/data/user/0/com.x/files/a.db", 10)
+    pool = AdbSessionPool(root=True, backend=dev)
+"""
+
+import os
+import re
+import shlex
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from adb_session import DEFAULT_TIMEOUT, AdbDisconnected, AdbTimeout
+
+
+class FakeDevice:
+    """
+    하드웨어 없이 세션/풀/추출 로직을 테스트하기 위한 가상 기기
+    - entries: {경로: (type, size)}  type = "d" | "f"   (add_dir / add_file 로 추가)
+    - packages: 설치된 서드파티 패키지 목록 (pm list packages -3)
+    - file_contents: cat 으로 읽을 내용 (예: /proc/meminfo)
+    - handlers: [(정규식, fn(device, match) -> (stdout, stderr, rc))] 기본 명령보다 먼저 검사
+    - hang_pattern: 이 정규식에 맞는 명령은 타임아웃 처리
+    - drop_next: 0보다 크면 그 횟수만큼 세션을 끊음 (재연결 테스트)
+    - commands: 실행된 명령 기록
+    - 지원 명령: echo, cat, [ -e|-d|-f 경로 ], ls -al/-ld, find [-type d|f] [-printf 형식], pm list/path,
+      am force-stop, ps, pkill/killall, 절대 경로 실행 파일 (프로세스 목록), "| grep"
+    - 셸 문법은 ; / && / 줄바꿈으로 이어진 단순 명령만 해석 (while 루프, heredoc, 여러 줄 스크립트는 미지원)
+      → path_classifier 분류 루프 / device_reset 리셋 스크립트는 tests 에서 로컬 sh 로 실행해 확인
+    """
+
+    def __init__(self, serial: str = "fake-0", packages=None, latency: float = 0.0):
+        self.serial = serial
+        self.entries: Dict[str, Tuple[str, int]] = {"/": ("d", 0)}
+        self.packages: List[str] = list(packages or [])
+        self.file_contents: Dict[str, str] = {
+            "/proc/meminfo": "MemTotal:        4000000 kB\nMemAvailable:    2000000 kB\n",
+        }
+        self.processes: List[str] = ["init", "zygote64"]
+        self.handlers: List[tuple] = []
+        self.hang_pattern: Optional[str] = None
+        self.drop_next = 0
+        self.latency = latency
+        self.mtime = 1704067200.0
+        self.online = True
+        self.commands: List[str] = []
+        self._lock = threading.Lock()
+
+    # --- 파일시스템 ---
+    def add_dir(self, path: str):
+        path = path.rstrip("/") or "/"
+        parts = path.split("/")
+        for i in range(2, len(parts) + 1):
+            self.entries.setdefault("/".join(parts[:i]), ("d", 0))
+
+    def add_file(self, path: str, size: int = 0):
+        self.add_dir(os.path.dirname(path))
+        self.entries[path] = ("f", size)
+
+    def children(self, path: str) -> List[str]:
+        prefix = path.rstrip("/") + "/"
+        return sorted(p for p in self.entries
+                      if p.startswith(prefix) and "/" not in p[len(prefix):])
+
+    def descendants(self, path: str) -> List[str]:
+        prefix = path.rstrip("/") + "/"
+        return sorted(p for p in self.entries if p == path or p.startswith(prefix))
+
+    # --- 백엔드 인터페이스 ---
+    def open_shell(self, root: bool = False):
+        if not self.online:
+            raise OSError(f"device '{self.serial}' not found")
+        return _FakeTransport(self, root)
+
+    def run_adb(self, args: List[str], timeout: float = DEFAULT_TIMEOUT) -> Tuple[int, str, str]:
+        if args[:1] == ["devices"]:
+            state = "device" if self.online else "offline"
+            return 0, f"List of devices attached\n{self.serial}\t{state}\n", ""
+        if args[:1] == ["shell"]:
+            out, err, rc = self.execute(" ".join(args[1:]))
+            return rc, out, err
+        return 0, "", ""
+
+    # --- 명령 해석 (; / && 로 이어진 단순 명령만) ---
+    def execute(self, command: str) -> Tuple[str, str, int]:
+        with self._lock:
+            self.commands.append(command)
+        if self.latency:
+            time.sleep(self.latency)
+
+        out_parts, err_parts, rc = [], [], 0
+        for stmt in re.split(r";|\n", command):
+            stmt = stmt.strip()
+            if not stmt:
+                continue
+            for i, part in enumerate(stmt.split("&&")):
+                if i and rc != 0:
+                    break
+                out, err, rc = self._simple(part.strip())
+                out_parts.append(out)
+                err_parts.append(err)
+        return "".join(out_parts), "".join(err_parts), rc
+
+    def _simple(self, cmd: str) -> Tuple[str, str, int]:
+        for pattern, fn in self.handlers:
+            m = re.search(pattern, cmd)
+            if m:
+                return fn(self, m)
+        # 파이프는 "명령 | grep 패턴" 만 지원
+        if "|" in cmd and not cmd.lstrip().startswith("su "):
+            first, *filters = cmd.split("|")
+            out, err, rc = self._simple(first.strip())
+            for f in filters:
+                f_argv = shlex.split(f)
+                if f_argv[:1] == ["grep"] and len(f_argv) > 1:
+                    lines = [l for l in out.splitlines(True) if f_argv[-1] in l]
+                    out, rc = "".join(lines), 0 if lines else 1
+            return out, err, rc
+        try:
+            argv = shlex.split(cmd)
+        except ValueError:
+            return "", "syntax error\n", 2
+        if not argv:
+            return "", "", 0
+        if argv[:2] == ["su", "-c"]:
+            return self.execute(" ".join(argv[2:]))
+
+        name, args = argv[0], argv[1:]
+        if ">" in args:
+            # 리다이렉트 출력은 버림 (echo 3 > /proc/sys/vm/drop_caches 등)
+            out, err, rc = self._simple(shlex.join(argv[:argv.index(">")]))
+            return "", err, rc
+        if name == "echo":
+            return " ".join(args) + "\n", "", 0
+        if name == "ps":
+            lines = ["USER PID PPID NAME\n"]
+            lines += [f"root {100 + i} 1 {p}\n" for i, p in enumerate(self.processes)]
+            return "".join(lines), "", 0
+        if name in ("pkill", "killall"):
+            target = args[-1] if args else ""
+            if target in self.processes:
+                self.processes = [p for p in self.processes if p != target]
+                return "", "", 0
+            return "", "", 1
+        if name.startswith("/"):
+            # 실행 파일 직접 실행 (frida-server & 등) → 프로세스 목록에 추가
+            self.processes.append(name.rsplit("/", 1)[-1])
+            return "", "", 0
+        if name in ("true", "sync"):
+            return "", "", 0
+        if name == "[" and len(args) == 3 and args[2] == "]":
+            entry = self.entries.get(args[1].rstrip("/") or "/")
+            ok = entry is not None and (args[0] == "-e" or entry[0] == args[0][1:])
+            return "", "", 0 if ok else 1
+        if name == "cat":
+            path = args[0] if args else ""
+            if path in self.file_contents:
+                return self.file_contents[path], "", 0
+            return "", f"cat: {path}: No such file or directory\n", 1
+        if name == "pm" and args[:2] == ["list", "packages"]:
+            return "".join(f"package:{p}\n" for p in self.packages), "", 0
+        if name == "pm" and args[:1] == ["path"]:
+            pkg = args[1] if len(args) > 1 else ""
+            if pkg in self.packages:
+                return f"package:/data/app/{pkg}-1/base.apk\n", "", 0
+            return "", "", 1
+        if name == "am" and args[:1] == ["force-stop"]:
+            return "", "", 0
+        if name == "ls":
+            return self._ls(args)
+        if name == "find":
+            return self._find(args)
+        return "", f"/system/bin/sh: {name}: not found\n", 127
+
+    def _ls_line(self, path: str, name: str) -> str:
+        kind, size = self.entries[path]
+        perm = "drwxrwx--x" if kind == "d" else "-rw-rw----"
+        return f"{perm} 2 u0_a1 u0_a1 {size} 2024-01-01 00:00 {name}\n"
+
+    def _ls(self, args):
+        flags = "".join(a[1:] for a in args if a.startswith("-"))
+        paths = [a for a in args if not a.startswith("-")] or ["/"]
+        path = paths[0].rstrip("/") or "/"
+        if path not in self.entries:
+            return "", f"ls: {path}: No such file or directory\n", 1
+        if "d" in flags or self.entries[path][0] == "f":
+            return self._ls_line(path, path), "", 0
+        children = self.children(path)
+        lines = [f"total {len(children)}\n"]
+        if "a" in flags:
+            lines.append(self._ls_line(path, "."))
+            lines.append("drwxr-xr-x 2 root root 0 2024-01-01 00:00 ..\n")
+        lines += [self._ls_line(p, p.rsplit("/", 1)[-1]) for p in children]
+        return "".join(lines), "", 0
+
+    def _find(self, args):
+        base = args[0].rstrip("/") if args else "/"
+        if base not in self.entries:
+            return "", f"find: {base}: No such file or directory\n", 1
+        if "-printf" in args:
+            # "[\\(] -type X -printf 형식 [\\)] -o ..." : 항목마다 타입이 맞는 첫 -printf 형식으로 출력
+            branches, want = [], None
+            for i, a in enumerate(args):
+                if a == "-type":
+                    want = args[i + 1]
+                elif a == "-printf":
+                    branches.append((want, args[i + 1]))
+                elif a == "-o":
+                    want = None
+            records = []
+            for p in self.descendants(base):
+                for want, fmt in branches:
+                    if want is None or want == self.entries[p][0]:
+                        records.append(self._printf(fmt, p))
+                        break
+            return "".join(records), "", 0
+        want = None
+        if "-type" in args:
+            want = args[args.index("-type") + 1]
+        hits = [p for p in self.descendants(base) if want is None or self.entries[p][0] == want]
+        return "".join(p + "\n" for p in hits), "", 0
+
+
+    _PRINTF_ESCAPES = {"t": "\t", "n": "\n", "0": "\0", "\\": "\\"}
+
+    def _printf(self, fmt: str, path: str) -> str:
+        """find -printf 형식 (%y %s %T@ %m %p %f, \\t \\n \\0)"""
+        kind, size = self.entries[path]
+        fields = {
+            "y": kind, "s": str(size), "T@": f"{self.mtime:.1f}",
+            "m": "771" if kind == "d" else "660", "p": path, "f": path.rsplit("/", 1)[-1],
+        }
+        return re.sub(
+            r"%(T@|[ysmpf%])|\\(.)",
+            lambda m: (fields.get(m.group(1), "%") if m.group(1) else self._PRINTF_ESCAPES.get(m.group(2), m.group(2))),
+            fmt,
+        )
+
+
+class _FakeTransport:
+    def __init__(self, device: FakeDevice, root: bool):
+        self.device = device
+        self.root = root
+        self.alive = True
+
+    def execute(self, command: str, timeout: float) -> Tuple[str, str, int]:
+        dev = self.device
+        if not self.alive or not dev.online:
+            self.alive = False
+            raise AdbDisconnected()
+        if dev.drop_next > 0:
+            dev.drop_next -= 1
+            self.alive = False
+            raise AdbDisconnected()
+        if dev.hang_pattern and re.search(dev.hang_pattern, command):
+            raise AdbTimeout()
+        return dev.execute(command)
+
+    def close(self):
+        self.alive = False
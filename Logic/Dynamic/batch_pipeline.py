@@ -2,9 +2,14 @@
 # -*- coding: utf-8 -*-
 
 """
-여러 앱에 대해 순차적으로 파이프라인 실행
+여러 앱에 대해 파이프라인 실행 (연결된 기기 여러 대에 병렬 분배)
 Usage:
     python batch_pipeline.py --applist applist.txt --duration 300 --runs 3
+    python batch_pipeline.py --applist applist.txt --devices SERIAL1,SERIAL2
+    python batch_pipeline.py --applist applist.txt --simulate 3   # 가상 기기로 스케줄러 테스트
+
+- 진행 상태는 --state 파일(기본: batch_state_<applist 이름>.json)에 저장,
+  같은 명령을 다시 실행하면 끝나지 않은 앱부터 이어서 실행 (--fresh: 처음부터)
 """
 
 import subprocess
@@ -14,7 +19,12 @@ import sys
 import time
 from datetime import datetime
 from pathlib import Path
-from device_manager import DeviceManager
+from device_manager import DeviceManager, COOLDOWN_MAX_MEMORY_PERCENT, COOLDOWN_MAX_TEMP
+from device_scheduler import (
+    BatchScheduler, BatchState, DeviceWorker, SimulatedFleetBackend,
+    discover_devices, simulated_fleet, simulated_run_app,
+    SUCCESS, FAILED, PENDING,
+)
 
 def log(level, message):
     """로그 출력"""
@@ -53,8 +63,11 @@ def read_applist(applist_path):
 
     return apps
 
-def run_pipeline(pkg, duration, runs, spawn, ground_truth_dir, auto_extract_adb, device_manager=None):
-    """단일 앱에 대해 pipeline_runner.js 실행"""
+def run_pipeline(pkg, duration, runs, spawn, ground_truth_dir, auto_extract_adb, device_manager=None, serial=None):
+    """
+    단일 앱에 대해 pipeline_runner.js 실행
+    - serial: 대상 기기 (ANDROID_SERIAL 로 전달 → 하위 adb / frida 호출이 이 기기만 사용)
+    """
     log('INFO', f'========== Starting pipeline for {pkg} ==========')
 
     # 디바이스 상태 사전 체크
@@ -103,11 +116,16 @@ def run_pipeline(pkg, duration, runs, spawn, ground_truth_dir, auto_extract_adb,
     # 실행
     start_time = time.time()
     try:
+        env = dict(os.environ)
+        if serial:
+            env['ANDROID_SERIAL'] = serial
+
         result = subprocess.run(
             cmd,
             cwd=os.path.dirname(os.path.abspath(__file__)),
             capture_output=False,  # 실시간 출력
             text=True,
+            env=env,
             timeout=duration * runs + 300  # 여유 시간 추가
         )
 
@@ -127,6 +145,51 @@ def run_pipeline(pkg, duration, runs, spawn, ground_truth_dir, auto_extract_adb,
         log('ERROR', f'Pipeline error for {pkg}: {e}')
         return False
 
+def build_workers(args, apps):
+    """대상 기기별 DeviceWorker 목록 (--simulate 면 가상 기기)"""
+    if args.simulate:
+        fleet = simulated_fleet(args.simulate, apps)
+        backend = SimulatedFleetBackend(fleet)
+        available = set(discover_devices(backend))
+        devices = [d for d in fleet if d.serial in available]
+        return [DeviceWorker(d.serial, DeviceManager(args.frida_server_path, serial=d.serial, backend=d))
+                for d in devices]
+
+    serials = discover_devices()
+    if args.devices:
+        wanted = [s.strip() for s in args.devices.split(',') if s.strip()]
+        missing = [s for s in wanted if s not in serials]
+        if missing:
+            log('WARN', f'Devices not available: {", ".join(missing)}')
+        serials = [s for s in wanted if s in serials]
+
+    workers = []
+    for serial in serials:
+        manager = None
+        if args.enable_device_management:
+            manager = DeviceManager(frida_server_path=args.frida_server_path, serial=serial)
+        workers.append(DeviceWorker(serial, manager))
+    return workers
+
+
+def prepare_device(worker):
+    """초기 상태 체크 (Frida 서버가 없으면 시작). 실패하면 False"""
+    manager = worker.manager
+    log('INFO', f'[{worker.serial}] Initial device health check...')
+    checks = manager.health_check(verbose=True)
+
+    if not checks['device_connected']:
+        log('ERROR', f'[{worker.serial}] Device not connected')
+        return False
+
+    if not checks['frida_running']:
+        log('WARN', f'[{worker.serial}] Frida server not running, starting...')
+        if not manager.start_frida_server():
+            log('ERROR', f'[{worker.serial}] Failed to start Frida server')
+            return False
+    return True
+
+
 def main():
     parser = argparse.ArgumentParser(description='Batch pipeline runner for multiple apps')
     parser.add_argument('--applist', required=True, help='Path to app list file (one package per line)')
@@ -136,16 +199,38 @@ def main():
     parser.add_argument('--no-spawn', dest='spawn', action='store_false', help='Disable spawn mode (use attach mode)')
     parser.add_argument('--ground-truth-dir', default='artifacts_output', help='Directory containing ground truth CSV files')
     parser.add_argument('--auto-extract-adb', action='store_true', help='Auto-generate ground truth via ADB extraction')
-    parser.add_argument('--delay', type=int, default=30, help='Delay between apps (seconds)')
-    parser.add_argument('--start-from', type=int, default=0, help='Start from index (0-based)')
+    parser.add_argument('--delay', type=int, default=30, help='Delay between apps on the same device (seconds)')
+    parser.add_argument('--start-from', type=int, default=0,
+                        help='(deprecated, use --state) Skip apps before this index (0-based) in this run only')
+
+    # 기기 / 스케줄링 옵션
+    parser.add_argument('--devices', help='Comma-separated device serials (default: all devices in adb devices)')
+    parser.add_argument('--state', help='Resumable state file (default: batch_state_<applist name>.json)')
+    parser.add_argument('--fresh', action='store_true', help='Ignore existing state file and start over')
+    parser.add_argument('--retry-failed', action='store_true', help='Re-run apps that failed in the state file')
+    parser.add_argument('--max-retries', type=int, default=1, help='Retries per app on another device (default: 1)')
+    parser.add_argument('--recover-delay', type=int, default=60,
+                        help='Seconds between health re-checks of an unhealthy device (default: 60)')
+
+    # 시뮬레이션 (하드웨어 없이 스케줄러 테스트)
+    parser.add_argument('--simulate', type=int, default=0, metavar='N', help='Run with N simulated devices')
+    parser.add_argument('--simulate-duration', type=float, default=0.5, help='Simulated pipeline time per app (seconds)')
+    parser.add_argument('--simulate-fail-rate', type=float, default=0.0, help='Simulated failure probability')
 
     # 디바이스 관리 옵션
     parser.add_argument('--enable-device-management', action='store_true',
                        help='Enable device health monitoring and Frida server management (RECOMMENDED)')
     parser.add_argument('--cooldown', type=int, default=30,
-                       help='Cooldown duration after each app (seconds, default: 30)')
+                       help='Max cooldown after each app (seconds, default: 30). '
+                            'Ends early once memory/temperature are below the limits')
+    parser.add_argument('--min-cooldown', type=int, default=0,
+                       help='Min cooldown after each app (seconds, default: 0)')
+    parser.add_argument('--cooldown-memory', type=float, default=COOLDOWN_MAX_MEMORY_PERCENT,
+                       help=f'Cooldown memory usage limit (percent, default: {COOLDOWN_MAX_MEMORY_PERCENT})')
+    parser.add_argument('--cooldown-temp', type=float, default=COOLDOWN_MAX_TEMP,
+                       help=f'Cooldown temperature limit (°C, default: {COOLDOWN_MAX_TEMP})')
     parser.add_argument('--restart-frida-interval', type=int, default=1,
-                       help='Restart Frida server every N apps (0=disable, default: 1=every app)')
+                       help='Restart Frida server every N apps per device (0=disable, default: 1=every app)')
     parser.add_argument('--frida-server-path', default='/data/local/tmp/frida-server',
                        help='Path to Frida server on device')
 
@@ -161,87 +246,110 @@ def main():
     total_apps = len(apps)
     log('INFO', f'Found {total_apps} apps in {args.applist}')
 
-    # 시작 인덱스 적용
+    # 상태 파일 (이어서 실행)
+    state_path = args.state or f'batch_state_{Path(args.applist).stem}.json'
+    if args.fresh and os.path.exists(state_path):
+        os.remove(state_path)
+    state = BatchState(state_path, apps, retry_failed=args.retry_failed)
+
     if args.start_from > 0:
-        apps = apps[args.start_from:]
-        log('INFO', f'Starting from index {args.start_from} ({total_apps - len(apps)} apps skipped)')
+        # 이번 실행에서만 건너뜀 (다음 실행에서 --start-from 없이 실행하면 다시 대상)
+        state.skip(apps[:args.start_from])
+        log('INFO', f'Skipping first {args.start_from} apps (--start-from, this run only)')
+
+    counts = state.counts()
+    log('INFO', f'State file: {state_path} (done {counts.get(SUCCESS, 0)}, failed {counts.get(FAILED, 0)}, '
+                f'pending {counts.get(PENDING, 0)})')
+
+    if args.simulate:
+        # 가상 기기: 기기 관리는 켜고, Frida 재시작 / 리셋 스크립트 없음 (쿨다운은 가상 기기 상태를 폴링해 바로 끝남)
+        args.enable_device_management = True
+        args.restart_frida_interval = 0
+
+    # 기기 찾기
+    workers = build_workers(args, apps)
+    if not workers:
+        log('ERROR', 'No device connected, cannot proceed')
+        sys.exit(1)
+    log('INFO', f'Devices: {", ".join(w.serial for w in workers)}')
 
     # 디바이스 매니저 초기화
-    device_manager = None
     if args.enable_device_management:
         log('INFO', 'Device management enabled')
-        device_manager = DeviceManager(frida_server_path=args.frida_server_path)
-
-        # 초기 상태 체크
-        log('INFO', 'Initial device health check...')
-        checks = device_manager.health_check(verbose=True)
-
-        if not checks['device_connected']:
-            log('ERROR', 'Device not connected, cannot proceed')
+        workers = [w for w in workers if prepare_device(w)]
+        if not workers:
+            log('ERROR', 'No healthy device, cannot proceed')
             sys.exit(1)
-
-        if not checks['frida_running']:
-            log('WARN', 'Frida server not running, starting...')
-            if not device_manager.start_frida_server():
-                log('ERROR', 'Failed to start Frida server, cannot proceed')
-                sys.exit(1)
     else:
         log('WARN', 'Device management disabled - pipeline may be unstable')
         log('INFO', 'Recommendation: Use --enable-device-management flag')
 
-    # 결과 저장
-    results = {
-        'success': [],
-        'failed': []
-    }
+    # 기기별 실행 / 정리 함수
+    if args.simulate:
+        run_app = simulated_run_app(args.simulate_duration, args.simulate_fail_rate)
+    else:
+        def run_app(pkg, worker):
+            return run_pipeline(
+                pkg=pkg,
+                duration=args.duration,
+                runs=args.runs,
+                spawn=args.spawn,
+                ground_truth_dir=args.ground_truth_dir,
+                auto_extract_adb=args.auto_extract_adb,
+                serial=worker.serial
+            )
+
+    def health_check(worker):
+        if not worker.manager:
+            return True
+        checks = worker.manager.health_check(verbose=False)
+        if not checks['device_connected']:
+            return False
+        if not checks['frida_running']:
+            log('WARN', f'[{worker.serial}] Frida not running, attempting restart...')
+            worker.manager.restart_frida_server()
+        return True
+
+    cooldown_options = dict(min_duration=args.min_cooldown, max_memory_percent=args.cooldown_memory,
+                            max_temp=args.cooldown_temp)
+
+    def after_app(worker, pkg, ok):
+        manager = worker.manager
+        if manager:
+            done = worker.completed + worker.failed
+            # Frida 서버 재시작 (설정된 간격마다)
+            if args.restart_frida_interval > 0 and done % args.restart_frida_interval == 0:
+                log('INFO', f'[{worker.serial}] Frida server restart interval reached ({args.restart_frida_interval} apps)')
+                manager.full_reset(cooldown_duration=args.cooldown, **cooldown_options)
+            else:
+                # 간단한 정리 + 쿨다운 (가상 기기는 리셋 스크립트를 실행하지 않으므로 쿨다운만)
+                log('INFO', f'[{worker.serial}] Performing cleanup and cooldown...')
+                if not args.simulate:
+                    manager.reset_device(['force_stop', 'drop_caches'])
+                manager.device_cooldown(args.cooldown, **cooldown_options)
+        else:
+            # 디바이스 관리 비활성화 시 기본 대기
+            log('INFO', f'[{worker.serial}] Waiting {args.delay} seconds before next app...')
+            time.sleep(args.delay)
+
+    scheduler = BatchScheduler(
+        workers, state, run_app,
+        after_app=after_app,
+        health_check=health_check,
+        max_retries=args.max_retries,
+        recover_delay=0.5 if args.simulate else args.recover_delay,
+    )
 
     batch_start_time = time.time()
-
-    # 각 앱에 대해 순차 실행
-    for idx, pkg in enumerate(apps, start=args.start_from):
-        log('INFO', f'Processing app {idx + 1}/{total_apps}: {pkg}')
-
-        success = run_pipeline(
-            pkg=pkg,
-            duration=args.duration,
-            runs=args.runs,
-            spawn=args.spawn,
-            ground_truth_dir=args.ground_truth_dir,
-            auto_extract_adb=args.auto_extract_adb,
-            device_manager=device_manager
-        )
-
-        if success:
-            results['success'].append(pkg)
-        else:
-            results['failed'].append(pkg)
-
-        # 마지막 앱이 아니면 디바이스 관리 작업 수행
-        if idx < total_apps - 1:
-            if device_manager:
-                # Frida 서버 재시작 (설정된 간격마다)
-                if args.restart_frida_interval > 0 and (idx + 1) % args.restart_frida_interval == 0:
-                    log('INFO', f'Frida server restart interval reached ({args.restart_frida_interval} apps)')
-                    device_manager.full_reset(cooldown_duration=args.cooldown)
-                else:
-                    # 간단한 정리 + 쿨다운
-                    log('INFO', 'Performing cleanup and cooldown...')
-                    device_manager.force_stop_all_apps()
-                    device_manager.clear_cache()
-                    device_manager.device_cooldown(args.cooldown)
-
-                    # 상태 체크
-                    checks = device_manager.health_check(verbose=True)
-                    if not checks['frida_running']:
-                        log('WARN', 'Frida stopped unexpectedly, restarting...')
-                        device_manager.restart_frida_server()
-            else:
-                # 디바이스 관리 비활성화 시 기본 대기
-                log('INFO', f'Waiting {args.delay} seconds before next app...')
-                time.sleep(args.delay)
+    scheduler.run()
 
     # 최종 결과
     total_elapsed = time.time() - batch_start_time
+    results = {
+        'success': state.with_status(SUCCESS),
+        'failed': state.with_status(FAILED),
+        'pending': state.with_status(PENDING),
+    }
 
     print('\n' + '=' * 50)
     log('INFO', 'Batch Pipeline Summary')
@@ -249,7 +357,16 @@ def main():
     print(f'Total apps: {total_apps}')
     print(f'Success: {len(results["success"])}')
     print(f'Failed: {len(results["failed"])}')
+    print(f'Not run: {len(results["pending"])}')
     print(f'Total elapsed: {total_elapsed / 3600:.2f} hours')
+    for w in workers:
+        cooldown = ''
+        if w.manager and w.manager.cooldown_history:
+            c = w.manager.cooldown_summary()
+            cooldown = (f', cooldown {c["total_seconds"]:.1f}s '
+                        f'(avg {c["avg_seconds"]:.1f}s over {c["count"]}, {c["timeouts"]} hit limit)')
+        print(f'  [{w.serial}] success {w.completed}, failed runs {w.failed}, busy {w.busy_seconds:.1f}s'
+              f'{cooldown}{" (retired)" if w.retired else ""}')
     print()
 
     if results['success']:
@@ -261,7 +378,7 @@ def main():
     if results['failed']:
         print('❌ Failed apps:')
         for pkg in results['failed']:
-            print(f'  - {pkg}')
+            print(f'  - {pkg} ({state.apps[pkg].get("device", "")})')
         print()
 
     # 결과 저장
@@ -269,17 +386,23 @@ def main():
     with open(result_file, 'w', encoding='utf-8') as f:
         f.write(f'Batch Pipeline Results\n')
         f.write(f'Date: {datetime.now()}\n')
-        f.write(f'Total: {total_apps}, Success: {len(results["success"])}, Failed: {len(results["failed"])}\n\n')
+        f.write(f'Devices: {", ".join(w.serial for w in workers)}\n')
+        f.write(f'Total: {total_apps}, Success: {len(results["success"])}, Failed: {len(results["failed"])}, '
+                f'Not run: {len(results["pending"])}\n\n')
         f.write('Success:\n')
         for pkg in results['success']:
             f.write(f'  {pkg}\n')
         f.write('\nFailed:\n')
         for pkg in results['failed']:
             f.write(f'  {pkg}\n')
+        if results['pending']:
+            f.write('\nNot run:\n')
+            for pkg in results['pending']:
+                f.write(f'  {pkg}\n')
 
     log('SUCCESS', f'Results saved to {result_file}')
 
-    sys.exit(0 if len(results['failed']) == 0 else 1)
+    sys.exit(0 if not results['failed'] and not results['pending'] else 1)
 
 if __name__ == '__main__':
     main()
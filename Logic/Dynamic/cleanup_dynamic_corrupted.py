@@ -8,22 +8,23 @@ Dynamic CSV 깨진 문자열 정리 스크립트
 
 import csv
 import re
+import sys
 from pathlib import Path
 
+# 공용 모듈 패키지 (Logic/shared)
+_LOGIC_DIR = str(Path(__file__).resolve().parent.parent)
+if _LOGIC_DIR not in sys.path:
+    sys.path.insert(0, _LOGIC_DIR)
+
+from shared.corruption_scan import corruption_mask, has_corruption
+
 
 def has_corrupted_chars(text: str) -> bool:
     """
-    문자열에 깨진 문자(제어 문자, non-printable)가 있는지 확인
+    문자열에 깨진 문자(제어 문자 0x00-0x1F / 0x7F-0x9F, U+FFFD)가 있는지 확인
+    (corruption_scan 문자 클래스 정규식 한 번으로 검사)
     """
-    for char in text:
-        code = ord(char)
-        # 제어 문자 (0x00-0x1F, 0x7F-0x9F) 제외
-        if code < 0x20 or (0x7F <= code <= 0x9F):
-            return True
-        # Unicode replacement character (깨진 문자 표시)
-        if char == '\ufffd':
-            return True
-    return False
+    return has_corruption(text)
 
 
 def is_path_root(segment: str) -> bool:
@@ -41,10 +42,11 @@ def is_path_root(segment: str) -> bool:
     return False
 
 
-def extract_valid_paths(path: str) -> list:
+def extract_valid_paths(path: str, corrupted=None) -> list:
     """
     경로에서 깨진 세그먼트 제거하고, 중간에 새 경로 루트가 나오면 분리
 
+    - corrupted: 경로 전체의 깨진 문자 포함 여부 (corruption_mask 로 미리 검사했으면 전달, None이면 여기서 검사)
     반환: 유효한 경로들의 리스트
     """
     if not path:
@@ -56,6 +58,9 @@ def extract_valid_paths(path: str) -> list:
     results = []
     current_path = []
     found_root = False  # 첫 번째 루트를 찾았는지
+    # 경로 전체에 깨진 문자가 없으면 세그먼트별 검사 생략
+    if corrupted is None:
+        corrupted = has_corrupted_chars(path)
 
     for i, seg in enumerate(segments):
         # 빈 세그먼트 (맨 앞 / 때문에 생기는)
@@ -64,7 +69,7 @@ def extract_valid_paths(path: str) -> list:
             continue
 
         # 깨진 세그먼트 발견
-        if has_corrupted_chars(seg):
+        if corrupted and has_corrupted_chars(seg):
             # 현재까지 모은 경로가 있으면 저장
             if current_path and len(current_path) > 1:  # 최소한 / 외에 뭔가 있어야
                 path_str = '/'.join(current_path)
@@ -115,29 +120,27 @@ def process_csv(input_path: Path, output_path: Path):
     with input_path.open('r', encoding='utf-8', errors='replace') as f:
         reader = csv.reader(f)
         header = next(reader, None)  # 헤더 읽기
-
-        for row in reader:
-            if not row:
-                continue
-
-            original_path = row[0]
-            extracted_paths = extract_valid_paths(original_path)
-
-            # 경로가 분리되었는지 확인
-            if len(extracted_paths) == 0:
-                # 완전히 깨진 경로
-                corrupted_count += 1
-            elif len(extracted_paths) == 1:
-                # 정상 경로 또는 깨진 부분만 제거
-                if has_corrupted_chars(original_path):
-                    corrupted_count += 1
-                all_paths.add(extracted_paths[0])
-            else:
-                # 여러 경로로 분리됨
+        original_paths = [row[0] for row in reader if row]
+
+    # 경로 컬럼 전체의 깨진 문자 여부를 한 번에 검사
+    for original_path, corrupted in zip(original_paths, corruption_mask(original_paths)):
+        extracted_paths = extract_valid_paths(original_path, corrupted)
+
+        # 경로가 분리되었는지 확인
+        if len(extracted_paths) == 0:
+            # 완전히 깨진 경로
+            corrupted_count += 1
+        elif len(extracted_paths) == 1:
+            # 정상 경로 또는 깨진 부분만 제거
+            if corrupted:
                 corrupted_count += 1
-                split_count += len(extracted_paths) - 1
-                for p in extracted_paths:
-                    all_paths.add(p)
+            all_paths.add(extracted_paths[0])
+        else:
+            # 여러 경로로 분리됨
+            corrupted_count += 1
+            split_count += len(extracted_paths) - 1
+            for p in extracted_paths:
+                all_paths.add(p)
 
     # 정렬 후 출력
     sorted_paths = sorted(all_paths)
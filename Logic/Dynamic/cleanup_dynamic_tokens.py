@@ -1,64 +1,113 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
+"""
+cleanup_dynamic_tokens.py
+dynamic_token_<pkg>.csv → dynamic_token_dup_<pkg>.csv ('�' 포함 행 제거 + path_tokenized 중복 제거)
+
+- 한 줄씩 읽으면서 바로 쓰기: 메모리는 파일 크기가 아니라 고유 path_tokenized 수에 비례
+- 깨진 문자 검사는 남기는 컬럼(path_tokenized)만
+- --jobs N: 여러 파일 동시 처리 (프로세스 풀)
+- 실행이 끝나면 출력 폴더에 파일별 통계 요약(cleanup_dynamic_tokens_summary.csv) 저장
+"""
 
 import os
+import csv
 import glob
+import time
 import argparse
-import pandas as pd
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+# 공용 모듈 패키지 (Logic/shared)
+_LOGIC_DIR = str(Path(__file__).resolve().parent.parent)
+if _LOGIC_DIR not in sys.path:
+    sys.path.insert(0, _LOGIC_DIR)
+
+from shared.path_list_io import open_csv, write_rows
+
+KEEP_COLUMN = "path_tokenized"
+BAD_CHAR = "\ufffd"
+SUMMARY_NAME = "cleanup_dynamic_tokens_summary.csv"
+SUMMARY_FIELDS = ["file", "output", "status", "total", "removed_bad", "removed_dup", "final", "seconds"]
+
 
 def clean_one_csv(in_path: str, out_dir: str):
+    """
+    파일 하나 정리 후 통계 dict 반환 (대상이 아니면 None)
+    status: ok / skip (path_tokenized 컬럼 없음) / error
+    """
     base = os.path.basename(in_path)
 
     # dynamic_token_<pkg>.csv 형식만 처리
     if not (base.startswith("dynamic_token_") and base.lower().endswith(".csv")):
-        return
+        return None
 
     pkg = base[len("dynamic_token_"):-len(".csv")]
     out_name = f"dynamic_token_dup_{pkg}.csv"
     out_path = os.path.join(out_dir, out_name)
+    stats = {"file": base, "output": out_name, "status": "ok",
+             "total": 0, "removed_bad": 0, "removed_dup": 0, "final": 0}
+    t0 = time.perf_counter()
 
-    # CSV 로드 (pandas 버전 무관)
+    os.makedirs(out_dir, exist_ok=True)
+    tmp_path = out_path + ".tmp"
     try:
-        with open(in_path, "r", encoding="utf-8", errors="replace") as f:
-            df = pd.read_csv(
-                f,
-                dtype=str,
-                keep_default_na=False
-            )
+        # 깨진 바이트는 U+FFFD로 받아서 BAD_CHAR 포함 행으로 제거
+        with open_csv(in_path, encoding="utf-8", errors="replace") as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            if KEEP_COLUMN not in header:
+                stats["status"] = "skip"
+                return stats
+            idx = header.index(KEEP_COLUMN)
+
+            seen = set()
+            with open(tmp_path, "w", encoding="utf-8-sig", newline="") as out:
+                writer = csv.writer(out, lineterminator=os.linesep)
+                writer.writerow([KEEP_COLUMN])
+                for row in reader:
+                    if not row:
+                        continue
+                    stats["total"] += 1
+                    token = row[idx] if idx < len(row) else ""
+
+                    # 1️⃣ '�' 포함된 행 제거
+                    if BAD_CHAR in token:
+                        stats["removed_bad"] += 1
+                        continue
+
+                    # 2️⃣ path_tokenized 기준 중복 제거 (처음 나온 행 유지)
+                    if token in seen:
+                        stats["removed_dup"] += 1
+                        continue
+                    seen.add(token)
+
+                    # 3️⃣ path_tokenized 컬럼만 남기기
+                    writer.writerow([token])
+        os.replace(tmp_path, out_path)
+        stats["final"] = len(seen)
     except Exception as e:
-        print(f"[ERROR] 로드 실패: {base} | {e}")
-        return
-
-    if "path_tokenized" not in df.columns:
-        print(f"[SKIP] path_tokenized 컬럼 없음: {base}")
-        return
-
-    total = len(df)
-
-    # 1️⃣ '�' 포함된 행 제거 (어느 열이든)
-    bad_mask = df.apply(
-        lambda col: col.astype(str).str.contains("�", regex=False, na=False)
-    ).any(axis=1)
-
-    removed_bad = int(bad_mask.sum())
-    df = df[~bad_mask]
-
-    # 2️⃣ path_tokenized 기준 중복 제거
-    before_dedup = len(df)
-    df = df.drop_duplicates(subset=["path_tokenized"], keep="first")
-    removed_dup = before_dedup - len(df)
-
-    # 3️⃣ path_tokenized 컬럼만 남기기
-    df = df[["path_tokenized"]]
-
-    os.makedirs(out_dir, exist_ok=True)
-    df.to_csv(out_path, index=False, encoding="utf-8-sig")
-
-    print(
-        f"[OK] {base} -> {out_name} | "
-        f"total={total}, removed_bad={removed_bad}, "
-        f"removed_dup={removed_dup}, final={len(df)}"
-    )
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        stats["status"] = f"error: {e}"
+    finally:
+        stats["seconds"] = round(time.perf_counter() - t0, 3)
+    return stats
+
+
+def _report(stats):
+    base = stats["file"]
+    if stats["status"] == "skip":
+        print(f"[SKIP] {KEEP_COLUMN} 컬럼 없음: {base}")
+    elif stats["status"] != "ok":
+        print(f"[ERROR] 처리 실패: {base} | {stats['status']}")
+    else:
+        print(
+            f"[OK] {base} -> {stats['output']} | "
+            f"total={stats['total']}, removed_bad={stats['removed_bad']}, "
+            f"removed_dup={stats['removed_dup']}, final={stats['final']} ({stats['seconds']}s)"
+        )
 
 
 def main():
@@ -66,6 +115,8 @@ def main():
     ap.add_argument("--in-dir", default=".", help="입력 CSV 폴더 (기본: 현재)")
     ap.add_argument("--out-dir", default=".", help="출력 CSV 폴더 (기본: 현재)")
     ap.add_argument("--pattern", default="dynamic_token_*.csv", help="파일 패턴")
+    ap.add_argument("-j", "--jobs", type=int, default=1,
+                    help="동시에 처리할 파일 수 (기본 1: 순차, 0: CPU 수)")
     args = ap.parse_args()
 
     files = sorted(glob.glob(os.path.join(args.in_dir, args.pattern)))
@@ -73,9 +124,42 @@ def main():
         print("[!] 대상 파일이 없습니다.")
         return
 
-    print(f"[INFO] found {len(files)} files")
-    for f in files:
-        clean_one_csv(f, args.out_dir)
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    print(f"[INFO] found {len(files)} files (jobs={jobs})")
+    t0 = time.perf_counter()
+
+    results = []
+    if jobs == 1 or len(files) <= 1:
+        for f in files:
+            stats = clean_one_csv(f, args.out_dir)
+            if stats:
+                _report(stats)
+                results.append(stats)
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(files))) as pool:
+            futures = [pool.submit(clean_one_csv, f, args.out_dir) for f in files]
+            for fut in as_completed(futures):
+                stats = fut.result()
+                if stats:
+                    _report(stats)
+                    results.append(stats)
+
+    if not results:
+        return
+
+    # 실행 요약
+    results.sort(key=lambda r: r["file"])
+    summary_path = os.path.join(args.out_dir, SUMMARY_NAME)
+    write_rows(summary_path, SUMMARY_FIELDS, results, encoding="utf-8-sig")
+
+    ok = [r for r in results if r["status"] == "ok"]
+    print(
+        f"[SUMMARY] {len(ok)}/{len(results)} files ok, "
+        f"total={sum(r['total'] for r in ok)}, removed_bad={sum(r['removed_bad'] for r in ok)}, "
+        f"removed_dup={sum(r['removed_dup'] for r in ok)}, final={sum(r['final'] for r in ok)} "
+        f"({time.perf_counter() - t0:.2f}s)"
+    )
+    print(f"[SUMMARY] saved: {summary_path}")
 
 if __name__ == "__main__":
     main()
@@ -1,10 +1,30 @@
 #!/usr/bin/env python3
 # cv_analyzer_lite.py - 경량화된 CV 기반 UI 요소 감지
 # Tesseract 없이 동작, 빠른 컨투어 기반 분석
+#
+# 사용법:
+#   python cv_analyzer_lite.py <image_path>   한 장 분석 후 종료 (결과 JSON 한 줄)
+#   python cv_analyzer_lite.py --server       상주 모드 (OpenCV 한 번만 로드, 요청/응답은 JSON 줄 단위, serve 참고)
+#       [--cache-size 64] [--cache-threshold 6]  화면 변화 감지 캐시 (ScreenCache, 0이면 끔)
 
+import argparse
 import sys
 import json
 import os
+import time
+from collections import OrderedDict
+
+# 중심 거리가 이보다 가까운 감지 결과는 같은 요소로 봄 (remove_duplicates)
+DUPLICATE_DISTANCE = 35
+
+# 후보가 이보다 많을 때만 KD-tree (scipy) 사용, 적으면 NumPy 거리 행렬이 더 빠름
+KD_TREE_MIN_POINTS = 2000
+
+# 화면 변화 감지 캐시 기본값 (ScreenCache)
+SCREEN_CACHE_SIZE = 64        # 최대 화면 수 (LRU)
+SCREEN_CACHE_THRESHOLD = 6    # dHash 해밍 거리 (비트) 이하면 같은 화면
+SCREEN_HASH_SIZE = 16         # dHash 격자 (16x16 = 256비트)
+SCREEN_IGNORE_TOP = 0.04      # 상단 상태 표시줄 비율 (시계/알림 아이콘 변화 무시)
 
 def install_opencv():
     """OpenCV 설치 확인"""
@@ -15,32 +35,91 @@ def install_opencv():
     except ImportError:
         try:
             import subprocess
+            # pip 출력이 결과 JSON(stdout)에 섞이지 않도록 stderr로
             subprocess.check_call([sys.executable, '-m', 'pip', 'install', 
-                                  'opencv-python-headless', 'numpy', '-q'])
+                                  'opencv-python-headless', 'numpy', '-q'], stdout=sys.stderr)
             return True
         except:
             return False
 
+def load_image(image_path=None, data=None):
+    """이미지 로드 (data: PNG 등 인코딩된 바이트, 없으면 image_path 파일)"""
+    import cv2
+    import numpy as np
+    
+    if data is not None:
+        return cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    return cv2.imread(image_path)
+
 def detect_ui_elements(image_path):
     """경량 CV 기반 UI 요소 감지"""
+    return analyze_image(load_image(image_path))
+
+def analyze_image(img):
+    """디코딩된 BGR 이미지에서 UI 요소 감지"""
     import cv2
     import numpy as np
     
-    # 이미지 로드
-    img = cv2.imread(image_path)
     if img is None:
         return {'elements': [], 'error': 'Failed to load image'}
     
     height, width = img.shape[:2]
     gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
     
+    # 공통 전처리 한 번 → 감지기별 후보 → 전체 후보 대상 중복 제거
+    features = preprocess(gray)
+    elements = collect_candidates(gray, width, height, features)
+    
+    # 중복 제거 및 정렬
+    elements = remove_duplicates(elements)
+    elements = sorted(elements, key=lambda x: x.get('priority', 0), reverse=True)
+    
+    return {
+        'elements': elements[:50],  # 상위 50개만
+        'total': len(elements),
+        'dimensions': {'width': width, 'height': height}
+    }
+
+def preprocess(gray):
+    """
+    감지기들이 같이 쓰는 전처리 (이미지당 한 번)
+    - cleaned: 적응형 이진화 + 모폴로지 닫기 (클릭 영역)
+    - horizontal: 가로선만 남긴 이진 이미지 (입력 필드 밑줄)
+    - edges: Canny 에지 (입력 필드 박스, 상단 아이콘은 이 결과를 잘라 씀)
+    """
+    import cv2
+    
+    # 적응형 이진화
+    binary = cv2.adaptiveThreshold(
+        gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+        cv2.THRESH_BINARY_INV, 11, 2
+    )
+    
+    # 모폴로지 연산으로 노이즈 제거
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
+    cleaned = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel)
+    
+    # 수평선 감지
+    horizontal_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (50, 1))
+    horizontal = cv2.morphologyEx(gray, cv2.MORPH_OPEN, horizontal_kernel)
+    _, horizontal = cv2.threshold(horizontal, 200, 255, cv2.THRESH_BINARY_INV)
+    
+    return {
+        'cleaned': cleaned,
+        'horizontal': horizontal,
+        'edges': cv2.Canny(gray, 50, 150),
+    }
+
+def collect_candidates(gray, width, height, features=None):
+    """모든 감지기의 후보 (중복 제거 전)"""
+    features = features if features is not None else preprocess(gray)
     elements = []
     
     # 1. 버튼/클릭 가능 영역 감지 (컨투어 기반)
-    elements.extend(detect_clickable_regions(gray, width, height))
+    elements.extend(detect_clickable_regions(gray, width, height, features))
     
     # 2. 입력 필드 감지 (수평선/박스)
-    elements.extend(detect_input_fields(gray, width, height))
+    elements.extend(detect_input_fields(gray, width, height, features))
     
     # 3. 네비게이션 바 감지
     elements.extend(detect_navigation(gray, width, height))
@@ -51,34 +130,19 @@ def detect_ui_elements(image_path):
         elements.append(fab)
     
     # 5. 아이콘 버튼 감지
-    elements.extend(detect_icons(gray, width, height))
-    
-    # 중복 제거 및 정렬
-    elements = remove_duplicates(elements)
-    elements = sorted(elements, key=lambda x: x.get('priority', 0), reverse=True)
+    elements.extend(detect_icons(gray, width, height, features))
     
-    return {
-        'elements': elements[:50],  # 상위 50개만
-        'total': len(elements),
-        'dimensions': {'width': width, 'height': height}
-    }
+    return elements
 
-def detect_clickable_regions(gray, width, height):
+def detect_clickable_regions(gray, width, height, features=None):
     """컨투어 기반 클릭 가능 영역 감지"""
     import cv2
     import numpy as np
     
     elements = []
     
-    # 적응형 이진화
-    binary = cv2.adaptiveThreshold(
-        gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-        cv2.THRESH_BINARY_INV, 11, 2
-    )
-    
-    # 모폴로지 연산으로 노이즈 제거
-    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
-    cleaned = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel)
+    # 이진화 + 노이즈 제거 (공통 전처리)
+    cleaned = (features if features is not None else preprocess(gray))['cleaned']
     
     # 컨투어 찾기
     contours, hierarchy = cv2.findContours(
@@ -114,19 +178,16 @@ def detect_clickable_regions(gray, width, height):
     
     return elements
 
-def detect_input_fields(gray, width, height):
+def detect_input_fields(gray, width, height, features=None):
     """입력 필드 감지 - 수평선 및 박스"""
     import cv2
     import numpy as np
     
     elements = []
+    features = features if features is not None else preprocess(gray)
     
-    # 수평선 감지
-    horizontal_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (50, 1))
-    horizontal = cv2.morphologyEx(gray, cv2.MORPH_OPEN, horizontal_kernel)
-    
-    _, binary = cv2.threshold(horizontal, 200, 255, cv2.THRESH_BINARY_INV)
-    contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    # 수평선 감지 (공통 전처리)
+    contours, _ = cv2.findContours(features['horizontal'], cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
     
     for contour in contours:
         x, y, w, h = cv2.boundingRect(contour)
@@ -145,8 +206,7 @@ def detect_input_fields(gray, width, height):
             })
     
     # 박스형 입력 필드 (에지 검출)
-    edges = cv2.Canny(gray, 50, 150)
-    contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    contours, _ = cv2.findContours(features['edges'], cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
     
     for contour in contours:
         x, y, w, h = cv2.boundingRect(contour)
@@ -263,18 +323,15 @@ def detect_fab(gray, width, height):
     
     return None
 
-def detect_icons(gray, width, height):
+def detect_icons(gray, width, height, features=None):
     """아이콘 버튼 감지 (상단 툴바 영역)"""
     import cv2
     import numpy as np
     
     elements = []
     
-    # 상단 툴바 영역
-    toolbar_region = gray[0:180, :]
-    
-    # 에지 검출
-    edges = cv2.Canny(toolbar_region, 50, 150)
+    # 상단 툴바 영역 에지 (공통 전처리 결과를 잘라 씀)
+    edges = (features if features is not None else preprocess(gray))['edges'][0:180, :]
     contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
     
     for contour in contours:
@@ -341,42 +398,269 @@ def calculate_confidence(area, aspect):
     
     return min(conf, 95)
 
-def remove_duplicates(elements):
-    """위치 기반 중복 제거"""
+def _neighbors_within(points, radius):
+    """
+    점마다 중심 거리 sqrt(dx^2 + dy^2) 가 radius 미만인 점 인덱스 배열 (자기 자신 포함)
+    - 점이 많고 scipy 가 있으면 KD-tree 로 후보를 좁힌 뒤 같은 식으로 다시 확인, 아니면 NumPy 거리 계산 (행 블록 단위)
+    - 이전 remove_duplicates 와 같은 비교식(np.sqrt(...) < radius)이라 경계값에서도 결과가 같음
+    """
     import numpy as np
     
-    if not elements:
-        return elements
-    
-    unique = []
+    cKDTree = None
+    if len(points) >= KD_TREE_MIN_POINTS:
+        try:
+            from scipy.spatial import cKDTree
+        except ImportError:
+            pass
+    
+    if cKDTree is not None:
+        tree = cKDTree(points)
+        neighbors = []
+        for i, idx in enumerate(tree.query_ball_point(points, radius)):
+            idx = np.asarray(idx, dtype=np.intp)
+            d = np.sqrt(((points[idx] - points[i]) ** 2).sum(axis=1))
+            neighbors.append(np.sort(idx[d < radius]))
+        return neighbors
+    
+    neighbors = []
+    for start in range(0, len(points), 1024):
+        block = points[start:start + 1024]
+        d = np.sqrt(((block[:, None, :] - points[None, :, :]) ** 2).sum(axis=2))
+        neighbors.extend(np.flatnonzero(row) for row in d < radius)
+    return neighbors
+
+def remove_duplicates(elements, distance=DUPLICATE_DISTANCE):
+    """
+    위치 기반 중복 제거 (이전 방식과 같은 결과)
+    - 감지 순서대로 보면서, 남아 있는 요소 중 가장 먼저 남은 것과 중심 거리가 distance 미만이면 중복
+      → 신뢰도가 더 높을 때만 그 요소를 빼고 새 요소를 맨 뒤에 남김
+    - 이웃은 _neighbors_within 으로 한 번에 구해 두고 남은 요소는 dict(삽입 순서 = 남긴 순서)로 관리
+      (요소마다 남긴 요소 전체와 거리를 계산하고 list.remove 하던 것을 이웃 수만큼만 확인)
+    """
+    import numpy as np
     
-    for elem in elements:
-        is_duplicate = False
+    if len(elements) < 2:
+        return list(elements)
+    
+    centers = np.array([(e['x'], e['y']) for e in elements], dtype=np.float64)
+    neighbors = _neighbors_within(centers, distance)
+    
+    unique = {}   # 남은 요소 인덱스 -> 남긴 순번
+    order = 0
+    for i, elem in enumerate(elements):
+        nearby = [j for j in neighbors[i].tolist() if j in unique]
+        if nearby:
+            existing = min(nearby, key=unique.__getitem__)
+            if elem.get('confidence', 0) <= elements[existing].get('confidence', 0):
+                continue
+            del unique[existing]
+        unique[i] = order
+        order += 1
+    
+    return [elements[i] for i in unique]
+
+class ScreenCache:
+    """
+    화면 변화 감지 캐시 (dHash 지각 해시 → 분석 결과)
+    - 상태 표시줄을 뺀 화면을 (hash_size+1) x hash_size 회색조로 줄여 이웃 픽셀 밝기 비교 비트열(dHash) 생성
+    - 저장된 화면 중 크기가 같고 해밍 거리 threshold 이하인 것이 있으면 그 결과를 그대로 반환
+    - max_size 를 넘으면 가장 오래 안 쓴 화면부터 제거 (LRU)
+    """
+    
+    def __init__(self, max_size=SCREEN_CACHE_SIZE, threshold=SCREEN_CACHE_THRESHOLD,
+                 hash_size=SCREEN_HASH_SIZE, ignore_top=SCREEN_IGNORE_TOP):
+        self.max_size = max_size
+        self.threshold = threshold
+        self.hash_size = hash_size
+        self.ignore_top = ignore_top
+        self.entries = OrderedDict()   # (width, height, hash) -> 분석 결과
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+    
+    def frame_hash(self, img):
+        """BGR 이미지 → dHash (int)"""
+        import cv2
+        import numpy as np
         
-        for existing in unique:
-            dx = abs(elem['x'] - existing['x'])
-            dy = abs(elem['y'] - existing['y'])
-            dist = np.sqrt(dx**2 + dy**2)
-            
-            if dist < 35:
-                # 신뢰도 높은 것 유지
-                if elem.get('confidence', 0) > existing.get('confidence', 0):
-                    unique.remove(existing)
-                    unique.append(elem)
-                is_duplicate = True
-                break
+        top = int(img.shape[0] * self.ignore_top)
+        gray = cv2.cvtColor(img[top:], cv2.COLOR_BGR2GRAY)
+        small = cv2.resize(gray, (self.hash_size + 1, self.hash_size), interpolation=cv2.INTER_AREA)
+        bits = small[:, 1:] > small[:, :-1]
+        return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+    
+    def lookup(self, img):
+        """
+        -> (캐시 키, 저장된 결과 또는 None, 해밍 거리)
+        - 가장 가까운 화면 기준, 찾으면 LRU 순서를 맨 뒤로
+        """
+        height, width = img.shape[:2]
+        key = (width, height, self.frame_hash(img))
+        
+        best_key, best_distance = None, None
+        for cached_key in self.entries:
+            if cached_key[:2] != key[:2]:
+                continue
+            distance = bin(cached_key[2] ^ key[2]).count('1')
+            if best_distance is None or distance < best_distance:
+                best_key, best_distance = cached_key, distance
+                if distance == 0:
+                    break
         
-        if not is_duplicate:
-            unique.append(elem)
+        if best_key is not None and best_distance <= self.threshold:
+            self.entries.move_to_end(best_key)
+            self.stats['hits'] += 1
+            return key, self.entries[best_key], best_distance
+        self.stats['misses'] += 1
+        return key, None, best_distance
+    
+    def put(self, key, result):
+        if self.max_size <= 0:
+            return
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.stats['evictions'] += 1
+    
+    def clear(self):
+        self.entries.clear()
+    
+    def summary(self):
+        lookups = self.stats['hits'] + self.stats['misses']
+        return dict(self.stats, size=len(self.entries), threshold=self.threshold,
+                    hit_rate=round(self.stats['hits'] / lookups, 3) if lookups else 0.0)
+
+def _read_request(stdin):
+    """요청 한 줄 (+ size 바이트 이미지) 읽기. 입력이 끝나면 None"""
+    line = stdin.readline()
+    if not line:
+        return None
+    line = line.strip()
+    if not line:
+        return {}
+    request = json.loads(line)
+    if 'size' in request:
+        size = int(request['size'])
+        data = stdin.read(size)
+        if len(data) < size:
+            return None
+        request['data'] = data
+    return request
+
+def _write_response(stdout, response):
+    stdout.write((json.dumps(response, ensure_ascii=False) + '\n').encode('utf-8'))
+    stdout.flush()
+
+def serve(stdin=None, stdout=None, cache=None):
+    """
+    상주 분석 모드: OpenCV를 한 번만 로드하고 stdin 요청을 차례로 처리
+    시작하면 {"ready": true, "pid": ...} 한 줄 출력
+    요청 (JSON 한 줄):
+      {"id": 1, "path": "screen.png"}             이미지 파일 경로
+      {"id": 2, "size": 123456}                   바로 뒤에 PNG 원본 123456 바이트
+      (+ "nocache": true 면 캐시를 보지 않고 새로 분석)
+      {"id": 3, "cmd": "ping" | "stats" | "clear"} / {"cmd": "shutdown"}
+    응답 (JSON 한 줄):
+      {"id": 1, "result": {detect_ui_elements 결과}, "ms": 12.3, "cached": false} / {"id": 1, "error": "..."}
+      캐시 적중 시 "cached": true, "distance": 해밍 거리
+    cache: ScreenCache (None 이면 캐시 없이 매번 분석)
+    """
+    stdin = stdin or sys.stdin.buffer
+    stdout = stdout or sys.stdout.buffer
     
-    return unique
+    if not install_opencv():
+        _write_response(stdout, {'ready': False, 'error': 'Failed to install OpenCV'})
+        return 1
+    import cv2
+    _write_response(stdout, {'ready': True, 'pid': os.getpid(), 'opencv': cv2.__version__})
+    
+    while True:
+        try:
+            request = _read_request(stdin)
+        except ValueError as e:
+            _write_response(stdout, {'id': None, 'error': f'Bad request: {e}'})
+            continue
+        if request is None:
+            break
+        if not request:
+            continue
+        
+        req_id = request.get('id')
+        cmd = request.get('cmd')
+        if cmd == 'shutdown':
+            break
+        if cmd == 'ping':
+            _write_response(stdout, {'id': req_id, 'result': 'pong'})
+            continue
+        if cmd == 'stats':
+            _write_response(stdout, {'id': req_id, 'result': cache.summary() if cache else None})
+            continue
+        if cmd == 'clear':
+            if cache:
+                cache.clear()
+            _write_response(stdout, {'id': req_id, 'result': 'cleared'})
+            continue
+        
+        started = time.perf_counter()
+        try:
+            if 'data' in request:
+                img = load_image(data=request['data'])
+            elif request.get('path'):
+                img = load_image(request['path'])
+            else:
+                _write_response(stdout, {'id': req_id, 'error': 'Request needs "path" or "size"'})
+                continue
+            
+            # 거의 같은 화면이면 이전 분석 결과 재사용
+            key, cached, distance = None, None, None
+            if cache is not None and img is not None and not request.get('nocache'):
+                key, cached, distance = cache.lookup(img)
+            if cached is not None:
+                _write_response(stdout, {
+                    'id': req_id,
+                    'result': cached,
+                    'ms': round((time.perf_counter() - started) * 1000, 1),
+                    'cached': True,
+                    'distance': distance
+                })
+                continue
+            
+            result = analyze_image(img)
+            if key is not None and 'error' not in result:
+                cache.put(key, result)
+        except Exception as e:
+            _write_response(stdout, {'id': req_id, 'error': str(e)})
+            continue
+        _write_response(stdout, {
+            'id': req_id,
+            'result': result,
+            'ms': round((time.perf_counter() - started) * 1000, 1),
+            'cached': False
+        })
+    return 0
 
 def main():
-    if len(sys.argv) < 2:
-        print(json.dumps({'error': 'Usage: cv_analyzer_lite.py <image_path>'}))
+    parser = argparse.ArgumentParser(description='Lightweight CV UI element detection')
+    parser.add_argument('image_path', nargs='?', help='Image to analyze (one-shot mode)')
+    parser.add_argument('--server', action='store_true', help='Persistent mode: JSON-lines requests on stdin')
+    parser.add_argument('--cache-size', type=int, default=SCREEN_CACHE_SIZE,
+                        help=f'Screen cache entries in server mode (0 = off, default: {SCREEN_CACHE_SIZE})')
+    parser.add_argument('--cache-threshold', type=int, default=SCREEN_CACHE_THRESHOLD,
+                        help=f'Max dHash Hamming distance for a cache hit (default: {SCREEN_CACHE_THRESHOLD})')
+    parser.add_argument('--hash-size', type=int, default=SCREEN_HASH_SIZE,
+                        help=f'dHash grid size (default: {SCREEN_HASH_SIZE} → {SCREEN_HASH_SIZE ** 2} bits)')
+    args = parser.parse_args()
+    
+    if args.server:
+        cache = None
+        if args.cache_size > 0:
+            cache = ScreenCache(args.cache_size, args.cache_threshold, args.hash_size)
+        sys.exit(serve(cache=cache))
+    
+    if not args.image_path:
+        print(json.dumps({'error': 'Usage: cv_analyzer_lite.py <image_path> | --server'}))
         sys.exit(1)
     
-    image_path = sys.argv[1]
+    image_path = args.image_path
     
     if not os.path.exists(image_path):
         print(json.dumps({'error': 'Image file not found'}))
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+cv_analyzer_lite 벤치마크 (저장된 스크린샷 폴더)
+- 이미지마다 단계별 시간 (ms): 디코딩 / 전처리 / 후보 감지 / 중복 제거
+- 중복 제거는 현재 구현(이웃 미리 계산)과 이전 구현(요소 쌍마다 비교)을 같은 후보로 돌려 시간과 남은 개수 비교
+  (결과는 같아야 함, tests/test_cv_analyzer_lite.py)
+- 스크린샷은 universal_automation_improved.js 실행 결과의 <out>/screenshots 폴더 등
+
+사용 예:
+    python cv_benchmark.py artifacts_output/com.example_123/screenshots
+    python cv_benchmark.py shots/ --repeat 5 --json bench.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+from cv_analyzer_lite import (
+    DUPLICATE_DISTANCE, collect_candidates, install_opencv, load_image, preprocess, remove_duplicates,
+)
+
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".webp")
+
+STAGES = ["decode", "preprocess", "detect", "nms", "nms_legacy"]
+
+
+def legacy_remove_duplicates(elements, distance=DUPLICATE_DISTANCE):
+    """이전 remove_duplicates (남긴 요소 전체와 하나씩 거리 비교, 비교 기준)"""
+    import numpy as np
+
+    unique = []
+    for elem in elements:
+        is_duplicate = False
+        for existing in unique:
+            dx = abs(elem['x'] - existing['x'])
+            dy = abs(elem['y'] - existing['y'])
+            if np.sqrt(dx**2 + dy**2) < distance:
+                if elem.get('confidence', 0) > existing.get('confidence', 0):
+                    unique.remove(existing)
+                    unique.append(elem)
+                is_duplicate = True
+                break
+        if not is_duplicate:
+            unique.append(elem)
+    return unique
+
+
+def _ms(started):
+    return (time.perf_counter() - started) * 1000
+
+
+def bench_image(path, repeat=3):
+    """이미지 하나를 repeat 번 분석 → 단계별 최소 시간 (ms) + 후보 / 결과 개수"""
+    import cv2
+
+    with open(path, "rb") as f:
+        data = f.read()
+
+    best = {stage: float("inf") for stage in STAGES}
+    row = {"image": os.path.basename(path)}
+    for _ in range(repeat):
+        started = time.perf_counter()
+        img = load_image(data=data)
+        best["decode"] = min(best["decode"], _ms(started))
+        if img is None:
+            return {"image": row["image"], "error": "Failed to load image"}
+
+        height, width = img.shape[:2]
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+
+        started = time.perf_counter()
+        features = preprocess(gray)
+        best["preprocess"] = min(best["preprocess"], _ms(started))
+
+        started = time.perf_counter()
+        candidates = collect_candidates(gray, width, height, features)
+        best["detect"] = min(best["detect"], _ms(started))
+
+        started = time.perf_counter()
+        kept = remove_duplicates(candidates)
+        best["nms"] = min(best["nms"], _ms(started))
+
+        started = time.perf_counter()
+        legacy = legacy_remove_duplicates(candidates)
+        best["nms_legacy"] = min(best["nms_legacy"], _ms(started))
+
+    row.update({stage: round(ms, 2) for stage, ms in best.items()})
+    row.update({"candidates": len(candidates), "kept": len(kept), "kept_legacy": len(legacy)})
+    return row
+
+
+def list_images(folder):
+    return sorted(
+        os.path.join(folder, name) for name in os.listdir(folder)
+        if name.lower().endswith(IMAGE_EXTS)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="cv_analyzer_lite benchmark over stored screenshots")
+    parser.add_argument("folder", help="Screenshot folder (png/jpg)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per image, best time is reported (default: 3)")
+    parser.add_argument("--limit", type=int, default=0, help="Only the first N images (0 = all)")
+    parser.add_argument("--json", help="Write per-image results to this JSON file")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.folder):
+        print(f"[ERROR] Folder not found: {args.folder}")
+        return 1
+    if not install_opencv():
+        print("[ERROR] Failed to install OpenCV")
+        return 1
+
+    images = list_images(args.folder)
+    if args.limit:
+        images = images[:args.limit]
+    if not images:
+        print(f"[ERROR] No images in {args.folder}")
+        return 1
+
+    rows = []
+    print(f"{'image':<32} {'decode':>8} {'prep':>8} {'detect':>8} {'nms':>8} {'legacy':>8} "
+          f"{'cand':>6} {'kept':>6} {'legacy':>6}")
+    for path in images:
+        row = bench_image(path, repeat=max(1, args.repeat))
+        rows.append(row)
+        if "error" in row:
+            print(f"{row['image']:<32} {row['error']}")
+            continue
+        print(f"{row['image'][:32]:<32} {row['decode']:>8.1f} {row['preprocess']:>8.1f} {row['detect']:>8.1f} "
+              f"{row['nms']:>8.2f} {row['nms_legacy']:>8.2f} "
+              f"{row['candidates']:>6} {row['kept']:>6} {row['kept_legacy']:>6}")
+
+    ok = [r for r in rows if "error" not in r]
+    if ok:
+        summary = {stage: round(statistics.median(r[stage] for r in ok), 2) for stage in STAGES}
+        total = summary["decode"] + summary["preprocess"] + summary["detect"] + summary["nms"]
+        speedup = summary["nms_legacy"] / summary["nms"] if summary["nms"] else 0
+        print(f"\n[SUMMARY] images={len(ok)} median ms: decode={summary['decode']} "
+              f"preprocess={summary['preprocess']} detect={summary['detect']} nms={summary['nms']} "
+              f"nms_legacy={summary['nms_legacy']} (x{speedup:.1f}) total={total:.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
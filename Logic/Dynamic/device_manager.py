@@ -7,16 +7,45 @@
 - 디바이스 상태 모니터링
 - 메모리/CPU 정리
 - 안정성 체크
+- 앱 강제 종료 / 캐시 정리 / Frida 재시작은 기기 스크립트 하나로 실행 (device_reset, adb 호출 1회)
+- 쿨다운은 메모리/온도/Frida 상태를 폴링해 기준을 만족하면 바로 종료 (기기별 이력 유지)
+- adb shell 명령은 열어 둔 세션(adb_session)으로 실행 (명령마다 adb 프로세스를 띄우지 않음)
 """
 
-import subprocess
 import time
 import re
+import shlex
 from datetime import datetime
 
+from adb_session import AdbBackend, AdbSessionPool
+from device_reset import DEFAULT_EXCLUDE, RESET_STEPS, build_reset_script, parse_reset_output
+
+# health_check 경고 기준 (이 값 이상이면 경고)
+HEALTH_MAX_MEMORY_PERCENT = 80
+HEALTH_MAX_TEMP = 60.0
+
+# 쿨다운 종료 기준 (health_check 의 경고 기준보다 여유 있게)
+COOLDOWN_MAX_MEMORY_PERCENT = 75
+COOLDOWN_MAX_TEMP = 45.0
+COOLDOWN_POLL_INTERVAL = 2
+# 기준을 못 맞추는 기기는 최근 쿨다운 종료 값 중 최저(평상시 수준) + 여유로 기준 완화
+COOLDOWN_BASELINE_WINDOW = 3
+COOLDOWN_BASELINE_MARGIN = {'memory_percent': 3.0, 'temp': 2.0}
+# 완화해도 health_check 경고 기준은 넘지 않음
+COOLDOWN_BASELINE_CEILING = {'memory_percent': HEALTH_MAX_MEMORY_PERCENT, 'temp': HEALTH_MAX_TEMP}
+
 class DeviceManager:
-    def __init__(self, frida_server_path='/data/local/tmp/frida-server'):
+    def __init__(self, frida_server_path='/data/local/tmp/frida-server', serial=None, backend=None):
+        """
+        serial: 대상 기기 (adb -s). None이면 adb 기본 기기
+        backend: 테스트용 가상 기기 등 (adb_sim.FakeDevice)
+        """
         self.frida_server_path = frida_server_path
+        self.serial = serial
+        self.backend = backend or AdbBackend(serial)
+        self.sessions = AdbSessionPool(root=False, size=2, backend=self.backend)
+        # 쿨다운 기록 (device_cooldown 한 번당 dict 하나)
+        self.cooldown_history = []
 
     def log(self, level, message):
         """로그 출력"""
@@ -33,23 +62,29 @@ class DeviceManager:
             # Windows 콘솔 인코딩 문제 회피
             print(f"[{timestamp}] {prefix} {message}".encode('utf-8', errors='replace').decode('utf-8', errors='replace'))
 
-    def adb(self, args, timeout=10):
-        """ADB 명령 실행"""
+    def adb(self, args, timeout=10, oneshot=False):
+        """
+        ADB 명령 실행 -> (returncode, stdout, stderr)
+        - ['shell', ...]: 세션 풀에서 실행 (adb shell처럼 인자를 공백으로 이어 붙인 명령)
+        - 그 외 / oneshot=True: adb 프로세스 한 번 실행 (백그라운드 데몬 실행 등 세션에 묶이면 안 되는 명령)
+        """
         try:
-            result = subprocess.run(
-                ['adb'] + args,
-                capture_output=True,
-                text=True,
-                timeout=timeout
-            )
-            return result.returncode, result.stdout, result.stderr
-        except subprocess.TimeoutExpired:
-            self.log('ERROR', f'ADB command timeout: {" ".join(args)}')
-            return -1, '', 'Timeout'
+            if args[:1] == ['shell'] and not oneshot:
+                out, err, code = self.sessions.run(' '.join(args[1:]), timeout=timeout)
+            else:
+                code, out, err = self.backend.run_adb(args, timeout=timeout)
         except Exception as e:
             self.log('ERROR', f'ADB command failed: {e}')
             return -1, '', str(e)
 
+        if code == -1 and err == 'Timeout':
+            self.log('ERROR', f'ADB command timeout: {" ".join(args)}')
+        return code, out, err
+
+    def close(self):
+        """열어 둔 adb shell 세션 정리"""
+        self.sessions.close()
+
     def check_device_connected(self):
         """디바이스 연결 확인"""
         code, out, err = self.adb(['devices'])
@@ -58,6 +93,9 @@ class DeviceManager:
 
         lines = out.strip().split('\n')
         devices = [line for line in lines[1:] if '\tdevice' in line]
+        if self.serial:
+            # 여러 기기가 연결된 경우 내 기기만 확인
+            devices = [line for line in devices if line.split()[0] == self.serial]
 
         if not devices:
             self.log('ERROR', 'No device connected')
@@ -99,17 +137,29 @@ class DeviceManager:
 
         return None
 
-    def is_frida_running(self):
-        """Frida 서버 실행 확인"""
+    def is_frida_running(self, verbose=True):
+        """Frida 서버 실행 확인 (verbose=False: 폴링용, 로그 없음)"""
         code, out, err = self.adb(['shell', 'su', '-c', 'ps | grep frida-server'])
 
         # grep이 매칭을 못 찾으면 code=1 반환 (정상)
-        if code == 0 and 'frida-server' in out and 'grep' not in out:
-            self.log('INFO', 'Frida server is running')
-            return True
-        else:
-            self.log('WARN', 'Frida server is NOT running')
-            return False
+        running = code == 0 and 'frida-server' in out and 'grep' not in out
+        if verbose:
+            if running:
+                self.log('INFO', 'Frida server is running')
+            else:
+                self.log('WARN', 'Frida server is NOT running')
+        return running
+
+    def wait_until(self, predicate, timeout, interval=0.5):
+        """predicate()가 True가 될 때까지 폴링 (고정 sleep 대체). timeout 안에 충족하면 True"""
+        deadline = time.time() + timeout
+        while True:
+            if predicate():
+                return True
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return False
+            time.sleep(min(interval, remaining))
 
     def stop_frida_server(self):
         """Frida 서버 중지"""
@@ -117,19 +167,17 @@ class DeviceManager:
 
         # pkill로 종료 시도
         code, out, err = self.adb(['shell', 'su', '-c', 'pkill frida-server'], timeout=5)
-        time.sleep(1)
 
-        # 확인
-        if not self.is_frida_running():
+        # 종료 확인 (최대 3초 폴링)
+        if self.wait_until(lambda: not self.is_frida_running(verbose=False), timeout=3):
             self.log('SUCCESS', 'Frida server stopped')
             return True
         else:
             # killall로 재시도
             self.log('WARN', 'pkill failed, trying killall...')
             code, out, err = self.adb(['shell', 'su', '-c', 'killall frida-server'], timeout=5)
-            time.sleep(1)
 
-            if not self.is_frida_running():
+            if self.wait_until(lambda: not self.is_frida_running(verbose=False), timeout=3):
                 self.log('SUCCESS', 'Frida server stopped (via killall)')
                 return True
             else:
@@ -143,14 +191,12 @@ class DeviceManager:
         # 백그라운드로 실행 (&)
         code, out, err = self.adb(
             ['shell', 'su', '-c', f'"{self.frida_server_path} &"'],
-            timeout=5
+            timeout=5,
+            oneshot=True
         )
 
-        # 시작 대기
-        time.sleep(2)
-
-        # 확인
-        if self.is_frida_running():
+        # 시작 확인 (프로세스가 보일 때까지 최대 5초 폴링)
+        if self.wait_until(lambda: self.is_frida_running(verbose=False), timeout=5):
             self.log('SUCCESS', 'Frida server started')
             return True
         else:
@@ -160,15 +206,11 @@ class DeviceManager:
             return False
 
     def restart_frida_server(self):
-        """Frida 서버 재시작"""
+        """Frida 서버 재시작 (종료 → 시작 → 실행 확인을 기기 스크립트 한 번으로)"""
         self.log('INFO', '========== Restarting Frida Server ==========')
 
-        # 1. 중지
-        self.stop_frida_server()
-        time.sleep(1)
-
-        # 2. 시작
-        success = self.start_frida_server()
+        status = self.reset_device(['frida'])
+        success = status.get('frida', {}).get('running') == 1
 
         if success:
             self.log('SUCCESS', 'Frida server restarted successfully')
@@ -177,16 +219,37 @@ class DeviceManager:
 
         return success
 
+    def reset_device(self, steps=RESET_STEPS, exclude_packages=None, timeout=60):
+        """
+        리셋 단계를 기기 스크립트 하나로 실행 (adb 호출 1회) -> 단계별 상태 dict
+        - steps: device_reset.RESET_STEPS 중 일부 (force_stop / drop_caches / frida / probe)
+        - 반환 예: {'force_stop': {'stopped': 12, 'failed': 0}, 'drop_caches': {'ok': 1}, 'done': {}}
+          스크립트가 중간에 끊기면 (타임아웃 등) 'done' 없음
+        - frida 단계가 있으면 adb 프로세스 한 번으로 실행 (시작한 Frida 서버가 세션에 묶이지 않도록)
+        """
+        exclude = list(DEFAULT_EXCLUDE) + [p for p in (exclude_packages or []) if p not in DEFAULT_EXCLUDE]
+        script = build_reset_script(steps, exclude=exclude, frida_server_path=self.frida_server_path)
+
+        started = time.time()
+        code, out, err = self.adb(['shell', 'su', '-c', shlex.quote(script)],
+                                  timeout=timeout, oneshot='frida' in steps)
+        status = parse_reset_output(out)
+
+        if 'done' not in status:
+            self.log('WARN', f'Reset script incomplete (code {code}): {err.strip()[:200]}')
+        else:
+            self.log('INFO', f'Reset ({", ".join(s for s in RESET_STEPS if s in steps)}) '
+                             f'finished in {time.time() - started:.1f}s')
+        return status
+
     def clear_cache(self):
-        """시스템 캐시 정리"""
+        """시스템 캐시 정리 (sync + drop_caches, 한 번에 실행)"""
         self.log('INFO', 'Clearing system cache...')
 
         # Drop caches (requires root)
-        code, out, err = self.adb(['shell', 'su', '-c', 'sync'])
-        time.sleep(0.5)
-        code, out, err = self.adb(['shell', 'su', '-c', 'echo 3 > /proc/sys/vm/drop_caches'])
+        status = self.reset_device(['drop_caches'])
 
-        if code == 0:
+        if status.get('drop_caches', {}).get('ok') == 1:
             self.log('SUCCESS', 'Cache cleared')
             return True
         else:
@@ -194,47 +257,115 @@ class DeviceManager:
             return False
 
     def force_stop_all_apps(self, exclude_packages=None):
-        """모든 앱 강제 종료 (시스템 앱 제외)"""
+        """모든 앱 강제 종료 (시스템 앱 제외, 패키지 목록 조회부터 기기에서 한 번에 실행)"""
         self.log('INFO', 'Force stopping all user apps...')
 
-        exclude_packages = exclude_packages or []
-        exclude_packages.extend([
-            'com.android.systemui',
-            'com.android.launcher',
-            'com.google.android.gms'
-        ])
-
-        # 실행 중인 프로세스 목록
-        code, out, err = self.adb(['shell', 'pm', 'list', 'packages', '-3'])  # -3 = 3rd party only
+        status = self.reset_device(['force_stop'], exclude_packages=exclude_packages)
+        result = status.get('force_stop')
 
-        if code != 0:
-            self.log('WARN', 'Failed to list packages')
+        if result is None:
+            self.log('WARN', 'Failed to stop apps')
             return False
 
-        packages = [line.replace('package:', '') for line in out.strip().split('\n')]
-        stopped = 0
-
-        for pkg in packages:
-            if pkg and pkg not in exclude_packages:
-                code, _, _ = self.adb(['shell', 'am', 'force-stop', pkg], timeout=2)
-                if code == 0:
-                    stopped += 1
-
-        self.log('SUCCESS', f'Stopped {stopped} apps')
+        self.log('SUCCESS', f"Stopped {result.get('stopped', 0)} apps")
         return True
 
-    def device_cooldown(self, duration=30):
-        """디바이스 쿨다운 대기"""
-        self.log('INFO', f'Device cooldown for {duration} seconds...')
-
-        # 진행률 표시
-        for i in range(duration):
-            remaining = duration - i
-            if remaining % 10 == 0 or remaining <= 5:
-                self.log('INFO', f'  Cooldown: {remaining}s remaining...')
-            time.sleep(1)
+    def cooldown_targets(self, max_memory_percent=COOLDOWN_MAX_MEMORY_PERCENT, max_temp=COOLDOWN_MAX_TEMP):
+        """
+        이번 쿨다운 종료 기준
+        - 최근 COOLDOWN_BASELINE_WINDOW 번의 쿨다운이 모두 기준보다 높게 끝났으면 기기 평상시 수준이 높은 것
+          → 그중 최저값 + 여유로 완화 (한 번이라도 기준 아래로 내려가면 원래 기준)
+        - 완화한 기준은 COOLDOWN_BASELINE_CEILING (health_check 경고 기준) 이하
+        - 완화했으면 원래 기준과 함께 로그
+        """
+        defaults = {'memory_percent': max_memory_percent, 'temp': max_temp}
+        targets = dict(defaults)
+        recent = self.cooldown_history[-COOLDOWN_BASELINE_WINDOW:]
+        for key in targets:
+            seen = [h[key] for h in recent if h.get(key) is not None]
+            if len(seen) == COOLDOWN_BASELINE_WINDOW:
+                relaxed = min(min(seen) + COOLDOWN_BASELINE_MARGIN[key], COOLDOWN_BASELINE_CEILING[key])
+                targets[key] = max(targets[key], relaxed)
+
+        units = {'memory_percent': '%', 'temp': '°C'}
+        changed = [f"{key} < {targets[key]:.1f}{units[key]} (default {defaults[key]:.1f}{units[key]})"
+                   for key in targets if targets[key] != defaults[key]]
+        if changed:
+            self.log('INFO', f"Cooldown targets relaxed to device baseline (last {COOLDOWN_BASELINE_WINDOW} "
+                             f"cooldowns ended above them): {', '.join(changed)}")
+        return targets
+
+    def device_cooldown(self, duration=30, min_duration=0, max_memory_percent=COOLDOWN_MAX_MEMORY_PERCENT,
+                        max_temp=COOLDOWN_MAX_TEMP, require_frida=False, poll_interval=COOLDOWN_POLL_INTERVAL):
+        """
+        디바이스 쿨다운 (적응형)
+        - 메모리 사용률 / 온도 (/ require_frida 면 Frida 실행)를 폴링해 기준을 만족하면 바로 종료
+        - duration: 최대 대기 (초), min_duration: 최소 대기 (초)
+        - 온도를 읽을 수 없는 기기는 온도 조건 통과
+        - 결과 dict는 self.cooldown_history 에도 추가
+        """
+        targets = self.cooldown_targets(max_memory_percent, max_temp)
+        self.log('INFO', f"Device cooldown (max {duration}s, until memory < {targets['memory_percent']:.0f}% "
+                         f"and temp < {targets['temp']:.0f}°C)...")
+
+        started = time.time()
+        next_report = 10
+        polls = 0
+        while True:
+            mem_info = self.get_memory_info()
+            temp = self.get_device_temp()
+            frida = self.is_frida_running(verbose=False) if require_frida else None
+            polls += 1
+            elapsed = time.time() - started
+
+            waiting = []
+            if mem_info and mem_info['used_percent'] >= targets['memory_percent']:
+                waiting.append(f"memory {mem_info['used_percent']}%")
+            if temp is not None and temp >= targets['temp']:
+                waiting.append(f'temp {temp:.1f}°C')
+            if require_frida and not frida:
+                waiting.append('frida')
+
+            if not waiting and elapsed >= min_duration:
+                reason = 'ready'
+                break
+            if elapsed >= duration:
+                reason = 'timeout'
+                break
+            if elapsed >= next_report:
+                self.log('INFO', f"  Cooldown: {elapsed:.0f}s, waiting for {', '.join(waiting) or 'min duration'}...")
+                next_report += 10
+            time.sleep(max(0.0, min(poll_interval, duration - elapsed)))
+
+        record = {
+            'started': started,
+            'seconds': round(elapsed, 1),
+            'reason': reason,
+            'polls': polls,
+            'memory_percent': mem_info['used_percent'] if mem_info else None,
+            'temp': temp,
+            'frida_running': frida,
+        }
+        self.cooldown_history.append(record)
 
-        self.log('SUCCESS', 'Cooldown completed')
+        if reason == 'ready':
+            self.log('SUCCESS', f'Cooldown completed in {elapsed:.1f}s')
+        elif waiting:
+            self.log('WARN', f"Cooldown limit reached ({duration}s), still waiting for {', '.join(waiting)}")
+        else:
+            self.log('WARN', f"Cooldown limit reached ({duration}s) before min duration ({min_duration}s)")
+        return record
+
+    def cooldown_summary(self):
+        """쿨다운 이력 요약 (횟수, 총/평균/최대 시간, 최대 대기로 끝난 횟수)"""
+        seconds = [h['seconds'] for h in self.cooldown_history]
+        return {
+            'count': len(seconds),
+            'total_seconds': round(sum(seconds), 1),
+            'avg_seconds': round(sum(seconds) / len(seconds), 1) if seconds else 0.0,
+            'max_seconds': max(seconds) if seconds else 0.0,
+            'timeouts': sum(1 for h in self.cooldown_history if h['reason'] == 'timeout'),
+        }
 
     def health_check(self, verbose=True):
         """디바이스 상태 체크"""
@@ -263,8 +394,8 @@ class DeviceManager:
                 self.log('INFO', f"Memory: {mem_info['available_mb']}MB available "
                         f"({mem_info['used_percent']}% used)")
 
-            # 메모리 사용률 80% 이하면 OK
-            checks['memory_ok'] = mem_info['used_percent'] < 80
+            # 메모리 사용률 80% 미만이면 OK
+            checks['memory_ok'] = mem_info['used_percent'] < HEALTH_MAX_MEMORY_PERCENT
 
             if not checks['memory_ok']:
                 self.log('WARN', f"High memory usage: {mem_info['used_percent']}%")
@@ -275,8 +406,8 @@ class DeviceManager:
             if verbose:
                 self.log('INFO', f'Temperature: {temp:.1f}°C')
 
-            # 온도 60도 이하면 OK
-            checks['temp_ok'] = temp < 60.0
+            # 온도 60도 미만이면 OK
+            checks['temp_ok'] = temp < HEALTH_MAX_TEMP
 
             if not checks['temp_ok']:
                 self.log('WARN', f'High temperature: {temp:.1f}°C')
@@ -298,28 +429,27 @@ class DeviceManager:
 
         return checks
 
-    def full_reset(self, cooldown_duration=30):
-        """전체 리셋 (Frida 재시작 + 캐시 정리 + 쿨다운)"""
+    def full_reset(self, cooldown_duration=30, **cooldown_options):
+        """
+        전체 리셋 (앱 강제 종료 + 캐시 정리 + Frida 재시작 + 쿨다운)
+        - 1~3단계는 기기 스크립트 하나로 실행, 쿨다운이 Frida 실행까지 확인 (cooldown_options: device_cooldown 인자)
+        """
         self.log('INFO', '========== Full Device Reset ==========')
 
-        # 1. 모든 앱 강제 종료
-        self.force_stop_all_apps()
-        time.sleep(2)
+        # 1~3. 앱 강제 종료 / 캐시 정리 / Frida 재시작 / 상태 확인
+        status = self.reset_device(RESET_STEPS)
+        stopped = status.get('force_stop', {}).get('stopped', 0)
+        cleared = status.get('drop_caches', {}).get('ok') == 1
+        self.log('INFO', f"Stopped {stopped} apps, cache {'cleared' if cleared else 'not cleared (may need root)'}")
 
-        # 2. Frida 서버 재시작
-        if not self.restart_frida_server():
+        if status.get('frida', {}).get('running') != 1:
             self.log('ERROR', 'Frida restart failed, attempting recovery...')
             time.sleep(5)
             self.start_frida_server()
 
-        time.sleep(2)
-
-        # 3. 캐시 정리
-        self.clear_cache()
-        time.sleep(1)
-
         # 4. 쿨다운
-        self.device_cooldown(cooldown_duration)
+        cooldown_options.setdefault('require_frida', True)
+        self.device_cooldown(cooldown_duration, **cooldown_options)
 
         # 5. 최종 상태 확인
         checks = self.health_check(verbose=True)
@@ -344,11 +474,19 @@ def main():
         'clear-cache', 'cooldown', 'full-reset'
     ])
     parser.add_argument('--frida-path', default='/data/local/tmp/frida-server')
-    parser.add_argument('--cooldown', type=int, default=30, help='Cooldown duration (seconds)')
+    parser.add_argument('-s', '--serial', default=None, help='Device serial (adb -s)')
+    parser.add_argument('--cooldown', type=int, default=30, help='Max cooldown duration (seconds)')
+    parser.add_argument('--min-cooldown', type=int, default=0, help='Min cooldown duration (seconds)')
+    parser.add_argument('--cooldown-memory', type=float, default=COOLDOWN_MAX_MEMORY_PERCENT,
+                        help='End cooldown when memory usage is below this percent')
+    parser.add_argument('--cooldown-temp', type=float, default=COOLDOWN_MAX_TEMP,
+                        help='End cooldown when temperature is below this (°C)')
 
     args = parser.parse_args()
 
-    manager = DeviceManager(frida_server_path=args.frida_path)
+    manager = DeviceManager(frida_server_path=args.frida_path, serial=args.serial)
+    cooldown_options = dict(min_duration=args.min_cooldown, max_memory_percent=args.cooldown_memory,
+                            max_temp=args.cooldown_temp)
 
     if args.action == 'check':
         manager.health_check(verbose=True)
@@ -361,9 +499,9 @@ def main():
     elif args.action == 'clear-cache':
         manager.clear_cache()
     elif args.action == 'cooldown':
-        manager.device_cooldown(args.cooldown)
+        manager.device_cooldown(args.cooldown, **cooldown_options)
     elif args.action == 'full-reset':
-        manager.full_reset(cooldown_duration=args.cooldown)
+        manager.full_reset(cooldown_duration=args.cooldown, **cooldown_options)
 
 
 if __name__ == '__main__':
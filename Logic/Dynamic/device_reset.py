@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+기기 리셋 스크립트 (한 번의 shell 호출로 리셋 전체 실행)
+- 앱 강제 종료 / 캐시 정리 / Frida 재시작 / 상태 확인을 기기에서 실행할 sh 스크립트 하나로 만듦
+- 패키지마다 am force-stop 을 보내고, sync / drop_caches / pkill / 시작 / ps 확인을 각각 보내던 방식 대체
+- 스크립트는 단계마다 "A3RESET <단계> key=value ..." 상태 줄을 출력 → parse_reset_output 으로 dict 변환
+- 기기 쪽 파일 경로(/proc/meminfo 등)는 스크립트 앞부분의 변수로 넣음 (DEVICE_PATHS)
+
+단계 (RESET_STEPS 순서로 실행):
+    force_stop   서드파티 앱 강제 종료 (exclude 제외)       → stopped, failed
+    drop_caches  sync + drop_caches                          → ok
+    frida        Frida 서버 종료 후 재시작, 실행될 때까지 대기 → stopped, running, waited_ms
+    probe        메모리 / 온도 / Frida 실행 여부              → mem_total_kb, mem_available_kb, temp_milli, frida
+
+사용 예 (DeviceManager.reset_device):
+    script = build_reset_script(["force_stop", "drop_caches"], exclude=["com.android.systemui"])
+    status = parse_reset_output(out)   # {"force_stop": {"stopped": 12, "failed": 0}, ...}
+"""
+
+import shlex
+from typing import Dict, Iterable, Optional
+
+RESET_STEPS = ("force_stop", "drop_caches", "frida", "probe")
+
+STATUS_PREFIX = "A3RESET"
+
+# 스크립트 변수 이름 → 기기 쪽 경로
+DEVICE_PATHS = {
+    "MEMINFO": "/proc/meminfo",
+    "DROP_CACHES": "/proc/sys/vm/drop_caches",
+    "THERMAL": "/sys/class/thermal/thermal_zone0/temp",
+}
+
+DEFAULT_EXCLUDE = ("com.android.systemui", "com.android.launcher", "com.google.android.gms")
+
+# Frida 종료 / 시작 대기 (0.1초 단위 반복 횟수)
+FRIDA_STOP_POLLS = 30
+FRIDA_START_POLLS = 50
+
+_STEP_SCRIPTS = {
+    "force_stop": """\
+stopped=0; failed=0
+for p in $(pm list packages -3 2>/dev/null | sed 's/^package://'); do
+  case " $EXCLUDE " in *" $p "*) continue ;; esac
+  if am force-stop "$p" >/dev/null 2>&1; then stopped=$((stopped+1)); else failed=$((failed+1)); fi
+done
+echo "A3RESET force_stop stopped=$stopped failed=$failed"
+""",
+    "drop_caches": """\
+sync
+if echo 3 > "$DROP_CACHES" 2>/dev/null; then ok=1; else ok=0; fi
+echo "A3RESET drop_caches ok=$ok"
+""",
+    "frida": """\
+name=${FRIDA##*/}
+stopped=0
+if pidof "$name" >/dev/null 2>&1; then
+  pkill "$name" 2>/dev/null || killall "$name" 2>/dev/null
+  i=0; while pidof "$name" >/dev/null 2>&1 && [ $i -lt %(stop_polls)d ]; do sleep 0.1; i=$((i+1)); done
+  pidof "$name" >/dev/null 2>&1 || stopped=1
+fi
+"$FRIDA" >/dev/null 2>&1 </dev/null &
+i=0; while ! pidof "$name" >/dev/null 2>&1 && [ $i -lt %(start_polls)d ]; do sleep 0.1; i=$((i+1)); done
+if pidof "$name" >/dev/null 2>&1; then running=1; else running=0; fi
+echo "A3RESET frida stopped=$stopped running=$running waited_ms=$((i*100))"
+""",
+    "probe": """\
+total=$(sed -n 's/^MemTotal: *\\([0-9]*\\).*/\\1/p' "$MEMINFO")
+avail=$(sed -n 's/^MemAvailable: *\\([0-9]*\\).*/\\1/p' "$MEMINFO")
+temp=$(cat "$THERMAL" 2>/dev/null)
+if pidof "${FRIDA##*/}" >/dev/null 2>&1; then frida=1; else frida=0; fi
+echo "A3RESET probe mem_total_kb=${total:-0} mem_available_kb=${avail:-0} temp_milli=${temp:-0} frida=$frida"
+""",
+}
+
+
+def build_reset_script(steps: Iterable[str], exclude: Optional[Iterable[str]] = None,
+                 frida_server_path: str = "/data/local/tmp/frida-server") -> str:
+    """
+    steps 를 RESET_STEPS 순서로 실행하는 sh 스크립트 (root 로 실행)
+    - 마지막 줄은 "A3RESET done" (출력이 끝까지 왔는지 확인용)
+    """
+    steps = [s for s in RESET_STEPS if s in set(steps)]
+    exclude = list(DEFAULT_EXCLUDE if exclude is None else exclude)
+    lines = [
+        f"EXCLUDE={shlex.quote(' '.join(exclude))}",
+        f"FRIDA={shlex.quote(frida_server_path)}",
+    ]
+    lines += [f"{name}={shlex.quote(path)}" for name, path in DEVICE_PATHS.items()]
+    polls = {"stop_polls": FRIDA_STOP_POLLS, "start_polls": FRIDA_START_POLLS}
+    lines += [_STEP_SCRIPTS[step] % polls for step in steps]
+    lines.append(f"echo \"{STATUS_PREFIX} done\"")
+    return "\n".join(line.rstrip("\n") for line in lines)
+
+
+def _value(raw: str):
+    try:
+        return int(raw)
+    except ValueError:
+        return raw
+
+
+def parse_reset_output(output: str) -> Dict[str, Dict[str, object]]:
+    """
+    "A3RESET <단계> key=value ..." 줄 → {단계: {key: value}} (숫자는 int)
+    - 스크립트가 끝까지 실행됐으면 "done" 키 포함
+    """
+    status: Dict[str, Dict[str, object]] = {}
+    for line in output.split("\n"):
+        parts = line.strip().split()
+        if len(parts) < 2 or parts[0] != STATUS_PREFIX:
+            continue
+        fields = {}
+        for item in parts[2:]:
+            key, sep, raw = item.partition("=")
+            if sep:
+                fields[key] = _value(raw)
+        status[parts[1]] = fields
+    return status
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+여러 기기 병렬 배치 스케줄러 (batch_pipeline.py 에서 사용)
+- adb devices 로 연결된 기기를 찾아 기기마다 DeviceManager(serial) 하나 + 작업 스레드 하나
+- 앱은 기기별 큐에 나눠 넣고, 자기 큐가 빈 기기는 가장 긴 다른 큐에서 가져감 (쉬는 기기 없이)
+- 실패한 앱은 max_retries 번까지 다른 기기 큐로 다시 넣음
+- 기기 상태 체크 실패 시 그 기기 큐를 다른 기기로 넘기고, 잠시 후 다시 확인
+- 진행 상황은 상태 파일(JSON)에 앱마다 저장 → 중단 후 같은 상태 파일로 다시 실행하면 남은 앱만 실행
+  (--start-from 인덱스 지정 대체)
+- simulated_fleet(): FakeDevice 기기 + 가짜 실행 함수로 하드웨어 없이 스케줄러 테스트
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from adb_session import AdbBackend
+from adb_sim import FakeDevice
+
+STATE_VERSION = 1
+
+PENDING = "pending"
+RUNNING = "running"
+SUCCESS = "success"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+def log(level, message, serial=None):
+    """로그 출력 (batch_pipeline.log 와 같은 형식, 기기 태그 추가)"""
+    timestamp = datetime.now().strftime('%H:%M:%S')
+    prefix = {
+        'INFO': '📌',
+        'SUCCESS': '✅',
+        'ERROR': '❌',
+        'WARN': '⚠️'
+    }.get(level, '  ')
+    tag = f"[{serial}] " if serial else ""
+    print(f"[{timestamp}] {prefix} {tag}{message}", flush=True)
+
+
+def discover_devices(backend=None) -> List[str]:
+    """adb devices 에서 사용 가능한(device 상태) 기기 serial 목록"""
+    code, out, err = (backend or AdbBackend()).run_adb(['devices'])
+    if code != 0:
+        return []
+    serials = []
+    for line in out.strip().split('\n')[1:]:
+        parts = line.split()
+        if len(parts) >= 2 and parts[1] == 'device':
+            serials.append(parts[0])
+    return serials
+
+
+class BatchState:
+    """
+    앱별 진행 상태 파일 (JSON, 저장할 때마다 임시 파일 → 교체)
+    apps: {패키지: {"status", "attempts", "device", "elapsed", "error", "updated"}}
+    - 불러올 때 running 으로 남은 앱(중단된 실행)은 pending 으로 되돌림
+    - skipped 는 그 실행에서만 유효 (skip, --start-from) → 불러올 때 pending 으로 되돌림
+    - 상태 파일에 없는 앱은 pending 으로 추가
+    """
+
+    def __init__(self, path: Optional[str], apps: List[str], retry_failed: bool = False):
+        self.path = path
+        self._lock = threading.Lock()
+        self.apps: Dict[str, dict] = {}
+
+        saved = self._load()
+        for pkg in apps:
+            entry = dict(saved.get(pkg) or {"status": PENDING, "attempts": 0})
+            if entry.get("status") in (RUNNING, SKIPPED) or (retry_failed and entry.get("status") == FAILED):
+                entry["status"] = PENDING
+                entry["attempts"] = 0
+            self.apps[pkg] = entry
+        self.save()
+
+    def _load(self) -> Dict[str, dict]:
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != STATE_VERSION:
+            return {}
+        return data.get("apps", {})
+
+    def save(self):
+        if not self.path:
+            return
+        data = {"version": STATE_VERSION, "updated": datetime.now().isoformat(timespec="seconds"),
+                "apps": self.apps}
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.path)
+
+    def update(self, pkg: str, **fields):
+        with self._lock:
+            entry = self.apps.setdefault(pkg, {"status": PENDING, "attempts": 0})
+            entry.update(fields)
+            entry["updated"] = datetime.now().isoformat(timespec="seconds")
+            self.save()
+
+    def skip(self, pkgs: List[str]):
+        """이번 실행에서 pending 인 앱을 건너뜀 (다음에 상태 파일을 불러오면 다시 pending)"""
+        for pkg in pkgs:
+            if self.apps.get(pkg, {}).get("status") == PENDING:
+                self.update(pkg, status=SKIPPED)
+
+    def with_status(self, *statuses) -> List[str]:
+        return [pkg for pkg, e in self.apps.items() if e.get("status") in statuses]
+
+    def counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for e in self.apps.values():
+            counts[e.get("status", PENDING)] = counts.get(e.get("status", PENDING), 0) + 1
+        return counts
+
+
+class DeviceWorker:
+    """기기 하나의 작업 큐와 상태"""
+
+    def __init__(self, serial: str, manager=None):
+        self.serial = serial
+        self.manager = manager
+        self.queue = deque()
+        self.healthy = True
+        self.retired = False
+        self.finished = False  # 작업 스레드 종료 (더 이상 큐를 비우지 않음)
+        self.completed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+
+
+class BatchScheduler:
+    """
+    기기별 큐 + 작업 가져가기 방식 스케줄러
+    - run_app(pkg, worker) -> bool : 앱 하나 실행 (성공 여부)
+    - after_app(worker, pkg, ok)    : 앱 실행 후 기기 정리 / 쿨다운 (기기 스레드에서 실행)
+    - health_check(worker) -> bool   : 앱 실행 전 기기 확인 (False 면 큐를 다른 기기로 넘김)
+    """
+
+    def __init__(self, workers: List[DeviceWorker], state: BatchState,
+                 run_app: Callable[[str, DeviceWorker], bool],
+                 after_app: Optional[Callable] = None,
+                 health_check: Optional[Callable[[DeviceWorker], bool]] = None,
+                 max_retries: int = 1, recover_delay: float = 30.0, recover_attempts: int = 3):
+        self.workers = workers
+        self.state = state
+        self.run_app = run_app
+        self.after_app = after_app
+        self.health_check = health_check
+        self.max_retries = max_retries
+        self.recover_delay = recover_delay
+        self.recover_attempts = recover_attempts
+        self._cond = threading.Condition()
+        self._in_flight = 0
+
+        # 남은 앱을 기기 큐에 번갈아 배분
+        pending = state.with_status(PENDING)
+        for i, pkg in enumerate(pending):
+            workers[i % len(workers)].queue.append(pkg)
+
+    # --- 큐 ---
+    def _live(self, exclude=None) -> List[DeviceWorker]:
+        """작업 스레드가 살아 있는 기기 (상태 체크 실패로 복구 대기 중인 기기 포함)"""
+        return [w for w in self.workers if not w.retired and not w.finished and w is not exclude]
+
+    def _active(self, exclude=None) -> List[DeviceWorker]:
+        return [w for w in self._live(exclude) if w.healthy]
+
+    def _enqueue(self, pkg: str, avoid: Optional[DeviceWorker] = None, front: bool = False):
+        """가장 짧은 큐에 추가 (avoid 기기는 다른 기기가 없을 때만, 종료한 기기 큐에는 넣지 않음)"""
+        candidates = self._active(exclude=avoid) or self._active() or \
+            self._live(exclude=avoid) or self._live() or self.workers
+        target = min(candidates, key=lambda w: len(w.queue))
+        if front:
+            target.queue.appendleft(pkg)
+        else:
+            target.queue.append(pkg)
+
+    def _hand_off(self, worker: DeviceWorker):
+        """기기 큐를 다른 기기로 넘김 (넘길 기기가 없으면 그대로 두고 복구 후 이어서 실행)"""
+        if not self._live(exclude=worker):
+            return
+        while worker.queue:
+            self._enqueue(worker.queue.popleft(), avoid=worker)
+        self._cond.notify_all()
+
+    def _steal(self, worker: DeviceWorker) -> Optional[str]:
+        """가장 긴 다른 큐의 뒤쪽에서 가져옴 (이 기기에서 실패했던 앱은 제외)"""
+        for donor in sorted((w for w in self.workers if w is not worker and w.queue),
+                            key=lambda w: len(w.queue), reverse=True):
+            for pkg in reversed(donor.queue):
+                if self.state.apps.get(pkg, {}).get("device") != worker.serial:
+                    donor.queue.remove(pkg)
+                    return pkg
+        return None
+
+    def _next(self, worker: DeviceWorker) -> Optional[str]:
+        with self._cond:
+            while True:
+                pkg = worker.queue.popleft() if worker.queue else self._steal(worker)
+                if pkg is not None:
+                    self._in_flight += 1
+                    return pkg
+                # 실행 중인 앱도, 큐에 남은 앱도 없으면 종료
+                # (이 기기에서 실패해 가져올 수 없는 앱이 다른 큐에 남아 있으면 그 기기의 재시도 결과를 기다림)
+                if self._in_flight == 0 and not any(w.queue for w in self.workers if not w.retired):
+                    worker.finished = True
+                    return None
+                # 다른 기기에서 실행 중인 앱이 실패해 다시 들어올 수 있으므로 대기
+                self._cond.wait(timeout=1.0)
+
+    def _done(self, pkg: str, worker: DeviceWorker, ok: bool, elapsed: float, error: str = ""):
+        entry = self.state.apps.get(pkg, {})
+        attempts = entry.get("attempts", 0) + 1
+        with self._cond:
+            self._in_flight -= 1
+            if ok:
+                worker.completed += 1
+                self.state.update(pkg, status=SUCCESS, attempts=attempts, device=worker.serial,
+                                  elapsed=round(elapsed, 1), error="")
+            elif attempts <= self.max_retries:
+                worker.failed += 1
+                self.state.update(pkg, status=PENDING, attempts=attempts, device=worker.serial,
+                                  elapsed=round(elapsed, 1), error=error)
+                self._enqueue(pkg, avoid=worker)
+                log('WARN', f'{pkg} failed, retry {attempts}/{self.max_retries} queued', worker.serial)
+            else:
+                worker.failed += 1
+                self.state.update(pkg, status=FAILED, attempts=attempts, device=worker.serial,
+                                  elapsed=round(elapsed, 1), error=error)
+            self._cond.notify_all()
+
+    def _requeue_unstarted(self, pkg: str, worker: DeviceWorker):
+        with self._cond:
+            self._in_flight -= 1
+            self._enqueue(pkg, avoid=worker, front=True)
+            self._cond.notify_all()
+
+    # --- 기기 상태 ---
+    def _recover(self, worker: DeviceWorker) -> bool:
+        """상태 체크 실패 기기: 큐를 넘기고 recover_delay 간격으로 다시 확인"""
+        with self._cond:
+            worker.healthy = False
+            self._hand_off(worker)
+        log('WARN', 'Device unhealthy, queue handed off to other devices', worker.serial)
+
+        for attempt in range(1, self.recover_attempts + 1):
+            time.sleep(self.recover_delay)
+            if self.health_check(worker):
+                with self._cond:
+                    worker.healthy = True
+                    self._cond.notify_all()
+                log('SUCCESS', f'Device recovered (check {attempt})', worker.serial)
+                return True
+
+        with self._cond:
+            worker.retired = True
+            self._hand_off(worker)
+        log('ERROR', 'Device retired after failed health checks', worker.serial)
+        return False
+
+    # --- 실행 ---
+    def _worker_loop(self, worker: DeviceWorker):
+        while True:
+            pkg = self._next(worker)
+            if pkg is None:
+                return
+
+            if self.health_check and not self.health_check(worker):
+                self._requeue_unstarted(pkg, worker)
+                if not self._recover(worker):
+                    return
+                continue
+
+            self.state.update(pkg, status=RUNNING, device=worker.serial)
+            log('INFO', f'Starting {pkg} ({self.state.counts().get(SUCCESS, 0)}/{len(self.state.apps)} done)',
+                worker.serial)
+            start = time.time()
+            error = ""
+            try:
+                ok = bool(self.run_app(pkg, worker))
+            except Exception as e:
+                ok, error = False, str(e)
+            elapsed = time.time() - start
+            worker.busy_seconds += elapsed
+            self._done(pkg, worker, ok, elapsed, error)
+
+            if self.after_app:
+                try:
+                    self.after_app(worker, pkg, ok)
+                except Exception as e:
+                    log('WARN', f'Post-app device maintenance failed: {e}', worker.serial)
+
+    def run(self) -> BatchState:
+        threads = [threading.Thread(target=self._worker_loop, args=(w,), name=f"device-{w.serial}", daemon=True)
+                   for w in self.workers]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return self.state
+
+
+# -------------------------
+# 시뮬레이션 (하드웨어 없이 테스트)
+# -------------------------
+def simulated_fleet(count: int, packages: List[str], offline: Optional[List[int]] = None) -> List[FakeDevice]:
+    """
+    가상 기기 count 대 (frida-server 실행 중, 대상 패키지 설치됨)
+    offline: 처음부터 연결이 끊긴 기기 번호 목록
+    """
+    devices = []
+    for i in range(count):
+        dev = FakeDevice(serial=f"sim-{i}", packages=packages)
+        dev.processes.append("frida-server")
+        dev.online = i not in (offline or [])
+        devices.append(dev)
+    return devices
+
+
+class SimulatedFleetBackend:
+    """adb devices 를 가상 기기 목록으로 응답하는 백엔드 (discover_devices 용)"""
+
+    def __init__(self, devices: List[FakeDevice]):
+        self.devices = devices
+        self.serial = None
+
+    def run_adb(self, args, timeout=10):
+        lines = ["List of devices attached"]
+        lines += [f"{d.serial}\t{'device' if d.online else 'offline'}" for d in self.devices]
+        return 0, "\n".join(lines) + "\n", ""
+
+
+def simulated_run_app(duration: float = 0.2, fail_rate: float = 0.0,
+                      fail_first: Optional[Dict[str, int]] = None, seed: Optional[int] = None):
+    """
+    pipeline_runner.js 대신 쓰는 가짜 실행 함수
+    - duration 초 대기 후 fail_rate 확률로 실패
+    - fail_first: {패키지: 처음 n번 실패}
+    """
+    rng = random.Random(seed)
+    remaining = dict(fail_first or {})
+    lock = threading.Lock()
+
+    def run_app(pkg, worker):
+        time.sleep(duration)
+        with lock:
+            if remaining.get(pkg, 0) > 0:
+                remaining[pkg] -= 1
+                return False
+            return rng.random() >= fail_rate
+
+    return run_app
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+기기 파일시스템 스냅샷 (명령 한 번으로 앱 경로 전체 수집)
+- 앱 내부/외부 루트 전체를 find -printf 한 번으로 훑어 (type, size, mtime, mode, path) 레코드를 NUL 구분으로 받음
+- 결과는 메모리 트리(PathSnapshot)로 만들어 basic / full 추출, static ADB 검증에서 ls·find 대신 조회
+- 폴더마다 ls -al 을 보내고 텍스트를 parse_ls_line 으로 파싱하던 방식을 대체
+- find -printf 를 지원하지 않는 기기는 find -exec stat 으로 한 번 더 시도 (줄 단위)
+- compress=True 면 기기에서 gzip + base64 로 묶어 전송 (파일이 많은 앱)
+
+사용 예:
+    from fs_snapshot import take_snapshot
+    snap = take_snapshot("com.example.app")
+    snap.children("/data/user/0/com.example.app")
+    snap.dirs("/data/user/0/com.example.app")
+"""
+
+import base64
+import gzip
+import shlex
+import stat
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence
+
+# 공용 모듈 패키지 (Logic/shared)
+_LOGIC_DIR = str(Path(__file__).resolve().parent.parent)
+if _LOGIC_DIR not in sys.path:
+    sys.path.insert(0, _LOGIC_DIR)
+
+from adb_session import get_pool
+from shared.path_list_io import iter_rows, write_rows
+
+SNAPSHOT_TIMEOUT = 120
+
+SNAPSHOT_FIELDS = ["path", "type", "size", "mtime", "mode"]
+
+# 같은 위치를 가리키는 경로 표기 (스냅샷에는 오른쪽 표기로 저장)
+PATH_ALIASES = (
+    ("/sdcard", "/storage/emulated/0"),
+    ("/storage/self/primary", "/storage/emulated/0"),
+    ("/mnt/sdcard", "/storage/emulated/0"),
+    ("/data/data", "/data/user/0"),
+)
+
+# find -printf 레코드: 타입 \t 크기 \t mtime \t 8진 모드 \t 경로 \0
+_PRINTF_FIELDS = r"\t%s\t%T@\t%m\t%p\0"
+
+
+class Entry(NamedTuple):
+    path: str
+    type: str      # "d" 폴더 / "f" 파일 / "l" 심볼릭 링크
+    size: int
+    mtime: float
+    mode: int
+
+    @property
+    def name(self) -> str:
+        return self.path.rsplit("/", 1)[-1]
+
+    @property
+    def is_dir(self) -> bool:
+        return self.type == "d"
+
+
+def canonical_path(path: str) -> str:
+    """끝 슬래시 제거 + 별칭 경로(/sdcard, /data/data ...)를 스냅샷 표기로"""
+    path = path.strip()
+    if len(path) > 1:
+        path = path.rstrip("/")
+    for alias, real in PATH_ALIASES:
+        if path == alias or path.startswith(alias + "/"):
+            return real + path[len(alias):]
+    return path
+
+
+def _parent(path: str) -> str:
+    head = path.rsplit("/", 1)[0]
+    return head or "/"
+
+
+class PathSnapshot:
+    """
+    스냅샷 트리 (경로 → Entry)
+    - children / walk / dirs / files 는 경로 순으로 정렬된 Entry 목록
+    - 조회 경로는 canonical_path 로 맞춘 뒤 찾음 (/sdcard/... 로 물어도 됨)
+    """
+
+    def __init__(self, entries: Iterable[Entry] = (), roots: Sequence[str] = (),
+                 package: Optional[str] = None, serial: Optional[str] = None,
+                 taken_at: Optional[float] = None):
+        self.entries: Dict[str, Entry] = {}
+        self.roots = [canonical_path(r) for r in roots]
+        self.package = package
+        self.serial = serial
+        self.taken_at = taken_at if taken_at is not None else time.time()
+        # adb_extraction.extract_paths 결과 폴더 경로 (CSV 저장 순서)
+        self.extracted: List[str] = []
+        self._children = None
+        for entry in entries:
+            self.add(entry)
+
+    def add(self, entry: Entry):
+        self.entries[entry.path] = entry
+        self._children = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[Entry]:
+        for path in sorted(self.entries):
+            yield self.entries[path]
+
+    def __contains__(self, path) -> bool:
+        return canonical_path(path) in self.entries
+
+    def get(self, path: str) -> Optional[Entry]:
+        return self.entries.get(canonical_path(path))
+
+    def exists(self, path: str) -> bool:
+        return path in self
+
+    def is_dir(self, path: str) -> bool:
+        entry = self.get(path)
+        return entry is not None and entry.is_dir
+
+    def deepest_existing(self, path: str) -> Optional[str]:
+        """path 자신 또는 가장 가까운 상위 경로 중 스냅샷에 있는 것 (없으면 None)"""
+        path = canonical_path(path)
+        while path and path != "/":
+            if path in self.entries:
+                return path
+            path = _parent(path)
+        return None
+
+    def _index(self) -> Dict[str, List[str]]:
+        if self._children is None:
+            index: Dict[str, List[str]] = {}
+            for path in sorted(self.entries):
+                index.setdefault(_parent(path), []).append(path)
+            self._children = index
+        return self._children
+
+    def children(self, path: str, type: Optional[str] = None) -> List[Entry]:
+        """바로 아래 항목 (ls 와 같은 이름 순). type="d" 면 폴더만"""
+        entries = [self.entries[p] for p in self._index().get(canonical_path(path), [])]
+        if type:
+            entries = [e for e in entries if e.type == type]
+        return entries
+
+    def walk(self, root: Optional[str] = None) -> List[Entry]:
+        """root 자신과 그 아래 전체 (root=None 이면 스냅샷 전체)"""
+        if root is None:
+            return list(self)
+        root = canonical_path(root)
+        prefix = root.rstrip("/") + "/"
+        return [self.entries[p] for p in sorted(self.entries)
+                if p == root or p.startswith(prefix)]
+
+    def dirs(self, root: Optional[str] = None) -> List[str]:
+        return [e.path for e in self.walk(root) if e.is_dir]
+
+    def files(self, root: Optional[str] = None) -> List[str]:
+        return [e.path for e in self.walk(root) if not e.is_dir]
+
+    def summary(self) -> Dict[str, int]:
+        counts = {"entries": len(self.entries), "dirs": 0, "files": 0, "links": 0, "bytes": 0}
+        for e in self.entries.values():
+            if e.type == "d":
+                counts["dirs"] += 1
+            elif e.type == "l":
+                counts["links"] += 1
+            else:
+                counts["files"] += 1
+                counts["bytes"] += e.size
+        return counts
+
+    def to_csv(self, path) -> int:
+        """스냅샷 CSV 저장 (path,type,size,mtime,mode). 저장한 행 수 반환"""
+        rows = ([e.path, e.type, e.size, f"{e.mtime:.3f}", f"{e.mode:o}"] for e in self)
+        return write_rows(path, SNAPSHOT_FIELDS, rows, encoding="utf-8-sig")
+
+    @classmethod
+    def from_csv(cls, path, **kwargs) -> "PathSnapshot":
+        entries = []
+        for row in iter_rows(path):
+            entries.append(Entry(
+                row["path"], row["type"], int(row["size"] or 0),
+                float(row["mtime"] or 0), int(row["mode"] or "0", 8)
+            ))
+        return cls(entries, **kwargs)
+
+
+# -------------------------
+# 기기 명령 / 파싱
+# -------------------------
+def app_roots(package_name: str, user: int = 0) -> List[str]:
+    """앱 내부/외부 저장소 루트 (없는 루트는 기기에서 건너뜀)"""
+    return [
+        f"/data/user/{user}/{package_name}",
+        f"/data/user_de/{user}/{package_name}",
+        f"/storage/emulated/{user}/Android/data/{package_name}",
+        f"/storage/emulated/{user}/Android/media/{package_name}",
+        f"/storage/emulated/{user}/Android/obb/{package_name}",
+    ]
+
+
+def _printf_find(root: str) -> str:
+    q = shlex.quote(root)
+    return (
+        f"[ -e {q} ] && find {q}"
+        f" \\( -type d -printf 'd{_PRINTF_FIELDS}' \\)"
+        f" -o \\( -type l -printf 'l{_PRINTF_FIELDS}' \\)"
+        f" -o -printf 'f{_PRINTF_FIELDS}'"
+    )
+
+
+def _stat_find(root: str) -> str:
+    q = shlex.quote(root)
+    return f"[ -e {q} ] && find {q} -exec stat -c '%f %s %Y %n' {{}} +"
+
+
+def snapshot_command(roots: Sequence[str], method: str = "printf", compress: bool = False) -> str:
+    """루트 전체를 훑는 기기 명령 하나 (method: "printf" | "stat")"""
+    build = _printf_find if method == "printf" else _stat_find
+    command = "; ".join(build(r) for r in roots) + "; true"
+    if compress:
+        command = f"( {command} ) | gzip -c | base64"
+    return command
+
+
+def parse_printf_records(output: str) -> Iterator[Entry]:
+    for record in output.split("\0"):
+        record = record.lstrip("\r\n")
+        if not record:
+            continue
+        parts = record.split("\t", 4)
+        if len(parts) != 5:
+            continue
+        kind, size, mtime, mode, path = parts
+        try:
+            yield Entry(canonical_path(path), kind, int(size), float(mtime), int(mode, 8))
+        except ValueError:
+            continue
+
+
+def parse_stat_records(output: str) -> Iterator[Entry]:
+    for line in output.split("\n"):
+        parts = line.rstrip("\r").split(" ", 3)
+        if len(parts) != 4:
+            continue
+        raw_mode, size, mtime, path = parts
+        try:
+            mode = int(raw_mode, 16)
+            entry_size = int(size)
+            entry_mtime = float(mtime)
+        except ValueError:
+            continue
+        kind = "d" if stat.S_ISDIR(mode) else "l" if stat.S_ISLNK(mode) else "f"
+        yield Entry(canonical_path(path), kind, entry_size, entry_mtime, stat.S_IMODE(mode))
+
+
+def _decompress(output: str) -> str:
+    return gzip.decompress(base64.b64decode(output)).decode("utf-8", errors="ignore")
+
+
+def take_snapshot(package_name: Optional[str] = None, roots: Optional[Sequence[str]] = None,
+                  pool=None, compress: bool = False,
+                  timeout: float = SNAPSHOT_TIMEOUT) -> Optional[PathSnapshot]:
+    """
+    기기 명령 한 번으로 스냅샷 생성 (실패하면 None)
+    - roots 미지정 시 app_roots(package_name)
+    - pool 미지정 시 adb_session 공용 root 풀
+    """
+    roots = list(roots or app_roots(package_name))
+    pool = pool or get_pool(root=True)
+
+    for method, parse in (("printf", parse_printf_records), ("stat", parse_stat_records)):
+        out, err, rc = pool.run(snapshot_command(roots, method, compress), timeout=timeout)
+        if rc == -1 and err in ("Timeout", "Disconnected"):
+            return None
+        if compress and out.strip():
+            try:
+                out = _decompress(out)
+            except (OSError, ValueError, EOFError):
+                out = ""
+        entries = list(parse(out))
+        # 레코드 없이 오류만 남음 (printf / stat 미지원 등) → 다음 방식, 둘 다 실패하면 None
+        # 루트가 하나도 없으면 (앱 미설치) 오류 없이 빈 스냅샷
+        if entries or not err.strip():
+            return PathSnapshot(entries, roots=roots, package=package_name,
+                                serial=getattr(pool, "serial", None))
+    return None
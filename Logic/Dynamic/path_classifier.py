@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+수집 경로 파일/폴더 일괄 분류
+- 경로 목록 전체를 열어 둔 root 세션으로 한 번에 보내고 (heredoc), 기기에서 test -d / -e 루프 한 번으로 판정
+- 경로마다 adb shell su -c "ls -ld ..." 를 띄우던 classifyPathTypes (500ms 타임아웃, 최대 500개) 대체
+- 결과: 경로 -> "directory" | "file" | "missing" (기기에 없는 경로)
+- cache_path 를 주면 패키지/실행 단위로 결과를 JSON에 저장해 두고 다음 호출에서는 새 경로만 조회
+
+CLI (pipeline_runner.js 에서 호출):
+    python path_classifier.py --input paths.txt --out path_types.json \
+        [--package com.x] [-s SERIAL] [--cache path_types_cache.json]
+    --input: 한 줄에 경로 하나 (또는 --csv 파일 --column path)
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# 공용 모듈 패키지 (Logic/shared)
+_LOGIC_DIR = str(Path(__file__).resolve().parent.parent)
+if _LOGIC_DIR not in sys.path:
+    sys.path.insert(0, _LOGIC_DIR)
+
+from adb_session import get_pool
+from shared.path_list_io import read_path_list
+
+CACHE_VERSION = 1
+
+# 명령 하나로 보낼 경로 수 (너무 큰 heredoc 은 나눠서 전송)
+DEFAULT_CHUNK_SIZE = 20000
+
+CLASSIFY_TIMEOUT = 60
+
+_TYPE_CODES = {"d": "directory", "f": "file", "-": "missing"}
+
+
+def classify_command(paths: List[str]) -> str:
+    """
+    기기에서 실행할 분류 루프 (경로 목록은 heredoc 으로 함께 전송)
+    출력: 경로마다 "<d|f|-> <경로>" 한 줄
+    """
+    eof = f"__A3_PATHS_{uuid.uuid4().hex}__"
+    body = "\n".join(paths)
+    return (
+        "while IFS= read -r p; do "
+        "if [ -d \"$p\" ]; then t=d; elif [ -e \"$p\" ]; then t=f; else t=-; fi; "
+        "printf '%s %s\\n' \"$t\" \"$p\"; "
+        f"done <<'{eof}'\n{body}\n{eof}"
+    )
+
+
+def parse_classify_output(output: str) -> Iterator[Tuple[str, str]]:
+    for line in output.split("\n"):
+        line = line.rstrip("\r")
+        if len(line) < 3 or line[1] != " " or line[0] not in _TYPE_CODES:
+            continue
+        yield line[2:], _TYPE_CODES[line[0]]
+
+
+def iter_classify(paths: Iterable[str], pool=None, serial: Optional[str] = None,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE,
+                  timeout: float = CLASSIFY_TIMEOUT) -> Iterator[Dict[str, str]]:
+    """
+    chunk_size 개씩 기기에서 분류해 chunk 결과(dict)를 차례로 반환
+    - 세션 오류(타임아웃 등)로 판정 못 한 chunk는 빈 dict
+    """
+    pool = pool or get_pool(serial, root=True)
+    paths = [p for p in dict.fromkeys(paths) if p and "\n" not in p]
+    for start in range(0, len(paths), chunk_size):
+        chunk = paths[start:start + chunk_size]
+        out, err, rc = pool.run(classify_command(chunk), timeout=timeout)
+        if rc == -1 and err in ("Timeout", "Disconnected"):
+            yield {}
+            continue
+        wanted = set(chunk)
+        yield {p: t for p, t in parse_classify_output(out) if p in wanted}
+
+
+def _load_cache(cache_path, package, serial) -> Dict[str, str]:
+    if not cache_path or not os.path.exists(cache_path):
+        return {}
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if state.get("version") != CACHE_VERSION or state.get("package") != package \
+            or state.get("serial") != serial:
+        return {}
+    return dict(state.get("types", {}))
+
+
+def _save_cache(cache_path, package, serial, types: Dict[str, str]):
+    state = {
+        "version": CACHE_VERSION,
+        "package": package,
+        "serial": serial,
+        "updated": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "types": types,
+    }
+    tmp = f"{cache_path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp, cache_path)
+
+
+def classify_paths(paths: Iterable[str], package: Optional[str] = None,
+                   serial: Optional[str] = None, pool=None, cache_path=None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE,
+                   timeout: float = CLASSIFY_TIMEOUT, stats: Optional[dict] = None) -> Dict[str, str]:
+    """
+    경로 -> "directory" | "file" | "missing"
+    - 캐시에 있는 경로는 기기에 묻지 않음, 새로 판정한 결과는 캐시에 추가 저장
+    - 기기 오류로 판정 못 한 경로는 결과에서 빠짐 (호출 쪽에서 휴리스틱 처리)
+    """
+    paths = list(dict.fromkeys(p for p in paths if p))
+    cache = _load_cache(cache_path, package, serial)
+    todo = [p for p in paths if p not in cache]
+
+    started = time.time()
+    resolved = 0
+    for chunk_types in iter_classify(todo, pool=pool, serial=serial,
+                                     chunk_size=chunk_size, timeout=timeout):
+        cache.update(chunk_types)
+        resolved += len(chunk_types)
+
+    if cache_path and resolved:
+        _save_cache(cache_path, package, serial, cache)
+
+    result = {p: cache[p] for p in paths if p in cache}
+    if stats is not None:
+        stats.update({
+            "paths": len(paths),
+            "cached": len(paths) - len(todo),
+            "queried": len(todo),
+            "unresolved": len(paths) - len(result),
+            "seconds": round(time.time() - started, 3),
+        })
+        for kind in _TYPE_CODES.values():
+            stats[kind] = sum(1 for t in result.values() if t == kind)
+    return result
+
+
+def _read_input(args) -> List[str]:
+    if args.csv:
+        return read_path_list(args.csv, args.column)
+    with open(args.input, "r", encoding="utf-8", errors="replace") as f:
+        return [line.rstrip("\r\n") for line in f if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="수집 경로 파일/폴더 일괄 분류 (ADB)")
+    src = parser.add_mutually_exclusive_group(required=True)
+    src.add_argument("--input", help="경로 목록 텍스트 (한 줄에 하나)")
+    src.add_argument("--csv", help="경로 CSV")
+    parser.add_argument("--column", default="path", help="--csv 경로 컬럼 (기본: path)")
+    parser.add_argument("--out", required=True, help="결과 JSON ({경로: 타입})")
+    parser.add_argument("--package", help="패키지 이름 (캐시 키)")
+    parser.add_argument("-s", "--serial", help="대상 기기 (adb -s)")
+    parser.add_argument("--cache", help="분류 결과 캐시 JSON (패키지/실행 단위)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--timeout", type=float, default=CLASSIFY_TIMEOUT, help="chunk 당 타임아웃 (초)")
+    args = parser.parse_args()
+
+    paths = _read_input(args)
+    stats = {}
+    types = classify_paths(paths, package=args.package, serial=args.serial,
+                           cache_path=args.cache, chunk_size=args.chunk_size,
+                           timeout=args.timeout, stats=stats)
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(types, f, ensure_ascii=False)
+
+    print(f"[SUMMARY] paths={stats['paths']} cached={stats['cached']} queried={stats['queried']} "
+          f"directory={stats['directory']} file={stats['file']} missing={stats['missing']} "
+          f"unresolved={stats['unresolved']} seconds={stats['seconds']}")
+    return 0 if stats["unresolved"] < stats["paths"] or not paths else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -248,20 +248,21 @@ function runAdbExtraction(packageName, outputPath) {
   return new Promise((resolve, reject) => {
     log('INFO', 'Running ADB extraction (basic) for ground truth...');
 
+    // 패키지명 / 출력 경로를 인자로 전달 (stdin 입력, 타임스탬프 파일 검색 없음)
+    const outputFile = path.resolve(outputPath);
     const proc = spawn('python', [
-      'adb_extraction.py'
+      'adb_extraction.py',
+      packageName,
+      '--mode', 'basic',
+      '--output', outputFile
     ], {
       cwd: __dirname,
-      stdio: ['pipe', 'pipe', 'pipe']
+      stdio: ['ignore', 'pipe', 'pipe']
     });
 
     let stdout = '';
     let stderr = '';
 
-    // 패키지명 입력
-    proc.stdin.write(packageName + '\n');
-    proc.stdin.end();
-
     proc.stdout.on('data', (data) => {
       const text = data.toString();
       stdout += text;
@@ -273,23 +274,11 @@ function runAdbExtraction(packageName, outputPath) {
     });
 
     proc.on('exit', (code) => {
-      if (code === 0) {
-        // 생성된 CSV 파일 찾기
-        const files = fs.readdirSync(__dirname)
-          .filter(f => f.startsWith(`paths_${packageName}_dirs_`) && f.endsWith('.csv') && !f.includes('recursive'))
-          .sort()
-          .reverse();
-
-        if (files.length > 0) {
-          const generatedFile = path.join(__dirname, files[0]);
-
-          // 목표 경로로 복사
-          fs.copyFileSync(generatedFile, outputPath);
-          log('SUCCESS', `ADB extraction (basic) completed: ${outputPath}`);
-          resolve(outputPath);
-        } else {
-          reject(new Error('ADB extraction output file not found'));
-        }
+      if (code === 0 && fs.existsSync(outputFile)) {
+        log('SUCCESS', `ADB extraction (basic) completed: ${outputPath}`);
+        resolve(outputPath);
+      } else if (code === 0) {
+        reject(new Error('ADB extraction output file not found'));
       } else {
         log('ERROR', `ADB extraction failed with code ${code}`);
         if (stderr) console.error(stderr);
@@ -310,20 +299,20 @@ function runFullAdbExtraction(packageName, outputPath) {
   return new Promise((resolve, reject) => {
     log('INFO', 'Running full ADB extraction (comprehensive) for ground truth...');
 
+    // 패키지명 / 출력 경로를 인자로 전달 (stdin 입력, 타임스탬프 파일 검색 없음)
+    const outputFile = path.resolve(outputPath);
     const proc = spawn('python', [
-      'full_adb_extraction.py'
+      'full_adb_extraction.py',
+      packageName,
+      '--output', outputFile
     ], {
       cwd: __dirname,
-      stdio: ['pipe', 'pipe', 'pipe']
+      stdio: ['ignore', 'pipe', 'pipe']
     });
 
     let stdout = '';
     let stderr = '';
 
-    // 패키지명 입력
-    proc.stdin.write(packageName + '\n');
-    proc.stdin.end();
-
     proc.stdout.on('data', (data) => {
       const text = data.toString();
       stdout += text;
@@ -335,23 +324,11 @@ function runFullAdbExtraction(packageName, outputPath) {
     });
 
     proc.on('exit', (code) => {
-      if (code === 0) {
-        // 생성된 recursive CSV 파일 찾기
-        const files = fs.readdirSync(__dirname)
-          .filter(f => f.startsWith(`paths_${packageName}_dirs_recursive_`) && f.endsWith('.csv'))
-          .sort()
-          .reverse();
-
-        if (files.length > 0) {
-          const generatedFile = path.join(__dirname, files[0]);
-
-          // 목표 경로로 복사
-          fs.copyFileSync(generatedFile, outputPath);
-          log('SUCCESS', `Full ADB extraction (comprehensive) completed: ${outputPath}`);
-          resolve(outputPath);
-        } else {
-          reject(new Error('Full ADB extraction output file not found'));
-        }
+      if (code === 0 && fs.existsSync(outputFile)) {
+        log('SUCCESS', `Full ADB extraction (comprehensive) completed: ${outputPath}`);
+        resolve(outputPath);
+      } else if (code === 0) {
+        reject(new Error('Full ADB extraction output file not found'));
       } else {
         log('ERROR', `Full ADB extraction failed with code ${code}`);
         if (stderr) console.error(stderr);
@@ -477,11 +454,67 @@ function runTokenization(inputCsvPath, outputCsvPath) {
 }
 
 /**
- * 파일/폴더 타입 분류 (최적화: 배치 처리 + 휴리스틱)
+ * path_classifier.py 실행 (경로 전체를 기기에서 한 번에 분류)
+ * 반환: { 경로: 'directory' | 'file' | 'missing' } (실패 시 빈 객체)
  */
-async function classifyPathTypes(paths, packageName) {
-  const { execSync } = require('child_process');
+function runPathClassifier(pathArray, packageName) {
+  return new Promise((resolve) => {
+    fse.ensureDirSync(pipelineDir);
+    const listPath = path.join(pipelineDir, 'classify_paths.txt');
+    const outPath = path.join(pipelineDir, 'path_types.json');
+    const cachePath = path.join(pipelineDir, 'path_types_cache.json');
+    fs.writeFileSync(listPath, pathArray.join('\n'), 'utf-8');
+
+    const proc = spawn('python', [
+      'path_classifier.py',
+      '--input', listPath,
+      '--out', outPath,
+      '--package', packageName,
+      '--cache', cachePath
+    ], {
+      cwd: __dirname,
+      stdio: ['ignore', 'pipe', 'pipe']
+    });
 
+    let stderr = '';
+
+    proc.stdout.on('data', (data) => {
+      process.stdout.write(data.toString());
+    });
+
+    proc.stderr.on('data', (data) => {
+      stderr += data.toString();
+    });
+
+    proc.on('exit', (code) => {
+      fse.removeSync(listPath);
+      if (code === 0 && fs.existsSync(outPath)) {
+        try {
+          resolve(JSON.parse(fs.readFileSync(outPath, 'utf-8')));
+          return;
+        } catch (e) {
+          log('WARN', `Path classifier output unreadable: ${e.message}`);
+        }
+      } else {
+        log('WARN', `Path classifier failed with code ${code}`);
+        if (stderr) console.error(stderr);
+      }
+      resolve({});
+    });
+
+    proc.on('error', (err) => {
+      log('WARN', `Failed to run path classifier: ${err.message}`);
+      resolve({});
+    });
+  });
+}
+
+/**
+ * 파일/폴더 타입 분류
+ * - 기기에서 일괄 판정 (path_classifier.py, 경로 수와 관계없이 명령 한 번)
+ * - 기기에 없는 경로 / 판정 실패 경로만 확장자 휴리스틱 (없으면 디렉토리로 추정)
+ */
+async function classifyPathTypes(paths, packageName) {
   log('INFO', 'Classifying paths as files or directories...');
 
   const pathArray = Array.from(paths);
@@ -497,80 +530,34 @@ async function classifyPathTypes(paths, packageName) {
     'bkp', 'bakxz', 'pma', 'exo', 'store', 'prof', 'cnt', 'pb'
   ]);
 
-  // 1단계: 휴리스틱으로 빠르게 분류
-  log('INFO', `  Classifying ${pathArray.length} paths using heuristics...`);
-  const uncertainPaths = [];
-
-  for (const p of pathArray) {
-    const basename = p.split('/').pop();
-    const parts = basename.split('.');
-
+  const guessType = (p) => {
+    const parts = p.split('/').pop().split('.');
     if (parts.length > 1 && parts[parts.length - 1]) {
-      const ext = parts[parts.length - 1].toLowerCase();
-      if (fileExtensions.has(ext)) {
-        pathTypeMap.set(p, 'file');
-        continue;
-      }
-    }
-
-    // 확실하지 않은 경로는 나중에 검증
-    uncertainPaths.push(p);
-  }
-
-  log('INFO', `  Heuristics classified ${pathTypeMap.size} files, ${uncertainPaths.length} uncertain paths`);
-
-  // 2단계: 배치로 불확실한 경로만 검증 (타임아웃 500ms로 단축)
-  if (uncertainPaths.length > 0) {
-    const directories = new Set();
-    const files = new Set();
-
-    // 배치 크기를 100개로 제한하여 처리
-    const batchSize = 100;
-    const maxPathsToCheck = Math.min(uncertainPaths.length, 500); // 최대 500개만 검증
-
-    log('INFO', `  Verifying up to ${maxPathsToCheck} uncertain paths in batches...`);
-
-    for (let i = 0; i < maxPathsToCheck; i += batchSize) {
-      const batch = uncertainPaths.slice(i, Math.min(i + batchSize, maxPathsToCheck));
-
-      for (const p of batch) {
-        try {
-          const lsCmd = `adb shell su -c "ls -ld '${p}' 2>/dev/null"`;
-          const lsResult = execSync(lsCmd, { encoding: 'utf-8', timeout: 500 });
-
-          if (lsResult.trim()) {
-            const firstChar = lsResult.trim()[0];
-            if (firstChar === 'd') {
-              directories.add(p);
-            } else if (firstChar === '-') {
-              files.add(p);
-            }
-          }
-        } catch (e) {
-          // 타임아웃이나 실패 시 무시 (휴리스틱으로 처리)
-        }
-      }
-
-      if (i + batchSize < maxPathsToCheck) {
-        log('INFO', `  Progress: ${Math.min(i + batchSize, maxPathsToCheck)}/${maxPathsToCheck} verified`);
+      if (fileExtensions.has(parts[parts.length - 1].toLowerCase())) {
+        return 'file';
       }
     }
+    // 판정 불가 경로는 디렉토리로 추정 (보수적 접근)
+    return 'directory';
+  };
 
-    log('INFO', `  Verified ${directories.size} directories and ${files.size} files`);
+  // 1단계: 기기에서 일괄 판정
+  log('INFO', `  Verifying ${pathArray.length} paths on device (batched)...`);
+  const deviceTypes = pathArray.length > 0 ? await runPathClassifier(pathArray, packageName) : {};
 
-    // 검증 결과 반영
-    for (const p of uncertainPaths) {
-      if (directories.has(p)) {
-        pathTypeMap.set(p, 'directory');
-      } else if (files.has(p)) {
-        pathTypeMap.set(p, 'file');
-      } else {
-        // 검증 실패한 경로는 디렉토리로 추정 (보수적 접근)
-        pathTypeMap.set(p, 'directory');
-      }
+  // 2단계: 판정 결과 반영, 기기에 없는 경로는 휴리스틱
+  let verified = 0;
+  for (const p of pathArray) {
+    const type = deviceTypes[p];
+    if (type === 'directory' || type === 'file') {
+      pathTypeMap.set(p, type);
+      verified++;
+    } else {
+      pathTypeMap.set(p, guessType(p));
     }
   }
 
+  log('INFO', `  Verified ${verified} paths on device, ${pathArray.length - verified} classified by heuristics`);
   log('SUCCESS', `Path classification complete: ${pathTypeMap.size} paths classified`);
   return pathTypeMap;
 }
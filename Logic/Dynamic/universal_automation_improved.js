@@ -69,6 +69,10 @@ const CONFIG = {
   MIN_ELEMENTS_FOR_CV: 12,      // CV를 더 빨리 사용
   UI_DUMP_TIMEOUT: 4000,
   CV_TIMEOUT: 3000,
+  CV_WORKER_START_TIMEOUT: 30000, // cv_analyzer_lite.py --server 시작 (OpenCV import) 대기
+  CV_WORKER_MAX_FAILURES: 3,      // 연속 실패 시 상주 워커 포기 → 매번 실행 방식
+  CV_CACHE_SIZE: 64,              // 화면 변화 감지 캐시 (워커 안, 0이면 끔)
+  CV_CACHE_THRESHOLD: 6,          // dHash 해밍 거리 이하면 같은 화면으로 보고 이전 CV 결과 재사용
   PARALLEL_SCREENSHOT: true,
   FORCE_NAV_AFTER_ACTIONS: 25,  // 15 → 25 (탭 전환 빈도 줄임)
   FORCE_BACK_AFTER_DEPTH: 8,    // 5 → 8 (더 깊이 탐색!)
@@ -104,6 +108,10 @@ let logFileStream = null;
 let debugLogStream = null;
 let xmlDumpSeq = 0;
 
+// 스크린샷 임시 파일 이름 (exec-out / CV 워커 실패 시 fallback 용)
+// batch_pipeline 병렬 실행 시 서로 덮어쓰지 않도록 기기(ANDROID_SERIAL) + pid 별 이름
+const TEMP_SCREEN_FILE = `temp_screen_${(process.env.ANDROID_SERIAL || 'default').replace(/[^\w.-]/g, '_')}_${process.pid}.png`;
+
 // 로그 함수
 function log(level, msg, data = null) {
   const ts = new Date().toISOString();
@@ -145,6 +153,31 @@ async function adb(args, timeout = 10000) {
   });
 }
 
+// 바이너리 출력 ADB 명령 (exec-out screencap 등) -> Buffer
+async function adbBinary(args, timeout = 10000) {
+  return new Promise((resolve, reject) => {
+    const p = spawn('adb', args, { stdio: ['ignore', 'pipe', 'pipe'] });
+    const chunks = [];
+    let err = '';
+    
+    const timer = setTimeout(() => {
+      p.kill();
+      reject(new Error(`ADB timeout: ${args.join(' ')}`));
+    }, timeout);
+    
+    p.stdout.on('data', d => chunks.push(d));
+    p.stderr.on('data', d => err += d.toString());
+    p.on('close', code => {
+      clearTimeout(timer);
+      if (code !== 0) {
+        reject(new Error(`ADB failed: ${err}`));
+      } else {
+        resolve(Buffer.concat(chunks));
+      }
+    });
+  });
+}
+
 async function sleep(ms) {
   return new Promise(r => setTimeout(r, ms));
 }
@@ -463,11 +496,201 @@ class RobustXMLParser {
   }
 }
 
+// ========== CV 분석 워커 ==========
+/**
+ * cv_analyzer_lite.py --server 상주 프로세스
+ * - OpenCV import / 설치 확인은 시작할 때 한 번만, 이후 화면마다 PNG 바이트를 stdin으로 보내고 JSON 한 줄을 받음
+ * - 타임아웃 / 비정상 종료 시 다음 요청에서 다시 띄움, 연속 실패가 많으면 disabled (호출 쪽에서 execSync 폴백)
+ * - 워커가 거의 같은 화면(dHash)은 이전 결과를 바로 돌려줌 (CV_CACHE_SIZE / CV_CACHE_THRESHOLD)
+ */
+class CVAnalyzerWorker {
+  constructor(scriptPath) {
+    this.scriptPath = scriptPath;
+    this.proc = null;
+    this.starting = null;
+    this.pending = new Map();
+    this.nextId = 1;
+    this.failures = 0;
+    this.disabled = false;
+    this.stats = { requests: 0, errors: 0, starts: 0, totalMs: 0, cacheHits: 0 };
+  }
+
+  start() {
+    if (this.proc) return Promise.resolve();
+    if (!this.starting) {
+      this.starting = this._spawn('python3')
+        .catch(() => this._spawn('python'))
+        .finally(() => { this.starting = null; });
+    }
+    return this.starting;
+  }
+
+  _spawn(cmd) {
+    return new Promise((resolve, reject) => {
+      const args = [
+        this.scriptPath, '--server',
+        '--cache-size', String(CONFIG.CV_CACHE_SIZE),
+        '--cache-threshold', String(CONFIG.CV_CACHE_THRESHOLD)
+      ];
+      const proc = spawn(cmd, args, { stdio: ['pipe', 'pipe', 'pipe'] });
+      let ready = false;
+      let buffer = '';
+
+      const timer = setTimeout(() => {
+        if (!ready) {
+          proc.kill();
+          reject(new Error('CV worker start timeout'));
+        }
+      }, CONFIG.CV_WORKER_START_TIMEOUT);
+
+      proc.on('error', e => {
+        clearTimeout(timer);
+        if (!ready) reject(e);
+      });
+      proc.on('exit', code => {
+        clearTimeout(timer);
+        if (!ready) reject(new Error(`CV worker exited (${code})`));
+        this._onExit(proc, code);
+      });
+      proc.stdin.on('error', () => {});  // 워커 종료 후 write (EPIPE) 무시
+      proc.stderr.on('data', d => log('DEBUG', `[cv-worker] ${d.toString().trim()}`));
+
+      proc.stdout.setEncoding('utf8');
+      proc.stdout.on('data', chunk => {
+        buffer += chunk;
+        let idx;
+        while ((idx = buffer.indexOf('\n')) >= 0) {
+          const line = buffer.slice(0, idx).trim();
+          buffer = buffer.slice(idx + 1);
+          if (!line) continue;
+
+          let msg;
+          try {
+            msg = JSON.parse(line);
+          } catch(e) {
+            log('DEBUG', `[cv-worker] non-JSON output: ${line.slice(0, 200)}`);
+            continue;
+          }
+
+          if (!ready) {
+            if (msg.ready) {
+              ready = true;
+              clearTimeout(timer);
+              this.proc = proc;
+              this.stats.starts++;
+              log('INFO', `CV worker started (${cmd}, pid ${msg.pid}, OpenCV ${msg.opencv})`);
+              resolve();
+            } else {
+              proc.kill();
+              reject(new Error(msg.error || 'CV worker failed to start'));
+            }
+            continue;
+          }
+          this._onMessage(msg);
+        }
+      });
+    });
+  }
+
+  _onMessage(msg) {
+    const entry = this.pending.get(msg.id);
+    if (!entry) return;
+    this.pending.delete(msg.id);
+    clearTimeout(entry.timer);
+    if (msg.error) {
+      entry.reject(new Error(msg.error));
+    } else {
+      this.stats.totalMs += msg.ms || 0;
+      if (msg.cached) this.stats.cacheHits++;
+      entry.resolve(msg.result);
+    }
+  }
+
+  _onExit(proc, code) {
+    if (this.proc !== proc) return;
+    this.proc = null;
+    this._rejectAll(new Error(`CV worker exited (${code})`));
+  }
+
+  _rejectAll(error) {
+    for (const entry of this.pending.values()) {
+      clearTimeout(entry.timer);
+      entry.reject(error);
+    }
+    this.pending.clear();
+  }
+
+  _fail(error) {
+    this.stats.errors++;
+    this.failures++;
+    if (this.failures >= CONFIG.CV_WORKER_MAX_FAILURES && !this.disabled) {
+      this.disabled = true;
+      this.stop();
+      log('WARN', `CV worker disabled after ${this.failures} failures: ${error.message}`);
+    }
+    throw error;
+  }
+
+  /**
+   * 이미지 분석 (png: PNG Buffer 또는 파일 경로) -> cv_analyzer_lite 결과 ({ elements, total, dimensions })
+   */
+  async analyze(png, timeout = CONFIG.CV_TIMEOUT) {
+    if (this.disabled) throw new Error('CV worker disabled');
+
+    try {
+      await this.start();
+    } catch(e) {
+      this._fail(e);
+    }
+
+    const proc = this.proc;
+    const id = this.nextId++;
+    this.stats.requests++;
+
+    try {
+      const result = await new Promise((resolve, reject) => {
+        const timer = setTimeout(() => {
+          this.pending.delete(id);
+          // 응답이 밀린 워커는 버리고 다음 요청에서 새로 시작
+          this.stop();
+          reject(new Error('CV worker timeout'));
+        }, timeout);
+        this.pending.set(id, { resolve, reject, timer });
+
+        if (Buffer.isBuffer(png)) {
+          proc.stdin.write(JSON.stringify({ id, size: png.length }) + '\n');
+          proc.stdin.write(png);
+        } else {
+          proc.stdin.write(JSON.stringify({ id, path: png }) + '\n');
+        }
+      });
+      this.failures = 0;
+      return result;
+    } catch(e) {
+      return this._fail(e);
+    }
+  }
+
+  stop() {
+    const proc = this.proc;
+    this.proc = null;
+    this._rejectAll(new Error('CV worker stopped'));
+    if (!proc) return;
+
+    try {
+      proc.stdin.write(JSON.stringify({ cmd: 'shutdown' }) + '\n');
+      proc.stdin.end();
+    } catch(e) {}
+    setTimeout(() => { try { proc.kill(); } catch(e) {} }, 1000).unref();
+  }
+}
+
 // ========== 다층 UI 감지기 ==========
 class MultiLayerUIDetector {
   constructor(pkg, outDir) {
     this.pkg = pkg;
     this.outDir = outDir;
+    this.cvWorker = new CVAnalyzerWorker(path.join(__dirname, 'cv_analyzer_lite.py'));
     this.xmlParser = new RobustXMLParser();
     this.screenSize = { width: 1080, height: 1920 };
     this.elementCache = null;
@@ -635,9 +858,25 @@ class MultiLayerUIDetector {
     const elements = [];
     
     try {
-      // 스크린샷 촬영
-      await adb(['shell', 'screencap', '-p', '/sdcard/temp_screen.png']);
-      await adb(['pull', '/sdcard/temp_screen.png', 'temp_screen.png']);
+      // 스크린샷 촬영 (exec-out: 기기/PC 임시 파일 없이 PNG 바이트를 바로 받음)
+      let png = null;
+      try {
+        png = await adbBinary(['exec-out', 'screencap', '-p']);
+        if (png.length < 8 || png.readUInt32BE(0) !== 0x89504e47) png = null;
+      } catch(e) {
+        log('DEBUG', `exec-out screencap failed: ${e.message}`);
+      }
+      if (!png) {
+        const deviceFile = `/sdcard/${TEMP_SCREEN_FILE}`;
+        try {
+          await adb(['shell', 'screencap', '-p', deviceFile]);
+          await adb(['pull', deviceFile, TEMP_SCREEN_FILE]);
+        } finally {
+          // 실행마다 이름이 달라지므로 분석 대상 기기에 남기지 않음 (실패해도 삭제)
+          await adb(['shell', 'rm', '-f', deviceFile]).catch(() => {});
+        }
+        png = fs.readFileSync(TEMP_SCREEN_FILE);
+      }
       
             // 스크린샷 로컬 저장 (디버깅용)
       if (this.outDir) {
@@ -649,31 +888,38 @@ class MultiLayerUIDetector {
           const filename = `screen_${ts}.png`;
           const targetPath = path.join(screenshotDir, filename);
 
-          fs.copyFileSync('temp_screen.png', targetPath);
+          fs.writeFileSync(targetPath, png);
         } catch (e) {
           // 스크린샷 저장 실패는 자동화 자체에 영향 없으니 무시
         }
       }
 
-      // Python CV 분석 실행
-      let cvResult;
+      // Python CV 분석 실행 (상주 워커, 실패 시 한 번 실행 방식)
+      let parsed;
       try {
-        cvResult = execSync('python3 cv_analyzer_lite.py temp_screen.png', {
-          encoding: 'utf8',
-          timeout: 5000,
-          stdio: ['pipe', 'pipe', 'pipe']
-        });
+        parsed = await this.cvWorker.analyze(png);
       } catch(e) {
-        // python3 실패 시 python 시도
-        cvResult = execSync('python cv_analyzer_lite.py temp_screen.png', {
-          encoding: 'utf8',
-          timeout: 5000,
-          stdio: ['pipe', 'pipe', 'pipe']
-        });
+        log('DEBUG', `CV worker failed (${e.message}), running cv_analyzer_lite.py once`);
+        fs.writeFileSync(TEMP_SCREEN_FILE, png);
+
+        let cvResult;
+        try {
+          cvResult = execSync(`python3 cv_analyzer_lite.py ${TEMP_SCREEN_FILE}`, {
+            encoding: 'utf8',
+            timeout: 5000,
+            stdio: ['pipe', 'pipe', 'pipe']
+          });
+        } catch(e) {
+          // python3 실패 시 python 시도
+          cvResult = execSync(`python cv_analyzer_lite.py ${TEMP_SCREEN_FILE}`, {
+            encoding: 'utf8',
+            timeout: 5000,
+            stdio: ['pipe', 'pipe', 'pipe']
+          });
+        }
+        parsed = JSON.parse(cvResult);
       }
       
-      const parsed = JSON.parse(cvResult);
-      
       for (const cvElem of (parsed.elements || [])) {
         elements.push({
           class: 'cv_detected',
@@ -1948,7 +2194,11 @@ class ImprovedFridaManager {
     log('INFO', 'Initializing Frida...');
     
     try {
-      this.device = await frida.getUsbDevice({ timeout: 5000 });
+      // batch_pipeline 병렬 실행 시 ANDROID_SERIAL 로 대상 기기 지정 (adb 호출과 같은 기기)
+      const serial = process.env.ANDROID_SERIAL;
+      this.device = serial
+        ? await frida.getDevice(serial, { timeout: 5000 })
+        : await frida.getUsbDevice({ timeout: 5000 });
       log('INFO', `Connected to device: ${this.device.name}`);
       
       if (argv.spawn) {
@@ -3039,12 +3289,21 @@ class UniversalAutomation {
     // Frida 정리
     await this.frida.cleanup();
     
+    // CV 워커 종료
+    this.detector.cvWorker.stop();
+    if (this.detector.cvWorker.stats.requests > 0) {
+      const st = this.detector.cvWorker.stats;
+      log('INFO', `CV worker: ${st.requests} requests (${st.cacheHits} same-screen cache hits), `
+        + `${st.errors} errors, ${st.starts} starts, `
+        + `avg ${(st.totalMs / Math.max(1, st.requests - st.errors)).toFixed(1)}ms`);
+    }
+    
     // 로그 스트림 정리
     if (logFileStream) logFileStream.end();
     if (debugLogStream) debugLogStream.end();
     
     // 임시 파일 삭제
-    try { fs.unlinkSync('temp_screen.png'); } catch(e) {}
+    try { fs.unlinkSync(TEMP_SCREEN_FILE); } catch(e) {}
   }
 }
 
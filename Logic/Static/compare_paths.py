@@ -9,15 +9,23 @@ ADB 경로 vs 우리 코드 경로 비교 스크립트 (포함 관계 비교)
 """
 
 import argparse
-import pandas as pd
 import re
 import sys
+from pathlib import Path
 
-def detect_path_column(df: pd.DataFrame) -> str:
-    for c in df.columns:
-        if "path" in str(c).lower():
-            return c
-    return df.columns[0]
+# 공용 모듈 패키지 (Logic/shared)
+_LOGIC_DIR = str(Path(__file__).resolve().parent.parent)
+if _LOGIC_DIR not in sys.path:
+    sys.path.insert(0, _LOGIC_DIR)
+
+from shared.path_list_io import detect_path_column, read_header, iter_path_column, write_rows
+
+def load_normalized_paths(csv_path: str, case_sensitive: bool) -> list:
+    """경로 컬럼('path'가 들어간 첫 컬럼, 없으면 첫 컬럼)을 정규화 후 순서 유지 중복 제거"""
+    col = detect_path_column(read_header(csv_path))
+    return list(dict.fromkeys(
+        normalize_path(p, case_sensitive) for p in iter_path_column(csv_path, col)
+    ))
 
 def normalize_path(p: str, case_sensitive: bool) -> str:
     if not isinstance(p, str):
@@ -38,28 +46,12 @@ def main():
     args = ap.parse_args()
 
     try:
-        adb_df = pd.read_csv(args.adb)
-        code_df = pd.read_csv(args.code)
+        adb_paths = load_normalized_paths(args.adb, args.case_sensitive)
+        code_paths = load_normalized_paths(args.code, args.case_sensitive)
     except Exception as e:
         print(f"[!] CSV 로드 실패: {e}", file=sys.stderr)
         sys.exit(1)
 
-    adb_col = detect_path_column(adb_df)
-    code_col = detect_path_column(code_df)
-
-    adb_paths = (
-        adb_df[adb_col].dropna().astype(str)
-        .map(lambda x: normalize_path(x, args.case_sensitive))
-        .drop_duplicates()
-        .tolist()
-    )
-    code_paths = (
-        code_df[code_col].dropna().astype(str)
-        .map(lambda x: normalize_path(x, args.case_sensitive))
-        .drop_duplicates()
-        .tolist()
-    )
-
     matched_rows = []
     matched_count = 0
 
@@ -91,8 +83,7 @@ def main():
     total = len(adb_paths)
     percent = round((matched_count / total) * 100, 2) if total else 0.0
 
-    out_df = pd.DataFrame(matched_rows)
-    out_df.to_csv(args.out, index=False, encoding="utf-8-sig")
+    write_rows(args.out, ["ADB_Path", "Match_Status", "Matched_Code_Path"], matched_rows, encoding="utf-8-sig")
 
     print(f"[결과] {total}개 중 {matched_count}개 일치 ({percent}%)")
     print(f"[저장됨] {args.out}")
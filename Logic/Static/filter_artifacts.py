@@ -4,12 +4,20 @@
 import argparse
 import re
 import sys
+from pathlib import Path
 from typing import Optional, List
 import pandas as pd
 
 # path_utils 디렉토리 추출 로직 import
 from path_utils import extract_directory_from_path
 
+# 공용 모듈 패키지 (Logic/shared)
+_LOGIC_DIR = str(Path(__file__).resolve().parent.parent)
+if _LOGIC_DIR not in sys.path:
+    sys.path.insert(0, _LOGIC_DIR)
+
+from shared.stage_io import read_stage_table
+
 def normalize_artifact_path(s: str) -> str:
     """앞 라벨(File:, Database:, SharedPreferences:) 제거하고 앞뒤 공백만 정리"""
     if not isinstance(s, str):
@@ -326,15 +334,12 @@ def main():
         description="artifact_path 라벨 제거 → 패키지 추출 → 기준 경로 포함 시 채택 → "
                     "총 공백 수≥3 시 제외 → 작은따옴표 제거 → 중복 제거 → CSV 저장"
     )
-    ap.add_argument("-i", "--input", required=True, help="입력 CSV (권장: package, artifact_path 포함)")
+    ap.add_argument("-i", "--input", required=True, help="입력 CSV/Parquet (권장: package, artifact_path 포함)")
     ap.add_argument("-o", "--output", required=True, help="출력 CSV (artifact_path 단일 컬럼)")
     args = ap.parse_args()
 
-    # CSV 로드
-    try:
-        df = pd.read_csv(args.input, encoding="utf-8")
-    except UnicodeDecodeError:
-        df = pd.read_csv(args.input, encoding="cp949")
+    # CSV / Parquet 로드 (CSV는 utf-8 → cp949 fallback)
+    df = read_stage_table(args.input)
 
     # 컬럼 추론
     cols = {c.lower(): c for c in df.columns}
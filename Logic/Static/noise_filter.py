@@ -6,14 +6,23 @@ sink 기준 노이즈 필터링 스크립트
 - filter.txt의 정규식 패턴을 읽어서 sink 컬럼이 매칭되는 행 제거
 - 필터링된 결과를 원본 파일에 덮어쓰기
 - 제거된 행은 별도 CSV로 저장
+- 입출력 경로가 .parquet 이면 Parquet 중간 파일 사용 (shared.stage_io)
 """
 
 import argparse
 import pandas as pd
 import re
 import sys
+from pathlib import Path
 from typing import List, Tuple
 
+# 공용 모듈 패키지 (Logic/shared)
+_LOGIC_DIR = str(Path(__file__).resolve().parent.parent)
+if _LOGIC_DIR not in sys.path:
+    sys.path.insert(0, _LOGIC_DIR)
+
+from shared.stage_io import read_stage_table, write_stage_table
+
 def load_filter_patterns(filter_file: str) -> List[str]:
     """Filter.txt 파일에서 유효한 정규식 패턴 목록 반환"""
     try:
@@ -89,9 +98,9 @@ def main():
         description="sink 기반 노이즈 필터링 - filter.txt의 패턴에 매칭되는 행 제거"
     )
     parser.add_argument("-i", "--input", required=True,
-                       help="입력 CSV 파일 (sink 컬럼 포함)")
+                       help="입력 CSV/Parquet 파일 (sink 컬럼 포함)")
     parser.add_argument("-o", "--output", required=True,
-                       help="출력 CSV 파일 (필터링된 결과로 덮어쓰기)")
+                       help="출력 CSV/Parquet 파일 (필터링된 결과로 덮어쓰기)")
     parser.add_argument("-f", "--filter", default="filter.txt",
                        help="필터 패턴 파일 경로 (기본: filter.txt)")
     parser.add_argument("--removed", default=None,
@@ -118,17 +127,11 @@ def main():
         print(f"  ... 외 {len(patterns) - 10}개")
     print()
 
-    # CSV 로드
+    # CSV / Parquet 로드 (CSV는 utf-8 → cp949 fallback)
     try:
-        df = pd.read_csv(args.input, encoding='utf-8')
-    except UnicodeDecodeError:
-        try:
-            df = pd.read_csv(args.input, encoding='cp949')
-        except Exception as e:
-            print(f"[!] 에러: CSV 파일 로드 실패: {e}", file=sys.stderr)
-            sys.exit(1)
+        df = read_stage_table(args.input)
     except Exception as e:
-        print(f"[!] 에러: CSV 파일 로드 실패: {e}", file=sys.stderr)
+        print(f"[!] 에러: 입력 파일 로드 실패: {e}", file=sys.stderr)
         sys.exit(1)
 
     total = len(df)
@@ -149,7 +152,7 @@ def main():
 
     # 결과 저장
     try:
-        kept_df.to_csv(args.output, index=False, encoding='utf-8-sig')
+        write_stage_table(kept_df, args.output)
         print(f"[저장 완료] 남은 행 → {args.output}")
     except Exception as e:
         print(f"[!] 에러: 출력 파일 저장 실패: {e}", file=sys.stderr)
@@ -158,7 +161,7 @@ def main():
     # 제거된 행 저장 (옵션)
     if args.removed:
         try:
-            removed_df.to_csv(args.removed, index=False, encoding='utf-8-sig')
+            write_stage_table(removed_df, args.removed)
             print(f"[저장 완료] 제거된 행 → {args.removed}")
         except Exception as e:
             print(f"[!] 경고: 제거된 행 파일 저장 실패: {e}", file=sys.stderr)
@@ -16,12 +16,19 @@
 11. 실험 모드 간소화 (PURE_AUTO만 유지)
 """
 
-import json, csv, argparse, re, hashlib
+import json, csv, argparse, re, hashlib, functools, sys
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple
 from collections import defaultdict, Counter
 from datetime import datetime
 
+# 공용 경로 토크나이저 (Logic/tokenizer: Dynamic / runner_scripts 와 같은 규칙 테이블) / 중간 파일 입출력 (Logic/shared)
+_LOGIC_DIR = str(Path(__file__).resolve().parent.parent)
+if _LOGIC_DIR not in sys.path:
+    sys.path.insert(0, _LOGIC_DIR)
+from shared.stage_io import is_parquet, write_rows_parquet
+from tokenizer import CachedTokenizer, token_mapping
+
 
 
 # 자동 추출 전용 모드 고정
@@ -318,61 +325,45 @@ def inject_dcloud_special_paths(
     _add(f"File: /data/user/0/{pkg_name}/files/cnc3ejE6/eje3cnc")
 # ========== 토큰화 로직 ==========
 class PathTokenizer:
-    def __init__(self):
-        self.token_patterns = [
-            (r'\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b', '<UUID>', 100),
-            (r'\b1[0-9]{12}\b', '<TIMESTAMP_MS>', 90),
-            (r'\b1[0-9]{9}\b', '<TIMESTAMP_SEC>', 89),
-            (r'\b20[0-9]{2}[-/]?[0-1][0-9][-/]?[0-3][0-9]\b', '<DATE>', 85),
-            (r'\b[0-2][0-9][:.]?[0-5][0-9][:.]?[0-5][0-9]\b', '<TIME>', 84),
-            (r'\b[0-9a-fA-F]{64}\b', '<HASH_SHA256>', 80),
-            (r'\b[0-9a-fA-F]{40}\b', '<HASH_SHA1>', 79),
-            (r'\b[0-9a-fA-F]{32}\b', '<HASH_MD5>', 78),
-            (r'[A-Za-z0-9+/]{16,}={0,2}', '<BASE64>', 75),
-            (r'\b[A-Za-z0-9]{20,}\b', '<SESSION_ID>', 70),
-            (r'[a-zA-Z0-9_-]+\.(jpg|jpeg|png|gif|webp|bmp)', '<IMAGE_FILE>', 60),
-            (r'[a-zA-Z0-9_-]+\.(mp4|avi|mkv|mov|wmv|flv)', '<VIDEO_FILE>', 60),
-            (r'[a-zA-Z0-9_-]+\.(mp3|wav|aac|flac|ogg|m4a)', '<AUDIO_FILE>', 60),
-            (r'[a-zA-Z0-9_-]+\.(pdf|doc|docx|xls|xlsx|ppt)', '<DOC_FILE>', 60),
-            (r'[a-zA-Z0-9_-]+\.(db|sqlite|sqlite3)', '<DB_FILE>', 60),
-            (r'[a-zA-Z0-9_-]+\.(xml|json|txt|log)', '<DATA_FILE>', 60),
-            (r'\b[0-9]{4,}\b', '<NUM_ID>', 50),
-            (r'\buser[_-]?[0-9]+\b', '<USER_ID>', 65),
-            (r'\buid[_-]?[0-9]+\b', '<USER_ID>', 65),
-            (r'\bv?[0-9]+\.[0-9]+(\.[0-9]+)?\b', '<VERSION>', 55),
-        ]
-        self.compiled_patterns = [
-            (re.compile(pattern, re.IGNORECASE), token, priority)
-            for pattern, token, priority in self.token_patterns
-        ]
+    """
+    artifact 경로 토큰화 (공용 tokenizer 규칙 → Dynamic 결과와 같은 토큰)
+    - 세그먼트 캐시는 CachedTokenizer, tokenize_with_mapping 결과는 경로 키로 LRU memoize
+    - mapping은 토큰화 전후 경로를 맞춰 {토큰: [원래 값]} 으로 복원 (tokenizer.token_mapping)
+    - 캐시된 mapping은 호출자끼리 공유되므로 수정하지 않는다
+    """
+
+    def __init__(self, cache_size: int = 1 << 16):
+        self._tokenizer = CachedTokenizer(maxsize=cache_size)
+        self._mapping_cached = functools.lru_cache(maxsize=cache_size)(self._tokenize_with_mapping)
 
     def tokenize(self, path: str) -> str:
         if not path or path.startswith('<'):
             return path
-        result = path
-        for pattern, token, _ in sorted(self.compiled_patterns, key=lambda x: -x[2]):
-            result = pattern.sub(token, result)
-        return result
+        return self._tokenizer(path)
 
     def tokenize_with_mapping(self, path: str) -> Tuple[str, Dict[str, List[str]]]:
         if not path or path.startswith('<'):
             return path, {}
-        result = path
-        mapping = defaultdict(list)
-        for pattern, token, _ in sorted(self.compiled_patterns, key=lambda x: -x[2]):
-            matches = pattern.findall(result)
-            if matches:
-                for match in matches:
-                    if isinstance(match, tuple):
-                        match = match[0]
-                    if match not in mapping[token]:
-                        mapping[token].append(match)
-                result = pattern.sub(token, result)
-        return result, dict(mapping)
+        return self._mapping_cached(path)
+
+    def _tokenize_with_mapping(self, path: str) -> Tuple[str, Dict[str, List[str]]]:
+        tokenized = self._tokenizer(path)
+        return tokenized, token_mapping(path, tokenized)
 
     def get_shorthash(self, path: str) -> str:
         return hashlib.md5(path.encode('utf-8')).hexdigest()[:8]
 
+    def cache_stats(self) -> Dict[str, Any]:
+        """mapping / 세그먼트 캐시 적중 통계"""
+        info = self._mapping_cached.cache_info()
+        seg = self._tokenizer.stats()
+        hits = info.hits + seg["segment_hits"] + seg["path_hits"]
+        misses = info.misses + seg["segment_misses"] + seg["path_misses"]
+        size = info.currsize + seg["segment_size"] + seg["path_size"]
+        lookups = hits + misses
+        return {"hits": hits, "misses": misses, "size": size,
+                "hit_rate": (hits / lookups) if lookups else 0.0}
+
 
 # ========== 경로 추출기 ==========
 class ArtifactExtractorMerged:
@@ -2696,9 +2687,140 @@ class PathPatternAnalyzer:
         return results
 
 
+def fix_bytedance_cache_path(r: Dict[str, Any]) -> Dict[str, Any]:
+    """Bytedance SDK 경로 후처리: /files → /cache 교체 (row 단위, in-place)"""
+    caller = r.get("caller", "")
+    artifact_path = r.get("artifact_path", "")
+
+    if caller and artifact_path and re.search(r'/bytedance/.*(adexpress|openadsdk|component)', caller, re.I):
+        if "/files/" in artifact_path:
+            r["artifact_path"] = artifact_path.replace("/files/", "/cache/")
+            # tokenized_path도 업데이트
+            if r.get("tokenized_path"):
+                r["tokenized_path"] = r["tokenized_path"].replace("/files/", "/cache/")
+            # pattern_type도 업데이트
+            if r.get("pattern_type") == "files":
+                r["pattern_type"] = "cache"
+    return r
+
+
+class ArtifactRowStore:
+    """
+    (package, artifact_path) 키 기준으로 삽입 시점에 중복을 제거하는 row 저장소
+
+    - 같은 키가 다시 들어오면 먼저 들어온 row를 유지하고 버린다. (기존 unique dict와 동일)
+    - /sdcard ↔ /storage/emulated/0 심볼릭 링크 경로는 row 복사본 대신
+      "원본 키 → 별칭 키"만 기록해 두고, 출력할 때 한 row씩 만들어낸다.
+    - watch()로 등록한 조건은 중복으로 버려지는 row까지 포함해 모든 삽입 row에 대해 검사한다.
+    - write_csv()는 저장된 row를 순서대로 스트리밍 출력한다.
+    """
+
+    SDCARD_PREFIX = "File: /sdcard/"
+    STORAGE_PREFIX = "File: /storage/emulated/0/"
+
+    def __init__(self, transform=None):
+        # 키 → row(dict) 또는 별칭 (원본 키, 원본 prefix 경로, 별칭 prefix 경로)
+        self._entries: Dict[Tuple[str, str], Any] = {}
+        self._transform = transform
+        self._watchers: Dict[str, Any] = {}
+        self._seen: set = set()
+        self.inserted = 0
+        self.duplicates = 0
+        self.aliases = 0
+
+    def watch(self, name: str, predicate) -> None:
+        """삽입되는 모든 row에 대해 predicate(row)가 한 번이라도 True였는지 기록"""
+        self._watchers[name] = predicate
+
+    def seen(self, name: str) -> bool:
+        return name in self._seen
+
+    def append(self, r: Dict[str, Any]) -> None:
+        if self._transform:
+            r = self._transform(r)
+        self.inserted += 1
+
+        for name, predicate in self._watchers.items():
+            if name not in self._seen and predicate(r):
+                self._seen.add(name)
+
+        key = (r.get("package", ""), r.get("artifact_path", ""))
+        if key in self._entries:
+            self.duplicates += 1
+            return
+        self._entries[key] = r
+
+    def extend(self, rows) -> None:
+        for r in rows:
+            self.append(r)
+
+    def add_storage_aliases(self) -> None:
+        """
+        현재까지 저장된 row에 대해 /sdcard ↔ /storage/emulated/0 별칭 키 생성
+        - /sdcard 경로가 있으면 → /storage/emulated/0 경로도 추가
+        - /storage/emulated/0 경로가 있으면 → /sdcard 경로도 추가
+        """
+        for key, r in list(self._entries.items()):
+            if not isinstance(r, dict):
+                continue
+            pkg, artifact_path = key
+            if artifact_path.startswith(self.SDCARD_PREFIX):
+                old, new = "/sdcard/", "/storage/emulated/0/"
+                alias_path = artifact_path.replace(self.SDCARD_PREFIX, self.STORAGE_PREFIX)
+            elif artifact_path.startswith(self.STORAGE_PREFIX):
+                old, new = "/storage/emulated/0/", "/sdcard/"
+                alias_path = artifact_path.replace(self.STORAGE_PREFIX, self.SDCARD_PREFIX)
+            else:
+                continue
+
+            alias_key = (pkg, alias_path)
+            if alias_key in self._entries:
+                continue
+            self._entries[alias_key] = (key, old, new)
+            self.aliases += 1
+
+    def _materialize(self, key: Tuple[str, str], entry: Any) -> Dict[str, Any]:
+        if isinstance(entry, dict):
+            return entry
+        src_key, old, new = entry
+        new_row = self._entries[src_key].copy()
+        new_row["artifact_path"] = key[1]
+        # tokenized_path도 업데이트
+        if new_row.get("tokenized_path"):
+            new_row["tokenized_path"] = new_row["tokenized_path"].replace(old, new)
+        return new_row
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self):
+        for key, entry in self._entries.items():
+            yield self._materialize(key, entry)
+
+    def iter_artifact_paths(self):
+        """row 복사 없이 artifact_path만 순회 (통계용)"""
+        for _, artifact_path in self._entries:
+            yield artifact_path
+
+    def write_csv(self, output_path: str, fieldnames: List[str]) -> int:
+        with open(output_path, "w", newline="", encoding="utf-8") as csvf:
+            w = csv.DictWriter(csvf, fieldnames=fieldnames)
+            w.writeheader()
+            for r in self:
+                w.writerow(r)
+        return len(self._entries)
+
+
 def process_jsonl(input_path: str, output_path: str, verbose: bool=False, enable_tokenization: bool=True):
     ext = ArtifactExtractorMerged(verbose=verbose, enable_tokenization=enable_tokenization, debug_log_path="artifacts_debug.log")
-    rows: List[Dict[str, Any]] = []
+    # (package, artifact_path) 기준 dedup-on-insert 저장소 (Bytedance /files → /cache 보정도 삽입 시 적용)
+    rows = ArtifactRowStore(transform=fix_bytedance_cache_path)
+    rows.watch("soloader", lambda r: "com/facebook/soloader" in (r.get("caller", "") + r.get("source", "")))
+    rows.watch("meta_storage", lambda r: "com/instagram" in (r.get("caller", "") + r.get("source", "")))
+    rows.watch("fb_storage_method", lambda r: re.search(
+        r'LX/[^;]+;->A0[0-9]\(Landroid/content/Context;I\)Ljava/io/File;',
+        r.get("sink", "") + r.get("source", "")) is not None)
+    rows.watch("facebook_package", lambda r: "com/facebook" in (r.get("caller", "") + r.get("source", "")))
 
     analyzer = PathPatternAnalyzer() if enable_tokenization else None
 
@@ -2760,7 +2882,7 @@ def process_jsonl(input_path: str, output_path: str, verbose: bool=False, enable
         inject_dcloud_special_paths(ext, rows, pkg_name)
 
     # Facebook SoLoader 감지 → lib-main 자동 주입
-    seen_soloader = any("com/facebook/soloader" in (r.get("caller", "") + r.get("source", "")) for r in rows)
+    seen_soloader = rows.seen("soloader")
     if pkg_name and seen_soloader and INJECT_HARDCODED_PATHS:  # ← 조건 추가
         # lib-main 경로 추가
         stub_row = {
@@ -2780,10 +2902,7 @@ def process_jsonl(input_path: str, output_path: str, verbose: bool=False, enable
         rows.append(rec)
 
     # 🆕 Instagram / Threads 하드코딩 경로 자동 주입
-    seen_meta_storage = any(
-        "com/instagram" in (r.get("caller", "") + r.get("source", ""))
-        for r in rows
-    )
+    seen_meta_storage = rows.seen("meta_storage")
 
     if pkg_name and seen_meta_storage and INJECT_HARDCODED_PATHS:  # ← 조건 추가
          for pattern, subpath in META_STORAGE_HARDCODED_PATHS.items():
@@ -2806,16 +2925,9 @@ def process_jsonl(input_path: str, output_path: str, verbose: bool=False, enable
     #[1128]
     # Facebook/Instagram/Threads/WhatsApp 등 Meta 앱 storage 감지
     # 방법 1: LX/[^;]+;->A0[0-9] 메서드 감지 (Threads, Instagram 등)
+    seen_fb_storage_method = rows.seen("fb_storage_method")
     # 방법 2: com/facebook 패키지 감지 (FB Lite 등)
-    seen_fb_storage_method = any(
-        re.search(r'LX/[^;]+;->A0[0-9]\(Landroid/content/Context;I\)Ljava/io/File;',
-                  r.get("sink", "") + r.get("source", ""))
-        for r in rows
-    )
-    seen_facebook_package = any(
-        "com/facebook" in (r.get("caller", "") + r.get("source", ""))
-        for r in rows
-    )
+    seen_facebook_package = rows.seen("facebook_package")
 
     # META-STORAGE-AUTO: FB_STORAGE_IDS를 사용하여 synthetic row 생성
     # Instagram, Threads, Facebook 등 Meta 앱에서 app_*, lib-compressed 등 자동 발견
@@ -2860,54 +2972,13 @@ def process_jsonl(input_path: str, output_path: str, verbose: bool=False, enable
 
     ext.close()
 
-    # Bytedance SDK 경로 후처리: /files → /cache 교체
-    # (중복 제거 전에 모두 수정)
-    for r in rows:
-        caller = r.get("caller", "")
-        artifact_path = r.get("artifact_path", "")
-
-        if caller and artifact_path and re.search(r'/bytedance/.*(adexpress|openadsdk|component)', caller, re.I):
-            if "/files/" in artifact_path:
-                new_path = artifact_path.replace("/files/", "/cache/")
-                r["artifact_path"] = new_path
-                # tokenized_path도 업데이트
-                if r.get("tokenized_path"):
-                    r["tokenized_path"] = r["tokenized_path"].replace("/files/", "/cache/")
-                # pattern_type도 업데이트
-                if r.get("pattern_type") == "files":
-                    r["pattern_type"] = "cache"
+    # Bytedance SDK 경로 후처리(/files → /cache)는 rows.append() 시점에 fix_bytedance_cache_path로 적용됨
 
     # /sdcard와 /storage/emulated/0 심볼릭 링크 경로 보완
     # - /sdcard 경로가 있으면 → /storage/emulated/0 경로도 추가
     # - /storage/emulated/0 경로가 있으면 → /sdcard 경로도 추가
-    sdcard_storage_pairs = []
-    for r in rows:
-        artifact_path = r.get("artifact_path", "")
-
-        # /sdcard로 시작하는 경로 → /storage/emulated/0 버전 생성
-        if artifact_path.startswith("File: /sdcard/"):
-            storage_path = artifact_path.replace("File: /sdcard/", "File: /storage/emulated/0/")
-            # 복사본 생성
-            new_row = r.copy()
-            new_row["artifact_path"] = storage_path
-            # tokenized_path도 업데이트
-            if new_row.get("tokenized_path"):
-                new_row["tokenized_path"] = new_row["tokenized_path"].replace("/sdcard/", "/storage/emulated/0/")
-            sdcard_storage_pairs.append(new_row)
-
-        # /storage/emulated/0로 시작하는 경로 → /sdcard 버전 생성
-        elif artifact_path.startswith("File: /storage/emulated/0/"):
-            sdcard_path = artifact_path.replace("File: /storage/emulated/0/", "File: /sdcard/")
-            # 복사본 생성
-            new_row = r.copy()
-            new_row["artifact_path"] = sdcard_path
-            # tokenized_path도 업데이트
-            if new_row.get("tokenized_path"):
-                new_row["tokenized_path"] = new_row["tokenized_path"].replace("/storage/emulated/0/", "/sdcard/")
-            sdcard_storage_pairs.append(new_row)
-
-    # 생성된 심볼릭 링크 경로들을 rows에 추가
-    rows.extend(sdcard_storage_pairs)
+    # - 복사본 dict 대신 별칭 키만 기록 (출력 시 생성)
+    rows.add_storage_aliases()
 
 
     # ✅ 여기에 추가:
@@ -2937,14 +3008,6 @@ def process_jsonl(input_path: str, output_path: str, verbose: bool=False, enable
         
         print(f"[META-INJECT] ✓ {len(INSTAGRAM_LITE_KNOWN_DIRS)}개 검증된 경로 주입")
 
-    # (package, artifact_path) 기준 중복 제거
-    unique: Dict[tuple[str, str], Dict[str, Any]] = {}
-    for r in rows:
-        key = (r.get("package", ""), r.get("artifact_path", ""))
-        if key not in unique:
-            unique[key] = r
-    rows = list(unique.values())
-
     # CSV 헤더
     fieldnames = [
         "line",
@@ -2963,17 +3026,20 @@ def process_jsonl(input_path: str, output_path: str, verbose: bool=False, enable
             "tokenized_path", "dynamic_tokens", "path_hash", "pattern_type", "confidence"
         ])
 
-    with open(output_path, "w", newline="", encoding="utf-8") as csvf:
-        w = csv.DictWriter(csvf, fieldnames=fieldnames)
-        w.writeheader(); w.writerows(rows)
+    # (package, artifact_path) 중복은 삽입 시점에 이미 제거됨 → 스트리밍 저장
+    # 출력 경로가 .parquet 이면 다음 단계(noise_filter)로 Parquet 중간 파일 전달
+    if is_parquet(output_path):
+        write_rows_parquet(rows, fieldnames, output_path)
+    else:
+        rows.write_csv(output_path, fieldnames)
 
     print(f"\n[OK] Results saved to: {output_path}")
     print(f"[OK] Debug log saved to: artifacts_debug.log")
     print(f"[OK] Total: {len(rows)} traces processed")
-    file_count = sum(1 for r in rows if "File:" in r.get("artifact_path", ""))
-    cache_count = sum(1 for r in rows if "/cache" in r.get("artifact_path", ""))
-    db_count = sum(1 for r in rows if "Database:" in r.get("artifact_path", ""))
-    sp_count = sum(1 for r in rows if "SharedPreferences:" in r.get("artifact_path", ""))
+    file_count = sum(1 for ap in rows.iter_artifact_paths() if "File:" in ap)
+    cache_count = sum(1 for ap in rows.iter_artifact_paths() if "/cache" in ap)
+    db_count = sum(1 for ap in rows.iter_artifact_paths() if "Database:" in ap)
+    sp_count = sum(1 for ap in rows.iter_artifact_paths() if "SharedPreferences:" in ap)
     print("\nStatistics:")
     print(f"  File artifacts: {file_count}")
     print(f"  Cache paths: {cache_count}")
@@ -2985,6 +3051,9 @@ def process_jsonl(input_path: str, output_path: str, verbose: bool=False, enable
         print(f"\n[Stats] Tokenization Statistics:")
         print(f"  Unique patterns: {len(summary)}")
         print(f"  Total tokenized paths: {sum(p['count'] for p in summary)}")
+        if ext.tokenizer:
+            cs = ext.tokenizer.cache_stats()
+            print(f"  Tokenizer cache hit: {cs['hit_rate']:.1%} ({cs['hits']}/{cs['hits'] + cs['misses']})")
         if summary:
             print("\n[Top 5] patterns:")
             for i, p in enumerate(summary[:5], 1):
@@ -2994,7 +3063,7 @@ def process_jsonl(input_path: str, output_path: str, verbose: bool=False, enable
 if __name__ == "__main__":
     p = argparse.ArgumentParser(description="Artifact Path Extractor v4 - Fixed Missing Paths")
     p.add_argument("input", help="JSONL from taint_ip_merged_patched.py --full-trace")
-    p.add_argument("-o","--output", help="Output CSV file")
+    p.add_argument("-o","--output", help="Output CSV file (.parquet → Parquet intermediate)")
     p.add_argument("-v","--verbose", action="store_true", help="Enable verbose debug logging")
     p.add_argument("--no-tokenization", action="store_true", help="Disable path tokenization")
     p.add_argument("--meta-ids-json",
@@ -9,6 +9,8 @@ Sink 시그니처 기반으로 파일/디렉토리를 구분하여,
 
 import os
 import re
+from functools import lru_cache
+from typing import Iterable, NamedTuple
 
 # 디렉토리 전용 Sinks (경로 그대로 유지)
 DIRECTORY_SINKS = [
@@ -94,18 +96,151 @@ KNOWN_FILE_EXTENSIONS = {
 }
 
 
+class SinkFlags(NamedTuple):
+    """SinkClassifier.classify() 결과 (sink + basename 기준 판정 플래그)"""
+    directory_sink: bool
+    file_sink: bool
+    ambiguous_sink: bool
+    file_constructor: bool
+    file_extension: bool
+    known_directory_name: bool
+
+
+# SinkClassifier 내부 카테고리 비트
+_DIRECTORY_BIT = 1
+_FILE_BIT = 2
+_AMBIGUOUS_BIT = 4
+_CONSTRUCTOR_BIT = 8
+
+
+class SinkClassifier:
+    """
+    디렉토리/파일 Sink 규칙을 한 번만 컴파일해 두고 재사용하는 분류기
+
+    - Sink 시그니처 목록 전체를 하나의 정규식(lookahead alternation)으로 묶어
+      sink 문자열을 한 번만 스캔한다. (리스트별 any() 반복 스캔 제거)
+    - 확장자/디렉토리 이름은 frozenset 조회로 판정한다.
+    - (sink, basename) 단위로 결과를 메모이즈한다.
+
+    판정 결과는 기존 is_*_sink / has_file_extension / is_known_directory_name 과 동일하다.
+    """
+
+    def __init__(self,
+                 directory_sinks: Iterable[str] = DIRECTORY_SINKS,
+                 file_sinks: Iterable[str] = FILE_SINKS,
+                 ambiguous_sinks: Iterable[str] = AMBIGUOUS_SINKS,
+                 file_constructor: str = FILE_CONSTRUCTOR,
+                 known_directory_names: Iterable[str] = KNOWN_DIRECTORY_NAMES,
+                 known_file_extensions: Iterable[str] = KNOWN_FILE_EXTENSIONS,
+                 cache_size: int = 8192):
+        masks = {}
+        for bit, patterns in ((_DIRECTORY_BIT, directory_sinks),
+                              (_FILE_BIT, file_sinks),
+                              (_AMBIGUOUS_BIT, ambiguous_sinks),
+                              (_CONSTRUCTOR_BIT, [file_constructor])):
+            for pattern in patterns:
+                masks[pattern] = masks.get(pattern, 0) | bit
+
+        # 같은 위치에서 시작하는 짧은 시그니처(접두사)도 매칭된 것으로 간주해야
+        # any(pattern in sink) 와 결과가 같아진다 → 접두사 마스크를 미리 합쳐 둔다.
+        self._masks = {
+            pattern: self._prefix_closure(pattern, masks)
+            for pattern in masks
+        }
+        # 가장 긴 시그니처가 먼저 매칭되도록 정렬 (겹치는 위치 모두 검사하기 위해 lookahead 사용)
+        ordered = sorted(masks, key=len, reverse=True)
+        self._sink_re = re.compile(
+            "(?=(" + "|".join(re.escape(p) for p in ordered) + "))"
+        )
+
+        self._known_directory_names = frozenset(known_directory_names)
+        self._known_file_extensions = frozenset(e.lower() for e in known_file_extensions)
+
+        self._classify_cached = lru_cache(maxsize=cache_size)(self._classify)
+
+    @staticmethod
+    def _prefix_closure(pattern: str, masks: dict) -> int:
+        mask = 0
+        for other, bits in masks.items():
+            if pattern.startswith(other):
+                mask |= bits
+        return mask
+
+    def sink_mask(self, sink: str) -> int:
+        """sink 문자열에 포함된 모든 시그니처 카테고리 비트 OR"""
+        if not sink:
+            return 0
+        mask = 0
+        masks = self._masks
+        for m in self._sink_re.finditer(sink):
+            mask |= masks[m.group(1)]
+        return mask
+
+    def has_file_extension(self, basename: str) -> bool:
+        """basename이 화이트리스트 확장자로 끝나는지 확인"""
+        if '.' not in basename:
+            return False
+        return basename.rsplit('.', 1)[-1].lower() in self._known_file_extensions
+
+    def is_known_directory_name(self, basename: str) -> bool:
+        """basename이 알려진 디렉토리 이름(정확 일치 또는 '<이름>_' 접두사)인지 확인"""
+        if not basename:
+            return False
+
+        if basename.startswith("app_"):
+            return True
+
+        names = self._known_directory_names
+        if basename in names:
+            return True
+        # "<dir_name>_..." 접두사: '_' 위치마다 앞부분이 디렉토리 이름인지 확인
+        idx = basename.find('_')
+        while idx != -1:
+            if basename[:idx] in names:
+                return True
+            idx = basename.find('_', idx + 1)
+
+        if basename.startswith('.') and not self.has_file_extension(basename):
+            return True
+
+        return False
+
+    def _classify(self, sink: str, basename: str) -> SinkFlags:
+        mask = self.sink_mask(sink)
+        return SinkFlags(
+            directory_sink=bool(mask & _DIRECTORY_BIT),
+            file_sink=bool(mask & _FILE_BIT),
+            ambiguous_sink=bool(mask & _AMBIGUOUS_BIT),
+            file_constructor=bool(mask & _CONSTRUCTOR_BIT),
+            file_extension=self.has_file_extension(basename),
+            known_directory_name=self.is_known_directory_name(basename),
+        )
+
+    def classify(self, sink: str, path: str) -> SinkFlags:
+        """sink/경로에 대한 모든 판정 플래그를 한 번에 반환 (memoized)"""
+        basename = os.path.basename(path) if path else ""
+        return self._classify_cached(sink or "", basename)
+
+    def cache_info(self):
+        return self._classify_cached.cache_info()
+
+
+# Static / new_static 공용 기본 분류기
+SINK_CLASSIFIER = SinkClassifier()
+
+
 def is_directory_sink(sink: str) -> bool:
     """Sink가 디렉토리 전용인지 판정"""
     if not sink:
         return False
-    return any(pattern in sink for pattern in DIRECTORY_SINKS)
+    return bool(SINK_CLASSIFIER.sink_mask(sink) & _DIRECTORY_BIT)
 
 
 def is_file_sink(sink: str) -> bool:
     """Sink가 파일 전용인지 판정"""
     if not sink:
         return False
-    return any(pattern in sink for pattern in FILE_SINKS)
+    return bool(SINK_CLASSIFIER.sink_mask(sink) & _FILE_BIT)
 
 
 def extract_path_only(artifact_path: str) -> str:
@@ -128,18 +263,9 @@ def has_file_extension(path: str) -> bool:
     if not path:
         return False
 
-    basename = os.path.basename(path)
-
-    # 확장자 추출
-    if '.' not in basename:
-        return False
-
     # 마지막 . 이후의 문자열을 확장자로 간주
-    ext = basename.rsplit('.', 1)[-1].lower()
-
-    # 화이트리스트에 있는 확장자만 파일로 인식
     # .v1, .v2, .v3 같은 버전 패턴은 화이트리스트에 없으므로 파일로 인식 안됨
-    return ext in KNOWN_FILE_EXTENSIONS
+    return SINK_CLASSIFIER.has_file_extension(os.path.basename(path))
 
 
 def is_known_directory_name(path: str) -> bool:
@@ -147,34 +273,15 @@ def is_known_directory_name(path: str) -> bool:
     if not path:
         return False
 
-    basename = os.path.basename(path)
-
-    # app_* 패턴 자동 인식 (Context.getDir()로 생성되는 디렉토리)
-    # 예: app_errorreporting, app_hprof, app_minidumps, app_traces 등
-    if basename.startswith("app_"):
-        return True
-
-    # 정확히 일치하거나 접두사로 시작하는 경우
-    for dir_name in KNOWN_DIRECTORY_NAMES:
-        if basename == dir_name or basename.startswith(dir_name + "_"):
-            return True
-
-    # .으로 시작하는 hidden 디렉토리 (예: .crashlytics.v3)
-    # has_file_extension()이 화이트리스트 방식이므로
-    # .v1, .v2, .v3 같은 버전 패턴은 자동으로 파일 확장자로 인식 안됨
-    if basename.startswith('.'):
-        # 알려진 파일 확장자가 아니면 디렉토리로 간주
-        if not has_file_extension(path):
-            return True
-
-    return False
+    # app_* 패턴 (Context.getDir()), 정확히 일치/접두사, 확장자 없는 hidden 디렉토리(.crashlytics.v3)
+    return SINK_CLASSIFIER.is_known_directory_name(os.path.basename(path))
 
 
 def is_ambiguous_sink(sink: str) -> bool:
     """Sink가 파일/디렉토리 모두에 사용 가능한지 판정"""
     if not sink:
         return False
-    return any(pattern in sink for pattern in AMBIGUOUS_SINKS)
+    return bool(SINK_CLASSIFIER.sink_mask(sink) & _AMBIGUOUS_BIT)
 
 
 def extract_directory_from_path(artifact_path: str, sink: str) -> str:
@@ -200,18 +307,21 @@ def extract_directory_from_path(artifact_path: str, sink: str) -> str:
     if not path or not path.startswith('/'):
         return artifact_path
 
+    # sink/basename 판정 플래그를 한 번에 계산 (memoized)
+    flags = SINK_CLASSIFIER.classify(sink, path)
+
     # 1. 디렉토리 전용 Sink → 그대로 유지
-    if is_directory_sink(sink):
+    if flags.directory_sink:
         return artifact_path
 
     # 2. 알려진 디렉토리 이름 → 그대로 유지 (우선순위 높음)
-    if is_known_directory_name(path):
+    if flags.known_directory_name:
         return artifact_path
 
     # 3. 모호한 Sink (exists, delete) → 확장자와 디렉토리 패턴으로 판단
-    if is_ambiguous_sink(sink):
+    if flags.ambiguous_sink:
         # 확장자가 있으면 파일로 간주 → 부모 디렉토리 추출
-        if has_file_extension(path):
+        if flags.file_extension:
             parent_dir = os.path.dirname(path)
             if parent_dir and parent_dir != '/':
                 return label + parent_dir
@@ -220,15 +330,15 @@ def extract_directory_from_path(artifact_path: str, sink: str) -> str:
 
     # 4. 파일 전용 Sink → 부모 디렉토리 추출
     # 단, exists와 delete는 위에서 처리됨
-    if is_file_sink(sink):
+    if flags.file_sink:
         parent_dir = os.path.dirname(path)
         if parent_dir and parent_dir != '/':
             return label + parent_dir
         return artifact_path
 
     # 5. File 생성자 → 확장자 유무로 판단 (단, 알려진 디렉토리는 위에서 처리됨)
-    if FILE_CONSTRUCTOR in sink:
-        if has_file_extension(path):
+    if flags.file_constructor:
+        if flags.file_extension:
             # 확장자 있음 → 파일로 간주 → 부모 디렉토리 추출
             parent_dir = os.path.dirname(path)
             if parent_dir and parent_dir != '/':
@@ -254,7 +364,7 @@ def extract_directory_from_path(artifact_path: str, sink: str) -> str:
         return artifact_path
 
     # 8. 알 수 없는 Sink → 보수적으로 확장자 기준 판단
-    if has_file_extension(path):
+    if flags.file_extension:
         parent_dir = os.path.dirname(path)
         if parent_dir and parent_dir != '/':
             return label + parent_dir
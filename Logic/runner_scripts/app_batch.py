@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+app_batch.py
+여러 앱의 dynamic_*.csv 후처리를 한 번에 실행하는 배치 유틸
+
+- applist.txt 기준 입력 파일 목록 (없으면 폴더 전체)
+- --jobs N: 프로세스 풀 병렬 실행 (워커마다 CachedTokenizer 하나를 만들어 재사용)
+- 앱별 처리 시간 출력
+- 완료된 앱은 출력 폴더의 .batch_state_<step>.json 에 단계별로 기록 → --resume 으로 다시 실행하면 완료된 앱은 건너뜀
+  (process_dynamic_results / tokenize_all_dynamic 처럼 출력 폴더가 같아도 단계마다 기록이 따로라 서로 초기화하지 않음)
+  (입력 파일 크기/수정 시각이 바뀌었거나 출력 파일이 없으면 다시 처리)
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+STATE_FILE_PATTERN = ".batch_state_{step}.json"
+
+
+def state_file_name(step: str) -> str:
+    """단계별 배치 상태 파일 이름"""
+    return STATE_FILE_PATTERN.format(step=step)
+
+# 워커 프로세스별 토크나이저 (init_worker_tokenizer 에서 생성)
+_WORKER_TOKENIZER = None
+
+
+def load_applist(base_dir: Path) -> list:
+    """applist.txt에서 패키지 목록 로드"""
+    applist_file = base_dir / "applist.txt"
+    if not applist_file.exists():
+        return None
+
+    packages = []
+    with applist_file.open('r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                packages.append(line)
+    return packages
+
+
+def list_app_csvs(input_dir: Path, base_dir: Path) -> List[Path]:
+    """applist.txt에 있는 앱의 dynamic_<pkg>.csv 목록 (applist가 없으면 전체)"""
+    applist = load_applist(base_dir)
+
+    if applist:
+        csv_files = [input_dir / f"dynamic_{pkg}.csv" for pkg in applist]
+        csv_files = [f for f in csv_files if f.exists()]
+        print(f"Using applist.txt: {len(applist)} packages specified, {len(csv_files)} files found")
+    else:
+        csv_files = list(input_dir.glob("dynamic_*.csv"))
+        print("No applist.txt found, processing all files")
+    return csv_files
+
+
+def add_batch_arguments(ap: argparse.ArgumentParser):
+    ap.add_argument("-j", "--jobs", type=int, default=1,
+                    help="동시에 처리할 앱 수 (기본 1: 순차, 0: CPU 수)")
+    ap.add_argument("--resume", action="store_true",
+                    help="이전 실행에서 완료된 앱은 건너뛰기 (출력 폴더의 .batch_state_<step>.json 기준)")
+
+
+def init_worker_tokenizer():
+    """ProcessPoolExecutor initializer: 워커마다 토크나이저(+세그먼트 캐시) 하나 (프로세스 공용 기본 토크나이저)"""
+    global _WORKER_TOKENIZER
+    from path_tokenizer import default_tokenizer
+    _WORKER_TOKENIZER = default_tokenizer()
+
+
+def worker_tokenizer():
+    if _WORKER_TOKENIZER is None:
+        init_worker_tokenizer()
+    return _WORKER_TOKENIZER
+
+
+def _fingerprint(path: Path) -> List[int]:
+    st = path.stat()
+    return [st.st_size, st.st_mtime_ns]
+
+
+class BatchState:
+    """출력 폴더 + 단계별 완료 앱 기록 (앱 하나가 끝날 때마다 저장)"""
+
+    def __init__(self, output_dir: Path, step: str):
+        self.path = Path(output_dir) / state_file_name(step)
+        self.done: Dict[str, Dict] = {}
+        if self.path.exists():
+            try:
+                with self.path.open('r', encoding='utf-8') as f:
+                    self.done = json.load(f).get("done", {})
+            except (OSError, ValueError):
+                self.done = {}
+
+    def is_done(self, csv_file: Path, output_file: Path) -> bool:
+        entry = self.done.get(csv_file.name)
+        return bool(entry) and entry.get("input") == _fingerprint(csv_file) and output_file.exists()
+
+    def mark_done(self, csv_file: Path, seconds: float, summary: str):
+        self.done[csv_file.name] = {
+            "input": _fingerprint(csv_file),
+            "seconds": round(seconds, 3),
+            "summary": summary,
+            "finished_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        self.save()
+
+    def reset(self):
+        self.done = {}
+        self.save()
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with tmp.open('w', encoding='utf-8') as f:
+            json.dump({"done": self.done}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.path)
+
+
+def _timed(task: Callable[[Path], str], csv_file: Path) -> Tuple[float, str]:
+    t0 = time.perf_counter()
+    summary = task(csv_file)
+    return time.perf_counter() - t0, summary
+
+
+def run_batch(csv_files: List[Path], task: Callable[[Path], str], output_for: Callable[[Path], Path],
+              output_dir: Path, step: str, jobs: int = 1, resume: bool = False,
+              initializer: Optional[Callable[[], None]] = None) -> Tuple[int, int]:
+    """
+    앱별 task(csv_file) -> 요약 문자열 을 실행하고 (성공 수, 실패 수) 반환
+    - task / initializer 는 프로세스 풀에서 쓰이므로 모듈 최상위 함수(또는 그 partial)여야 한다.
+    - output_for(csv_file): 앱별 출력 파일 경로 (--resume 시 존재 여부 확인용)
+    - step: 상태 파일 이름에 들어가는 단계 이름 (출력 폴더를 같이 쓰는 단계끼리 겹치지 않게)
+    """
+    state = BatchState(output_dir, step)
+    if not resume:
+        state.reset()
+
+    pending = []
+    for csv_file in csv_files:
+        if resume and state.is_done(csv_file, output_for(csv_file)):
+            print(f"    ⏭️  {csv_file.name}: 이전 실행에서 완료 ({state.done[csv_file.name]['seconds']}s)")
+        else:
+            pending.append(csv_file)
+
+    total = len(pending)
+    if resume and total < len(csv_files):
+        print(f"[resume] {len(csv_files) - total}개 완료된 앱 건너뜀, {total}개 처리")
+
+    jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+    success = failed = 0
+    t_start = time.perf_counter()
+
+    def _report(idx, csv_file, fut_result=None, error=None):
+        nonlocal success, failed
+        if error is None:
+            seconds, summary = fut_result
+            state.mark_done(csv_file, seconds, summary)
+            print(f"[{idx}/{total}] ✅ {csv_file.name}: {summary} ({seconds:.2f}s)")
+            success += 1
+        else:
+            print(f"[{idx}/{total}] ❌ {csv_file.name}: ERROR: {error}")
+            failed += 1
+
+    if jobs == 1 or total <= 1:
+        if initializer:
+            initializer()
+        for idx, csv_file in enumerate(pending, 1):
+            try:
+                _report(idx, csv_file, _timed(task, csv_file))
+            except Exception as e:
+                _report(idx, csv_file, error=e)
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, total), initializer=initializer) as pool:
+            futures = {pool.submit(_timed, task, csv_file): csv_file for csv_file in pending}
+            for idx, fut in enumerate(as_completed(futures), 1):
+                csv_file = futures[fut]
+                try:
+                    _report(idx, csv_file, fut.result())
+                except Exception as e:
+                    _report(idx, csv_file, error=e)
+
+    print(f"[batch] {success + failed}개 앱 처리, 총 {time.perf_counter() - t_start:.2f}s (jobs={jobs})")
+    return success, failed
@@ -7,12 +7,22 @@ Dynamic CSV 깨진 문자 정리 스크립트 (데이터 손실 없음)
 - 중복 제거
 """
 
+import argparse
 import csv
+import functools
 import sys
 from pathlib import Path
 
-# Windows 인코딩 문제 해결
-if sys.platform == 'win32':
+# 공용 모듈 패키지 (Logic/shared)
+_LOGIC_DIR = str(Path(__file__).resolve().parent.parent)
+if _LOGIC_DIR not in sys.path:
+    sys.path.insert(0, _LOGIC_DIR)
+
+from app_batch import add_batch_arguments, list_app_csvs, run_batch
+from shared.corruption_scan import path_fragments, scan_column
+
+# Windows 인코딩 문제 해결 (스크립트 실행 시에만, import 시 호출자 stdout은 건드리지 않음)
+if sys.platform == 'win32' and __name__ == "__main__":
     import io
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
@@ -79,49 +89,57 @@ def extract_valid_paths(text: str) -> list:
     """
     텍스트에서 유효한 경로들을 추출
 
-    알고리즘:
-    1. 문자를 하나씩 스캔
-    2. '/'를 만나면 경로 시작 가능성
-    3. 깨진 문자를 만나면 현재 경로 종료
-    4. 유효한 경로만 수집
+    - 깨진 문자를 만나면 현재 경로 종료, 다음 '/'부터 새 경로 시작
+      (corruption_scan.PATH_FRAGMENT_RE 한 번으로 모든 조각 추출)
+    - 유효한 경로만 수집
     """
     if not text:
         return []
 
-    paths = []
-    current = []
-    in_path = False
-
-    for char in text:
-        if is_corrupted_char(char):
-            # 깨진 문자 발견 → 현재 경로 저장
-            if current:
-                path = ''.join(current).strip()
-                if is_valid_android_path(path):
-                    paths.append(path)
-            current = []
-            in_path = False
-
-        elif char == '/':
-            # 경로 시작 또는 구분자
-            current.append(char)
-            in_path = True
-
-        elif in_path:
-            # 경로 내부 문자 (일반 문자만)
-            current.append(char)
+    return [path for path in path_fragments(text) if is_valid_android_path(path)]
+
 
+def clean_path_rows(rows, unique_paths: dict):
+    """
+    (path, type) 행 목록을 정리해서 unique_paths(path -> type)에 병합
+
+    - path 컬럼 전체를 corruption_scan.scan_column 으로 한 번에 검사 (깨진 문자 여부 + 유효 경로 조각)
+    - 깨진 경로는 유효한 조각만 추출 (분리된 경로는 원본 타입 유지)
+    - 모든 경로에 정규화 적용
+    반환: (깨진 행 수, 분리로 늘어난 경로 수)
+    """
+    rows = [(path_text, path_type) for path_text, path_type in rows if path_text]
+    corrupted_count = 0
+    split_count = 0
+
+    scans = scan_column([path_text for path_text, _ in rows])
+    for (path_text, path_type), (corrupted, fragments) in zip(rows, scans):
+        if corrupted:
+            # 깨진 경로에서 유효한 경로들 추출 (extract_valid_paths 와 같은 규칙)
+            extracted = [p for p in fragments if is_valid_android_path(p)]
+            corrupted_count += 1
+            if len(extracted) > 1:
+                # 여러 경로로 분리됨 (모두 같은 타입으로 추정)
+                split_count += len(extracted) - 1
+            candidates = extracted
         else:
-            # 경로 밖 문자는 무시
-            pass
+            candidates = [path_text]
 
-    # 마지막 경로 처리
-    if current:
-        path = ''.join(current).strip()
-        if is_valid_android_path(path):
-            paths.append(path)
+        for p in candidates:
+            normalized = normalize_android_path(p)
+            if is_valid_android_path(normalized):
+                unique_paths[normalized] = path_type
 
-    return paths
+    return corrupted_count, split_count
+
+
+def read_path_rows(input_path: Path) -> list:
+    """CSV → (path, type) 행 목록 (따옴표 / 공백 제거, type 기본값: directory)"""
+    with input_path.open('r', encoding='utf-8', errors='replace') as f:
+        return [
+            (row.get('path', '').strip().strip('"'), row.get('type', 'directory').strip())
+            for row in csv.DictReader(f)
+        ]
 
 
 def process_csv(input_path: Path, output_path: Path):
@@ -134,48 +152,7 @@ def process_csv(input_path: Path, output_path: Path):
     - 중복 제거
     """
     unique_paths = {}  # path -> type 매핑
-    corrupted_count = 0
-    split_count = 0
-
-    with input_path.open('r', encoding='utf-8', errors='replace') as f:
-        reader = csv.DictReader(f)
-
-        for row in reader:
-            path_text = row.get('path', '').strip().strip('"')
-            path_type = row.get('type', 'directory').strip()  # 기본값: directory
-
-            if not path_text:
-                continue
-
-            # 깨진 문자가 있는지 확인
-            has_corruption = any(is_corrupted_char(c) for c in path_text)
-
-            if has_corruption:
-                # 깨진 경로에서 유효한 경로들 추출
-                extracted = extract_valid_paths(path_text)
-
-                if len(extracted) == 0:
-                    # 완전히 깨진 경로
-                    corrupted_count += 1
-                elif len(extracted) == 1:
-                    # 깨진 부분만 제거, 정규화 적용
-                    normalized = normalize_android_path(extracted[0])
-                    if is_valid_android_path(normalized):
-                        unique_paths[normalized] = path_type
-                    corrupted_count += 1
-                else:
-                    # 여러 경로로 분리됨 (모두 같은 타입으로 추정), 정규화 적용
-                    for p in extracted:
-                        normalized = normalize_android_path(p)
-                        if is_valid_android_path(normalized):
-                            unique_paths[normalized] = path_type
-                    corrupted_count += 1
-                    split_count += len(extracted) - 1
-            else:
-                # 정상 경로, 정규화 적용
-                normalized = normalize_android_path(path_text)
-                if is_valid_android_path(normalized):
-                    unique_paths[normalized] = path_type
+    corrupted_count, split_count = clean_path_rows(read_path_rows(input_path), unique_paths)
 
     # 정렬 후 출력
     sorted_items = sorted(unique_paths.items())
@@ -189,22 +166,21 @@ def process_csv(input_path: Path, output_path: Path):
     return len(sorted_items), corrupted_count, split_count
 
 
-def load_applist(base_dir: Path) -> list:
-    """applist.txt에서 패키지 목록 로드"""
-    applist_file = base_dir / "applist.txt"
-    if not applist_file.exists():
-        return None
-
-    packages = []
-    with applist_file.open('r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith('#'):
-                packages.append(line)
-    return packages
+def _clean_task(csv_file: Path, output_dir: Path) -> str:
+    """배치 작업 단위: 앱 하나 정리 → 요약 문자열"""
+    count, corrupted, split = process_csv(csv_file, output_dir / csv_file.name)
+    if corrupted > 0:
+        if split > 0:
+            return f"{count} paths ({corrupted} corrupted, {split} split)"
+        return f"{count} paths ({corrupted} corrupted)"
+    return f"{count} paths (no corruption)"
 
 
 def main():
+    ap = argparse.ArgumentParser(description="Dynamic CSV 깨진 문자 정리 (Dynamic/ → Dynamic_cleaned/)")
+    add_batch_arguments(ap)
+    args = ap.parse_args()
+
     base_dir = Path(__file__).parent  # 현재 스크립트가 있는 디렉토리
     input_dir = base_dir / "Dynamic"
     output_dir = base_dir / "Dynamic_cleaned"
@@ -212,19 +188,8 @@ def main():
     # 출력 디렉토리 생성
     output_dir.mkdir(exist_ok=True)
 
-    # applist.txt 확인
-    applist = load_applist(base_dir)
-
-    if applist:
-        # applist에 있는 파일만 처리
-        csv_files = [input_dir / f"dynamic_{pkg}.csv" for pkg in applist]
-        csv_files = [f for f in csv_files if f.exists()]
-        print(f"Using applist.txt: {len(applist)} packages specified, {len(csv_files)} files found")
-    else:
-        # 모든 파일 처리
-        csv_files = list(input_dir.glob("dynamic_*.csv"))
-        print(f"No applist.txt found, processing all files")
-
+    # applist.txt 확인 (없으면 모든 파일 처리)
+    csv_files = list_app_csvs(input_dir, base_dir)
     total = len(csv_files)
 
     print("=" * 80)
@@ -236,37 +201,19 @@ def main():
     print("=" * 80)
     print()
 
-    success = 0
-    failed = 0
-    total_corrupted = 0
-    total_split = 0
-
-    for idx, csv_file in enumerate(csv_files, 1):
-        output_file = output_dir / csv_file.name
-
-        print(f"[{idx}/{total}] Processing: {csv_file.name}")
-
-        try:
-            count, corrupted, split = process_csv(csv_file, output_file)
-            if corrupted > 0:
-                if split > 0:
-                    print(f"    ✅ {count} paths ({corrupted} corrupted, {split} split)")
-                else:
-                    print(f"    ✅ {count} paths ({corrupted} corrupted)")
-            else:
-                print(f"    ✅ {count} paths (no corruption)")
-            success += 1
-            total_corrupted += corrupted
-            total_split += split
-        except Exception as e:
-            print(f"    ❌ ERROR: {str(e)}")
-            failed += 1
+    success, failed = run_batch(
+        csv_files,
+        functools.partial(_clean_task, output_dir=output_dir),
+        output_for=lambda f: output_dir / f.name,
+        output_dir=output_dir,
+        step="clean_corrupted_paths",
+        jobs=args.jobs,
+        resume=args.resume,
+    )
 
     print()
     print("=" * 80)
     print(f"Completed: {success} success, {failed} failed")
-    print(f"Total corrupted paths cleaned: {total_corrupted}")
-    print(f"Total paths split from corrupted: {total_split}")
     print("=" * 80)
 
 
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+dynamic_postprocess.py
+동적 분석 결과 후처리를 한 프로세스 안에서 실행 (clean → folders → tokenize → dedup)
+
+- dynamic_<pkg>.csv 를 한 번 읽고 db_dynamic_<pkg>.csv 를 한 번 쓴다.
+- 단계별 규칙은 clean_corrupted_paths.py / extract_folders_only.py / path_tokenizer.py 와 동일
+  (출력도 process_dynamic_results.py 3단계 실행 결과와 같다)
+- 중간 산출물(Dynamic_cleaned / Dynamic_folders / Dynamic_tokenized)은 intermediate_dir 지정 시에만 저장
+
+- 증분 모드(postprocess_dynamic_runs): run별 수집 CSV 중 새 run만 읽고, 새 폴더 경로만 토큰화해서 누적 결과에 병합
+  (패키지별 상태 파일에 처리한 run ID / 내용 해시 / 정리된 경로 / 폴더→토큰 매핑 보관)
+
+사용법:
+    python dynamic_postprocess.py -i dynamic_com.x.csv -o db_dynamic_com.x.csv
+    python dynamic_postprocess.py -i dynamic_com.x.csv -o db_dynamic_com.x.csv --intermediate-dir out/
+    python dynamic_postprocess.py --runs-dir Export/dynamic --package com.x -o db_dynamic_com.x.csv
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+# 공용 모듈 패키지 (Logic/shared)
+_LOGIC_DIR = str(Path(__file__).resolve().parent.parent)
+if _LOGIC_DIR not in sys.path:
+    sys.path.insert(0, _LOGIC_DIR)
+
+from clean_corrupted_paths import clean_path_rows, read_path_rows
+from extract_folders_only import extract_folder_path
+
+INTERMEDIATE_DIRS = ("Dynamic_cleaned", "Dynamic_folders", "Dynamic_tokenized")
+
+
+def clean_rows(input_path: Path, stats: Dict[str, int],
+               unique_paths: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """
+    깨진 문자 제거 + 경로 정규화 (clean_corrupted_paths.process_csv 와 동일 규칙)
+    반환: path -> type (같은 경로는 마지막 type 유지)
+    - unique_paths: 이전 run까지의 결과에 이어서 병합할 때 지정
+    """
+    if unique_paths is None:
+        unique_paths = {}
+
+    rows = read_path_rows(input_path)
+    stats["rows"] += len(rows)
+    corrupted, split = clean_path_rows(rows, unique_paths)
+    stats["corrupted"] += corrupted
+    stats["split"] += split
+
+    return unique_paths
+
+
+def _write_path_csv(path: Path, header, rows, **writer_kwargs):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open('w', encoding=writer_kwargs.pop("encoding", "utf-8"), newline='') as f:
+        writer = csv.writer(f, **writer_kwargs)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def _write_outputs(output_csv: Path, cleaned: Dict[str, str], folders, tokenized,
+                   intermediate_dir, name: str):
+    # 최종 산출물: path_tokenizer --dedupe-only 출력과 같은 형식 (utf-8-sig, pandas to_csv 줄바꿈)
+    _write_path_csv(output_csv, ['path'], ([p] for p in tokenized),
+                    encoding="utf-8-sig", lineterminator=os.linesep)
+
+    if intermediate_dir:
+        base = Path(intermediate_dir)
+        _write_path_csv(base / "Dynamic_cleaned" / name, ['path', 'type'], sorted(cleaned.items()))
+        _write_path_csv(base / "Dynamic_folders" / name, ['path'], ([p] for p in sorted(folders)))
+        tokenized_path = base / "Dynamic_tokenized" / name.replace("dynamic_", "db_dynamic_")
+        if tokenized_path.resolve() != output_csv.resolve():
+            _write_path_csv(tokenized_path, ['path'], ([p] for p in tokenized),
+                            encoding="utf-8-sig", lineterminator=os.linesep)
+
+
+def postprocess_dynamic_csv(input_csv, output_csv, intermediate_dir=None,
+                            name: Optional[str] = None, tokenizer=None) -> Dict[str, int]:
+    """
+    dynamic_<pkg>.csv → db_dynamic_<pkg>.csv
+
+    - intermediate_dir: 지정하면 그 아래 Dynamic_cleaned / Dynamic_folders / Dynamic_tokenized 에 단계별 결과 저장
+    - name: 중간 산출물 파일명 (기본: 입력 파일명, 예: dynamic_<pkg>.csv)
+    - tokenizer: 경로 토큰화 함수 (기본: 공용 tokenizer.default_tokenizer, CLI 기본과 같은 core 규칙)
+    반환: 단계별 행 수 통계
+    """
+    input_csv = Path(input_csv)
+    output_csv = Path(output_csv)
+    name = name or input_csv.name
+
+    if tokenizer is None:
+        from path_tokenizer import default_tokenizer
+        tokenizer = default_tokenizer()
+
+    stats = {"rows": 0, "corrupted": 0, "split": 0, "cleaned": 0, "folders": 0, "tokenized": 0}
+    t0 = time.perf_counter()
+
+    # 1) 깨진 문자 제거
+    cleaned = clean_rows(input_csv, stats)
+    stats["cleaned"] = len(cleaned)
+
+    # 2) 폴더 경로만 추출 (file → 상위 폴더)
+    folders = {extract_folder_path(path, path_type) for path, path_type in cleaned.items()}
+    stats["folders"] = len(folders)
+
+    # 3) 토큰화 + 중복 제거
+    tokenized = sorted({tokenizer(p) for p in folders})
+    stats["tokenized"] = len(tokenized)
+
+    _write_outputs(output_csv, cleaned, folders, tokenized, intermediate_dir, name)
+
+    stats["seconds"] = time.perf_counter() - t0
+    return stats
+
+
+# -------------------------
+# 증분 처리 (run 단위)
+# -------------------------
+STATE_VERSION = 1
+
+# run별 수집 결과 파일명 (pipeline_runner.js가 pipeline_<pkg>_<timestamp>/ 아래에 생성)
+RUN_CSV_NAME = "merged_collected_paths.csv"
+
+
+def _file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with Path(path).open('rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _tokenizer_fingerprint() -> str:
+    """토큰화 규칙이 바뀌면 폴더→토큰 캐시를 버리기 위한 규칙 테이블 해시"""
+    from tokenizer import rules_fingerprint
+    return rules_fingerprint()
+
+
+def find_run_csvs(runs_dir, package_name: str) -> Dict[str, Path]:
+    """runs_dir 아래 pipeline_<pkg>_*/merged_collected_paths.csv → {run ID(폴더명): 경로}"""
+    runs = {}
+    for d in sorted(Path(runs_dir).glob(f"pipeline_{package_name}_*")):
+        f = d / RUN_CSV_NAME
+        if d.is_dir() and f.exists():
+            runs[d.name] = f
+    return runs
+
+
+def default_state_path(runs_dir, package_name: str) -> Path:
+    return Path(runs_dir) / f".postprocess_state_{package_name}.json"
+
+
+def _load_state(state_path: Path) -> Dict:
+    empty = {"version": STATE_VERSION, "runs": {}, "cleaned": {}, "tokens": {}, "tokenizer": ""}
+    if not state_path.exists():
+        return empty
+    try:
+        with state_path.open('r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return empty
+    if state.get("version") != STATE_VERSION:
+        return empty
+    return state
+
+
+def _save_state(state_path: Path, state: Dict):
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = state_path.with_suffix(".tmp")
+    with tmp.open('w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp, state_path)
+
+
+def postprocess_dynamic_runs(run_csvs: Dict[str, Path], output_csv, state_path,
+                             intermediate_dir=None, name: Optional[str] = None,
+                             tokenizer=None) -> Dict[str, int]:
+    """
+    run별 수집 CSV를 누적 처리해 db_dynamic_<pkg>.csv 작성 (새 run만 읽고 새 폴더만 토큰화)
+
+    - run_csvs: {run ID: CSV 경로}. run ID 정렬 순서(= 수집 시각 순)로 병합 → 같은 경로는 마지막 run의 type 유지
+    - state_path: 패키지별 상태 파일 (처리한 run ID와 내용 해시, 정리된 경로, 폴더→토큰 매핑)
+    - 이미 처리한 run의 내용이 바뀌었거나 사라졌으면 상태를 버리고 전체 run을 다시 처리
+    - 결과는 모든 run CSV를 이어 붙여 postprocess_dynamic_csv로 처리한 것과 같다.
+    """
+    output_csv = Path(output_csv)
+    state_path = Path(state_path)
+    name = name or output_csv.name.replace("db_dynamic_", "dynamic_")
+
+    if tokenizer is None:
+        from path_tokenizer import default_tokenizer
+        tokenizer = default_tokenizer()
+
+    stats = {"rows": 0, "corrupted": 0, "split": 0, "cleaned": 0, "folders": 0, "tokenized": 0,
+             "runs_total": len(run_csvs), "runs_new": 0, "newly_tokenized": 0, "rebuilt": 0}
+    t0 = time.perf_counter()
+
+    state = _load_state(state_path)
+    hashes = {run_id: _file_sha256(p) for run_id, p in run_csvs.items()}
+
+    # 처리했던 run이 바뀌었거나 없어졌으면 누적 결과를 믿을 수 없음 → 전체 재처리
+    if any(hashes.get(run_id) != h for run_id, h in state["runs"].items()):
+        state["runs"], state["cleaned"] = {}, {}
+        stats["rebuilt"] = 1
+
+    fingerprint = _tokenizer_fingerprint()
+    if state.get("tokenizer") != fingerprint:
+        state["tokens"], state["tokenizer"] = {}, fingerprint
+
+    # 1) 새 run만 읽어서 정리 결과에 병합
+    cleaned = state["cleaned"]
+    for run_id in sorted(run_csvs):
+        if run_id in state["runs"]:
+            continue
+        clean_rows(Path(run_csvs[run_id]), stats, cleaned)
+        state["runs"][run_id] = hashes[run_id]
+        stats["runs_new"] += 1
+    stats["cleaned"] = len(cleaned)
+
+    # 2) 폴더 경로 (type 변경 반영을 위해 누적 경로 전체에서 다시 계산, 정규식 없음)
+    folders = {extract_folder_path(path, path_type) for path, path_type in cleaned.items()}
+    stats["folders"] = len(folders)
+
+    # 3) 처음 보는 폴더만 토큰화
+    tokens = state["tokens"]
+    for folder in folders:
+        if folder not in tokens:
+            tokens[folder] = tokenizer(folder)
+            stats["newly_tokenized"] += 1
+    tokenized = sorted({tokens[folder] for folder in folders})
+    stats["tokenized"] = len(tokenized)
+
+    _write_outputs(output_csv, cleaned, folders, tokenized, intermediate_dir, name)
+
+    _save_state(state_path, state)
+    stats["seconds"] = time.perf_counter() - t0
+    return stats
+
+
+def format_stats(stats: Dict[str, int], with_time: bool = True) -> str:
+    text = (
+        f"{stats['rows']} rows → {stats['cleaned']} paths "
+        f"({stats['corrupted']} corrupted, {stats['split']} split) → "
+        f"{stats['folders']} folders → {stats['tokenized']} tokenized"
+    )
+    return f"{text} ({stats['seconds']:.2f}s)" if with_time else text
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Dynamic CSV 후처리 (clean → folders → tokenize → dedup)")
+    src = ap.add_mutually_exclusive_group(required=True)
+    src.add_argument("-i", "--input", help="입력 dynamic_<pkg>.csv")
+    src.add_argument("--runs-dir", help="pipeline_<pkg>_*/ 폴더들이 있는 위치 (증분 모드)")
+    ap.add_argument("-o", "--output", required=True, help="출력 db_dynamic_<pkg>.csv")
+    ap.add_argument("--package", help="패키지명 (--runs-dir 사용 시 필수)")
+    ap.add_argument("--state", default=None, help="증분 상태 파일 (기본: <runs-dir>/.postprocess_state_<pkg>.json)")
+    ap.add_argument("--intermediate-dir", default=None,
+                    help="단계별 중간 산출물(Dynamic_cleaned/folders/tokenized)을 저장할 폴더")
+    args = ap.parse_args()
+
+    if args.runs_dir:
+        if not args.package:
+            ap.error("--runs-dir 사용 시 --package가 필요합니다")
+        runs = find_run_csvs(args.runs_dir, args.package)
+        if not runs:
+            print(f"[!] run 결과 없음: {args.runs_dir}/pipeline_{args.package}_*/{RUN_CSV_NAME}", file=sys.stderr)
+            sys.exit(1)
+        stats = postprocess_dynamic_runs(
+            runs, args.output, args.state or default_state_path(args.runs_dir, args.package),
+            intermediate_dir=args.intermediate_dir, name=f"dynamic_{args.package}.csv",
+        )
+        print(f"[+] runs: {stats['runs_new']} new / {stats['runs_total']} total"
+              f"{' (state rebuilt)' if stats['rebuilt'] else ''}, {stats['newly_tokenized']} folders tokenized")
+    else:
+        if not Path(args.input).exists():
+            print(f"[!] 입력 파일 없음: {args.input}", file=sys.stderr)
+            sys.exit(1)
+        stats = postprocess_dynamic_csv(args.input, args.output, args.intermediate_dir)
+
+    print(f"[+] {format_stats(stats)}")
+    print(f"[+] wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,7 @@ Dynamic 분석 실행 + 후처리 파이프라인 자동 실행 (clean -> folder
 최종 목표:
 1) Export/dynamic_{pkg}.csv 생성 (동적 수집 결과)
 2) 위 파일을 입력으로 후처리 3단계 수행
-3) 중간 산출물: Case/Export/dynamic/Dynamic_cleaned, Dynamic_folders, Dynamic_tokenized 에 저장
+3) 중간 산출물 (요청 시): Case/Export/dynamic/Dynamic_cleaned, Dynamic_folders, Dynamic_tokenized 에 저장
 4) 최종 산출물: Case/Export/db_dynamic_*.csv 저장
 """
 
@@ -74,138 +74,85 @@ def run_postprocess_pipeline(
     package_name: str,
     export_dir: str,
     export_dynamic_dir: str,
-    input_export_csv_path: str
+    input_export_csv_path: str,
+    keep_intermediate: bool = None,
+    incremental: bool = None
 ):
     """
-    후처리 파이프라인을 Case Export 기준으로 돌리기 위한 래퍼.
-
-    전략:
-    - process_dynamic_results.py는 BASE_DIR=__file__.parent 기준으로
-      Dynamic/, Dynamic_cleaned/ ... 을 만들기 때문에,
-      Case Export/dynamic 아래에 "작업용 workspace"를 만들고,
-      필요한 스크립트들을 거기로 복사한 다음 그 위치에서 실행한다.
-    - 그럼 중간 산출물이 workspace 안에 생기므로,
-      workspace 결과를 export_dynamic_dir로 이동/정리하고,
-      최종 db_dynamic_*.csv는 export_dir 루트로 복사한다.
+    후처리 파이프라인 (clean -> folders -> tokenize -> dedup) 을 현재 프로세스에서 실행.
+
+    - dynamic_{pkg}.csv를 한 번 읽고 export_dir/db_dynamic_{pkg}.csv를 한 번 쓴다.
+      (스크립트 복사 / 단계별 subprocess / 중간 CSV 재읽기 없음)
+    - keep_intermediate=True 일 때만 export_dynamic_dir 아래
+      Dynamic_cleaned, Dynamic_folders, Dynamic_tokenized 중간 산출물을 저장한다.
+      None이면 환경 변수 A3_KEEP_DYNAMIC_INTERMEDIATE (1/true/yes) 값을 따른다.
+    - incremental=True 이면 export_dynamic_dir 아래 보관된 pipeline_{pkg}_* run 결과를
+      패키지별 상태 파일(.postprocess_state_{pkg}.json) 기준으로 새 run만 처리해 누적 결과에 병합한다.
+      None이면 환경 변수 A3_DYNAMIC_INCREMENTAL (1/true/yes) 값을 따른다.
     """
 
     safe_print("\n" + "=" * 60)
     safe_print("=== Dynamic 후처리 파이프라인 시작 (3단계) ===")
     safe_print("=" * 60)
 
-    runner_base = Path(__file__).parent
-
-    # 필수 파일들 (dynamic_runner.py와 같은 폴더에 있다고 가정)
-    required_files = [
-        runner_base / "process_dynamic_results.py",
-        runner_base / "clean_corrupted_paths.py",
-        runner_base / "extract_folders_only.py",
-        runner_base / "tokenize_all_dynamic.py",
-        runner_base / "path_tokenizer.py",
-    ]
-
-    missing = [p.name for p in required_files if not p.exists()]
-    if missing:
-        safe_print(f"[!] 후처리 필수 파일 누락: {', '.join(missing)}")
-        safe_print("    (모두 dynamic_runner.py와 같은 폴더에 있어야 함)")
-        return None
-
-    # Case Export/dynamic 아래에 작업공간 생성
-    export_dynamic_dir_p = Path(export_dynamic_dir)
-    workspace = export_dynamic_dir_p / "_postprocess_workspace"
-    _ensure_empty_dir(workspace)
+    if keep_intermediate is None:
+        keep_intermediate = os.environ.get("A3_KEEP_DYNAMIC_INTERMEDIATE", "").strip().lower() in ("1", "true", "yes")
+    if incremental is None:
+        incremental = os.environ.get("A3_DYNAMIC_INCREMENTAL", "").strip().lower() in ("1", "true", "yes")
 
-    # workspace로 스크립트 복사
-    for f in required_files:
-        shutil.copy2(str(f), str(workspace / f.name))
+    try:
+        from dynamic_postprocess import (
+            INTERMEDIATE_DIRS, postprocess_dynamic_csv, postprocess_dynamic_runs,
+            find_run_csvs, default_state_path, format_stats,
+        )
+    except ImportError as e:
+        safe_print(f"[!] 후처리 모듈 로드 실패: {e}")
+        return None
 
-    # process_dynamic_results.py가 찾는 입력 구조: workspace/Dynamic/dynamic_*.csv
-    ws_dynamic = workspace / "Dynamic"
-    ws_dynamic.mkdir(parents=True, exist_ok=True)
+    export_dir_p = Path(export_dir)
+    export_dir_p.mkdir(parents=True, exist_ok=True)
+    final_db_dst = export_dir_p / f"db_dynamic_{package_name}.csv"
 
-    ws_input_csv = ws_dynamic / f"dynamic_{package_name}.csv"
-    shutil.copy2(input_export_csv_path, str(ws_input_csv))
-    safe_print(f"[+] 후처리 입력 준비: {ws_input_csv}")
+    intermediate_dir = None
+    if keep_intermediate:
+        intermediate_dir = Path(export_dynamic_dir)
+        # 기존 중간 산출물 폴더는 덮어쓰기
+        for name in INTERMEDIATE_DIRS:
+            _ensure_empty_dir(intermediate_dir / name)
 
-    # workspace에서 process_dynamic_results.py 실행
-    cmd = [sys.executable, "process_dynamic_results.py"]
-    safe_print(f"[+] 실행: {' '.join(cmd)}")
-    safe_print(f"[+] CWD: {workspace}")
+    run_csvs = find_run_csvs(export_dynamic_dir, package_name) if incremental else {}
+    if incremental and not run_csvs:
+        safe_print("[!] 보관된 pipeline run 결과 없음 → 전체 후처리로 진행")
 
     try:
-        p = subprocess.run(
-            cmd,
-            cwd=str(workspace),
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            errors="replace"
-        )
-        if p.stdout:
-            safe_print(p.stdout.rstrip())
-        if p.returncode != 0:
-            if p.stderr:
-                safe_print(p.stderr.rstrip())
-            safe_print(f"[!] 후처리 실패 (exit code {p.returncode})")
-            return None
+        if run_csvs:
+            safe_print(f"[+] 후처리 입력(증분): {export_dynamic_dir} (pipeline run {len(run_csvs)}개)")
+            stats = postprocess_dynamic_runs(
+                run_csvs,
+                final_db_dst,
+                default_state_path(export_dynamic_dir, package_name),
+                intermediate_dir=intermediate_dir,
+                name=f"dynamic_{package_name}.csv",
+            )
+            safe_print(f"[+] 새 run {stats['runs_new']}개 / 전체 {stats['runs_total']}개"
+                       f"{' (상태 재구성)' if stats['rebuilt'] else ''}, 새로 토큰화한 폴더 {stats['newly_tokenized']}개")
+        else:
+            safe_print(f"[+] 후처리 입력: {input_export_csv_path}")
+            stats = postprocess_dynamic_csv(
+                input_export_csv_path,
+                final_db_dst,
+                intermediate_dir=intermediate_dir,
+                name=f"dynamic_{package_name}.csv",
+            )
     except Exception as e:
         safe_print(f"[!] 후처리 실행 오류: {e}")
         return None
 
-    # workspace 결과물들을 Case Export/dynamic 아래로 이동/정리
-    # (원하는 위치: Case/Export/dynamic/Dynamic_cleaned ... )
-    targets = {
-        "Dynamic_cleaned": workspace / "Dynamic_cleaned",
-        "Dynamic_folders": workspace / "Dynamic_folders",
-        "Dynamic_tokenized": workspace / "Dynamic_tokenized",
-    }
-
-    for name, src in targets.items():
-        if src.exists() and src.is_dir():
-            dst = export_dynamic_dir_p / name
-            # 기존 폴더 있으면 덮어쓰기
-            if dst.exists():
-                shutil.rmtree(dst, ignore_errors=True)
-            shutil.move(str(src), str(dst))
-            safe_print(f"[+] 중간 산출물 저장: {dst}")
-        else:
-            safe_print(f"[!] 경고: {name} 생성 안됨 (없음): {src}")
-
-    # 최종 산출물: export_dir 루트로 db_dynamic_*.csv 복사
-    tokenized_dir = export_dynamic_dir_p / "Dynamic_tokenized"
-    db_csv_candidates = []
-    if tokenized_dir.exists():
-        db_csv_candidates = list(tokenized_dir.rglob(f"db_dynamic_{package_name}.csv"))
-        if not db_csv_candidates:
-            # 패키지명 정확히 매칭 안되면 전체 후보 중 package_name 포함 우선
-            all_db = list(tokenized_dir.rglob("db_dynamic_*.csv"))
-            db_csv_candidates = [p for p in all_db if package_name in p.name] or all_db
-
-    if not db_csv_candidates:
-        safe_print("[!] 경고: db_dynamic_*.csv 최종 산출물을 찾지 못했습니다.")
-        return None
-
-    # 가장 “패키지명 정확 매칭” 우선으로 1개 선택
-    final_db_csv = None
-    for pth in db_csv_candidates:
-        if pth.name == f"db_dynamic_{package_name}.csv":
-            final_db_csv = pth
-            break
-    if final_db_csv is None:
-        final_db_csv = db_csv_candidates[0]
-
-    export_dir_p = Path(export_dir)
-    export_dir_p.mkdir(parents=True, exist_ok=True)
-    final_db_dst = export_dir_p / final_db_csv.name
-    shutil.copy2(str(final_db_csv), str(final_db_dst))
+    safe_print(f"[+] {format_stats(stats)}")
+    if intermediate_dir:
+        safe_print(f"[+] 중간 산출물 저장: {intermediate_dir}")
     safe_print(f"[+] 최종 산출물 저장: {final_db_dst}")
 
-    # workspace는 남길지/지울지 선택 (디버깅 편의상 기본 삭제)
-    try:
-        shutil.rmtree(workspace, ignore_errors=True)
-    except:
-        pass
-
     safe_print("=" * 60)
     safe_print("=== Dynamic 후처리 파이프라인 완료 ===")
     safe_print("=" * 60)
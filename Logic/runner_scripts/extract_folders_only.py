@@ -7,12 +7,16 @@
 - 중복 제거
 """
 
+import argparse
 import csv
+import functools
 import sys
 from pathlib import Path
 
-# Windows 인코딩 문제 해결
-if sys.platform == 'win32':
+from app_batch import add_batch_arguments, list_app_csvs, run_batch
+
+# Windows 인코딩 문제 해결 (스크립트 실행 시에만, import 시 호출자 stdout은 건드리지 않음)
+if sys.platform == 'win32' and __name__ == "__main__":
     import io
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
@@ -71,22 +75,17 @@ def process_csv(input_path: Path, output_path: Path):
     return len(sorted_paths)
 
 
-def load_applist(base_dir: Path) -> list:
-    """applist.txt에서 패키지 목록 로드"""
-    applist_file = base_dir / "applist.txt"
-    if not applist_file.exists():
-        return None
-
-    packages = []
-    with applist_file.open('r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith('#'):
-                packages.append(line)
-    return packages
+def _extract_task(csv_file: Path, output_dir: Path) -> str:
+    """배치 작업 단위: 앱 하나 폴더 경로 추출 → 요약 문자열"""
+    count = process_csv(csv_file, output_dir / csv_file.name)
+    return f"{count} folder paths"
 
 
 def main():
+    ap = argparse.ArgumentParser(description="폴더 경로만 추출 (Dynamic_cleaned/ → Dynamic_folders/)")
+    add_batch_arguments(ap)
+    args = ap.parse_args()
+
     base_dir = Path(__file__).parent  # 현재 스크립트가 있는 디렉토리
     input_dir = base_dir / "Dynamic_cleaned"
     output_dir = base_dir / "Dynamic_folders"
@@ -94,19 +93,8 @@ def main():
     # 출력 디렉토리 생성
     output_dir.mkdir(exist_ok=True)
 
-    # applist.txt 확인
-    applist = load_applist(base_dir)
-
-    if applist:
-        # applist에 있는 파일만 처리
-        csv_files = [input_dir / f"dynamic_{pkg}.csv" for pkg in applist]
-        csv_files = [f for f in csv_files if f.exists()]
-        print(f"Using applist.txt: {len(applist)} packages specified, {len(csv_files)} files found")
-    else:
-        # 모든 파일 처리
-        csv_files = list(input_dir.glob("dynamic_*.csv"))
-        print(f"No applist.txt found, processing all files")
-
+    # applist.txt 확인 (없으면 모든 파일 처리)
+    csv_files = list_app_csvs(input_dir, base_dir)
     total = len(csv_files)
 
     print("=" * 80)
@@ -118,21 +106,15 @@ def main():
     print("=" * 80)
     print()
 
-    success = 0
-    failed = 0
-
-    for idx, csv_file in enumerate(csv_files, 1):
-        output_file = output_dir / csv_file.name
-
-        print(f"[{idx}/{total}] Processing: {csv_file.name}")
-
-        try:
-            count = process_csv(csv_file, output_file)
-            print(f"    ✅ {count} folder paths")
-            success += 1
-        except Exception as e:
-            print(f"    ❌ ERROR: {str(e)}")
-            failed += 1
+    success, failed = run_batch(
+        csv_files,
+        functools.partial(_extract_task, output_dir=output_dir),
+        output_for=lambda f: output_dir / f.name,
+        output_dir=output_dir,
+        step="extract_folders_only",
+        jobs=args.jobs,
+        resume=args.resume,
+    )
 
     print()
     print("=" * 80)
@@ -75,14 +75,20 @@
 
 import os
 import re
-import pandas as pd
 import sys
+from pathlib import Path
+
+# 공용 모듈 패키지 (Logic/shared)
+_LOGIC_DIR = str(Path(__file__).resolve().parent.parent)
+if _LOGIC_DIR not in sys.path:
+    sys.path.insert(0, _LOGIC_DIR)
+
+from shared.path_list_io import detect_encoding, read_header, iter_path_column, write_rows
 
 print("=" * 80)
 print("[extract_temp_files.py] 시작")
 print(f"[DEBUG] sys.argv: {sys.argv}")
 print(f"[DEBUG] Python: {sys.version}")
-print(f"[DEBUG] pandas: {pd.__version__}")
 print("=" * 80)
 
 # ✅ 확장된 임시파일 패턴
@@ -106,24 +112,23 @@ def extract_temp_rows(dynamic_csv: str):
         return []
     
     try:
-        df = pd.read_csv(dynamic_csv, encoding="utf-8")
-        print(f"[DEBUG] CSV 로드 성공")
-        print(f"[DEBUG] shape: {df.shape}")
-        print(f"[DEBUG] columns: {df.columns.tolist()}")
+        encoding = detect_encoding(dynamic_csv)
+        header = read_header(dynamic_csv, encoding)
+        print(f"[DEBUG] CSV 로드 성공 (encoding: {encoding})")
+        print(f"[DEBUG] columns: {header}")
+        paths = list(iter_path_column(dynamic_csv, encoding=encoding)) if header else []
     except Exception as e:
         print(f"[ERROR] CSV 로드 실패: {e}")
         import traceback
         traceback.print_exc()
         return []
     
-    if df.empty:
+    if not paths:
         print("[WARN] CSV가 비어있음")
         return []
     
-    col = df.columns[0]
+    col = header[0]
     print(f"[DEBUG] 사용 컬럼: {col}")
-    
-    paths = df[col].dropna().astype(str)
     print(f"[DEBUG] 경로 수: {len(paths)}")
     
     hit = []
@@ -173,14 +178,11 @@ def write_temp_csv(dynamic_csv: str, out_csv: str):
     
     if not rows:
         print("[WARN] 조건에 맞는 임시파일이 없습니다.")
-        out_df = pd.DataFrame(columns=["name", "path", "kind", "attr"])
-    else:
-        out_df = pd.DataFrame(rows, columns=["name", "path", "kind", "attr"])
     
     try:
-        out_df.to_csv(out_csv, index=False, encoding="utf-8")
+        written = write_rows(out_csv, ["name", "path", "kind", "attr"], rows, encoding="utf-8")
         print(f"[SUCCESS] CSV 저장 완료: {out_csv}")
-        print(f"[DEBUG] 저장된 행 수: {len(out_df)}")
+        print(f"[DEBUG] 저장된 행 수: {written}")
         print(f"[DEBUG] 파일 존재 확인: {os.path.exists(out_csv)}")
         
         if os.path.exists(out_csv):
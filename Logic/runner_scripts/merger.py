@@ -6,7 +6,14 @@ Static/Dynamic 결과 병합
 """
 import os
 import sys
-import pandas as pd
+from pathlib import Path
+
+# 공용 모듈 패키지 (Logic/shared)
+_LOGIC_DIR = str(Path(__file__).resolve().parent.parent)
+if _LOGIC_DIR not in sys.path:
+    sys.path.insert(0, _LOGIC_DIR)
+
+from shared.path_list_io import read_path_set, read_header, write_path_list
 
 if sys.platform == 'win32':
     import io
@@ -17,17 +24,14 @@ if sys.platform == 'win32':
 def load_path_set(csv_path):
     """CSV 파일에서 경로 set 로드"""
     try:
-        df = pd.read_csv(csv_path, encoding='utf-8')
+        if not read_header(csv_path):
+            print(f"[WARN] 빈 CSV: {csv_path}")
+            return set()
+        # 첫 번째 컬럼 (pandas 없이 스트리밍)
+        paths = read_path_set(csv_path)
     except Exception as e:
         print(f"[ERROR] CSV 로드 실패: {csv_path} ({e})")
         return None
-    
-    if df.shape[1] == 0:
-        print(f"[WARN] 빈 CSV: {csv_path}")
-        return set()
-    
-    first_col = df.columns[0]
-    paths = set(df[first_col].dropna().astype(str))
     return paths
 
 
@@ -77,8 +81,7 @@ def merge_results(package_name, output_dir=None):
     merged_paths = static_set | dynamic_set
     
     # 결과 저장
-    df_output = pd.DataFrame(sorted(merged_paths), columns=["path"])
-    df_output.to_csv(output_csv, index=False, encoding='utf-8')
+    write_path_list(output_csv, sorted(merged_paths), header="path", encoding='utf-8')
 
     print(f"\n[{package_name}]")
     print(f"  Static paths: {len(static_set)}")
@@ -5,10 +5,12 @@
 
 사용법:
     python process_dynamic_results.py
+    python process_dynamic_results.py --jobs 4 --resume   # 앱 4개씩 병렬, 완료된 앱 건너뛰기
 
 필수 디렉토리 구조:
     - Dynamic/           : 원본 dynamic_*.csv 파일들이 있는 폴더
-    - path_tokenizer.py  : 토큰화 스크립트
+    - dynamic_postprocess.py, path_tokenizer.py : 후처리 / 토큰화 모듈 (같은 폴더)
+    - ../tokenizer/      : 공용 토큰화 규칙 패키지 (Logic/tokenizer)
 
 출력:
     - Dynamic_cleaned/   : 깨진 문자 제거된 CSV
@@ -16,10 +18,12 @@
     - Dynamic_tokenized/ : 토큰화된 최종 결과 (db_dynamic_*.csv)
 """
 
-import subprocess
+import argparse
 import sys
 from pathlib import Path
 
+from app_batch import add_batch_arguments, init_worker_tokenizer, list_app_csvs, run_batch, worker_tokenizer
+
 # Windows 인코딩 문제 해결
 if sys.platform == 'win32':
     import io
@@ -34,10 +38,14 @@ DYNAMIC_CLEANED_DIR = BASE_DIR / "Dynamic_cleaned"
 DYNAMIC_FOLDERS_DIR = BASE_DIR / "Dynamic_folders"
 DYNAMIC_TOKENIZED_DIR = BASE_DIR / "Dynamic_tokenized"
 
-# 필수 스크립트 경로
-CLEAN_SCRIPT = BASE_DIR / "clean_corrupted_paths.py"
-EXTRACT_SCRIPT = BASE_DIR / "extract_folders_only.py"
-TOKENIZE_SCRIPT = BASE_DIR / "tokenize_all_dynamic.py"
+# 필수 모듈 경로 (모두 같은 프로세스에서 import)
+REQUIRED_MODULES = [
+    BASE_DIR / "dynamic_postprocess.py",
+    BASE_DIR / "clean_corrupted_paths.py",
+    BASE_DIR / "extract_folders_only.py",
+    BASE_DIR / "path_tokenizer.py",
+    BASE_DIR.parent / "tokenizer" / "engine.py",
+]
 
 
 def check_prerequisites():
@@ -58,77 +66,46 @@ def check_prerequisites():
 
     print(f"✅ Dynamic 디렉토리에서 {len(csv_files)}개 CSV 파일 발견")
 
-    # 필수 스크립트 확인
-    missing_scripts = []
-    for script in [CLEAN_SCRIPT, EXTRACT_SCRIPT, TOKENIZE_SCRIPT]:
-        if not script.exists():
-            missing_scripts.append(script.name)
-
-    if missing_scripts:
-        print(f"❌ 필수 스크립트를 찾을 수 없습니다: {', '.join(missing_scripts)}")
+    # 필수 모듈 확인
+    missing = [m.name for m in REQUIRED_MODULES if not m.exists()]
+    if missing:
+        print(f"❌ 필수 스크립트를 찾을 수 없습니다: {', '.join(missing)}")
         return False
 
     print(f"✅ 모든 필수 스크립트 확인 완료")
-
-    # path_tokenizer.py 확인
-    tokenizer = BASE_DIR / "path_tokenizer.py"
-    if not tokenizer.exists():
-        print(f"❌ path_tokenizer.py를 찾을 수 없습니다: {tokenizer}")
-        return False
-
-    print(f"✅ path_tokenizer.py 확인 완료")
     print()
 
     return True
 
 
-def run_step(step_num, step_name, script_path):
-    """파이프라인 단계 실행"""
-    print("=" * 80)
-    print(f"Step {step_num}: {step_name}")
-    print("=" * 80)
-    print()
+def output_path_for(csv_file: Path) -> Path:
+    return DYNAMIC_TOKENIZED_DIR / csv_file.name.replace("dynamic_", "db_dynamic_")
 
-    try:
-        result = subprocess.run(
-            ["python", str(script_path)],
-            capture_output=True,
-            text=True,
-            check=True,
-            encoding='utf-8',
-            errors='replace'
-        )
-
-        # 스크립트 출력 표시
-        print(result.stdout)
-
-        print(f"✅ Step {step_num} 완료")
-        print()
-        return True
-
-    except subprocess.CalledProcessError as e:
-        print(e.stdout)
-        print(e.stderr)
-        print(f"❌ Step {step_num} 실패 (exit code {e.returncode})")
-        print()
-        return False
-    except Exception as e:
-        print(f"❌ Step {step_num} 실패: {str(e)}")
-        print()
-        return False
+
+def _postprocess_task(csv_file: Path) -> str:
+    """배치 작업 단위: 앱 하나 clean → folders → tokenize (중간 산출물 포함)"""
+    from dynamic_postprocess import format_stats, postprocess_dynamic_csv
+
+    stats = postprocess_dynamic_csv(csv_file, output_path_for(csv_file),
+                                    intermediate_dir=BASE_DIR, tokenizer=worker_tokenizer())
+    return format_stats(stats, with_time=False)
 
 
 def main():
+    ap = argparse.ArgumentParser(description="동적 분석 결과 후처리 파이프라인 (Dynamic/ → Dynamic_tokenized/)")
+    add_batch_arguments(ap)
+    args = ap.parse_args()
+
     print("=" * 80)
     print("동적 분석 결과 후처리 파이프라인")
     print("=" * 80)
     print()
     print(f"작업 디렉토리: {BASE_DIR}")
     print()
-    print("처리 단계:")
-    print("  1. 깨진 문자 제거 (clean_corrupted_paths.py)")
-    print("  2. 폴더 경로만 추출 (extract_folders_only.py)")
-    print("  3. 경로 토큰화 (tokenize_all_dynamic.py)")
+    print("처리 단계 (파일마다 한 번 읽고 한 번 쓰기):")
+    print("  1. 깨진 문자 제거 (clean_corrupted_paths 규칙)")
+    print("  2. 폴더 경로만 추출 (extract_folders_only 규칙)")
+    print("  3. 경로 토큰화 + 중복 제거 (path_tokenizer)")
     print()
 
     # 사전 조건 확인
@@ -138,24 +115,26 @@ def main():
         print("=" * 80)
         sys.exit(1)
 
-    # Step 1: 깨진 문자 제거
-    if not run_step(1, "깨진 문자 제거", CLEAN_SCRIPT):
-        print("=" * 80)
-        print("❌ 파이프라인 실패 (Step 1)")
-        print("=" * 80)
-        sys.exit(1)
+    # applist.txt 확인 (없으면 모든 파일 처리)
+    csv_files = list_app_csvs(DYNAMIC_DIR, BASE_DIR)
+    total = len(csv_files)
+    print()
 
-    # Step 2: 폴더 경로만 추출
-    if not run_step(2, "폴더 경로만 추출", EXTRACT_SCRIPT):
-        print("=" * 80)
-        print("❌ 파이프라인 실패 (Step 2)")
-        print("=" * 80)
-        sys.exit(1)
+    success, failed = run_batch(
+        csv_files,
+        _postprocess_task,
+        output_for=output_path_for,
+        output_dir=DYNAMIC_TOKENIZED_DIR,
+        step="process_dynamic_results",
+        jobs=args.jobs,
+        resume=args.resume,
+        initializer=init_worker_tokenizer,
+    )
+    print()
 
-    # Step 3: 토큰화
-    if not run_step(3, "경로 토큰화", TOKENIZE_SCRIPT):
+    if failed:
         print("=" * 80)
-        print("❌ 파이프라인 실패 (Step 3)")
+        print(f"❌ 파이프라인 실패 ({failed}/{total})")
         print("=" * 80)
         sys.exit(1)
 
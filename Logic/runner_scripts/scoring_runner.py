@@ -165,9 +165,15 @@ scoring_runner.py
 새 스코어링 시스템(priority_scoring_system_2.py) 적용
 """
 import sys, os
-import pandas as pd
 from pathlib import Path
 
+# 공용 모듈 패키지 (Logic/shared)
+_LOGIC_DIR = str(Path(__file__).resolve().parent.parent)
+if _LOGIC_DIR not in sys.path:
+    sys.path.insert(0, _LOGIC_DIR)
+
+from shared.path_list_io import read_header, iter_path_column
+
 # 새 Score 모듈 import
 sys.path.insert(0, str(Path(__file__).parent.parent / "Score"))
 from Logic.Score.priority_scoring_system_2 import ForensicPriorityScorer
@@ -196,26 +202,20 @@ def run_scoring(merged_csv_path, crime_type='살인', output_dir=None):
         return None
     
     try:
-        df = pd.read_csv(merged_csv_path, encoding='utf-8')
-        print(f"[+] {len(df)}개 아티팩트 로드")
+        header = read_header(merged_csv_path)
+        if not header:
+            print("[ERROR] 빈 CSV 파일")
+            return None
+
+        path_column = header[0]
+        print(f"[+] 경로 열: {path_column}")
+
+        # 경로 리스트 생성 (첫 번째 열, 공백뿐인 값 제외)
+        paths = [p for p in iter_path_column(merged_csv_path) if p.strip()]
     except Exception as e:
         print(f"[ERROR] CSV 로드 실패: {e}")
         return None
     
-    if df.shape[1] == 0:
-        print("[ERROR] 빈 CSV 파일")
-        return None
-    
-    path_column = df.columns[0]
-    print(f"[+] 경로 열: {path_column}")
-    
-    # 경로 리스트 생성
-    paths = [
-        str(row[path_column])
-        for _, row in df.iterrows()
-        if pd.notna(row[path_column]) and str(row[path_column]).strip()
-    ]
-    
     print(f"[+] {len(paths)}개 유효 경로 확인")
     
     # 스코어링 실행
@@ -10,6 +10,11 @@ import os
 import re
 from pathlib import Path
 
+# 공용 모듈 패키지 (Logic/shared)
+_LOGIC_DIR = str(Path(__file__).resolve().parent.parent)
+if _LOGIC_DIR not in sys.path:
+    sys.path.insert(0, _LOGIC_DIR)
+
 # Windows 콘솔 인코딩 문제 해결
 if sys.platform == 'win32':
     import io
@@ -66,6 +71,24 @@ def run_cmd(cmd: str, description: str = ""):
     return True
 
 
+def report_snapshot_coverage(snapshot, paths_csv):
+    """
+    ADB 스냅샷(fs_snapshot.PathSnapshot) 기준 static 경로 존재 여부 요약
+    - 경로 그대로 있으면 exact, 상위 폴더까지만 있으면 parent (토큰이 들어간 경로 등)
+    """
+    from shared.path_list_io import detect_path_column, read_header, iter_path_column
+
+    col = detect_path_column(read_header(paths_csv))
+    counts = {"total": 0, "exact": 0, "parent": 0}
+    for path in iter_path_column(paths_csv, col):
+        counts["total"] += 1
+        hit = snapshot.deepest_existing(path)
+        if hit is None:
+            continue
+        counts["exact" if snapshot.exists(path) else "parent"] += 1
+    return counts
+
+
 def extract_package_name(apk_path):
     """APK에서 패키지명 추출"""
     try:
@@ -79,8 +102,13 @@ def extract_package_name(apk_path):
         safe_print(f"[!] 패키지명 추출 실패: {e}")
         return None
 
-def run_static_analysis(apk_path, output_dir=None):
-    """Static 분석 실행"""
+def run_static_analysis(apk_path, output_dir=None, intermediate=None):
+    """
+    Static 분석 실행
+    - intermediate: 단계 간 중간 파일 형식 ("csv" | "parquet")
+      None이면 환경변수 A3_STATIC_INTERMEDIATE, 없으면 "csv"
+      parquet이어도 최종 결과(GUI용)는 CSV
+    """
     safe_print("=" * 60)
     safe_print("=== Static 분석 시작 ===")
     safe_print("=" * 60)
@@ -97,6 +125,11 @@ def run_static_analysis(apk_path, output_dir=None):
 
     safe_pkg_name = re.sub(r'[^\w\-.]', '_', package_name)
 
+    intermediate = (intermediate or os.environ.get("A3_STATIC_INTERMEDIATE") or "csv").lower()
+    if intermediate not in ("csv", "parquet"):
+        safe_print(f"[!] 알 수 없는 중간 파일 형식: {intermediate} (csv 사용)")
+        intermediate = "csv"
+
     # Static Logic 디렉토리 찾기 (Static 사용)
     script_dir = Path(__file__).parent
     static_dir = script_dir.parent / "Static"
@@ -121,7 +154,7 @@ def run_static_analysis(apk_path, output_dir=None):
 
     # 파일명 정의
     taint_out = f"taint_flows_{safe_pkg_name}_merged.jsonl"
-    artifacts_out = f"artifacts_path_{safe_pkg_name}_merged.csv"
+    artifacts_out = f"artifacts_path_{safe_pkg_name}_merged.{intermediate}"
     filtered_out = f"artifacts_{safe_pkg_name}_filter_path.csv"
     final_output = f"static_{package_name}.csv"
 
@@ -169,69 +202,55 @@ def run_static_analysis(apk_path, output_dir=None):
         safe_print("=== 4.5단계: ADB 경로 검증 ===")
         safe_print("=" * 60)
         
-        adb_extract_script = script_dir.parent / "Dynamic" / "adb_extraction.py"
-        compare_script = script_dir.parent / "Dynamic" / "compare_paths.py"
+        dynamic_dir = script_dir.parent / "Dynamic"
+        compare_script = dynamic_dir / "compare_paths.py"
+        adb_paths_file = f"paths_{safe_pkg_name}_dirs.csv"
         
-        # ADB 경로 추출
-        if adb_extract_script.exists():
-            #  adb_extraction.py는 대화형이므로 패키지명을 stdin으로 전달
+        # ADB 경로 추출 (adb_extraction.extract_paths 를 프로세스 안에서 호출)
+        if (dynamic_dir / "adb_extraction.py").exists():
             safe_print(f"\n[+] ADB 경로 추출 중...")
             safe_print(f"[+] 패키지: {package_name}")
             
             try:
-                # adb_extraction.py 실행 (패키지명 자동 입력)
-                result = subprocess.run(
-                    ['python', str(adb_extract_script)],
-                    input=package_name + '\n',  # ← stdin으로 패키지명 전달
-                    capture_output=True,
-                    text=True,
-                    encoding='utf-8',
-                    errors='replace',
-                    cwd=str(script_dir.parent / "Dynamic"),  # Dynamic 폴더에서 실행
-                    timeout=60
-                )
-                
-                if result.stdout:
-                    for line in result.stdout.split('\n'):
-                        if line.strip():
-                            safe_print(line)
+                if str(dynamic_dir) not in sys.path:
+                    sys.path.append(str(dynamic_dir))
+                from adb_extraction import extract_paths, write_paths_csv
+
+                snapshot = extract_paths(package_name, mode="basic")
                 
-                if result.returncode == 0:
-                    safe_print("[+] ADB 추출 완료")
-                    
-                    # ADB 결과 파일 찾기 (Dynamic 폴더에 생성됨)
-                    dynamic_dir = script_dir.parent / "Dynamic"
-                    adb_files = list(dynamic_dir.glob(f"paths_{package_name}_dirs_*.csv"))
+                if snapshot.extracted:
+                    write_paths_csv(adb_paths_file, snapshot.extracted)
+                    safe_print(f"[+] ADB 추출 완료: {len(snapshot.extracted)}개 폴더")
+                    safe_print(f"[+] ADB 파일: {adb_paths_file}")
+
+                    # static 경로가 기기에 실제로 있는지 요약
+                    if len(snapshot) and os.path.exists(filtered_out):
+                        cov = report_snapshot_coverage(snapshot, filtered_out)
+                        safe_print(
+                            f"[+] 스냅샷 검증: {cov['total']}개 중 "
+                            f"경로 존재 {cov['exact']}개, 상위 폴더만 존재 {cov['parent']}개"
+                        )
                     
-                    if adb_files:
-                        # 가장 최근 파일 선택
-                        adb_paths_file = str(sorted(adb_files)[-1])
-                        safe_print(f"[+] ADB 파일: {adb_paths_file}")
+                    #  compare_paths.py 실행
+                    if compare_script.exists():
+                        safe_print(f"\n[+] Static vs ADB 비교 중...")
+                        
+                        cmd_compare = (
+                            f'python "{compare_script}" '
+                            f'--static "{artifacts_out}" '
+                            f'--adb "{adb_paths_file}" '
+                            f'--output "{filtered_out}"'
+                        )
                         
-                        #  compare_paths.py 실행
-                        if compare_script.exists():
-                            safe_print(f"\n[+] Static vs ADB 비교 중...")
-                            
-                            cmd_compare = (
-                                f'python "{compare_script}" '
-                                f'--static "{artifacts_out}" '
-                                f'--adb "{adb_paths_file}" '
-                                f'--output "{filtered_out}"'
-                            )
-                            
-                            if run_cmd(cmd_compare, "ADB 검증"):
-                                safe_print("[+]  ADB 검증 완료 - 일치하는 경로만 필터링됨")
-                            else:
-                                safe_print("[WARN] ⚠️ ADB 비교 실패, 기존 필터 결과 사용")
+                        if run_cmd(cmd_compare, "ADB 검증"):
+                            safe_print("[+]  ADB 검증 완료 - 일치하는 경로만 필터링됨")
                         else:
-                            safe_print("[WARN] compare_paths.py 없음")
+                            safe_print("[WARN] ⚠️ ADB 비교 실패, 기존 필터 결과 사용")
                     else:
-                        safe_print("[WARN] ADB 결과 파일 없음")
+                        safe_print("[WARN] compare_paths.py 없음")
                 else:
-                    safe_print(f"[WARN] ADB 추출 실패 (exit code: {result.returncode})")
+                    safe_print("[WARN] ADB 추출 결과 없음")
             
-            except subprocess.TimeoutExpired:
-                safe_print("[WARN] ADB 추출 타임아웃")
             except Exception as e:
                 safe_print(f"[WARN] ADB 추출 오류: {e}")
         else:
@@ -244,6 +263,7 @@ def run_static_analysis(apk_path, output_dir=None):
             taint_out,
             artifacts_out,
             filtered_out,
+            adb_paths_file,
             "memory_trace.log",
             "meta_context_file_methods.txt",
             "meta_storage_ids_debug.json",
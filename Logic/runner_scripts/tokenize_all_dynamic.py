@@ -1,16 +1,22 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
-Dynamic_cleaned CSV를 path_tokenizer.py로 토큰화
+Dynamic_folders CSV를 path_tokenizer로 토큰화
+- path_tokenizer.tokenize_csv 를 같은 프로세스에서 호출 (파일마다 인터프리터 + pandas 재시작 없음)
+- --jobs N: 프로세스 풀 병렬 처리 (워커마다 토크나이저 캐시 하나)
+- --resume: 이전 실행에서 완료된 앱 건너뛰기
 """
 
-import subprocess
+import argparse
+import contextlib
+import io
 import sys
 from pathlib import Path
 
+from app_batch import add_batch_arguments, init_worker_tokenizer, list_app_csvs, run_batch, worker_tokenizer
+
 # Windows 인코딩 문제 해결
-if sys.platform == 'win32':
-    import io
+if sys.platform == 'win32' and __name__ == "__main__":
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
 
@@ -18,40 +24,38 @@ if sys.platform == 'win32':
 BASE_DIR = Path(__file__).parent  # 현재 스크립트가 있는 디렉토리
 INPUT_DIR = BASE_DIR / "Dynamic_folders"
 OUTPUT_DIR = BASE_DIR / "Dynamic_tokenized"
-TOKENIZER = BASE_DIR / "path_tokenizer.py"
 
-def load_applist(base_dir: Path) -> list:
-    """applist.txt에서 패키지 목록 로드"""
-    applist_file = base_dir / "applist.txt"
-    if not applist_file.exists():
-        return None
 
-    packages = []
-    with applist_file.open('r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith('#'):
-                packages.append(line)
-    return packages
+def output_path_for(csv_file: Path) -> Path:
+    # 출력 파일명: dynamic_xxx.csv -> db_dynamic_xxx.csv
+    return OUTPUT_DIR / csv_file.name.replace("dynamic_", "db_dynamic_")
+
+
+def _tokenize_task(csv_file: Path) -> str:
+    """배치 작업 단위: 앱 하나 토큰화 (path_tokenizer --dedupe-only --unique-col-name path 와 동일)"""
+    from path_tokenizer import tokenize_csv
+
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        tokenize_csv(
+            csv_file, output_path_for(csv_file),
+            column="path", new_column="path_tokenized",
+            dedupe_only=True, with_counts=False, unique_col_name="path",
+            tokenizer=worker_tokenizer(),
+        )
+    return out.getvalue().strip()
 
 
 def main():
+    ap = argparse.ArgumentParser(description="Dynamic_folders CSV 토큰화 (→ Dynamic_tokenized/db_dynamic_*.csv)")
+    add_batch_arguments(ap)
+    args = ap.parse_args()
+
     # 출력 디렉토리 생성
     OUTPUT_DIR.mkdir(exist_ok=True)
 
-    # applist.txt 확인
-    applist = load_applist(BASE_DIR)
-
-    if applist:
-        # applist에 있는 파일만 처리
-        csv_files = [INPUT_DIR / f"dynamic_{pkg}.csv" for pkg in applist]
-        csv_files = [f for f in csv_files if f.exists()]
-        print(f"Using applist.txt: {len(applist)} packages specified, {len(csv_files)} files found")
-    else:
-        # 모든 파일 처리
-        csv_files = list(INPUT_DIR.glob("dynamic_*.csv"))
-        print(f"No applist.txt found, processing all files")
-
+    # applist.txt 확인 (없으면 모든 파일 처리)
+    csv_files = list_app_csvs(INPUT_DIR, BASE_DIR)
     total = len(csv_files)
 
     print("=" * 60)
@@ -63,42 +67,16 @@ def main():
     print("=" * 60)
     print()
 
-    success = 0
-    failed = 0
-
-    for idx, csv_file in enumerate(csv_files, 1):
-        # 출력 파일명: dynamic_xxx.csv -> db_dynamic_xxx.csv
-        output_filename = csv_file.name.replace("dynamic_", "db_dynamic_")
-        output_file = OUTPUT_DIR / output_filename
-
-        print(f"[{idx}/{total}] Processing: {csv_file.name}")
-
-        try:
-            # path_tokenizer.py 실행
-            result = subprocess.run(
-                [
-                    "python", str(TOKENIZER),
-                    "--csv", str(csv_file),
-                    "--column", "path",
-                    "--new-column", "path_tokenized",
-                    "--out", str(output_file),
-                    "--dedupe-only",
-                    "--unique-col-name", "path"
-                ],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-
-            print(f"    ✅ Success: {result.stdout.strip()}")
-            success += 1
-
-        except subprocess.CalledProcessError as e:
-            print(f"    ❌ ERROR: {e.stderr.strip()}")
-            failed += 1
-        except Exception as e:
-            print(f"    ❌ ERROR: {str(e)}")
-            failed += 1
+    success, failed = run_batch(
+        csv_files,
+        _tokenize_task,
+        output_for=output_path_for,
+        output_dir=OUTPUT_DIR,
+        step="tokenize_all_dynamic",
+        jobs=args.jobs,
+        resume=args.resume,
+        initializer=init_worker_tokenizer,
+    )
 
     print()
     print("=" * 60)
@@ -106,4 +84,4 @@ def main():
     print("=" * 60)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
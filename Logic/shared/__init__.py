@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+"""
+shared
+Static / new_static / Dynamic / runner_scripts 공용 입출력 모듈 (단일 소스)
+
+모듈
+    path_list_io    경로 목록 CSV 읽기 / 쓰기 (표준 라이브러리 csv, pandas 불필요)
+    corruption_scan 경로 문자열의 깨진 문자 검사 / 유효 경로 조각 추출
+    stage_io        Static 단계 간 중간 파일 (CSV / Parquet)
+
+- 스크립트에서는 tokenizer 패키지와 같이 Logic 폴더를 sys.path에 넣고 import 한다.
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from shared.path_list_io import read_path_list
+- 모듈마다 필요한 것만 import 하도록 여기서는 아무것도 재노출하지 않는다.
+"""
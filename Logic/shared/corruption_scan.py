@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+corruption_scan.py
+경로 문자열의 깨진 문자(제어 문자, DEL~0x9F, U+FFFD) 검사 공용 모듈
+
+- 문자 하나씩 is_corrupted_char를 호출하던 검사를 미리 컴파일한 문자 클래스 정규식 한 번으로 처리
+- 깨진 문자 사이의 유효 경로 조각('/'부터 다음 깨진 문자 전까지)도 같은 정규식 한 번으로 추출
+- 컬럼 단위 검사(corruption_mask / scan_column)는 pandas .str 정규식으로 컬럼 전체를 한 번에 처리
+  (pandas가 없으면 값마다 같은 정규식으로 검사)
+(clean_corrupted_paths.py / cleanup_dynamic_corrupted.py / dynamic_postprocess.py 공용)
+"""
+
+import re
+from typing import Iterable, List, Tuple
+
+# 제어 문자 (0x00-0x1F), DEL + C1 제어 문자 (0x7F-0x9F), Unicode replacement character
+CORRUPTED_CHAR_CLASS = "[\x00-\x1f\x7f-\x9f\ufffd]"
+
+# 깨진 문자가 아닌 구간에서 첫 '/'부터 구간 끝까지 = 유효 경로 후보 조각
+PATH_FRAGMENT_PATTERN = "/[^\x00-\x1f\x7f-\x9f\ufffd]*"
+
+CORRUPTED_RE = re.compile(CORRUPTED_CHAR_CLASS)
+PATH_FRAGMENT_RE = re.compile(PATH_FRAGMENT_PATTERN)
+
+# str.translate 용: 깨진 문자 삭제 테이블
+_DELETE_CORRUPTED = dict.fromkeys(
+    list(range(0x00, 0x20)) + list(range(0x7F, 0xA0)) + [0xFFFD]
+)
+
+
+def has_corruption(text: str) -> bool:
+    """문자열에 깨진 문자가 하나라도 있으면 True"""
+    return CORRUPTED_RE.search(text) is not None
+
+
+def strip_corrupted(text: str) -> str:
+    """깨진 문자만 삭제한 문자열"""
+    return text.translate(_DELETE_CORRUPTED)
+
+
+def path_fragments(text: str) -> List[str]:
+    """
+    깨진 문자로 끊긴 경로 조각 목록 (앞뒤 공백 제거)
+    - 깨진 문자를 만나면 현재 경로 종료, 다음 '/'부터 새 경로 시작
+    - '/' 앞의 문자는 버림
+    """
+    return [m.strip() for m in PATH_FRAGMENT_RE.findall(text)]
+
+
+def scan_path(text: str) -> Tuple[bool, List[str]]:
+    """(깨진 문자 포함 여부, 경로 조각 목록). 깨진 문자가 없으면 조각은 원문 그대로 하나"""
+    if CORRUPTED_RE.search(text) is None:
+        return False, [text]
+    return True, path_fragments(text)
+
+
+def _as_series(values):
+    """pandas Series로 변환 (이미 Series면 그대로, pandas가 없으면 None)"""
+    if hasattr(values, "str"):
+        return values.astype(str)
+    try:
+        import pandas as pd
+    except ImportError:
+        return None
+    return pd.Series(list(values), dtype=object).astype(str)
+
+
+def corruption_mask(values: Iterable[str]) -> List[bool]:
+    """컬럼 전체 has_corruption (pandas면 .str.contains 한 번)"""
+    s = _as_series(values)
+    if s is None:
+        return [has_corruption(v) for v in values]
+    return s.str.contains(CORRUPTED_CHAR_CLASS, regex=True).tolist()
+
+
+def scan_column(values: Iterable[str]) -> List[Tuple[bool, List[str]]]:
+    """
+    컬럼 전체 scan_path
+    - pandas면 .str.contains / .str.findall 로 한 번에 처리 (list 등도 Series로 변환)
+    - pandas가 없으면 값마다 scan_path
+    """
+    s = _as_series(values)
+    if s is None:
+        return [scan_path(v) for v in values]
+    mask = s.str.contains(CORRUPTED_CHAR_CLASS, regex=True)
+    frags = s.where(mask, "").str.findall(PATH_FRAGMENT_PATTERN)
+    return [
+        (True, [f.strip() for f in fr]) if bad else (False, [v])
+        for v, bad, fr in zip(s, mask, frags)
+    ]
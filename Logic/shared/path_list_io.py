@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+path_list_io.py
+경로 목록 CSV 입출력 공용 모듈 (표준 라이브러리 csv만 사용)
+
+- 경로 컬럼 하나를 읽고 쓰는 작은 스크립트(merger / compare_paths / cleanup_dynamic_tokens /
+  extract_temp_files / scoring_runner)가 pandas import 없이 바로 시작하도록 분리
+- 읽기는 한 줄씩 스트리밍 (파일 전체를 DataFrame으로 올리지 않음)
+- 인코딩은 파일 앞부분을 보고 한 번에 결정 (BOM → utf-8 → cp949),
+  utf-8로 통째로 읽다가 실패하면 cp949로 다시 읽던 방식을 대체
+- 디코딩은 strict: 앞부분 이후에서 utf-8 디코딩이 실패하면 cp949로 다시 열고 읽던 줄 다음부터 이어서 읽음
+  (U+FFFD로 바꿔 넣지 않음. cp949로도 안 되면 UnicodeDecodeError)
+- 읽기 결과는 pd.read_csv(...)[col].dropna().astype(str) 과 같은 값 (빈 칸 제외, 공백 유지)
+- 쓰기는 DataFrame.to_csv(index=False) 와 같은 형식 (QUOTE_MINIMAL, os.linesep 줄바꿈)
+
+pandas import 정책: 위 스크립트들은 모듈 최상위에서 pandas를 import 하지 않는다.
+DataFrame이 꼭 필요한 기능은 해당 함수 안에서만 import 한다.
+"""
+
+import codecs
+import csv
+import itertools
+import os
+from contextlib import closing
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+# 인코딩 판별에 쓰는 파일 앞부분 크기
+DEFAULT_SAMPLE_SIZE = 1 << 16
+
+# BOM이 없을 때 순서대로 시도할 인코딩
+DEFAULT_ENCODINGS = ("utf-8", "cp949")
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def detect_encoding(path, sample_size: int = DEFAULT_SAMPLE_SIZE,
+                    candidates: Sequence[str] = DEFAULT_ENCODINGS) -> str:
+    """
+    파일 앞부분(sample_size 바이트)으로 인코딩 판별
+    - BOM이 있으면 BOM 기준 (utf-8-sig는 BOM을 떼고 읽음)
+    - 없으면 candidates 중 앞부분을 오류 없이 디코딩하는 첫 인코딩
+      (잘린 멀티바이트 문자가 끝에 걸려도 오류로 보지 않음)
+    """
+    with open(path, "rb") as f:
+        sample = f.read(sample_size)
+
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+
+    at_eof = len(sample) < sample_size
+    for encoding in candidates:
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=at_eof)
+        except UnicodeDecodeError:
+            continue
+        return encoding
+    return candidates[-1]
+
+
+def open_csv(path, encoding: Optional[str] = None, errors: str = "strict"):
+    """
+    csv 모듈용 텍스트 스트림 (encoding 미지정 시 detect_encoding)
+    - 스트림을 직접 읽으면 cp949 재시도가 없음 → 행 단위로 읽을 때는 iter_lines / iter_rows 사용
+    - 깨진 바이트를 U+FFFD로 받아야 하는 경우에만 errors="replace" 지정
+    """
+    return open(path, "r", encoding=encoding or detect_encoding(path), errors=errors, newline="")
+
+
+def iter_lines(path, encoding: Optional[str] = None,
+               candidates: Sequence[str] = DEFAULT_ENCODINGS) -> Iterator[str]:
+    """
+    텍스트 줄 스트리밍 (strict 디코딩, csv.reader 입력용)
+    - encoding 이 candidates 의 마지막이 아니면 UnicodeDecodeError 시 마지막 인코딩(cp949)으로 다시 열고
+      이미 넘긴 줄 수만큼 건너뛰어 이어서 읽음
+    """
+    encoding = encoding or detect_encoding(path, candidates=candidates)
+    done = 0
+    while True:
+        try:
+            with open_csv(path, encoding) as f:
+                for line in itertools.islice(f, done, None):
+                    yield line
+                    done += 1
+            return
+        except UnicodeDecodeError:
+            if encoding not in candidates[:-1]:
+                raise
+            encoding = candidates[-1]
+
+
+def detect_path_column(header: Sequence[str]) -> int:
+    """이름에 'path'가 들어간 첫 컬럼 위치 (없으면 0)"""
+    for i, name in enumerate(header):
+        if "path" in str(name).lower():
+            return i
+    return 0
+
+
+def iter_rows(path, encoding: Optional[str] = None) -> Iterator[Dict[str, str]]:
+    """헤더 기준 dict row 스트리밍 (빈 줄 제외, 모자란 칸은 빈 문자열)"""
+    with closing(iter_lines(path, encoding)) as lines:
+        for row in csv.DictReader(lines, restval=""):
+            yield row
+
+
+def read_header(path, encoding: Optional[str] = None) -> List[str]:
+    with closing(iter_lines(path, encoding)) as lines:
+        return next(csv.reader(lines), [])
+
+
+def iter_path_column(path, column=None, encoding: Optional[str] = None) -> Iterator[str]:
+    """
+    경로 컬럼 값 스트리밍 (빈 칸은 건너뜀)
+    - column: 컬럼 이름 또는 위치. None이면 첫 번째 컬럼
+    """
+    with closing(iter_lines(path, encoding)) as lines:
+        reader = csv.reader(lines)
+        header = next(reader, None)
+        if not header:
+            return
+        if column is None:
+            idx = 0
+        elif isinstance(column, int):
+            idx = column
+        else:
+            idx = header.index(column)
+        for row in reader:
+            if idx < len(row) and row[idx] != "":
+                yield row[idx]
+
+
+def read_path_list(path, column=None, encoding: Optional[str] = None, unique: bool = False) -> List[str]:
+    """경로 컬럼 목록 (unique=True면 처음 나온 순서대로 중복 제거)"""
+    paths = iter_path_column(path, column, encoding)
+    if unique:
+        return list(dict.fromkeys(paths))
+    return list(paths)
+
+
+def read_path_set(path, column=None, encoding: Optional[str] = None) -> set:
+    return set(iter_path_column(path, column, encoding))
+
+
+def write_rows(path, fieldnames: Sequence[str], rows: Iterable, encoding: str = "utf-8") -> int:
+    """
+    row 목록을 CSV로 저장 (DataFrame.to_csv(index=False)와 같은 형식). 저장한 행 수 반환
+    - rows: dict(fieldnames 키) 또는 값 시퀀스
+    """
+    count = 0
+    with open(path, "w", encoding=encoding, newline="") as f:
+        writer = csv.writer(f, lineterminator=os.linesep)
+        writer.writerow(fieldnames)
+        for row in rows:
+            if isinstance(row, dict):
+                row = [row.get(name, "") for name in fieldnames]
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def write_path_list(path, paths: Iterable[str], header: str = "path", encoding: str = "utf-8") -> int:
+    """경로 한 컬럼 CSV 저장. 저장한 행 수 반환"""
+    return write_rows(path, [header], ([p] for p in paths), encoding=encoding)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Static 단계 간 중간 파일 입출력
+- 출력 경로 확장자가 .parquet 이면 Arrow/Parquet, 그 외에는 기존 CSV
+- Parquet: caller/source/sink 등 시그니처 컬럼은 dictionary 인코딩, tainted는 bool 타입
+- CSV 읽기: utf-8 → cp949 fallback (기존 filter_artifacts / noise_filter 동작과 동일)
+- 빈 값: CSV는 빈 칸을 NaN으로 읽으므로 Parquet도 None / "" 를 null로 저장하고 NaN으로 읽음
+  (Parquet 중간 파일을 써도 str(row.get(...)) 결과가 CSV와 같도록)
+- pandas / pyarrow는 필요할 때만 import (artifacts_path_merged_fin.py는 pandas 없이 동작)
+"""
+
+from typing import Any, Dict, Iterable, List
+
+# 같은 긴 시그니처 문자열이 수천 번 반복되는 컬럼 → dictionary 인코딩
+SIGNATURE_COLUMNS = (
+    "package",
+    "caller",
+    "source",
+    "sink",
+    "matched_source_pattern",
+    "matched_sink_pattern",
+    "pattern_type",
+)
+
+# "Yes"/"No", True/False 가 섞여 들어오는 컬럼 → bool
+BOOL_COLUMNS = ("tainted",)
+
+_TRUE_VALUES = {"yes", "true", "1"}
+
+
+def is_parquet(path: str) -> bool:
+    return str(path).lower().endswith(".parquet")
+
+
+def _to_bool(v: Any) -> bool:
+    if isinstance(v, bool):
+        return v
+    return str(v).strip().lower() in _TRUE_VALUES
+
+
+def _text(v: Any):
+    """문자열 컬럼 값 (None / NaN / "" → None = Parquet null)"""
+    if v is None or (isinstance(v, float) and v != v):
+        return None
+    return str(v) or None
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("[!] Parquet 중간 파일을 쓰려면 pyarrow가 필요합니다: pip install pyarrow")
+    return pa, pq
+
+
+def write_rows_parquet(rows: Iterable[Dict[str, Any]], fieldnames: List[str], output_path: str) -> int:
+    """dict row 목록을 Parquet으로 저장 (pandas 불필요). 저장한 행 수 반환"""
+    pa, pq = _require_pyarrow()
+
+    columns: Dict[str, List[Any]] = {name: [] for name in fieldnames}
+    count = 0
+    for r in rows:
+        for name in fieldnames:
+            columns[name].append(r.get(name))
+        count += 1
+
+    arrays = []
+    for name in fieldnames:
+        values = columns[name]
+        if name in BOOL_COLUMNS:
+            arrays.append(pa.array([_to_bool(v) for v in values], type=pa.bool_()))
+        elif name in SIGNATURE_COLUMNS:
+            arrays.append(pa.array([_text(v) for v in values], type=pa.string()).dictionary_encode())
+        elif name == "line":
+            arrays.append(pa.array(values, type=pa.int64()))
+        elif name == "confidence":
+            arrays.append(pa.array(values, type=pa.float64()))
+        else:
+            arrays.append(pa.array([_text(v) for v in values], type=pa.string()))
+
+    table = pa.Table.from_arrays(arrays, names=list(fieldnames))
+    pq.write_table(table, output_path)
+    return count
+
+
+def read_stage_table(path: str):
+    """중간 파일을 DataFrame으로 읽기 (Parquet은 memory map, CSV는 utf-8 → cp949)"""
+    import pandas as pd
+
+    if is_parquet(path):
+        _, pq = _require_pyarrow()
+        # dictionary 컬럼은 pandas category로 복원됨
+        df = pq.read_table(path, memory_map=True).to_pandas()
+        # 문자열 null은 None으로 변환됨 → read_csv와 같이 NaN으로 통일
+        for name in df.columns:
+            if df[name].dtype == object:
+                df[name] = df[name].where(df[name].notna(), float("nan"))
+        return df
+
+    try:
+        return pd.read_csv(path, encoding="utf-8")
+    except UnicodeDecodeError:
+        return pd.read_csv(path, encoding="cp949")
+
+
+def write_stage_table(df, path: str, csv_encoding: str = "utf-8-sig") -> None:
+    """DataFrame을 중간 파일로 저장 (확장자에 따라 Parquet / CSV)"""
+    if not is_parquet(path):
+        df.to_csv(path, index=False, encoding=csv_encoding)
+        return
+
+    pa, pq = _require_pyarrow()
+    out = df.copy()
+    for name in BOOL_COLUMNS:
+        if name in out.columns:
+            out[name] = out[name].map(_to_bool).astype(bool)
+    for name in SIGNATURE_COLUMNS:
+        if name in out.columns and str(out[name].dtype) != "category":
+            out[name] = out[name].map(_text).astype("category")
+
+    pq.write_table(pa.Table.from_pandas(out, preserve_index=False), path)
+
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+tokenizer
+Static / Dynamic / runner_scripts 공용 경로 토크나이저 (규칙 테이블 + 캐시 단일 소스)
+
+API
+    tokenize(path)              경로 하나 토큰화
+    tokenize_many(paths)        여러 경로 토큰화 (list)
+    tokenize_series(series)     pandas Series 토큰화 (고유값만 한 번씩 토큰화 후 map)
+    tokenize_with_mapping(path) (토큰화 경로, {토큰: [원래 값, ...]})
+
+- 기본 토크나이저는 core 규칙 + 세그먼트 LRU 캐시 (path_tokenizer.py CLI 기본 / db_dynamic_<pkg>.csv 와 같은 결과)
+  후처리 규칙까지 쓰려면 CachedTokenizer(postprocess=True) 를 tokenizer= 로 넘긴다.
+- 스크립트에서는 Logic 폴더를 sys.path에 넣고 import 한다.
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from tokenizer import tokenize
+"""
+
+import hashlib
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from .engine import (
+    CORE_RULES,
+    POSTPROCESS_RULES,
+    DEFAULT_CACHE_SIZE,
+    CachedTokenizer,
+    RuleProfiler,
+    TokenizerEngine,
+    tokenize_one,
+    tokenize_one_core,
+)
+
+# 프로세스 전체에서 공유하는 기본 토크나이저 (처음 쓸 때 생성)
+_DEFAULT_TOKENIZER = None
+
+# 토큰 자리표시자 (<uuid>, <number>, <firebase_session> ...)
+_TOKEN_RE = re.compile(r"<[A-Za-z0-9_]+>")
+
+
+def default_tokenizer() -> CachedTokenizer:
+    global _DEFAULT_TOKENIZER
+    if _DEFAULT_TOKENIZER is None:
+        _DEFAULT_TOKENIZER = CachedTokenizer()
+    return _DEFAULT_TOKENIZER
+
+
+def tokenize(path: str, tokenizer=None) -> str:
+    return (tokenizer or default_tokenizer())(path)
+
+
+def tokenize_many(paths: Iterable[str], tokenizer=None) -> List[str]:
+    tok = tokenizer or default_tokenizer()
+    return [tok(p) for p in paths]
+
+
+def tokenize_series(series, tokenizer=None):
+    """
+    Series.astype(str) 토큰화 (path_tokenizer.tokenize_csv 와 같은 값)
+    - 같은 경로가 반복되는 컬럼이 대부분이므로 고유값만 토큰화한 뒤 map
+    """
+    values = series.astype(str)
+    uniques = values.unique()
+    table = dict(zip(uniques, tokenize_many(uniques, tokenizer)))
+    return values.map(table)
+
+
+def token_mapping(original: str, tokenized: str) -> Dict[str, List[str]]:
+    """
+    원래 경로와 토큰화 경로를 맞춰 {토큰: [원래 값, ...]} 복원
+    - 토큰 자리를 (.*?) 로 바꾼 정규식을 원래 경로 전체에 맞춘다. 맞지 않으면 빈 dict
+    - 원래 경로에 이미 들어 있던 토큰은 제외
+    """
+    if not isinstance(tokenized, str) or original == tokenized:
+        return {}
+    names = _TOKEN_RE.findall(tokenized)
+    if not names:
+        return {}
+    pattern = "(.*?)".join(map(re.escape, _TOKEN_RE.split(tokenized)))
+    m = re.fullmatch(pattern, original, re.DOTALL)
+    if not m:
+        return {}
+
+    mapping: Dict[str, List[str]] = {}
+    for name, value in zip(names, m.groups()):
+        if value == name:
+            continue
+        values = mapping.setdefault(name, [])
+        if value not in values:
+            values.append(value)
+    return mapping
+
+
+def tokenize_with_mapping(path: str, tokenizer=None) -> Tuple[str, Dict[str, List[str]]]:
+    tokenized = tokenize(path, tokenizer)
+    return tokenized, token_mapping(path, tokenized)
+
+
+def rules_fingerprint() -> str:
+    """규칙 테이블(engine.py) 내용 해시 — 토큰화 결과 캐시 무효화 기준"""
+    return hashlib.sha256((Path(__file__).parent / "engine.py").read_bytes()).hexdigest()
@@ -0,0 +1,1101 @@
+# -*- coding: utf-8 -*-
+"""
+tokenizer/engine.py
+경로 토큰화 규칙 테이블 + trigger 엔진 + 세그먼트 캐시 + 규칙 프로파일러 (단일 소스)
+- pandas 없이 동작 (Series 처리는 tokenizer.tokenize_series)
+"""
+import re, csv, functools, time
+from pathlib import Path
+
+# -------------------------
+# Regex
+# -------------------------
+
+ANDROID_DATA_APP_RANDOM_RE = re.compile(
+    r"(/data/app/[^/]+-)([A-Za-z0-9_-]{8,}={0,2})(?=(?:/|$))"
+)
+
+FIREBASE_FRC_RE = re.compile(r"(frc_1:)(\d+)(:android:)([0-9A-Fa-f]{16})(?=_)")
+
+FIREBASE_HEARTBEAT_B64_RE = re.compile(r"(FirebaseHeartBeat)([A-Za-z0-9+_-]{20,}={0,2})")
+PERSISTED_INSTALL_B64_RE  = re.compile(r"(PersistedInstallation\.)([A-Za-z0-9+_-]{20,}={0,2})")
+
+# -------------------------
+# [ADD] PersistedInstallation 짧은 ID 대응
+# -------------------------
+PERSISTED_INSTALL_ANY_RE = re.compile(
+    r"(PersistedInstallation\.)([A-Za-z0-9+_-]{8,}={0,2})(?=(?:/|$|,))"
+)
+
+# -------------------------
+# Crashlytics
+# -------------------------
+CRASHLYTICS_OPEN_SESSION_RE = re.compile(
+    r"(/\.crashlytics\.v3/[^/]+/open-sessions/)([0-9A-Za-z_-]{8,128})(?=(?:/|$|,))"
+)
+CRASHLYTICS_PENDING_SESSION_RE = re.compile(
+    r"(/\.crashlytics\.v3/[^/]+/pending-sessions/)([0-9A-Za-z_-]{8,128})(?=(?:/|$|,))"
+)
+CRASHLYTICS_SESSIONS_RE = re.compile(
+    r"(/\.crashlytics\.v3/[^/]+/sessions/)([0-9A-Za-z_-]{8,128})(?=(?:/|$|,))"
+)
+CRASHLYTICS_REPORTS_RE = re.compile(
+    r"(/\.crashlytics\.v3/[^/]+/reports/)([0-9A-Za-z_-]{8,128})(?=(?:/|$|,))"
+)
+CRASHLYTICS_NATIVE_REPORTS_RE = re.compile(
+    r"(/\.crashlytics\.v3/[^/]+/native-reports/)([0-9A-Za-z_-]{8,128})(?=(?:/|$|,))"
+)
+
+# -------------------------
+# [ADD] Crashlytics aqs.<md5> 파일명 내부 토큰화
+# -------------------------
+CRASHLYTICS_AQS_MD5_RE = re.compile(
+    r"(aqs\.)([0-9A-Fa-f]{32})(?=(?:/|$|,))"
+)
+
+# -------------------------
+# Firebase Datastore
+# -------------------------
+FIREBASE_DATASTORE_SESSION_SETTINGS_RE = re.compile(
+    r"(firebase_session_)([A-Za-z0-9_-]{10,})(?=_settings\.preferences_pb(?:/|$|,))"
+)
+FIREBASE_DATASTORE_SESSION_EVENTS_RE = re.compile(
+    r"(firebase_session_)([A-Za-z0-9_-]{10,})(?=_events\.pb(?:/|$|,))"
+)
+FIREBASE_DATASTORE_SESSION_ANY_PB_RE = re.compile(
+    r"(firebase_session_)([A-Za-z0-9_-]{10,})(?=_[^/]*\.pb(?:/|$|,))"
+)
+
+# -------------------------
+# [ADD] datastore/firebase_session_<id> (suffix 없는 plain 케이스)
+# -------------------------
+FIREBASE_DATASTORE_SESSION_PLAIN_RE = re.compile(
+    r"(firebase_session_)([A-Za-z0-9_-]{10,})(?=(?:/|$|,))"
+)
+
+# -------------------------
+# WebView Cache (Cache_Data + Code Cache)
+# -------------------------
+WEBVIEW_CACHE_DATA_ENTRY_RE = re.compile(
+    r"(/WebView/Default/HTTP Cache/Cache_Data/)"
+    r"([0-9A-Fa-f]{16})(?=_[0-9A-Za-z](?:/|$|,))"
+)
+
+WEBVIEW_CODE_CACHE_JS_ENTRY_RE = re.compile(
+    r"(/WebView/Default/HTTP Cache/Code Cache/js/)"
+    r"([0-9A-Fa-f]{16})(?=_[0-9A-Za-z](?:/|$|,))"
+)
+
+# -------------------------
+# [ADD] WebView Chrome profile (.com.google.Chrome.<random>)
+# -------------------------
+WEBVIEW_CHROME_PROFILE_RE = re.compile(
+    r"(\.com\.google\.Chrome\.)([0-9A-Za-z_-]{3,32})(?=(?:/|$|,))"
+)
+
+# -------------------------
+# [ADD] WebView BrowserMetrics-<8hex>-<4hex>.pma
+# -------------------------
+WEBVIEW_BROWSER_METRICS_RE = re.compile(
+    r"(BrowserMetrics-)([0-9A-Fa-f]{8})-([0-9A-Fa-f]{4})(?=\.pma(?:/|$|,))"
+)
+
+# -------------------------
+# Vungle cache
+# -------------------------
+VUNGLE_DOWNLOAD_DIR_RE = re.compile(
+    r"(/vungle_cache/downloads/)([0-9A-Fa-f]{12,64})(?=(?:/|$|,))"
+)
+VUNGLE_ASSET_FILE_RE = re.compile(
+    r"(/vungle_cache/downloads/(?:<vungle_download>|[0-9A-Fa-f]{12,64})/)"
+    r"(\d{1,6})_([0-9A-Fa-f]{8,64})(?=\.[0-9A-Za-z]+(?:/|$|,))"
+)
+
+# -------------------------
+# Generic patterns
+# -------------------------
+BASE64_FULL_RE = re.compile(
+    r"(?<![A-Za-z0-9+_=<\-])"
+    r"(?=[A-Za-z0-9+_\-]*[+=])"
+    r"([A-Za-z0-9+_\-]{20,}={0,2})"
+    r"(?![A-Za-z0-9+_=>\-])"
+)
+
+MD5_SEG_RE    = re.compile(r"(?:(?<=/)|(?<=^))([0-9A-Fa-f]{32})(?=(?:\.[0-9A-Za-z_-]+)*(?:/|$|,))")
+SHA256_SEG_RE = re.compile(r"(?:(?<=/)|(?<=^))([0-9A-Fa-f]{64})(?=(?:\.[0-9A-Za-z_-]+)*(?:/|$|,))")
+UUID_SEG_RE   = re.compile(r"(?i)(?:(?<=/)|(?<=^))([0-9a-f]{8}(?:-[0-9a-f]{4}){3}-[0-9a-f]{12})(?=(?:/|$|,))")
+HEX8_SEG_RE   = re.compile(r"(?:(?<=/)|(?<=^))([0-9A-Fa-f]{8})(?=(?:/|$|,))")
+
+DECIMAL_LONG_SEG = re.compile(r"(?:(?<=/)|(?<=^))-?\d{6,}(?=(?:\.[0-9A-Za-z_-]+)*(?:/|$|,))")
+USER_ROOT_RE = re.compile(r"^(/data/(?:user|user_de)/\d+/)(.*)$")
+
+# -------------------------
+# [ADD] shared_prefs: LaunchDarkly
+# -------------------------
+LAUNCHDARKLY_PREF_RE = re.compile(
+    r"(/shared_prefs/LaunchDarkly_)([A-Za-z0-9_-]{10,})(?=(?:\.xml|/|$|,))"
+)
+
+# -------------------------
+# [ADD] shared_prefs: Firebase Auth Store (짧은 ID 포함)
+# -------------------------
+FIREBASE_AUTH_STORE_RE = re.compile(
+    r"(/shared_prefs/com\.google\.firebase\.auth\.api\.Store\.)([A-Za-z0-9+_-]{6,}={0,2})(?=(?:\.xml|/|$|,))"
+)
+
+# =====================================================================
+# [ADD] Mixpanel shared_prefs
+# =====================================================================
+MIXPANEL_PREF_RE = re.compile(
+    r"(/shared_prefs/com\.mixpanel\.android\.mpmetrics\."
+    r"MixpanelAPI(?:\.TimeEvents)?_)([0-9A-Fa-f]{32})(?=\.xml(?:\.bak)?(?:/|$|,))"
+)
+
+# -------------------------
+# [ADD] Facebook(Katana) 전용 패턴 보완
+# -------------------------
+UUID_IN_MIXED_RE = re.compile(
+    r"(?i)(?<![0-9a-f])([0-9a-f]{8}(?:-[0-9a-f]{4}){3}-[0-9a-f]{12})(?![0-9a-f])"
+)
+
+UUID_BEFORE_UNDERSCORE_RE = re.compile(
+    r"(?i)(?<![0-9a-f])([0-9a-f]{8}(?:-[0-9a-f]{4}){3}-[0-9a-f]{12})(?=_)(?![0-9a-f])"
+)
+
+FB_SESS_TIMESTAMP_RE = re.compile(
+    r"(?<=sess)[^/]*?-(\d{10,})(?=-)"
+)
+
+KEY_SUFFIX_LONGNUM_RE = re.compile(
+    r"(_)(\d{8,})(?=(?:/|$|,))"
+)
+
+HEX4_IN_HYPHEN_CHAIN_RE = re.compile(
+    r"(?<=-)([0-9A-Fa-f]{4})(?=-)"
+)
+
+FB_CRITICAL_NATIVE_RE = re.compile(
+    r"(critical_native_)(\d{10,})-([0-9A-Fa-f]{8}(?:-[0-9A-Fa-f]{4}){3}-[0-9A-Fa-f]{12})(?=(?:/|$|,))"
+)
+
+FB_CRITICAL_ANR_APP_DEATH_RE = re.compile(
+    r"(critical_anr_app_death_)(\d{10,})-([0-9A-Fa-f]{8}(?:-[0-9A-Fa-f]{4}){3}-[0-9A-Fa-f]{12})(?=(?:/|$|,))"
+)
+
+SHA1_SEG_RE = re.compile(
+    r"(?:(?<=/)|(?<=^))([0-9A-Fa-f]{40})(?=(?:\.[0-9A-Za-z_-]+)*(?:/|$|,))"
+)
+
+SHA1_IN_MIXED_RE = re.compile(
+    r"(?i)(?<![0-9a-f])([0-9a-f]{40})(?![0-9a-f])"
+)
+
+LONGNUM_ALPHA_SUFFIX_RE = re.compile(
+    r"(?<![A-Za-z0-9_])(\d{10,})([a-z])(?![A-Za-z0-9_])"
+)
+
+FB_NEWSFEED_SHARD_RE = re.compile(
+    r"(/com\.facebook\.katana/files/NewsFeed/)([0-9A-Fa-f]{2})(?=(?:/|$|,))"
+)
+
+FB_IMAGE_SCOPED_LC_RE = re.compile(
+    r"(/(?:app_image_scoped|cache/image_scoped)/)(\d{6,})(/lc-)([A-Za-z0-9_-]{8,})(-)(\d+)(?=(?:/|$|,))"
+)
+
+# -------------------------
+# [ADD] Crashlytics v2 경로 대응
+# -------------------------
+CRASHLYTICS_V2_OPEN_SESSION_RE = re.compile(
+    r"(/\.com\.google\.firebase\.crashlytics\.files\.v2:[^/]+/open-sessions/)([0-9A-Za-z_-]{8,128})(?=(?:/|$|,))"
+)
+
+CRASHLYTICS_V2_AE_FILE_RE = re.compile(
+    r"(/\.com\.google\.firebase\.crashlytics\.files\.v2:[^/]+/)(\.ae)(\d{10,})(?=(?:/|$|,))"
+)
+
+CRASHLYTICS_EVENT_SEQ_RE = re.compile(
+    r"(event)(\d{6,})(?=(?:/|$|,))"
+)
+
+# -------------------------
+# [ADD] WebView Cache todelete_<16hex>_<flag>_<n> 패턴
+# -------------------------
+WEBVIEW_CACHE_TODELETE_RE = re.compile(
+    r"(/WebView/Default/HTTP Cache/Cache_Data/)(todelete_)([0-9A-Fa-f]{16})(_)([0-9A-Za-z])(_)(\d+)(?=(?:/|$|,))"
+)
+
+# =====================================================================
+# [ADD] event000..._ / Service Worker ScriptCache
+# =====================================================================
+CRASHLYTICS_EVENT_SEQ_UNDERSCORE_RE = re.compile(
+    r"(event)(\d{6,})(?=(?:_|/|$|,))"
+)
+
+WEBVIEW_SERVICE_WORKER_SCRIPTCACHE_RE = re.compile(
+    r"(/Default/Service Worker/ScriptCache/)([0-9A-Fa-f]{16})(?=_[0-9A-Za-z](?:/|$|,))"
+)
+
+# =====================================================================
+# [ADD] Weverse analytics log: analytics<digits>.log
+# =====================================================================
+WEVERSE_ANALYTICS_LOG_RE = re.compile(
+    r"(/weverse_log/analytics)(\d{6,})(\.log)(?=(?:/|$|,))"
+)
+
+# =====================================================================
+# [ADD] Service Worker CacheStorage: /CacheStorage/<sha1>/<uuid>/<16hex>_<flag>
+# =====================================================================
+WEBVIEW_SERVICE_WORKER_CACHESTORAGE_ENTRY_RE = re.compile(
+    r"(/CacheStorage/)([0-9A-Fa-f]{40})(/)([0-9a-fA-F]{8}(?:-[0-9a-fA-F]{4}){3}-[0-9a-fA-F]{12})(/)([0-9A-Fa-f]{16})(?=_[0-9A-Za-z](?:/|$|,))"
+)
+
+# =====================================================================
+# [ADD] frc_1 패턴 보완
+# =====================================================================
+FIREBASE_FRC_ANYHEX_RE = re.compile(
+    r"(frc_1:)(\d+)(:android:)([0-9A-Fa-f]{16,64})(?=_)"
+)
+
+# =====================================================================
+# [ADD] firebase_session_***== 처럼 '=' 포함(base64 padding) 케이스 보완
+# =====================================================================
+FIREBASE_DATASTORE_SESSION_SETTINGS_EQ_RE = re.compile(
+    r"(firebase_session_)([A-Za-z0-9+/_=-]{10,})(?=_settings\.preferences_pb(?:/|$|,))"
+)
+FIREBASE_DATASTORE_SESSION_EVENTS_EQ_RE = re.compile(
+    r"(firebase_session_)([A-Za-z0-9+/_=-]{10,})(?=_events\.pb(?:/|$|,))"
+)
+FIREBASE_DATASTORE_SESSION_ANY_PB_EQ_RE = re.compile(
+    r"(firebase_session_)([A-Za-z0-9+/_=-]{10,})(?=_[^/]*\.pb(?:/|$|,))"
+)
+FIREBASE_DATASTORE_SESSION_PLAIN_EQ_RE = re.compile(
+    r"(firebase_session_)([A-Za-z0-9+/_=-]{10,})(?=(?:/|$|,))"
+)
+
+# =====================================================================
+# [ADD] datastore/firebase_session_<id>_data.preferences_pb 같은 케이스 보완
+# =====================================================================
+FIREBASE_DATASTORE_SESSION_ANY_PREFERENCES_PB_EQ_RE = re.compile(
+    r"(firebase_session_)([A-Za-z0-9+/_=-]{10,})(?=_[^/]*\.preferences_pb(?:/|$|,))"
+)
+
+# =====================================================================
+# [ADD] datastore/firebase_session_<id>_*.preferences_pb.tmp 같은 케이스 보완
+# =====================================================================
+FIREBASE_DATASTORE_SESSION_ANY_PREFERENCES_PB_TMP_EQ_RE = re.compile(
+    r"(firebase_session_)([A-Za-z0-9+/_=-]{10,})(?=_[^/]*\.preferences_pb\.tmp(?:/|$|,))"
+)
+
+# =====================================================================
+# [ADD] UUID 뒤에 바로 문자/숫자 붙는 케이스 대응
+# =====================================================================
+UUID_FOLLOWED_BY_ALNUM_RE = re.compile(
+    r"(?i)([0-9a-f]{8}(?:-[0-9a-f]{4}){3}-[0-9a-f]{12})(?=[A-Za-z0-9])"
+)
+
+# =====================================================================
+# [ADD] Reddit shared_prefs
+# =====================================================================
+REDDIT_ONBOARDING_T2_RE = re.compile(
+    r"(/shared_prefs/prefs_onboarding_topic_chaining_t2_)([A-Za-z0-9_]+)(?=\.xml(?:\.bak)?(?:/|$|,))"
+)
+
+# =====================================================================
+# [ADD] Reddit exo timestamp (filename 내부)
+# =====================================================================
+REDDIT_EXO_TS_RE = re.compile(
+    r"(\.)(\d{10,})(?=\.v\d+\.exo(?:/|$|,))"
+)
+
+# =====================================================================
+# [ADD] image_cache v2.ols100.<n>./<n>
+# =====================================================================
+IMAGE_CACHE_OLS100_RE = re.compile(
+    r"(cache/image_cache/v2\.ols100\.)(\d+)(/)(\d+)(?=(?:/|$|,))"
+)
+
+# =====================================================================
+# [ADD] AppLovin shared_prefs
+# =====================================================================
+APPLOVIN_PREF_RE = re.compile(
+    r"(/shared_prefs/com\.applovin\.sdk\.preferences\.)([A-Za-z0-9_-]{20,})(?=\.xml(?:\.bak)?(?:/|$|,))"
+)
+
+# =====================================================================
+# [ADD] adjoe static/media 점 사이 20~32hex
+# =====================================================================
+DOT_HEX20_32_RE = re.compile(
+    r"(\.)([0-9A-Fa-f]{20,32})(?=\.)"
+)
+
+# =====================================================================
+# [ADD] WebView 변형 프로필에도 적용되는 "일반화 WebView HTTP Cache" 패턴
+# =====================================================================
+WEBVIEW_HTTP_CACHE_CODE_JS_ANYPROFILE_RE = re.compile(
+    r"(/Default/HTTP Cache/Code Cache/js/)([0-9A-Fa-f]{16})(?=_[0-9A-Za-z](?:/|$|,))"
+)
+WEBVIEW_HTTP_CACHE_DATA_ANYPROFILE_RE = re.compile(
+    r"(/Default/HTTP Cache/Cache_Data/)([0-9A-Fa-f]{16})(?=_[0-9A-Za-z](?:/|$|,))"
+)
+WEBVIEW_HTTP_CACHE_TODELETE_ANYPROFILE_RE = re.compile(
+    r"(/Default/HTTP Cache/Cache_Data/)(todelete_)([0-9A-Fa-f]{16})(_)([0-9A-Za-z])(_)(\d+)(?=(?:/|$|,))"
+)
+
+# =====================================================================
+# [ADD] apminsight: 세그먼트 시작이 "긴 숫자 + _"인 케이스
+# =====================================================================
+SEG_LONGNUM_BEFORE_UNDERSCORE_RE = re.compile(
+    r"(?:(?<=/)|(?<=^))(\d{10,})(?=_)"
+)
+
+# =====================================================================
+# [ADD] apminsight: 16hex + 1글자(G 같은) 세그먼트 토큰화
+# =====================================================================
+HEX16_LETTER_SEG_RE = re.compile(
+    r"(?i)(?:(?<=/)|(?<=^))([0-9a-f]{16})([A-Za-z])(?=(?:/|$|,))"
+)
+
+# =====================================================================
+# [ADD] apminsight 내부 토큰 추가 처리
+# =====================================================================
+APMINSIGHT_LONGNUM_BETWEEN_UNDERSCORES_RE = re.compile(
+    r"(?<=_)(\d{10,})(?=_)"
+)
+APMINSIGHT_HEX16_LETTER_AFTER_UNDERSCORE_RE = re.compile(
+    r"(?i)(?:(?<=_)|(?<=/)|(?<=^))([0-9a-f]{16})([A-Za-z])(?=(?:_|\.|/|$|,))"
+)
+
+# =====================================================================
+# [ADD] font / screenshot 보완
+# =====================================================================
+DOT_NUMBER_PAIR_SEG_RE = re.compile(
+    r"(?:(?<=/)|(?<=^))(\d{6,})\.(\d{3,})(?=(?:/|$|,))"
+)
+UNDERSCORE_NUMBER_BEFORE_EXT_RE = re.compile(
+    r"(_)(\d{6,})(?=\.[0-9A-Za-z]{1,8}(?:/|$|,))"
+)
+
+# =====================================================================
+# ✅✅✅ [ADD] (이전 요청) Facebook Lite image_cache .cnt 키 토큰화
+# =====================================================================
+FB_LITE_IMAGE_CACHE_CNT_KEY_RE = re.compile(
+    r"(/cache/image_cache/v2\.ols100\.\d+/\d+/)([A-Za-z0-9_-]{16,})(?=\.cnt(?:/|$|,))"
+)
+
+# =====================================================================
+# ✅✅✅ [ADD] (이전 요청) Instagram app_errorreporting 전용 패턴
+# =====================================================================
+IG_ERROR_REPORTS_TS_UUID_RE = re.compile(
+    r"(/app_errorreporting/reports/)([A-Za-z_]+_)(\d{10,})-([0-9a-fA-F]{8}(?:-[0-9a-fA-F]{4}){3}-[0-9a-fA-F]{12})(?=(?:/|$|,))"
+)
+IG_ERROR_SESS_RE = re.compile(
+    r"(/app_errorreporting/)(sess__0*\d+)-(\d{10,})-([0-9a-fA-F]{8}(?:-[0-9a-fA-F]{4}){3}-[0-9a-fA-F]{12})(?=(?:/|$|,))"
+)
+
+# =====================================================================
+# ✅✅✅ [ADD] (이전 요청) Instagram cache/http_responses 보완
+# =====================================================================
+HTTP_RESP_LEADING_HEX8_RE = re.compile(
+    r"(?:(?<=/)|(?<=^))([0-9A-Fa-f]{8})(?=-)"
+)
+HTTP_RESP_COPYNUM_RE = re.compile(
+    r"(-copy)(\d{4,})(?=-)"
+)
+
+# =====================================================================
+# ✅✅✅ [ADD] (이전 요청) Instagram modules/pytorch_<sha256> 보완
+# =====================================================================
+PYTORCH_SHA256_IN_NAME_RE = re.compile(
+    r"(pytorch_)([0-9A-Fa-f]{64})(?=(?:/|$|,))"
+)
+
+# =====================================================================
+# ✅✅✅ [ADD] (이전 요청) quickpromotion lat/lng URL-encoded 소수점 처리
+# =====================================================================
+LAT_URLENCODED_DEC_RE = re.compile(r"(lat%3a)(\d+)\.(\d+)")
+LNG_URLENCODED_DEC_RE = re.compile(r"(lng%3a)(\d+)\.(\d+)")
+
+# =====================================================================
+# ✅✅✅ [ADD] (이전 요청) Instagram images.stash 전용 보완 (1차)
+# =====================================================================
+IG_IMAGES_STASH_KEY_RE = re.compile(
+    r"(/cache/images\.stash/(?:clean|dirty)/)([A-Za-z0-9_-]{20,})(?=-[0-9A-Fa-f]{4}-)"
+)
+IG_IMAGES_STASH_UNDERSCORE_NEGNUM_RE = re.compile(r"(_-)(\d+)(?=(?:/|$|,))")
+
+# =====================================================================
+# ✅✅✅ [ADD NEW] (이번 요청) images.stash 꼬리 패턴을 “통째로” 확실히 잡기
+#   -<hex4>-<n>-<n>_-<n>  (여기서 n은 1자리여도 됨)
+# =====================================================================
+IG_IMAGES_STASH_TAIL_RE2 = re.compile(
+    r"-(?P<hex>[0-9A-Fa-f]{4})-(?P<a>\d+)-(?P<b>\d+)_-(?P<c>\d+)(?=(?:/|$|,))"
+)
+
+# =====================================================================
+# ✅✅✅ [ADD NEW] (이번 요청) ExoPlayerCacheDir: -1.<URLSAFE_TOKEN>.mp4 를 무조건 토큰화
+# =====================================================================
+IG_EXO_MP4_URLSAFE_TOKEN_RE = re.compile(
+    r"(\.v\.-1\.)([A-Za-z0-9_-]{20,})(?=\.mp4(?:\.|/|$|,))"
+)
+
+# =====================================================================
+# ✅✅✅ [ADD NEW] (이번 요청) Instagram DB 파일명: *_<digits>.db(-journal|-wal|-shm) 앞 숫자 토큰화
+# =====================================================================
+DB_UNDERSCORE_LONGNUM_BEFORE_DB_VARIANTS_RE = re.compile(
+    r"(_)(\d{6,})(?=\.db(?:-(?:journal|wal|shm))?(?:/|$|,))"
+)
+
+# =========================================================
+# ✅✅✅ [ADD NEW] (이번 케이스) image_cache 키(.cnt/.tmp) 일반화 + tmp 숫자
+#   - com.matilda... 같이 앱이 달라도 토큰화
+# =========================================================
+IMAGE_CACHE_CNT_KEY_ANY_RE = re.compile(
+    r"(/cache/image_cache/v2\.ols100\.\d+/\d+/)([A-Za-z0-9_-]{12,})(?=\.cnt(?:/|$|,))"
+)
+IMAGE_CACHE_TMP_KEY_ANY_RE = re.compile(
+    r"(/cache/image_cache/v2\.ols100\.\d+/\d+/)([A-Za-z0-9_-]{12,})(?=\.)(\d{6,})(?=\.tmp(?:/|$|,))"
+)
+DOT_LONGNUM_BEFORE_TMP_RE = re.compile(
+    r"(\.)(\d{6,})(?=\.tmp(?:/|$|,))"
+)
+
+# =========================================================
+# ✅✅✅ [ADD NEW] (이번 케이스) app_modules 접두사+sha256 세그먼트 토큰화
+#   예: shared_fizz_ms_profilo_<64hex>
+# =========================================================
+APP_MODULES_SHA256_SUFFIX_RE = re.compile(
+    r"(?i)(/_?[^/]*_)([0-9a-f]{64})(?=(?:/|$|,))"
+)
+
+# =========================================================
+# ✅✅✅ [ADD NEW] (이번 케이스) AdvancedCrypto persistent 파일의 prev/att.<token>.jpg|gif 토큰화
+#   BASE64_FULL_RE는 '=' 또는 '+' 조건이 있어서 urlsafe 토큰이 안 잡히는 케이스 보완
+# =========================================================
+FB_ADVCRYPTO_MEDIA_TOKEN_RE = re.compile(
+    r"(/AdvancedCrypto/)(\d+)(/persistent/(?:prev|att)\.)([A-Za-z0-9_-]{20,})(?=\.(?:jpg|gif)(?:/|$|,))"
+)
+
+# =========================================================
+# ✅✅✅ [ADD NEW] (이번 케이스) dex/oat p-<digits>.zip.prof 같은 케이스 숫자 토큰화
+# =========================================================
+P_DASH_LONGNUM_RE = re.compile(
+    r"(?:(?<=/)|(?<=^))(p-)(\d{6,})(?=\.zip\.prof(?:/|$|,))"
+)
+
+# =====================================================================
+# [ADD] 이미 <...> 토큰이 있어도 적용하는 후처리 패턴 (disk_cache/.ae/.7e55ef20 보완)
+# =====================================================================
+# ---------------------------------------------------------
+# 1) Crashlytics v3: ".ae<digits>" (현재 v2만 처리해서 누락됨)
+#   예) .../.crashlytics.v3/<pkg>/.ae1765767943015
+# ---------------------------------------------------------
+CRASHLYTICS_V3_AE_RE = re.compile(
+    r"(/\.crashlytics\.v3/[^/]+/\.ae)(\d{10,})(?=(?:/|$|,))"
+)
+
+# ---------------------------------------------------------
+# 2) Unity ArchivedEvents: "<number>.7e55ef20" 처럼 점 뒤 8hex가 남는 케이스
+#   (HEX8_SEG_RE는 '세그먼트 전체가 8hex'일 때만 잡아서 누락됨)
+# ---------------------------------------------------------
+DOT_HEX8_RE = re.compile(r"(\.)([0-9A-Fa-f]{8})(?=(?:_|/|$|,))")
+
+# ---------------------------------------------------------
+# 3) Everytime 같은 케이스:
+#   ".../<uuid>dHuFYimOesRBKexe_creative_....png"
+#   -> <uuid> 뒤에 붙는 긴 랜덤 토큰(underscore 전까지)을 <id>로 토큰화
+# ---------------------------------------------------------
+UUID_ATTACHED_TOKEN_BEFORE_UNDERSCORE_RE = re.compile(
+    r"(<uuid>)([A-Za-z0-9_-]{12,})(?=_)"  # underscore 앞의 긴 토큰
+)
+
+# ---------------------------------------------------------
+# 4) image_manager_disk_cache / image_manager_disk_cache_static 의 .cnt / .tmp 처리
+#   예) .../cache/image_manager_disk_cache/v2.ols100.1/7/<KEY>.cnt
+#   예) .../cache/image_manager_disk_cache/v2.ols100.1/96/<KEY>.<digits>.tmp
+# ---------------------------------------------------------
+IMG_MGR_DISK_CACHE_CNT_RE = re.compile(
+    r"(/cache/(?:image_manager_disk_cache|image_manager_disk_cache_static)/v2\.ols100\.\d+/\d+/)"
+    r"([A-Za-z0-9_-]{12,})(?=\.cnt(?:/|$|,))"
+)
+IMG_MGR_DISK_CACHE_TMP_RE = re.compile(
+    r"(/cache/(?:image_manager_disk_cache|image_manager_disk_cache_static)/v2\.ols100\.\d+/\d+/)"
+    r"([A-Za-z0-9_-]{12,})(\.)(\d{6,})(?=\.tmp(?:/|$|,))"
+)
+
+# -------------------------
+# 디렉토리 토큰화 방지
+# -------------------------
+def apply_dir_tokens(t: str) -> str:
+    """
+    ✅ 표준 디렉토리(files/cache/shared_prefs/no_backup 등)는 토큰화하지 않는다.
+    ✅ 이미 <...> 토큰이 들어간 라인은 2차 토큰화를 막기 위해 그대로 둔다.
+    """
+    if "<" in t and ">" in t:
+        return t
+    return t
+
+def tokenize_decimals_after_user_root(t: str) -> str:
+    m = USER_ROOT_RE.match(t)
+    if not m:
+        return t
+    prefix, rest = m.groups()
+    rest = re.sub(r"(?<![A-Za-z0-9_])\d+(?![A-Za-z0-9_])", "<number>", rest)
+    return prefix + rest
+
+# -------------------------
+# Tokenize engine
+# -------------------------
+# 규칙 테이블: (trigger, 규칙) 을 기존 적용 순서 그대로 나열한다.
+#   trigger = 규칙이 매칭되려면 반드시 있어야 하는 조건 (없으면 re.sub 자체를 건너뜀)
+#     - "literal"        : 문자열 포함 여부
+#     - ("any", (a, b))  : 둘 중 하나라도 포함
+#     - ("hex", n)       : 16진수 연속 n자 이상
+#     - ("digit", n)     : 숫자 연속 n자 이상
+#     - None             : 항상 적용
+#   규칙 = (compiled_regex, replacement) 또는 str -> str 함수
+# 연속된 같은 trigger 규칙은 한 그룹으로 묶어 조건을 한 번만 검사한다.
+# trigger는 "현재" 문자열 기준으로 검사하므로 앞 규칙이 문자열을 바꿔도 결과는 기존 순차 적용과 동일하다.
+
+_HEX_RUN_RE = re.compile(r"[0-9A-Fa-f]+")
+_DIGIT_RUN_RE = re.compile(r"\d+")
+
+
+def _longest_run(rx: re.Pattern, t: str) -> int:
+    return max(map(len, rx.findall(t)), default=0)
+
+
+CORE_RULES = [
+    # /data/app 랜덤 suffix
+    ("/data/app/", (ANDROID_DATA_APP_RANDOM_RE, r"\1<base64>")),
+
+    # Firebase
+    ("frc_1:", (FIREBASE_FRC_RE, r"\1<firebase_project_number>\3<firebase_app_instance_hex16>")),
+    ("FirebaseHeartBeat", (FIREBASE_HEARTBEAT_B64_RE, r"\1<firebase_installation_b64>")),
+    ("PersistedInstallation.", (PERSISTED_INSTALL_B64_RE, r"\1<firebase_installation_b64>")),
+    ("PersistedInstallation.", (PERSISTED_INSTALL_ANY_RE, r"\1<firebase_installation_b64>")),
+    ("frc_1:", (FIREBASE_FRC_ANYHEX_RE, r"\1<firebase_project_number>\3<firebase_app_instance_hex>")),
+
+    # Datastore firebase_session (+ '=' padding 포함 보완)
+    ("firebase_session_", (FIREBASE_DATASTORE_SESSION_SETTINGS_RE, r"\1<firebase_session>")),
+    ("firebase_session_", (FIREBASE_DATASTORE_SESSION_EVENTS_RE, r"\1<firebase_session>")),
+    ("firebase_session_", (FIREBASE_DATASTORE_SESSION_ANY_PB_RE, r"\1<firebase_session>")),
+    ("firebase_session_", (FIREBASE_DATASTORE_SESSION_PLAIN_RE, r"\1<firebase_session>")),
+    ("firebase_session_", (FIREBASE_DATASTORE_SESSION_SETTINGS_EQ_RE, r"\1<firebase_session>")),
+    ("firebase_session_", (FIREBASE_DATASTORE_SESSION_EVENTS_EQ_RE, r"\1<firebase_session>")),
+    ("firebase_session_", (FIREBASE_DATASTORE_SESSION_ANY_PB_EQ_RE, r"\1<firebase_session>")),
+    ("firebase_session_", (FIREBASE_DATASTORE_SESSION_PLAIN_EQ_RE, r"\1<firebase_session>")),
+    ("firebase_session_", (FIREBASE_DATASTORE_SESSION_ANY_PREFERENCES_PB_EQ_RE, r"\1<firebase_session>")),
+    ("firebase_session_", (FIREBASE_DATASTORE_SESSION_ANY_PREFERENCES_PB_TMP_EQ_RE, r"\1<firebase_session>")),
+
+    # Crashlytics v3
+    ("/.crashlytics.v3/", (CRASHLYTICS_OPEN_SESSION_RE, r"\1<session>")),
+    ("/.crashlytics.v3/", (CRASHLYTICS_PENDING_SESSION_RE, r"\1<session>")),
+    ("/.crashlytics.v3/", (CRASHLYTICS_SESSIONS_RE, r"\1<session>")),
+    ("/.crashlytics.v3/", (CRASHLYTICS_REPORTS_RE, r"\1<crash_report>")),
+    ("/.crashlytics.v3/", (CRASHLYTICS_NATIVE_REPORTS_RE, r"\1<crash_report>")),
+    ("aqs.", (CRASHLYTICS_AQS_MD5_RE, r"\1<md5>")),
+
+    # Crashlytics v2
+    ("/.com.google.firebase.crashlytics.files.v2:", (CRASHLYTICS_V2_OPEN_SESSION_RE, r"\1<session>")),
+    ("/.com.google.firebase.crashlytics.files.v2:", (CRASHLYTICS_V2_AE_FILE_RE, r"\1\2<number>")),
+
+    # event
+    ("event", (CRASHLYTICS_EVENT_SEQ_RE, r"\1<crash_event_seq>")),
+    ("event", (CRASHLYTICS_EVENT_SEQ_UNDERSCORE_RE, r"\1<crash_event_seq>")),
+
+    # WebView cache
+    ("/Default/HTTP Cache/", (WEBVIEW_CACHE_DATA_ENTRY_RE, r"\1<cache_entry_hex16>")),
+    ("/Default/HTTP Cache/", (WEBVIEW_CODE_CACHE_JS_ENTRY_RE, r"\1<cache_entry_hex16>")),
+    ("/Default/HTTP Cache/", (WEBVIEW_CACHE_TODELETE_RE, r"\1\2<cache_entry_hex16>\4\5\6<number>")),
+    ("/Default/HTTP Cache/", (WEBVIEW_HTTP_CACHE_CODE_JS_ANYPROFILE_RE, r"\1<cache_entry_hex16>")),
+    ("/Default/HTTP Cache/", (WEBVIEW_HTTP_CACHE_DATA_ANYPROFILE_RE, r"\1<cache_entry_hex16>")),
+    ("/Default/HTTP Cache/", (WEBVIEW_HTTP_CACHE_TODELETE_ANYPROFILE_RE, r"\1\2<cache_entry_hex16>\4\5\6<number>")),
+    ("/Default/Service Worker/ScriptCache/", (WEBVIEW_SERVICE_WORKER_SCRIPTCACHE_RE, r"\1<cache_entry_hex16>")),
+    ("/CacheStorage/", (WEBVIEW_SERVICE_WORKER_CACHESTORAGE_ENTRY_RE, r"\1<sha1>\3<uuid>\5<cache_entry_hex16>")),
+    (".com.google.Chrome.", (WEBVIEW_CHROME_PROFILE_RE, r"\1<webview_profile>")),
+    ("BrowserMetrics-", (WEBVIEW_BROWSER_METRICS_RE, r"\1<hex8>-<hex4>")),
+
+    # Vungle
+    ("/vungle_cache/downloads/", (VUNGLE_DOWNLOAD_DIR_RE, r"\1<vungle_download>")),
+    ("/vungle_cache/downloads/", (VUNGLE_ASSET_FILE_RE, r"\1<asset_index>_<asset_id>")),
+
+    # shared_prefs
+    ("/shared_prefs/LaunchDarkly_", (LAUNCHDARKLY_PREF_RE, r"\1<launchdarkly_key>")),
+    ("/shared_prefs/com.google.firebase.auth.api.Store.", (FIREBASE_AUTH_STORE_RE, r"\1<firebase_auth_store>")),
+    ("/shared_prefs/com.mixpanel.android.mpmetrics.MixpanelAPI", (MIXPANEL_PREF_RE, r"\1<mixpanel_distinct_id>")),
+
+    # apminsight
+    (("digit", 10), (SEG_LONGNUM_BEFORE_UNDERSCORE_RE, "<number>")),
+    (("digit", 10), (APMINSIGHT_LONGNUM_BETWEEN_UNDERSCORES_RE, "<number>")),
+    (("hex", 16), (HEX16_LETTER_SEG_RE, "<apminsight_id>")),
+    (("hex", 16), (APMINSIGHT_HEX16_LETTER_AFTER_UNDERSCORE_RE, "<apminsight_id>")),
+
+    # font/screenshot
+    (("digit", 6), (DOT_NUMBER_PAIR_SEG_RE, "<number>.<number>")),
+    (("digit", 6), (UNDERSCORE_NUMBER_BEFORE_EXT_RE, r"\1<number>")),
+
+    # UUID 뒤에 바로 붙는 문자열 (UUID 마지막 12hex)
+    (("hex", 12), (UUID_FOLLOWED_BY_ALNUM_RE, "<uuid>")),
+
+    # Reddit
+    ("/shared_prefs/prefs_onboarding_topic_chaining_t2_", (REDDIT_ONBOARDING_T2_RE, r"\1<reddit_t2_id>")),
+    (".exo", (REDDIT_EXO_TS_RE, r"\1<number>")),
+
+    # image_cache v2.ols100.<n>/<n>
+    ("cache/image_cache/v2.ols100.", (IMAGE_CACHE_OLS100_RE, r"\1<number>\3<number>")),
+
+    # AppLovin
+    ("/shared_prefs/com.applovin.sdk.preferences.", (APPLOVIN_PREF_RE, r"\1<applovin_pref_id>")),
+
+    # adjoe dot hex
+    (("hex", 20), (DOT_HEX20_32_RE, r"\1<hex>")),
+
+    # Facebook critical
+    ("critical_native_", (FB_CRITICAL_NATIVE_RE, r"\1<number>-<uuid>")),
+    ("critical_anr_app_death_", (FB_CRITICAL_ANR_APP_DEATH_RE, r"\1<number>-<uuid>")),
+
+    # Facebook mixed
+    (("hex", 12), (UUID_BEFORE_UNDERSCORE_RE, "<uuid>")),
+    (("hex", 12), (UUID_IN_MIXED_RE, "<uuid>")),
+    ("sess", (FB_SESS_TIMESTAMP_RE, "<number>")),
+    (("digit", 8), (KEY_SUFFIX_LONGNUM_RE, r"\1<number>")),
+    ("-", (HEX4_IN_HYPHEN_CHAIN_RE, "<hex4>")),
+    (("hex", 40), (SHA1_IN_MIXED_RE, "<sha1>")),
+    (("digit", 10), (LONGNUM_ALPHA_SUFFIX_RE, "<id>")),
+    ("/com.facebook.katana/files/NewsFeed/", (FB_NEWSFEED_SHARD_RE, r"\1<hex2>")),
+    ("image_scoped/", (FB_IMAGE_SCOPED_LC_RE, r"\1<number>\3<lc_id>\5<number>")),
+
+    # Weverse
+    ("/weverse_log/analytics", (WEVERSE_ANALYTICS_LOG_RE, r"\1<number>\3")),
+
+    # FB Lite image_cache .cnt 키
+    ("/cache/image_cache/v2.ols100.", (FB_LITE_IMAGE_CACHE_CNT_KEY_RE, r"\1<cache_key>")),
+
+    # Instagram errorreporting reports/sess 구조 정규화
+    ("/app_errorreporting/reports/", (IG_ERROR_REPORTS_TS_UUID_RE, r"\1\2<number>-<uuid>")),
+    ("/app_errorreporting/sess__", (IG_ERROR_SESS_RE, r"\1sess<number>-<uuid>")),
+
+    # Instagram http_responses: 선두 8hex + copy<number>
+    (("hex", 8), (HTTP_RESP_LEADING_HEX8_RE, "<hex8>")),
+    ("-copy", (HTTP_RESP_COPYNUM_RE, r"\1<number>")),
+
+    # Instagram pytorch_<sha256>
+    ("pytorch_", (PYTORCH_SHA256_IN_NAME_RE, r"\1<sha256>")),
+
+    # quickpromotion lat/lng 소수점 URL-encoded
+    ("lat%3a", (LAT_URLENCODED_DEC_RE, r"\1\2.<number>")),
+    ("lng%3a", (LNG_URLENCODED_DEC_RE, r"\1\2.<number>")),
+
+    # images.stash: 키를 <base64>로 강제 + 꼬리(-ccb7-5-1_-1) 정규화
+    ("/cache/images.stash/", (IG_IMAGES_STASH_KEY_RE, r"\1<base64>")),
+    ("_-", (IG_IMAGES_STASH_UNDERSCORE_NEGNUM_RE, r"\1<number>")),
+    ("_-", (IG_IMAGES_STASH_TAIL_RE2, r"-<hex4>-<number>-<number>_-<number>")),
+
+    # ExoPlayerCacheDir: -1.<TOKEN>.mp4 토큰 무조건 <base64>
+    (".v.-1.", (IG_EXO_MP4_URLSAFE_TOKEN_RE, r"\1<base64>")),
+
+    # *_<digits>.db(-journal|-wal|-shm) 숫자 토큰화
+    (".db", (DB_UNDERSCORE_LONGNUM_BEFORE_DB_VARIANTS_RE, r"\1<number>")),
+
+    # "일반 앱" image_cache .cnt/.tmp 키 토큰화
+    ("/cache/image_cache/v2.ols100.", (IMAGE_CACHE_CNT_KEY_ANY_RE, r"\1<cache_key>")),
+    ("/cache/image_cache/v2.ols100.", (IMAGE_CACHE_TMP_KEY_ANY_RE, r"\1<cache_key>.<number>")),
+    (".tmp", (DOT_LONGNUM_BEFORE_TMP_RE, r"\1<number>")),
+
+    # app_modules *_<sha256> 토큰화
+    (("hex", 64), (APP_MODULES_SHA256_SUFFIX_RE, r"\1<sha256>")),
+
+    # AdvancedCrypto prev/att.<token>.jpg|gif 토큰화
+    ("/AdvancedCrypto/", (FB_ADVCRYPTO_MEDIA_TOKEN_RE, r"\1<number>\3<base64>")),
+
+    # p-<digits>.zip.prof 토큰화
+    (".zip.prof", (P_DASH_LONGNUM_RE, r"\1<number>")),
+
+    # base64-like (일반): '+' 또는 '=' 가 반드시 포함됨
+    (("any", ("+", "=")), (BASE64_FULL_RE, "<base64>")),
+
+    # hash류 (세그먼트 완전 일치)
+    (("hex", 12), (UUID_SEG_RE, "<uuid>")),
+    (("hex", 64), (SHA256_SEG_RE, "<sha256>")),
+    (("hex", 32), (MD5_SEG_RE, "<md5>")),
+    (("hex", 40), (SHA1_SEG_RE, "<sha1>")),
+    (("hex", 8), (HEX8_SEG_RE, "<hex8>")),
+
+    # numbers
+    (("digit", 6), (DECIMAL_LONG_SEG, "<number>")),
+    ("/data/user", tokenize_decimals_after_user_root),
+]
+
+# 이미 <...> 토큰이 들어간 필드에도 적용하는 후처리 규칙
+POSTPROCESS_RULES = [
+    # crashlytics v3 .ae
+    ("/.crashlytics.v3/", (CRASHLYTICS_V3_AE_RE, r"\1<number>")),
+    # Unity ArchivedEvents ".7e55ef20" 같은 8hex
+    (("hex", 8), (DOT_HEX8_RE, r"\1<hex8>")),
+    # <uuid> 바로 뒤에 붙은 랜덤 토큰
+    ("<uuid>", (UUID_ATTACHED_TOKEN_BEFORE_UNDERSCORE_RE, r"\1<id>")),
+    # image_manager_disk_cache(.cnt/.tmp)
+    ("image_manager_disk_cache", (IMG_MGR_DISK_CACHE_CNT_RE, r"\1<cache_key>")),
+    ("image_manager_disk_cache", (IMG_MGR_DISK_CACHE_TMP_RE, r"\1<cache_key>.<number>")),
+]
+
+
+class TokenizerEngine:
+    """
+    규칙 테이블을 trigger 그룹으로 컴파일한 단일 패스 토크나이저
+    - 문자열에 trigger가 없으면 해당 그룹의 re.sub를 실행하지 않는다.
+    - 16진수/숫자 연속 길이는 문자열이 바뀔 때만 다시 계산한다.
+    """
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self.groups = []
+        for trigger, rule in self.rules:
+            if isinstance(rule, tuple):
+                rx, repl = rule
+                action = functools.partial(rx.sub, repl)
+            else:
+                action = rule
+            if self.groups and self.groups[-1][0] == trigger:
+                self.groups[-1][1].append(action)
+            else:
+                self.groups.append((trigger, [action]))
+
+    def run(self, t: str) -> str:
+        hex_run = digit_run = -1  # -1: 현재 문자열 기준 미계산
+
+        for trigger, actions in self.groups:
+            if trigger is None:
+                pass
+            elif isinstance(trigger, str):
+                if trigger not in t:
+                    continue
+            else:
+                kind, arg = trigger
+                if kind == "hex":
+                    if hex_run < 0:
+                        hex_run = _longest_run(_HEX_RUN_RE, t)
+                    if hex_run < arg:
+                        continue
+                elif kind == "digit":
+                    if digit_run < 0:
+                        digit_run = _longest_run(_DIGIT_RUN_RE, t)
+                    if digit_run < arg:
+                        continue
+                elif kind == "any":
+                    if not any(lit in t for lit in arg):
+                        continue
+
+            for action in actions:
+                new = action(t)
+                if new is not t and new != t:
+                    t = new
+                    hex_run = digit_run = -1
+        return t
+
+    # --- 규칙별 프로파일링 (RuleProfiler 에서만 사용) ---
+    def start_profile(self):
+        """run 을 계측 버전으로 교체하고 규칙별 카운터 초기화"""
+        n = len(self.rules)
+        self.prof_checked = [0] * n   # trigger 검사 횟수
+        self.prof_calls = [0] * n     # trigger 통과 → 규칙 실행 횟수
+        self.prof_matches = [0] * n   # 실행 결과 문자열이 바뀐 횟수
+        self.prof_seconds = [0.0] * n
+        self.run = self._run_profiled
+
+    def stop_profile(self):
+        self.__dict__.pop("run", None)
+
+    def _run_profiled(self, t: str) -> str:
+        # run 과 같은 로직 + 규칙별 카운터/시간 기록
+        hex_run = digit_run = -1
+        idx = 0
+        clock = time.perf_counter
+
+        for trigger, actions in self.groups:
+            first, idx = idx, idx + len(actions)
+            for i in range(first, idx):
+                self.prof_checked[i] += 1
+
+            if trigger is None:
+                pass
+            elif isinstance(trigger, str):
+                if trigger not in t:
+                    continue
+            else:
+                kind, arg = trigger
+                if kind == "hex":
+                    if hex_run < 0:
+                        hex_run = _longest_run(_HEX_RUN_RE, t)
+                    if hex_run < arg:
+                        continue
+                elif kind == "digit":
+                    if digit_run < 0:
+                        digit_run = _longest_run(_DIGIT_RUN_RE, t)
+                    if digit_run < arg:
+                        continue
+                elif kind == "any":
+                    if not any(lit in t for lit in arg):
+                        continue
+
+            for i, action in enumerate(actions, first):
+                t0 = clock()
+                new = action(t)
+                self.prof_seconds[i] += clock() - t0
+                self.prof_calls[i] += 1
+                if new is not t and new != t:
+                    self.prof_matches[i] += 1
+                    t = new
+                    hex_run = digit_run = -1
+        return t
+
+
+_CORE_ENGINE = TokenizerEngine(CORE_RULES)
+_POSTPROCESS_ENGINE = TokenizerEngine(POSTPROCESS_RULES)
+
+
+def _has_token(seg: str) -> bool:
+    return ("<" in seg and ">" in seg)
+
+
+def tokenize_one_core(s: str) -> str:
+    """경로 하나를 핵심 규칙으로 토큰화 (표준 디렉토리는 유지, ID/키만 토큰화)"""
+    if not isinstance(s, str) or not s:
+        return s
+    return _CORE_ENGINE.run(apply_dir_tokens(s))
+
+
+def _postprocess_even_if_tokenized_v3(seg: str) -> str:
+    """
+    이미 <...> 토큰이 들어간 문자열이라도,
+    남아있는 케이스(.cnt key, .tmp 숫자, .ae, .<8hex>, <uuid>뒤 토큰)를 추가로 정규화한다.
+    """
+    if not isinstance(seg, str) or not seg:
+        return seg
+    return _POSTPROCESS_ENGINE.run(seg)
+
+
+def tokenize_one(s: str, core=tokenize_one_core) -> str:
+    """
+    최종 tokenizer
+    - 콤마 라인(원본경로,file,토큰경로): 필드별 처리
+        1) 토큰 없으면 core 토큰화
+        2) 토큰 있든 없든 후처리(postprocess)는 반드시 수행
+    - 콤마 없는 라인도 동일하게 core → 후처리
+    - core: core 토큰화 함수 (CachedTokenizer.core 등으로 교체 가능)
+    """
+    if not isinstance(s, str) or not s:
+        return s
+
+    if "," in s:
+        out = []
+        for seg in s.split(","):
+            tmp = seg if _has_token(seg) else core(seg)
+            out.append(_postprocess_even_if_tokenized_v3(tmp))
+        return ",".join(out)
+
+    if _has_token(s):
+        return _postprocess_even_if_tokenized_v3(s)
+
+    return _postprocess_even_if_tokenized_v3(core(s))
+
+# -------------------------
+# Segment cache
+# -------------------------
+# 같은 디렉토리 prefix를 공유하는 경로가 대부분이므로 '/' 단위 세그먼트 토큰화 결과를 LRU로 memoize 한다.
+#   - 대부분의 core 규칙은 한 세그먼트 안에서만 매칭된다 → ("/" + 세그먼트) 단독 토큰화 결과가 경로 전체 토큰화와 같다.
+#   - 상위 디렉토리에 의존하는 규칙(crashlytics / webview / shared_prefs 등, trigger에 '/' 포함)이 걸리는 경로는
+#     경로 전체를 키로 캐시한다.
+#   - /data/user/<n>/ 이하 숫자 규칙은 세그먼트를 다시 합친 뒤 경로 전체에 적용한다 (CORE_RULES 마지막 규칙).
+
+DEFAULT_CACHE_SIZE = 1 << 16
+
+# 세그먼트를 다시 합친 뒤 경로 전체에 적용하는 규칙
+_WHOLE_PATH_RULES = (tokenize_decimals_after_user_root,)
+
+# 경로에 포함되면 세그먼트 단위로 나누지 않고 경로 전체를 토큰화하는 문자열
+#   - '/' 가 들어간 trigger: 여러 세그먼트에 걸쳐 매칭
+#   - firebase_session_: ID 문자 클래스에 '/' 포함
+#   - 개행: '$' 가 문자열 끝 개행 앞에서도 매칭됨
+PATH_CONTEXT_TRIGGERS = tuple(dict.fromkeys(
+    [trigger for trigger, rule in CORE_RULES
+     if isinstance(trigger, str) and "/" in trigger and rule not in _WHOLE_PATH_RULES]
+    + ["firebase_session_", "\n"]
+))
+
+_SEGMENT_ENGINE = TokenizerEngine([
+    (trigger, rule) for trigger, rule in CORE_RULES
+    if rule not in _WHOLE_PATH_RULES and trigger not in PATH_CONTEXT_TRIGGERS
+])
+
+
+class CachedTokenizer:
+    """
+    세그먼트 단위 LRU 캐시 토크나이저 (출력은 tokenize_one_core / tokenize_one과 동일)
+    - postprocess=False: tokenize_one_core 와 동일 (CLI 기본)
+    - postprocess=True : tokenize_one 과 동일 (콤마 필드 + 후처리)
+    - maxsize: 세그먼트 캐시 / 경로 캐시 각각의 최대 항목 수
+    """
+
+    def __init__(self, postprocess: bool = False, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.postprocess = postprocess
+        self._segment = functools.lru_cache(maxsize=maxsize)(self._tokenize_segment)
+        self._path = functools.lru_cache(maxsize=maxsize)(tokenize_one_core)
+
+    @staticmethod
+    def _tokenize_segment(seg: str) -> str:
+        # 앞에 '/'를 붙여 경로 안에서와 같은 경계 조건으로 토큰화
+        return _SEGMENT_ENGINE.run("/" + seg)[1:]
+
+    def core(self, s: str) -> str:
+        if not isinstance(s, str) or not s:
+            return s
+        if not s.startswith("/") or any(lit in s for lit in PATH_CONTEXT_TRIGGERS):
+            return self._path(s)
+
+        t = "/".join(map(self._segment, s.split("/")))
+        if "/data/user" in t:
+            t = tokenize_decimals_after_user_root(t)
+        return t
+
+    def __call__(self, s: str) -> str:
+        if self.postprocess:
+            return tokenize_one(s, core=self.core)
+        return self.core(s)
+
+    def clear(self):
+        self._segment.cache_clear()
+        self._path.cache_clear()
+
+    def stats(self) -> dict:
+        seg = self._segment.cache_info()
+        path = self._path.cache_info()
+        hits = seg.hits + path.hits
+        lookups = hits + seg.misses + path.misses
+        return {
+            "segment_hits": seg.hits,
+            "segment_misses": seg.misses,
+            "segment_size": seg.currsize,
+            "path_hits": path.hits,
+            "path_misses": path.misses,
+            "path_size": path.currsize,
+            "hit_rate": (hits / lookups) if lookups else 0.0,
+        }
+
+    def format_stats(self) -> str:
+        st = self.stats()
+        seg_total = st["segment_hits"] + st["segment_misses"]
+        path_total = st["path_hits"] + st["path_misses"]
+        return (
+            f"cache hit {st['hit_rate']:.1%} "
+            f"(segment {st['segment_hits']}/{seg_total}, whole-path {st['path_hits']}/{path_total})"
+        )
+
+# -------------------------
+# Rule profiling
+# -------------------------
+# 코퍼스를 캐시 없이 토큰화하면서 규칙별 trigger 검사 / 실행 / 매칭 횟수와 누적 시간을 기록한다.
+#   - hot 규칙: 누적 시간 상위 → 순서 조정 / trigger 보강 대상
+#   - dead 규칙: 코퍼스 전체에서 한 번도 문자열을 바꾸지 않은 규칙 → 정리 후보
+PROFILE_FIELDS = ["engine", "order", "rule", "trigger", "checked", "calls", "matches", "seconds", "us_per_call"]
+
+
+def _rule_name(rule) -> str:
+    """규칙 테이블 항목 → 모듈 상수/함수 이름 (없으면 정규식 앞부분)"""
+    target = rule[0] if isinstance(rule, tuple) else rule
+    for name, obj in globals().items():
+        if obj is target and not name.startswith("_"):
+            return name
+    if isinstance(target, re.Pattern):
+        return target.pattern[:60]
+    return getattr(target, "__name__", repr(target))
+
+
+def _trigger_text(trigger) -> str:
+    if trigger is None:
+        return "always"
+    if isinstance(trigger, str):
+        return repr(trigger)
+    kind, arg = trigger
+    if kind == "any":
+        return "any(" + ", ".join(map(repr, arg)) + ")"
+    return f"{kind}>={arg}"
+
+
+class RuleProfiler:
+    """
+    with RuleProfiler() as prof:
+        for p in paths: tokenize_one(p)
+    prof.rows() / prof.write_csv(path) / prof.format_report()
+
+    - 프로파일링 중에는 CachedTokenizer 대신 tokenize_one / tokenize_one_core 를 직접 써야
+      경로마다 규칙이 실제로 실행된다 (캐시 hit이면 규칙이 돌지 않음).
+    """
+
+    ENGINES = (("core", _CORE_ENGINE), ("postprocess", _POSTPROCESS_ENGINE))
+
+    def __init__(self):
+        self._rows = None
+
+    def __enter__(self):
+        for _, engine in self.ENGINES:
+            engine.start_profile()
+        return self
+
+    def __exit__(self, *exc):
+        self._rows = self._collect()
+        for _, engine in self.ENGINES:
+            engine.stop_profile()
+        return False
+
+    def _collect(self) -> list:
+        rows = []
+        for label, engine in self.ENGINES:
+            for i, (trigger, rule) in enumerate(engine.rules):
+                calls = engine.prof_calls[i]
+                seconds = engine.prof_seconds[i]
+                rows.append({
+                    "engine": label,
+                    "order": i,
+                    "rule": _rule_name(rule),
+                    "trigger": _trigger_text(trigger),
+                    "checked": engine.prof_checked[i],
+                    "calls": calls,
+                    "matches": engine.prof_matches[i],
+                    "seconds": round(seconds, 6),
+                    "us_per_call": round(seconds / calls * 1e6, 3) if calls else 0.0,
+                })
+        return rows
+
+    def rows(self) -> list:
+        return self._rows if self._rows is not None else self._collect()
+
+    def hot_rules(self, top: int = 10) -> list:
+        return sorted(self.rows(), key=lambda r: r["seconds"], reverse=True)[:top]
+
+    def dead_rules(self) -> list:
+        return [r for r in self.rows() if r["matches"] == 0]
+
+    def write_csv(self, path: Path):
+        with Path(path).open("w", encoding="utf-8-sig", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=PROFILE_FIELDS)
+            writer.writeheader()
+            writer.writerows(self.rows())
+
+    def format_report(self, top: int = 10) -> str:
+        rows = self.rows()
+        total = sum(r["seconds"] for r in rows)
+        lines = [f"[profile] {len(rows)} rules, total rule time {total * 1000:.1f} ms"]
+        lines.append(f"[profile] hot rules (top {top} by cumulative time):")
+        for r in self.hot_rules(top):
+            share = r["seconds"] / total if total else 0.0
+            lines.append(
+                f"    {r['engine'] + '#' + str(r['order']):<16} {r['rule']:<50} {r['seconds'] * 1000:8.2f} ms "
+                f"({share:5.1%})  calls={r['calls']} matches={r['matches']}"
+            )
+        dead = self.dead_rules()
+        lines.append(f"[profile] dead rules (no match in corpus): {len(dead)}")
+        for r in dead:
+            lines.append(f"    {r['engine'] + '#' + str(r['order']):<16} {r['rule']:<50} "
+                         f"trigger={r['trigger']} calls={r['calls']}")
+        return "\n".join(lines)
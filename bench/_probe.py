@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+_probe.py
+벤치마크 단계 실행용 자식 프로세스
+
+사용법: python _probe.py <결과 JSON> <스크립트 경로> [스크립트 인자...]
+
+- 스크립트를 __main__으로 실행 (static_runner가 subprocess로 돌리는 것과 동일한 조건)
+- 실행 시간(초), 종료 코드, 프로세스 최대 메모리(MB)를 결과 JSON에 기록
+"""
+import json
+import os
+import runpy
+import sys
+import time
+
+
+def peak_memory_mb():
+    """현재 프로세스의 최대 RSS(MB). 측정 불가 환경이면 None"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS는 bytes, Linux는 KB 단위
+        if sys.platform == "darwin":
+            return peak / (1024 * 1024)
+        return peak / 1024
+    except ImportError:
+        pass
+
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        peak = getattr(info, "peak_wset", None) or info.rss
+        return peak / (1024 * 1024)
+    except ImportError:
+        return None
+
+
+def main():
+    if len(sys.argv) < 3:
+        print("사용법: python _probe.py <결과 JSON> <스크립트 경로> [인자...]", file=sys.stderr)
+        sys.exit(2)
+
+    result_path = sys.argv[1]
+    script = os.path.abspath(sys.argv[2])
+
+    # 스크립트 폴더의 모듈(path_utils 등)을 import 할 수 있도록
+    sys.path.insert(0, os.path.dirname(script))
+    sys.argv = [script] + sys.argv[3:]
+
+    returncode = 0
+    start = time.perf_counter()
+    try:
+        runpy.run_path(script, run_name="__main__")
+    except SystemExit as e:
+        if isinstance(e.code, int):
+            returncode = e.code
+        elif e.code:
+            print(e.code, file=sys.stderr)
+            returncode = 1
+    elapsed = time.perf_counter() - start
+
+    with open(result_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "seconds": elapsed,
+            "returncode": returncode,
+            "peak_mb": peak_memory_mb(),
+        }, f)
+
+    sys.exit(returncode)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bench_common.py
+Static 파이프라인 벤치마크 공용 유틸
+
+- 픽스처 탐색 (bench/fixtures/*.jsonl, Logic/A3-results/static_*_result.csv)
+- 단계별 실행 (_probe.py 자식 프로세스) + 행 수 / 출력 해시 계산
+"""
+import csv
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+BENCH_DIR = Path(__file__).resolve().parent
+ROOT_DIR = BENCH_DIR.parent
+LOGIC_DIR = ROOT_DIR / "Logic"
+A3_RESULTS_DIR = LOGIC_DIR / "A3-results"
+FIXTURES_DIR = BENCH_DIR / "fixtures"
+PROBE_SCRIPT = BENCH_DIR / "_probe.py"
+
+# 단계 이름 (실행 순서)
+STAGES = ["extract", "noise_filter", "filter_artifacts", "path_tokenizer"]
+
+csv.field_size_limit(min(sys.maxsize, 2 ** 31 - 1))
+
+
+def static_dir(variant: str = "Static", logic_dir: Path = LOGIC_DIR) -> Path:
+    """Static / new_static 중 벤치마크 대상 폴더"""
+    return Path(logic_dir) / variant
+
+
+def discover_fixtures(keyword: Optional[str] = None) -> List[Dict[str, str]]:
+    """
+    픽스처 목록 반환
+    - kind="jsonl"      : 기록해 둔 taint JSONL (extract 단계부터 전부 실행)
+    - kind="result_csv" : A3-results의 static 결과 CSV (filter_artifacts 단계부터 실행)
+    """
+    fixtures = []
+
+    if FIXTURES_DIR.exists():
+        for p in sorted(FIXTURES_DIR.glob("*.jsonl")):
+            fixtures.append({"name": p.stem, "kind": "jsonl", "path": str(p)})
+
+    if A3_RESULTS_DIR.exists():
+        for p in sorted(A3_RESULTS_DIR.glob("static_*_result.csv")):
+            pkg = p.name[len("static_"):-len("_result.csv")]
+            fixtures.append({"name": pkg, "kind": "result_csv", "path": str(p)})
+
+    if keyword:
+        fixtures = [f for f in fixtures if keyword in f["name"]]
+    return fixtures
+
+
+def count_rows(path: str) -> int:
+    """JSONL은 비어있지 않은 줄 수, Parquet은 메타데이터 행 수, CSV는 헤더 제외 행 수"""
+    if not os.path.exists(path):
+        return 0
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        return pq.read_metadata(path).num_rows
+    if path.endswith(".jsonl"):
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            return sum(1 for line in f if line.strip())
+    with open(path, "r", encoding="utf-8-sig", errors="ignore", newline="") as f:
+        return max(sum(1 for _ in csv.reader(f)) - 1, 0)
+
+
+def file_sha256(path: str) -> Optional[str]:
+    if not os.path.exists(path):
+        return None
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def stage_plan(fixture: Dict[str, str], workdir: Path, variant: str = "Static",
+               logic_dir: Path = LOGIC_DIR, intermediate: str = "csv") -> List[Dict]:
+    """
+    픽스처 하나에 대해 실행할 단계 목록 (static_runner.py와 같은 순서/인자)
+    각 단계: name, script, args, input, output
+    - logic_dir: 스크립트를 가져올 Logic 폴더 (다른 버전 트리와 비교할 때 지정)
+    - intermediate: extract / noise_filter 출력 형식 ("csv" | "parquet", static_runner의 A3_STATIC_INTERMEDIATE)
+    """
+    sdir = static_dir(variant, logic_dir)
+    artifacts_out = str(workdir / f"artifacts.{intermediate}")
+    noise_out = str(workdir / f"artifacts_noise.{intermediate}")
+    filtered_out = str(workdir / "filter_path.csv")
+    tokenized_out = str(workdir / "tokenized.csv")
+
+    plan = []
+    if fixture["kind"] == "jsonl":
+        plan.append({
+            "name": "extract",
+            "script": str(sdir / "artifacts_path_merged_fin.py"),
+            "args": [fixture["path"], "-o", artifacts_out],
+            "input": fixture["path"],
+            "output": artifacts_out,
+        })
+        plan.append({
+            "name": "noise_filter",
+            "script": str(sdir / "noise_filter.py"),
+            "args": ["-i", artifacts_out, "-o", noise_out, "-f", str(sdir / "filter.txt"), "--quiet"],
+            "input": artifacts_out,
+            "output": noise_out,
+        })
+        filter_input = noise_out
+    else:
+        filter_input = fixture["path"]
+
+    plan.append({
+        "name": "filter_artifacts",
+        "script": str(sdir / "filter_artifacts.py"),
+        "args": ["-i", filter_input, "-o", filtered_out],
+        "input": filter_input,
+        "output": filtered_out,
+    })
+    plan.append({
+        "name": "path_tokenizer",
+        "script": str(Path(logic_dir) / "runner_scripts" / "path_tokenizer.py"),
+        "args": ["--csv", filtered_out, "--column", "artifact_path", "--out", tokenized_out],
+        "input": filtered_out,
+        "output": tokenized_out,
+    })
+    return plan
+
+
+def run_stage(stage: Dict, workdir: Path, timeout: int = 1800) -> Dict:
+    """
+    단계 하나를 _probe.py 자식 프로세스로 실행하고 측정값 반환
+    - rows_in, seconds, rows_per_sec, peak_mb, output_sha256, ok, error
+    """
+    probe_out = workdir / f"_probe_{stage['name']}.json"
+    if probe_out.exists():
+        probe_out.unlink()
+
+    rows_in = count_rows(stage["input"])
+    cmd = [sys.executable, str(PROBE_SCRIPT), str(probe_out), stage["script"]] + stage["args"]
+
+    result = {
+        "rows_in": rows_in,
+        "seconds": None,
+        "rows_per_sec": None,
+        "peak_mb": None,
+        "output_sha256": None,
+        "ok": False,
+        "error": "",
+    }
+
+    try:
+        proc = subprocess.run(
+            cmd,
+            cwd=str(workdir),  # artifacts_debug.log 등 부산물은 작업 폴더에 생성
+            capture_output=True,
+            encoding="utf-8",
+            errors="replace",
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        result["error"] = f"timeout ({timeout}s)"
+        return result
+
+    if not probe_out.exists():
+        tail = (proc.stderr or "").strip().splitlines()[-3:]
+        result["error"] = " | ".join(tail) or f"exit {proc.returncode}"
+        return result
+
+    with open(probe_out, "r", encoding="utf-8") as f:
+        probe = json.load(f)
+
+    result["seconds"] = probe["seconds"]
+    result["peak_mb"] = probe["peak_mb"]
+    result["output_sha256"] = file_sha256(stage["output"])
+    if probe["seconds"] > 0:
+        result["rows_per_sec"] = rows_in / probe["seconds"]
+
+    if probe["returncode"] != 0:
+        tail = (proc.stderr or "").strip().splitlines()[-3:]
+        result["error"] = " | ".join(tail) or f"exit {probe['returncode']}"
+    else:
+        result["ok"] = True
+    return result
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+equivalence.py
+Static 단계 최적화용 회귀 동등성 검사 (golden output gate)
+
+기준 구현(git ref, 기본 HEAD)과 후보 구현(현재 작업 트리)을 같은 픽스처로 나란히 실행하고,
+- 단계별 출력 행 집합 비교 (추가/삭제된 행)
+- 패키지별 최종 경로 집합을 Logic/A3-results 결과와 비교 (누락/추가 경로)
+- 단계별 실행 시간 비교
+를 출력한다. 후보 출력이 기준과 다르면 exit 1 → 최적화 PR의 gate로 사용.
+
+사용법:
+    python bench/equivalence.py                        # HEAD vs 작업 트리
+    python bench/equivalence.py --reference main -k kakao
+    python bench/equivalence.py --reference-dir /path/to/old/Logic --show 20
+    python bench/equivalence.py --intermediate parquet   # 후보만 Parquet 중간 파일로 실행
+"""
+import argparse
+import csv
+import io
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+from bench_common import (A3_RESULTS_DIR, LOGIC_DIR, ROOT_DIR, count_rows, discover_fixtures,
+                          run_stage, stage_plan)
+
+# 동등성 비교에서 제외할 컬럼 (입력 줄 번호는 구현과 무관한 메타데이터)
+IGNORED_COLUMNS = {"line"}
+
+# git ref에서 꺼낼 폴더 (stage_plan이 참조하는 스크립트 위치)
+REFERENCE_PATHS = ["Logic/Static", "Logic/new_static", "Logic/runner_scripts", "Logic/tokenizer", "Logic/shared"]
+
+
+def _exists_in_ref(ref: str, path: str) -> bool:
+    proc = subprocess.run(["git", "-C", str(ROOT_DIR), "cat-file", "-e", f"{ref}:{path}"], capture_output=True)
+    return proc.returncode == 0
+
+
+def export_reference_tree(ref: str, dest: Path) -> Path:
+    """git ref의 Logic 스크립트를 dest에 풀고, dest/Logic 경로 반환 (ref에 없는 폴더는 건너뜀)"""
+    paths = [p for p in REFERENCE_PATHS if _exists_in_ref(ref, p)]
+    proc = subprocess.run(
+        ["git", "-C", str(ROOT_DIR), "archive", "--format=tar", ref] + paths,
+        capture_output=True,
+    )
+    if proc.returncode != 0:
+        raise SystemExit(f"[!] git archive 실패 ({ref}): {proc.stderr.decode('utf-8', 'replace').strip()}")
+
+    with tarfile.open(fileobj=io.BytesIO(proc.stdout)) as tar:
+        tar.extractall(dest)
+    return dest / "Logic"
+
+
+def read_row_set(path: str) -> Tuple[Set[Tuple], List[str]]:
+    """CSV를 (행 튜플 집합, 헤더)로 읽기. IGNORED_COLUMNS는 비교에서 제외"""
+    if not Path(path).exists():
+        return set(), []
+    with open(path, "r", encoding="utf-8-sig", errors="replace", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        keep = [i for i, c in enumerate(header) if c not in IGNORED_COLUMNS]
+        rows = {tuple(row[i] if i < len(row) else "" for i in keep) for row in reader}
+    return rows, [header[i] for i in keep]
+
+
+def read_path_set(path: str, column: str = None) -> Set[str]:
+    """CSV의 경로 컬럼(없으면 첫 컬럼) 값 집합"""
+    if not Path(path).exists():
+        return set()
+    with open(path, "r", encoding="utf-8-sig", errors="replace", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        idx = header.index(column) if column in header else 0
+        return {row[idx].strip().rstrip("/") for row in reader if len(row) > idx and row[idx].strip()}
+
+
+def a3_expected_paths(package: str) -> Set[str]:
+    """Logic/A3-results/static_<package>_result.csv 경로 집합 (없으면 빈 집합)"""
+    p = A3_RESULTS_DIR / f"static_{package}_result.csv"
+    return read_path_set(str(p)) if p.exists() else set()
+
+
+def run_side(fixture: Dict, logic_dir: Path, variant: str,
+             intermediate: str = "csv") -> Tuple[Dict[str, Dict], Path]:
+    """한쪽 구현으로 픽스처의 모든 단계를 실행 → (단계별 결과, 작업 폴더)"""
+    workdir = Path(tempfile.mkdtemp(prefix=f"equiv_{fixture['name']}_"))
+    results = {}
+    for stage in stage_plan(fixture, workdir, variant, logic_dir, intermediate):
+        r = run_stage(stage, workdir)
+        r["output"] = stage["output"]
+        results[stage["name"]] = r
+        if not r["ok"]:
+            break
+    return results, workdir
+
+
+def print_samples(label: str, items: Set, show: int):
+    for item in sorted(items)[:show]:
+        text = ",".join(item) if isinstance(item, tuple) else item
+        print(f"        {label} {text}")
+    if len(items) > show:
+        print(f"        ... 외 {len(items) - show}개")
+
+
+def compare_fixture(fixture: Dict, ref_logic: Path, cand_logic: Path, variant: str, show: int,
+                    intermediate: str = "csv") -> bool:
+    """픽스처 하나 비교. 후보가 기준과 동등하면 True (기준은 항상 CSV 중간 파일)"""
+    print(f"\n=== {fixture['name']} ({fixture['kind']}) ===")
+    ref, ref_dir = run_side(fixture, ref_logic, variant)
+    cand, cand_dir = run_side(fixture, cand_logic, variant, intermediate)
+    equivalent = True
+
+    try:
+        for stage_name, r in ref.items():
+            c = cand.get(stage_name)
+            if c is None or not c["ok"] or not r["ok"]:
+                err = (c or {}).get("error") if r["ok"] else f"기준 실행 실패: {r['error']}"
+                print(f"  [!] {stage_name}: 실행 실패 - {err}")
+                equivalent = False
+                break
+
+            speedup = (r["seconds"] / c["seconds"]) if c["seconds"] else 0.0
+            timing = f"{r['seconds']:.3f}s → {c['seconds']:.3f}s (x{speedup:.2f})"
+
+            if r["output_sha256"] == c["output_sha256"]:
+                print(f"  [=] {stage_name:<17} identical            {timing}")
+                continue
+
+            if Path(r["output"]).suffix != Path(c["output"]).suffix:
+                # CSV ↔ Parquet 중간 파일: 행 수만 비교 (내용은 다음 단계 CSV 출력으로 확인)
+                ref_count, cand_count = count_rows(r["output"]), count_rows(c["output"])
+                if ref_count != cand_count:
+                    equivalent = False
+                    print(f"  [!] {stage_name:<17} {ref_count} → {cand_count} rows ({Path(c['output']).suffix})  {timing}")
+                else:
+                    print(f"  [~] {stage_name:<17} {cand_count} rows ({Path(c['output']).suffix})  {timing}")
+                continue
+
+            ref_rows, ref_header = read_row_set(r["output"])
+            cand_rows, cand_header = read_row_set(c["output"])
+            if ref_header != cand_header:
+                print(f"  [!] {stage_name:<17} 헤더 변경 {ref_header} → {cand_header}")
+                equivalent = False
+                continue
+
+            added = cand_rows - ref_rows
+            removed = ref_rows - cand_rows
+            if not added and not removed:
+                # 행 순서 / line 번호 / 인코딩만 다른 경우 (집합 기준 동등)
+                print(f"  [~] {stage_name:<17} same row set         {timing}")
+                continue
+
+            equivalent = False
+            print(f"  [!] {stage_name:<17} +{len(added)} / -{len(removed)} rows  {timing}")
+            print_samples("+", added, show)
+            print_samples("-", removed, show)
+
+        # 패키지별 최종 경로 집합 vs A3-results
+        expected = a3_expected_paths(fixture["name"])
+        if expected and "filter_artifacts" in ref and "filter_artifacts" in cand:
+            ref_paths = read_path_set(ref["filter_artifacts"]["output"], "artifact_path")
+            cand_paths = read_path_set(cand["filter_artifacts"]["output"], "artifact_path")
+            ref_missing = expected - ref_paths
+            cand_missing = expected - cand_paths
+            print(f"  [A3] 기준 경로 {len(expected)}개 중 누락: 기준 {len(ref_missing)}개 / 후보 {len(cand_missing)}개")
+
+            lost = cand_missing - ref_missing
+            gained = ref_missing - cand_missing
+            if lost:
+                equivalent = False
+                print(f"  [!] 후보에서 새로 누락된 A3 경로 {len(lost)}개")
+                print_samples("-", lost, show)
+            if gained:
+                print(f"  [i] 후보에서 새로 찾은 A3 경로 {len(gained)}개")
+                print_samples("+", gained, show)
+    finally:
+        shutil.rmtree(ref_dir, ignore_errors=True)
+        shutil.rmtree(cand_dir, ignore_errors=True)
+
+    return equivalent
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Static 단계 기준/후보 구현 출력 동등성 검사")
+    ap.add_argument("--reference", default="HEAD", help="기준 구현 git ref (기본: HEAD)")
+    ap.add_argument("--reference-dir", default=None, help="기준 구현 Logic 폴더 (지정 시 --reference 무시)")
+    ap.add_argument("--candidate-dir", default=str(LOGIC_DIR), help="후보 구현 Logic 폴더 (기본: 작업 트리)")
+    ap.add_argument("--variant", default="Static", choices=["Static", "new_static"])
+    ap.add_argument("-k", "--keyword", default=None, help="픽스처 이름 필터 (부분 일치)")
+    ap.add_argument("--show", type=int, default=10, help="추가/삭제 샘플 출력 개수")
+    ap.add_argument("--intermediate", default="csv", choices=["csv", "parquet"],
+                    help="후보 구현의 extract / noise_filter 출력 형식 (기준은 CSV)")
+    args = ap.parse_args()
+
+    fixtures = discover_fixtures(args.keyword)
+    if not fixtures:
+        print("[!] 픽스처가 없습니다. bench/fixtures/*.jsonl 또는 Logic/A3-results 확인", file=sys.stderr)
+        sys.exit(1)
+
+    tmp_ref = None
+    if args.reference_dir:
+        ref_logic = Path(args.reference_dir).resolve()
+        ref_label = str(ref_logic)
+    else:
+        tmp_ref = Path(tempfile.mkdtemp(prefix="equiv_ref_"))
+        ref_logic = export_reference_tree(args.reference, tmp_ref)
+        ref_label = f"git:{args.reference}"
+    cand_logic = Path(args.candidate_dir).resolve()
+
+    print(f"[+] 기준: {ref_label}")
+    print(f"[+] 후보: {cand_logic}")
+    print(f"[+] 픽스처 {len(fixtures)}개, variant={args.variant}, 후보 중간 파일={args.intermediate}")
+
+    failed = []
+    try:
+        for fixture in fixtures:
+            if not compare_fixture(fixture, ref_logic, cand_logic, args.variant, args.show, args.intermediate):
+                failed.append(fixture["name"])
+    finally:
+        if tmp_ref:
+            shutil.rmtree(tmp_ref, ignore_errors=True)
+
+    print()
+    if failed:
+        print(f"[!] 출력이 달라진 픽스처 {len(failed)}개: {', '.join(failed)}")
+        sys.exit(1)
+    print(f"[OK] {len(fixtures)}개 픽스처 모두 기준 구현과 동등")
+
+
+if __name__ == "__main__":
+    main()
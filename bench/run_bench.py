@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+run_bench.py
+Static 파이프라인 벤치마크
+
+기록된 픽스처를 artifacts_path_merged_fin → noise_filter → filter_artifacts → path_tokenizer
+순서로 재생하고, 단계별 rows/sec, 최대 메모리, 출력 해시를 baseline.json과 비교한다.
+(기기 / APK 불필요)
+
+사용법:
+    python bench/run_bench.py                      # 전체 픽스처 측정 + baseline 비교
+    python bench/run_bench.py -k instagram         # 이름에 instagram 포함된 픽스처만
+    python bench/run_bench.py --update-baseline    # 현재 측정값을 baseline으로 저장
+"""
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from bench_common import BENCH_DIR, discover_fixtures, run_stage, stage_plan
+
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+
+
+def bench_fixture(fixture, variant, repeat, keep_workdir):
+    """픽스처 하나의 모든 단계를 repeat번 실행 → 단계별 최적(최소 시간) 측정값"""
+    workdir = Path(tempfile.mkdtemp(prefix=f"bench_{fixture['name']}_"))
+    runs = {}
+    try:
+        for _ in range(repeat):
+            for stage in stage_plan(fixture, workdir, variant):
+                r = run_stage(stage, workdir)
+                runs.setdefault(stage["name"], []).append(r)
+                if not r["ok"]:
+                    break
+    finally:
+        if keep_workdir:
+            print(f"    작업 폴더 유지: {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    results = {}
+    for name, rs in runs.items():
+        failed = [r for r in rs if not r["ok"]]
+        if failed:
+            results[name] = failed[0]
+            continue
+        best = min(rs, key=lambda r: r["seconds"])
+        # 반복 실행 간 출력이 달라지면 비결정적 출력으로 표시
+        if len({r["output_sha256"] for r in rs}) > 1:
+            best["ok"] = False
+            best["error"] = "출력 해시가 반복 실행마다 다름 (비결정적)"
+        results[name] = best
+    return results
+
+
+def compare(key, cur, base, tolerance, mem_tolerance):
+    """baseline 대비 문제 목록 반환 (빈 리스트면 통과)"""
+    issues = []
+    if not cur["ok"]:
+        issues.append(f"FAILED ({cur['error']})")
+        return issues
+    if base is None:
+        return issues
+
+    if base.get("output_sha256") and cur["output_sha256"] != base["output_sha256"]:
+        issues.append("OUTPUT CHANGED")
+
+    base_rps = base.get("rows_per_sec")
+    if base_rps and cur["rows_per_sec"] is not None and cur["rows_per_sec"] < base_rps * (1 - tolerance):
+        issues.append(f"SLOWER ({cur['rows_per_sec']:.0f} < {base_rps:.0f} rows/s)")
+
+    base_mem = base.get("peak_mb")
+    if base_mem and cur["peak_mb"] is not None and cur["peak_mb"] > base_mem * (1 + mem_tolerance):
+        issues.append(f"MORE MEMORY ({cur['peak_mb']:.1f} > {base_mem:.1f} MB)")
+    return issues
+
+
+def fmt(v, spec):
+    return "-" if v is None else format(v, spec)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Static 파이프라인 벤치마크 (rows/sec, peak memory, output hash)")
+    ap.add_argument("-k", "--keyword", default=None, help="픽스처 이름 필터 (부분 일치)")
+    ap.add_argument("--variant", default="Static", choices=["Static", "new_static"],
+                    help="측정할 Static 스크립트 폴더 (기본: Static)")
+    ap.add_argument("--repeat", type=int, default=1, help="단계별 반복 횟수 (최소 시간 채택)")
+    ap.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="baseline JSON 경로")
+    ap.add_argument("--update-baseline", action="store_true", help="현재 측정값으로 baseline 갱신")
+    ap.add_argument("--tolerance", type=float, default=0.25,
+                    help="rows/sec 허용 하락 비율 (기본: 0.25 = 25%%)")
+    ap.add_argument("--mem-tolerance", type=float, default=0.25,
+                    help="최대 메모리 허용 증가 비율 (기본: 0.25 = 25%%)")
+    ap.add_argument("--json-out", default=None, help="측정 결과 JSON 저장 경로")
+    ap.add_argument("--keep-workdir", action="store_true", help="단계별 중간 CSV 폴더 삭제하지 않음")
+    args = ap.parse_args()
+
+    fixtures = discover_fixtures(args.keyword)
+    if not fixtures:
+        print("[!] 픽스처가 없습니다. bench/fixtures/*.jsonl 또는 Logic/A3-results 확인", file=sys.stderr)
+        sys.exit(1)
+
+    baseline_path = Path(args.baseline)
+    baseline = {}
+    if baseline_path.exists():
+        with open(baseline_path, "r", encoding="utf-8") as f:
+            baseline = json.load(f).get("results", {})
+
+    print(f"[+] 픽스처 {len(fixtures)}개, variant={args.variant}, repeat={args.repeat}")
+    print(f"[+] baseline: {baseline_path if baseline else '(없음)'}\n")
+
+    measured = {}
+    regressions = 0
+
+    header = f"{'fixture:stage':<58} {'rows':>7} {'sec':>8} {'rows/s':>10} {'peakMB':>8}  hash"
+    print(header)
+    print("-" * len(header))
+
+    for fixture in fixtures:
+        results = bench_fixture(fixture, args.variant, args.repeat, args.keep_workdir)
+        for stage_name, r in results.items():
+            key = f"{fixture['name']}:{stage_name}"
+            measured[key] = r
+
+            issues = compare(key, r, baseline.get(key), args.tolerance, args.mem_tolerance)
+            if issues and not args.update_baseline:
+                regressions += 1
+
+            short_hash = (r["output_sha256"] or "-")[:12]
+            line = (f"{key:<58} {r['rows_in']:>7} {fmt(r['seconds'], '.3f'):>8} "
+                    f"{fmt(r['rows_per_sec'], '.0f'):>10} {fmt(r['peak_mb'], '.1f'):>8}  {short_hash}")
+            if issues:
+                line += "  [!] " + ", ".join(issues)
+            elif key not in baseline:
+                line += "  (new)"
+            print(line)
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(measured, f, ensure_ascii=False, indent=2)
+        print(f"\n[+] 측정 결과 저장: {args.json_out}")
+
+    if args.update_baseline:
+        merged = dict(baseline)
+        merged.update({k: v for k, v in measured.items() if v["ok"]})
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "updated": datetime.now().isoformat(timespec="seconds"),
+                "variant": args.variant,
+                "python": sys.version.split()[0],
+                "results": merged,
+            }, f, ensure_ascii=False, indent=2, sort_keys=True)
+        print(f"\n[+] baseline 갱신: {baseline_path} ({len(merged)}개 항목)")
+        return
+
+    if regressions:
+        print(f"\n[!] baseline 대비 문제 {regressions}건")
+        sys.exit(1)
+    print("\n[OK] baseline 대비 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
@@ -24,6 +24,13 @@ runner_scripts_dir = current_file.parent.parent.parent / "Logic" / "runner_scrip
 if str(runner_scripts_dir) not in sys.path:
     sys.path.insert(0, str(runner_scripts_dir))
 
+# Logic/Dynamic 경로 추가 (adb_session: 앱 이름 조회 시 adb shell 세션 재사용)
+dynamic_dir = current_file.parent.parent.parent / "Logic" / "Dynamic"
+if str(dynamic_dir) not in sys.path:
+    sys.path.append(str(dynamic_dir))
+
+from adb_session import get_pool
+
 BOTTOM_SECTION_HEIGHT = 680  # <- 여기만 바꿔서 하단 세로 조절
 
 
@@ -693,23 +700,20 @@ class AcquisitionPage(QWidget):
     def get_label(self, pkg):
         """aapt로 APK에서 앱 이름 추출"""
         try:
+            # 열어 둔 adb shell 세션 재사용 (get_label은 여러 스레드에서 동시에 호출됨)
+            pool = get_pool()
+
             # APK 경로 찾기
-            p = subprocess.run(
-                ["adb", "shell", "pm", "path", pkg],
-                capture_output=True, text=True, timeout=2
-            )
-            
-            apk_path = p.stdout.strip().replace("package:", "")
+            out, _, _ = pool.run(f"pm path {pkg}", timeout=2)
+
+            apk_path = out.strip().replace("package:", "")
             if not apk_path:
                 return None
             
             # aapt로 앱 정보 추출
-            p2 = subprocess.run(
-                ["adb", "shell", f"aapt dump badging {apk_path} | grep 'application-label:'"],
-                capture_output=True, text=True, timeout=3
-            )
-            
-            m = re.search(r"application-label:'([^']+)'", p2.stdout)
+            out, _, _ = pool.run(f"aapt dump badging {apk_path} | grep 'application-label:'", timeout=3)
+
+            m = re.search(r"application-label:'([^']+)'", out)
             if m:
                 return m.group(1)
         
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+adb_session 테스트 (기기 없이 adb_sim.FakeDevice / 로컬 sh 로 실행)
+    python -m pytest tests
+"""
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Logic" / "Dynamic"))
+
+from adb_session import TIMEOUT_RESULT, AdbSession, AdbSessionPool, ShellTransport  # noqa: E402
+from adb_sim import FakeDevice  # noqa: E402
+
+
+@pytest.fixture
+def device():
+    dev = FakeDevice(packages=["com.a", "com.b"])
+    dev.add_file("/data/user/0/com.a/files/x.db", 5)
+    return dev
+
+
+@pytest.fixture
+def pool(device):
+    p = AdbSessionPool(root=True, size=2, backend=device, timeout=1)
+    yield p
+    p.close()
+
+
+def test_run_and_map(pool):
+    out, err, rc = pool.run("ls -al /data/user/0/com.a")
+    assert rc == 0 and err == ""
+    assert out.splitlines()[-1].endswith(" files")
+
+    results = pool.map(["pm list packages -3", "echo hi", "[ -d /data/user/0/com.a/files ]"])
+    assert results[0] == ("package:com.a\npackage:com.b\n", "", 0)
+    assert results[1][0].strip() == "hi"
+    assert results[2][2] == 0
+
+
+def test_drop_next_reconnects_and_retries(device, pool):
+    assert pool.run("echo warm")[2] == 0
+    device.drop_next = 1
+
+    out, _, rc = pool.run("echo again")
+    assert (out.strip(), rc) == ("again", 0)
+    stats = pool.stats()
+    assert stats["disconnects"] == 1
+    assert stats["connects"] == 2
+    assert device.commands.count("echo again") == 1
+
+
+def test_hang_pattern_times_out_and_session_recovers(device, pool):
+    device.hang_pattern = r"^sleep"
+
+    assert pool.run("sleep 100") == TIMEOUT_RESULT
+    assert pool.stats()["timeouts"] == 1
+    assert "sleep 100" not in device.commands  # 타임아웃 명령은 재시도하지 않음
+
+    device.hang_pattern = None
+    assert pool.run("echo ok")[0].strip() == "ok"
+
+
+class _LocalShell:
+    """
+    로컬 sh 를 adb shell 대신 여는 백엔드 (ShellTransport sentinel 처리 확인용)
+    - merged_stderr: stderr 를 stdout 으로 합쳐 보내는 구형 기기 흉내
+    """
+    serial = "local"
+
+    def __init__(self, merged_stderr=False, cwd=None):
+        self.merged_stderr = merged_stderr
+        self.cwd = cwd
+
+    def open_shell(self, root=False):
+        script = "exec sh 2>&1" if self.merged_stderr else "exec sh"
+        if self.cwd:
+            script = f"cd '{self.cwd}' && {script}"
+        return ShellTransport(["sh", "-c", script])
+
+
+@pytest.mark.skipif(shutil.which("sh") is None, reason="sh 없음")
+def test_shell_transport_output_without_trailing_newline():
+    with AdbSession(backend=_LocalShell(), timeout=5) as s:
+        assert s.run("printf x >&2") == ("", "x", 0)
+        assert s.run("printf y; echo e >&2; false") == ("y", "e\n", 1)
+        assert s.run("echo a; echo b >&2") == ("a\n", "b\n", 0)
+
+
+@pytest.mark.skipif(shutil.which("sh") is None, reason="sh 없음")
+def test_shell_transport_merged_stderr():
+    with AdbSession(backend=_LocalShell(merged_stderr=True), timeout=5) as s:
+        assert s.run("echo a; echo b >&2") == ("a\nb\n", "", 0)
+        assert s.run("printf x >&2; false") == ("x", "", 1)
+        # 앞 명령의 sentinel 줄이 다음 명령 출력에 섞이지 않음
+        assert s.run("printf y") == ("y", "", 0)
+        assert s.stats["timeouts"] == 0
+
+
+def test_fake_find_printf_snapshot(device, pool):
+    from fs_snapshot import take_snapshot
+
+    device.add_dir("/data/user/0/com.a/cache")
+    snap = take_snapshot(roots=["/data/user/0/com.a"], pool=pool)
+    assert snap is not None
+    types = {e.path: (e.type, e.size) for e in snap}
+    assert types["/data/user/0/com.a/files/x.db"] == ("f", 5)
+    assert types["/data/user/0/com.a/cache"] == ("d", 0)
+
+
+@pytest.mark.skipif(shutil.which("sh") is None, reason="sh 없음")
+def test_classify_paths_on_local_shell(tmp_path):
+    from path_classifier import iter_classify
+
+    (tmp_path / "dir").mkdir()
+    (tmp_path / "dir" / "a b.txt").write_text("x")
+    paths = [str(tmp_path / "dir"), str(tmp_path / "dir" / "a b.txt"), str(tmp_path / "missing"), "-n"]
+    pool = AdbSessionPool(backend=_LocalShell(cwd=str(tmp_path)), size=1, timeout=5)
+    try:
+        result = {}
+        for chunk in iter_classify(paths, pool=pool, chunk_size=2):
+            result.update(chunk)
+    finally:
+        pool.close()
+    assert result == {paths[0]: "directory", paths[1]: "file", paths[2]: "missing", "-n": "missing"}
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+app_batch 테스트 (출력 폴더를 같이 쓰는 단계끼리 --resume 상태가 섞이지 않는지)
+    python -m pytest tests
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Logic" / "runner_scripts"))
+
+from app_batch import BatchState, run_batch, state_file_name  # noqa: E402
+
+
+def make_inputs(tmp_path, n=3):
+    in_dir = tmp_path / "Dynamic"
+    in_dir.mkdir()
+    files = []
+    for i in range(n):
+        f = in_dir / f"dynamic_com.app{i}.csv"
+        f.write_text("path,type\n/data/x,file\n", encoding="utf-8")
+        files.append(f)
+    return files
+
+
+def step_runner(out_dir, calls, name):
+    def task(csv_file):
+        calls.append((name, csv_file.name))
+        (out_dir / csv_file.name).write_text("done", encoding="utf-8")
+        return "ok"
+
+    def run(files, resume):
+        return run_batch(files, task, output_for=lambda f: out_dir / f.name, output_dir=out_dir,
+                         step=name, resume=resume)
+
+    return run
+
+
+def test_steps_sharing_output_dir_keep_separate_state(tmp_path):
+    files = make_inputs(tmp_path)
+    out_dir = tmp_path / "Dynamic_tokenized"
+    calls = []
+    process = step_runner(out_dir, calls, "process_dynamic_results")
+    tokenize = step_runner(out_dir, calls, "tokenize_all_dynamic")
+
+    assert process(files, resume=False) == (3, 0)
+    # 다른 단계의 새 실행(--resume 없음)이 process 단계 기록을 지우지 않음
+    assert tokenize(files[:1], resume=False) == (1, 0)
+    assert (out_dir / state_file_name("process_dynamic_results")).exists()
+    assert (out_dir / state_file_name("tokenize_all_dynamic")).exists()
+
+    calls.clear()
+    assert process(files, resume=True) == (0, 0)
+    # process 단계가 끝낸 앱이라도 tokenize 단계는 건너뛰지 않음
+    assert tokenize(files, resume=True) == (2, 0)
+    assert calls == [("tokenize_all_dynamic", f.name) for f in files[1:]]
+
+
+def test_state_reloads_per_step(tmp_path):
+    files = make_inputs(tmp_path, n=1)
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    (out_dir / files[0].name).write_text("done", encoding="utf-8")
+
+    BatchState(out_dir, "a").mark_done(files[0], 0.1, "ok")
+
+    assert BatchState(out_dir, "a").is_done(files[0], out_dir / files[0].name)
+    assert not BatchState(out_dir, "b").is_done(files[0], out_dir / files[0].name)
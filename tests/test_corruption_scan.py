@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+shared.corruption_scan 테스트 (컬럼 단위 검사가 값마다 검사한 결과와 같은지)
+    python -m pytest tests
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Logic"))
+
+from shared.corruption_scan import (  # noqa: E402
+    corruption_mask, has_corruption, scan_column, scan_path, strip_corrupted,
+)
+
+VALUES = [
+    "/data/user/0/com.a/files/x.db",
+    "/data/data/com.a/\x00\x01/sdcard/Download/y",
+    "junk�/storage/emulated/0/a \x85/data/app/b",
+    "\x7f\x9f",
+    "",
+    "sdcard/DCIM",
+]
+
+
+def test_scan_path():
+    assert scan_path(VALUES[0]) == (False, [VALUES[0]])
+    assert scan_path(VALUES[1]) == (True, ["/data/data/com.a/", "/sdcard/Download/y"])
+    assert scan_path(VALUES[2]) == (True, ["/storage/emulated/0/a", "/data/app/b"])
+    assert scan_path(VALUES[3]) == (True, [])
+
+
+def test_strip_corrupted():
+    assert strip_corrupted(VALUES[1]) == "/data/data/com.a//sdcard/Download/y"
+    assert strip_corrupted(VALUES[0]) == VALUES[0]
+
+
+def test_column_matches_per_value():
+    expected = [scan_path(v) for v in VALUES]
+    assert scan_column(VALUES) == expected
+    assert scan_column(iter(VALUES)) == expected
+    assert corruption_mask(VALUES) == [has_corruption(v) for v in VALUES]
+
+
+def test_column_from_series():
+    pd = pytest.importorskip("pandas")
+    s = pd.Series(VALUES)
+    assert scan_column(s) == [scan_path(v) for v in VALUES]
+    assert corruption_mask(s) == [has_corruption(v) for v in VALUES]
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+cv_analyzer_lite.remove_duplicates 테스트 (이전 구현 cv_benchmark.legacy_remove_duplicates 와 결과가 같은지)
+    python -m pytest tests
+"""
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Logic" / "Dynamic"))
+
+import cv_analyzer_lite  # noqa: E402
+from cv_analyzer_lite import remove_duplicates  # noqa: E402
+from cv_benchmark import legacy_remove_duplicates  # noqa: E402
+
+
+def element(x, y, confidence, idx):
+    return {'x': x, 'y': y, 'confidence': confidence, 'id': idx}
+
+
+def random_elements(rng, n, size=300, floats=False):
+    coord = (lambda: rng.uniform(0, size)) if floats else (lambda: rng.randrange(size))
+    return [element(coord(), coord(), rng.choice([40, 50, 60, 70, 80]), i) for i in range(n)]
+
+
+def ids(elements):
+    return [e['id'] for e in elements]
+
+
+def test_replacement_moves_to_end():
+    elements = [
+        element(0, 0, 50, 0),
+        element(100, 0, 50, 1),
+        element(10, 0, 70, 2),    # 0 을 대체 → 맨 뒤
+        element(110, 0, 50, 3),   # 1 과 신뢰도 같음 → 버림
+        element(40, 0, 90, 4),    # 0 은 이미 빠짐, 2 와 거리 30 → 2 를 대체
+        element(0, 35, 10, 5),    # 0 과 거리가 정확히 35 → 중복 아님
+    ]
+    assert ids(remove_duplicates(elements)) == [1, 4, 5]
+    assert ids(legacy_remove_duplicates(elements)) == [1, 4, 5]
+
+
+@pytest.mark.parametrize("floats", [False, True])
+def test_matches_legacy_on_random_lists(floats):
+    rng = random.Random(0)
+    for _ in range(2000):
+        elements = random_elements(rng, rng.randrange(0, 40), floats=floats)
+        assert ids(remove_duplicates(elements)) == ids(legacy_remove_duplicates(elements))
+
+
+def test_kd_tree_path_matches_legacy(monkeypatch):
+    pytest.importorskip("scipy")
+    monkeypatch.setattr(cv_analyzer_lite, "KD_TREE_MIN_POINTS", 2)
+    rng = random.Random(1)
+    for _ in range(200):
+        elements = random_elements(rng, rng.randrange(2, 60), floats=rng.random() < 0.5)
+        assert ids(remove_duplicates(elements)) == ids(legacy_remove_duplicates(elements))
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+device_manager 쿨다운 테스트 (adb_sim.FakeDevice, 메모리/온도 값은 테스트에서 지정)
+    python -m pytest tests
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Logic" / "Dynamic"))
+
+from adb_sim import FakeDevice  # noqa: E402
+from device_manager import COOLDOWN_BASELINE_WINDOW, DeviceManager  # noqa: E402
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    m = DeviceManager(backend=FakeDevice())
+    m.readings = {'memory': 50, 'temp': 30.0}
+    monkeypatch.setattr(m, "get_memory_info", lambda: {'used_percent': m.readings['memory']})
+    monkeypatch.setattr(m, "get_device_temp", lambda: m.readings['temp'])
+    yield m
+    m.close()
+
+
+def test_timeout_before_min_duration_has_no_empty_wait_list(manager, capsys):
+    record = manager.device_cooldown(duration=0, min_duration=5, poll_interval=0)
+
+    assert record['reason'] == 'timeout'
+    out = capsys.readouterr().out
+    assert "still waiting for" not in out
+    assert "before min duration (5s)" in out
+
+
+def test_timeout_lists_unmet_conditions(manager, capsys):
+    manager.readings['temp'] = 50.0
+    manager.device_cooldown(duration=0, poll_interval=0)
+
+    assert "still waiting for temp 50.0°C" in capsys.readouterr().out
+
+
+def test_relaxed_targets_are_logged(manager, capsys):
+    assert manager.cooldown_targets() == {'memory_percent': 75, 'temp': 45.0}
+    assert "relaxed" not in capsys.readouterr().out
+
+    manager.cooldown_history = [{'memory_percent': 76 + i, 'temp': 30.0} for i in range(COOLDOWN_BASELINE_WINDOW)]
+    targets = manager.cooldown_targets()
+
+    assert targets['memory_percent'] == 79.0 and targets['temp'] == 45.0
+    out = capsys.readouterr().out
+    assert "memory_percent < 79.0% (default 75.0%)" in out
+    assert "temp <" not in out
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+device_reset 테스트 (생성한 리셋 스크립트를 로컬 sh 로 실제 실행)
+- su / pm / am / pidof / pkill / killall / frida-server 는 PATH 앞에 둔 스텁 스크립트
+- 기기 쪽 경로(DEVICE_PATHS)는 임시 파일로 바꿔서 실행
+    python -m pytest tests
+"""
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Logic" / "Dynamic"))
+
+import device_reset  # noqa: E402
+from adb_session import ShellTransport  # noqa: E402
+from device_reset import RESET_STEPS, build_reset_script, parse_reset_output  # noqa: E402
+
+pytestmark = pytest.mark.skipif(shutil.which("sh") is None, reason="sh 없음")
+
+PACKAGES = ["com.a", "com.b", "com.bad", "com.android.systemui"]
+
+STUBS = {
+    "su": '[ "$1" = -c ] && shift\nexec sh -c "$1"\n',
+    "pm": '[ "$1 $2 $3" = "list packages -3" ] || exit 1\n'
+          + "".join(f"echo package:{p}\n" for p in PACKAGES),
+    "am": 'echo "$2" >> "$STUB_STATE/am.log"\n[ "$2" != com.bad ]\n',
+    "pidof": '[ -e "$STUB_STATE/$1.pid" ]\n',
+    "pkill": 'rm -f "$STUB_STATE/$1.pid"\n',
+    "killall": 'rm -f "$STUB_STATE/$1.pid"\n',
+    "frida-server": 'touch "$STUB_STATE/frida-server.pid"\n',
+}
+
+
+@pytest.fixture
+def device(tmp_path, monkeypatch):
+    """스텁 명령 폴더 + 상태 폴더 + 기기 경로 임시 파일"""
+    bin_dir = tmp_path / "bin"
+    state = tmp_path / "state"
+    bin_dir.mkdir()
+    state.mkdir()
+    for name, body in STUBS.items():
+        stub = bin_dir / name
+        stub.write_text("#!/bin/sh\n" + body)
+        stub.chmod(0o755)
+
+    (tmp_path / "meminfo").write_text("MemTotal:        4000000 kB\nMemAvailable:    1000000 kB\n")
+    (tmp_path / "temp").write_text("41000\n")
+    monkeypatch.setitem(device_reset.DEVICE_PATHS, "MEMINFO", str(tmp_path / "meminfo"))
+    monkeypatch.setitem(device_reset.DEVICE_PATHS, "DROP_CACHES", str(tmp_path / "drop_caches"))
+    monkeypatch.setitem(device_reset.DEVICE_PATHS, "THERMAL", str(tmp_path / "temp"))
+    monkeypatch.setattr(device_reset, "FRIDA_START_POLLS", 3)
+
+    env = dict(os.environ, PATH=f"{bin_dir}{os.pathsep}{os.environ['PATH']}", STUB_STATE=str(state))
+    return {"tmp": tmp_path, "state": state, "frida": str(bin_dir / "frida-server"), "env": env}
+
+
+def run_script(device, script):
+    proc = subprocess.run(["sh", "-c", script], env=device["env"], capture_output=True, text=True, timeout=30)
+    return parse_reset_output(proc.stdout)
+
+
+def test_all_steps(device):
+    (device["state"] / "frida-server.pid").touch()
+
+    status = run_script(device, build_reset_script(RESET_STEPS, exclude=["com.android.systemui"],
+                                                   frida_server_path=device["frida"]))
+
+    assert list(status) == list(RESET_STEPS) + ["done"]
+    assert status["force_stop"] == {"stopped": 2, "failed": 1}
+    assert (device["state"] / "am.log").read_text().split() == ["com.a", "com.b", "com.bad"]
+    assert status["drop_caches"] == {"ok": 1}
+    assert (device["tmp"] / "drop_caches").read_text().strip() == "3"
+    assert status["frida"]["stopped"] == 1 and status["frida"]["running"] == 1
+    assert status["probe"] == {"mem_total_kb": 4000000, "mem_available_kb": 1000000,
+                               "temp_milli": 41000, "frida": 1}
+
+
+def test_steps_run_in_fixed_order(device):
+    status = run_script(device, build_reset_script(["probe", "force_stop"], exclude=[],
+                                                   frida_server_path=device["frida"]))
+
+    assert list(status) == ["force_stop", "probe", "done"]
+    assert status["force_stop"] == {"stopped": 3, "failed": 1}
+    assert status["probe"]["frida"] == 0
+
+
+def test_failures_are_reported(device, monkeypatch):
+    monkeypatch.setitem(device_reset.DEVICE_PATHS, "DROP_CACHES", str(device["tmp"] / "missing" / "drop_caches"))
+    monkeypatch.setitem(device_reset.DEVICE_PATHS, "THERMAL", str(device["tmp"] / "missing" / "temp"))
+    missing_frida = str(device["tmp"] / "missing" / "frida-server")
+
+    status = run_script(device, build_reset_script(["drop_caches", "frida", "probe"],
+                                                   frida_server_path=missing_frida))
+
+    assert status["drop_caches"] == {"ok": 0}
+    assert status["frida"] == {"stopped": 0, "running": 0, "waited_ms": 300}
+    assert status["probe"]["temp_milli"] == 0
+    assert "done" in status
+
+
+class _LocalShellBackend:
+    """adb shell 대신 스텁 PATH 의 로컬 sh (DeviceManager.reset_device 의 su -c 인용까지 확인)"""
+    serial = "local"
+
+    def __init__(self, device):
+        self.env = device["env"]
+
+    def open_shell(self, root=False):
+        return ShellTransport(["env", f"PATH={self.env['PATH']}", f"STUB_STATE={self.env['STUB_STATE']}", "sh"])
+
+    def run_adb(self, args, timeout=10):
+        assert args[:1] == ["shell"]
+        proc = subprocess.run(["sh", "-c", " ".join(args[1:])], env=self.env, capture_output=True, text=True,
+                              timeout=timeout)
+        return proc.returncode, proc.stdout, proc.stderr
+
+
+def test_device_manager_reset_device(device):
+    from device_manager import DeviceManager
+
+    (device["state"] / "frida-server.pid").touch()
+    manager = DeviceManager(frida_server_path=device["frida"], backend=_LocalShellBackend(device))
+    try:
+        assert manager.force_stop_all_apps(exclude_packages=["com.bad"])
+        assert "com.bad" not in (device["state"] / "am.log").read_text().split()
+        assert manager.restart_frida_server()
+        assert manager.clear_cache()
+    finally:
+        manager.close()
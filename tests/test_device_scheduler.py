@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+device_scheduler 테스트 (가상 기기 SimulatedFleetBackend 로 실행, 하드웨어 불필요)
+    python -m pytest tests
+"""
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Logic" / "Dynamic"))
+
+from device_scheduler import (  # noqa: E402
+    FAILED, PENDING, RUNNING, SKIPPED, STATE_VERSION, SUCCESS,
+    BatchScheduler, BatchState, DeviceWorker, SimulatedFleetBackend,
+    discover_devices, simulated_fleet, simulated_run_app,
+)
+
+APPS = [f"com.app{i}" for i in range(6)]
+
+
+@pytest.fixture
+def fleet():
+    devices = simulated_fleet(2, APPS)
+    backend = SimulatedFleetBackend(devices)
+    workers = [DeviceWorker(serial) for serial in discover_devices(backend)]
+    return devices, backend, workers
+
+
+def recording(run_app):
+    """run_app 호출 기록 [(패키지, 기기)]"""
+    calls = []
+    lock = threading.Lock()
+
+    def wrapped(pkg, worker):
+        with lock:
+            calls.append((pkg, worker.serial))
+        return run_app(pkg, worker)
+
+    return wrapped, calls
+
+
+def write_state(path, apps):
+    path.write_text(json.dumps({"version": STATE_VERSION, "apps": apps}), encoding="utf-8")
+
+
+def test_discover_skips_offline_devices():
+    devices = simulated_fleet(3, APPS, offline=[1])
+    assert discover_devices(SimulatedFleetBackend(devices)) == ["sim-0", "sim-2"]
+
+
+def test_device_dies_mid_app(tmp_path, fleet):
+    devices, backend, workers = fleet
+    base = simulated_run_app(duration=0.05)
+    died = []
+
+    def run_app(pkg, worker):
+        if worker.serial == "sim-0":
+            # 첫 앱 실행 도중 연결 끊김
+            devices[0].online = False
+            died.append(pkg)
+            return False
+        return base(pkg, worker)
+
+    state = BatchState(str(tmp_path / "state.json"), APPS)
+    scheduler = BatchScheduler(
+        workers, state, run_app,
+        health_check=lambda w: w.serial in discover_devices(backend),
+        max_retries=1, recover_delay=0, recover_attempts=2,
+    )
+    scheduler.run()
+
+    assert len(died) == 1
+    assert state.with_status(SUCCESS) == APPS
+    assert state.apps[died[0]]["device"] == "sim-1"
+    assert state.apps[died[0]]["attempts"] == 2
+    assert workers[0].retired and workers[0].completed == 0
+    assert workers[1].completed == len(APPS)
+
+
+def test_retry_exhaustion_uses_other_device(tmp_path, fleet):
+    _, _, workers = fleet
+    run_app, calls = recording(simulated_run_app(duration=0.01, fail_first={"com.app2": 10}))
+
+    state = BatchState(str(tmp_path / "state.json"), APPS)
+    BatchScheduler(workers, state, run_app, max_retries=2, recover_delay=0).run()
+
+    assert state.with_status(FAILED) == ["com.app2"]
+    assert state.apps["com.app2"]["attempts"] == 3
+    assert len(state.with_status(SUCCESS)) == len(APPS) - 1
+    devices_tried = [serial for pkg, serial in calls if pkg == "com.app2"]
+    assert len(devices_tried) == 3
+    assert all(a != b for a, b in zip(devices_tried, devices_tried[1:]))
+
+
+def test_resume_from_state_file(tmp_path, fleet):
+    _, _, workers = fleet
+    path = tmp_path / "state.json"
+    write_state(path, {
+        "com.app0": {"status": SUCCESS, "attempts": 1},
+        "com.app1": {"status": RUNNING, "attempts": 1, "device": "sim-0"},
+        "com.app2": {"status": FAILED, "attempts": 2},
+    })
+
+    state = BatchState(str(path), APPS)
+    assert state.apps["com.app1"] == {"status": PENDING, "attempts": 0, "device": "sim-0"}
+    assert state.apps["com.app2"]["status"] == FAILED
+
+    run_app, calls = recording(simulated_run_app(duration=0.01))
+    BatchScheduler(workers, state, run_app, recover_delay=0).run()
+
+    assert sorted(pkg for pkg, _ in calls) == ["com.app1", "com.app3", "com.app4", "com.app5"]
+    saved = json.loads(path.read_text(encoding="utf-8"))["apps"]
+    assert saved["com.app2"]["status"] == FAILED
+    assert all(saved[pkg]["status"] == SUCCESS for pkg in APPS if pkg != "com.app2")
+
+
+def test_retry_failed(tmp_path, fleet):
+    _, _, workers = fleet
+    path = tmp_path / "state.json"
+    write_state(path, {pkg: {"status": SUCCESS, "attempts": 1} for pkg in APPS})
+    write_state(path, dict(json.loads(path.read_text(encoding="utf-8"))["apps"],
+                           **{"com.app4": {"status": FAILED, "attempts": 2}}))
+
+    assert BatchState(str(path), APPS).with_status(PENDING) == []
+
+    state = BatchState(str(path), APPS, retry_failed=True)
+    assert state.with_status(PENDING) == ["com.app4"]
+    run_app, calls = recording(simulated_run_app(duration=0.01))
+    BatchScheduler(workers, state, run_app, recover_delay=0).run()
+
+    assert [pkg for pkg, _ in calls] == ["com.app4"]
+    assert state.apps["com.app4"]["status"] == SUCCESS
+
+
+def test_skip_is_not_persisted(tmp_path, fleet):
+    _, _, workers = fleet
+    path = tmp_path / "state.json"
+
+    state = BatchState(str(path), APPS)
+    state.skip(APPS[:2])
+    assert state.with_status(SKIPPED) == APPS[:2]
+    run_app, calls = recording(simulated_run_app(duration=0.01))
+    BatchScheduler(workers, state, run_app, recover_delay=0).run()
+    assert sorted(pkg for pkg, _ in calls) == APPS[2:]
+
+    # 다음 실행 (--start-from 없음): 건너뛴 앱만 실행
+    state = BatchState(str(path), APPS)
+    assert state.with_status(PENDING) == APPS[:2]
+    run_app, calls = recording(simulated_run_app(duration=0.01))
+    BatchScheduler([DeviceWorker(w.serial) for w in workers], state, run_app, recover_delay=0).run()
+    assert sorted(pkg for pkg, _ in calls) == APPS[:2]
+    assert state.with_status(SUCCESS) == APPS
+
+
+def test_single_device_recovers_and_keeps_queue(tmp_path, fleet):
+    _, _, workers = fleet
+    checks = iter([True, False, False])
+
+    state = BatchState(str(tmp_path / "state.json"), APPS)
+    scheduler = BatchScheduler(
+        workers[:1], state, simulated_run_app(duration=0.01),
+        health_check=lambda w: next(checks, True),
+        recover_delay=0, recover_attempts=3,
+    )
+    scheduler.run()
+
+    assert state.with_status(SUCCESS) == APPS
+    assert workers[0].healthy and not workers[0].retired